@@ -0,0 +1,301 @@
+-- Generated by activity_factors.py - do not edit.
+-- mysql carbon_app < activityFactors.sql
+SET NAMES utf8mb4;
+
+CREATE TABLE IF NOT EXISTS `activity_factors` (
+  `activity_key` int(10) UNSIGNED NOT NULL,
+  `activity_id` varchar(64) NOT NULL,
+  `activity_name` varchar(150) NOT NULL,
+  `category` varchar(40) NOT NULL,
+  `type` varchar(30) NOT NULL,
+  `unit` varchar(20) NOT NULL,
+  `emission_factor` decimal(12,6) NOT NULL,
+  `source` varchar(255) NOT NULL,
+  `active` tinyint(1) NOT NULL DEFAULT 1,
+  PRIMARY KEY (`activity_key`),
+  UNIQUE KEY `uq_activity_factors_id` (`activity_id`),
+  KEY `idx_activity_factors_category` (`category`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
+INSERT INTO `activity_factors` (`activity_key`, `activity_id`, `activity_name`, `category`, `type`, `unit`, `emission_factor`, `source`, `active`) VALUES
+(1, 'business_travel_air_with_rf_passengerkm', 'Fly with Radiative Forcing', 'business_travel_air', 'general', 'passenger.km', 0.22255143, 'DEFRA 2025', 1),
+(2, 'business_travel_air_without_rf_passengerkm', 'Fly without Radiative Forcing', 'business_travel_air', 'general', 'passenger.km', 0.13158143, 'DEFRA 2025', 1),
+(3, 'business_travel_sea_unspecified_passengerkm', 'Sail', 'business_travel_sea', 'general', 'passenger.km', 0.08691333, 'DEFRA 2025', 1),
+(4, 'delivery_vehicles_cng_kgkm', 'Receive a delivery (CNG van)', 'delivery_vehicles', 'general', 'kg·km', 0.00090155, 'DEFRA 2025', 1),
+(5, 'delivery_vehicles_diesel_kgkm', 'Receive a delivery (diesel van)', 'delivery_vehicles', 'general', 'kg·km', 0.00079373, 'DEFRA 2025', 1),
+(6, 'delivery_vehicles_lpg_kgkm', 'Receive a delivery (LPG van)', 'delivery_vehicles', 'general', 'kg·km', 0.00099118, 'DEFRA 2025', 1),
+(7, 'delivery_vehicles_petrol_kgkm', 'Receive a delivery (petrol van)', 'delivery_vehicles', 'general', 'kg·km', 0.00086378, 'DEFRA 2025', 1),
+(8, 'delivery_vehicles_electric_van_kgkm', 'Receive a delivery (electric van)', 'delivery_vehicles', 'general', 'kg·km', 0.00023434, 'DEFRA 2025', 1),
+(9, 'food_ale', 'Drink Ale', 'food', 'drank', 'litres', 0.48869, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(10, 'food_almond_butter', 'Eat Almond butter', 'food', 'ate', 'kg', 0.387011, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(11, 'food_almond_milk', 'Drink Almond milk', 'food', 'drank', 'litres', 0.655888, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(12, 'food_almonds', 'Eat Almonds', 'food', 'ate', 'kg', 0.602368, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(13, 'food_apple_juice', 'Drink Apple juice', 'food', 'drank', 'litres', 0.458378, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(14, 'food_apple_pie', 'Eat Apple pie', 'food', 'ate', 'kg', 1.244974, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(15, 'food_apples', 'Eat Apples', 'food', 'ate', 'kg', 0.507354, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(16, 'food_apricot_jam', 'Use Apricot jam', 'food', 'used', 'kg', 1.382105, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(17, 'food_asparagus', 'Eat Asparagus', 'food', 'ate', 'kg', 0.925692, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(18, 'food_avocados', 'Eat Avocados', 'food', 'ate', 'kg', 0.921227, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(19, 'food_bacon', 'Eat Bacon', 'food', 'ate', 'kg', 19.314209, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(20, 'food_bagels', 'Eat Bagels', 'food', 'ate', 'kg', 0.802813, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(21, 'food_baguette', 'Eat Baguette', 'food', 'ate', 'kg', 0.995644, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(22, 'food_banana_loaf', 'Eat Banana loaf', 'food', 'ate', 'kg', 1.868787, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(23, 'food_bananas', 'Eat Bananas', 'food', 'ate', 'kg', 0.87335, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(24, 'food_beans', 'Eat Beans', 'food', 'ate', 'kg', 1.373308, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(25, 'food_beef_burger', 'Eat Beef burger', 'food', 'ate', 'kg', 53.976371, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(26, 'food_beef_curry', 'Eat Beef curry', 'food', 'ate', 'kg', 17.368725, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(27, 'food_beef_meatballs', 'Eat Beef meatballs', 'food', 'ate', 'kg', 70.787474, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(28, 'food_beef_mince', 'Eat Beef mince', 'food', 'ate', 'kg', 95.034572, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(29, 'food_beef_noodles', 'Eat Beef noodles', 'food', 'ate', 'kg', 2.290114, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(30, 'food_beef_steak', 'Drink Beef steak', 'food', 'drank', 'litres', 129.747715, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(31, 'food_beer', 'Drink Beer', 'food', 'drank', 'litres', 0.686283, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(32, 'food_beetroot', 'Eat Beetroot', 'food', 'ate', 'kg', 2.658241, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(33, 'food_biscuits', 'Eat Biscuits', 'food', 'ate', 'kg', 3.989251, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(34, 'food_blue_cheese', 'Eat Blue cheese', 'food', 'ate', 'kg', 20.105753, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(35, 'food_brazil_nuts', 'Eat Brazil nuts', 'food', 'ate', 'kg', 2.513051, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(36, 'food_bread', 'Eat Bread', 'food', 'ate', 'kg', 0.878761, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(37, 'food_breakfast_cereal', 'Eat Breakfast cereal', 'food', 'ate', 'kg', 1.493427, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(38, 'food_brie', 'Eat Brie', 'food', 'ate', 'kg', 19.139581, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(39, 'food_broccoli', 'Eat Broccoli', 'food', 'ate', 'kg', 0.897402, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(40, 'food_butter', 'Eat Butter', 'food', 'ate', 'kg', 3.324503, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(41, 'food_cabbage', 'Eat Cabbage', 'food', 'ate', 'kg', 0.890284, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(42, 'food_caesar_salad', 'Eat Caesar salad', 'food', 'ate', 'kg', 2.079189, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(43, 'food_camembert', 'Eat Camembert', 'food', 'ate', 'kg', 16.28143, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(44, 'food_carrot_cake', 'Eat Carrot cake', 'food', 'ate', 'kg', 2.010722, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(45, 'food_carrots', 'Eat Carrots', 'food', 'ate', 'kg', 0.935163, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(46, 'food_cashew_nuts', 'Eat Cashew nuts', 'food', 'ate', 'kg', 2.087644, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(47, 'food_cauliflower', 'Eat Cauliflower', 'food', 'ate', 'kg', 0.891726, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(48, 'food_cereal_bars', 'Eat Cereal bars', 'food', 'ate', 'kg', 2.853384, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(49, 'food_cheddar_cheese', 'Eat Cheddar cheese', 'food', 'ate', 'kg', 20.749045, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(50, 'food_cheesecake', 'Eat Cheesecake', 'food', 'ate', 'kg', 2.369302, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(51, 'food_cherry_tomatoes', 'Eat Cherry tomatoes', 'food', 'ate', 'kg', 2.26636, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(52, 'food_chia_seeds', 'Eat Chia seeds', 'food', 'ate', 'kg', 1.220554, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(53, 'food_chicken_breast', 'Eat Chicken breast', 'food', 'ate', 'kg', 9.272323, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(54, 'food_chicken_burger', 'Eat Chicken burger', 'food', 'ate', 'kg', 5.434487, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(55, 'food_chicken_curry', 'Eat Chicken curry', 'food', 'ate', 'kg', 3.616546, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(56, 'food_chicken_noodles', 'Eat Chicken noodles', 'food', 'ate', 'kg', 2.383996, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(57, 'food_chicken_pasta', 'Eat Chicken pasta', 'food', 'ate', 'kg', 2.946765, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(58, 'food_chicken_sausages', 'Eat Chicken sausages', 'food', 'ate', 'kg', 8.164302, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(59, 'food_chicken_thighs', 'Eat Chicken thighs', 'food', 'ate', 'kg', 9.981881, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(60, 'food_chicken_wings', 'Eat Chicken wings', 'food', 'ate', 'kg', 9.583456, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(61, 'food_chickpeas', 'Eat Chickpeas', 'food', 'ate', 'kg', 1.344353, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(62, 'food_chilli_con_carne', 'Eat Chilli con carne', 'food', 'ate', 'kg', 13.540805, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(63, 'food_chocolate_biscuits', 'Eat Chocolate biscuits', 'food', 'ate', 'kg', 5.083679, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(64, 'food_chocolate_cake', 'Eat Chocolate cake', 'food', 'ate', 'kg', 3.952118, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(65, 'food_chocolate_cereals', 'Eat Chocolate cereals', 'food', 'ate', 'kg', 2.877626, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(66, 'food_chocolate_cheesecake', 'Eat Chocolate cheesecake', 'food', 'ate', 'kg', 4.900424, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(67, 'food_chocolate_spread', 'Use Chocolate spread', 'food', 'used', 'kg', 5.3723, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(68, 'food_cider', 'Drink Cider', 'food', 'drank', 'litres', 1.081633, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(69, 'food_coconut_milk', 'Drink Coconut milk', 'food', 'drank', 'litres', 3.31999, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(70, 'food_coconut_oil', 'Use Coconut oil', 'food', 'used', 'kg', 0.528741, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(71, 'food_cod', 'Consume Cod', 'food', 'other', 'kg', 10.904109, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(72, 'food_cod_fish_fingers', 'Consume Cod fish fingers', 'food', 'other', 'kg', 9.313182, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(73, 'food_cod_fishcakes', 'Consume Cod fishcakes', 'food', 'other', 'kg', 7.815675, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(74, 'food_coffee_beans', 'Drink Coffee beans', 'food', 'drank', 'litres', 16.824608, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(75, 'food_coffee_pods', 'Drink Coffee pods', 'food', 'drank', 'litres', 20.299764, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(76, 'food_cookies', 'Eat Cookies', 'food', 'ate', 'kg', 3.357278, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(77, 'food_cottage_cheese', 'Eat Cottage cheese', 'food', 'ate', 'kg', 25.278503, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(78, 'food_cottage_pie', 'Consume Cottage pie', 'food', 'other', 'kg', 11.851271, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(79, 'food_courgettes', 'Eat Courgettes', 'food', 'ate', 'kg', 0.846479, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(80, 'food_couscous', 'Consume Couscous', 'food', 'other', 'kg', 1.157979, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(81, 'food_cows_milk', 'Drink Cow\'s milk', 'food', 'drank', 'litres', 3.703237, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(82, 'food_cracker_biscuits', 'Eat Cracker biscuits', 'food', 'ate', 'kg', 2.448466, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(83, 'food_crisps', 'Eat Crisps', 'food', 'ate', 'kg', 3.031724, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(84, 'food_croissants', 'Eat Croissants', 'food', 'ate', 'kg', 1.682228, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(85, 'food_cucumber', 'Consume Cucumber', 'food', 'other', 'kg', 0.847114, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(86, 'food_dairy-free_cheese', 'Consume Dairy-free cheese', 'food', 'other', 'kg', 1.976174, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(87, 'food_dairy-free_ice_cream', 'Eat Dairy-free ice cream', 'food', 'ate', 'kg', 2.451197, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(88, 'food_dark_chocolate', 'Eat Dark chocolate', 'food', 'ate', 'kg', 20.620037, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(89, 'food_doughnuts', 'Eat Doughnuts', 'food', 'ate', 'kg', 2.199665, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(90, 'food_egg_noodles', 'Eat Egg noodles', 'food', 'ate', 'kg', 1.381512, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(91, 'food_eggs', 'Eat Eggs', 'food', 'ate', 'kg', 4.4366, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(92, 'food_falafels', 'Eat Falafels', 'food', 'ate', 'kg', 1.098106, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(93, 'food_feta_cheese', 'Eat Feta cheese', 'food', 'ate', 'kg', 14.838609, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(94, 'food_flapjack', 'Eat Flapjack', 'food', 'ate', 'kg', 1.947683, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(95, 'food_frozen_chips_french_fries', 'Consume Frozen chips (french fries)', 'food', 'other', 'kg', 0.753472, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(96, 'food_frozen_jacket_potatoes', 'Eat Frozen jacket potatoes', 'food', 'ate', 'kg', 0.51752, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(97, 'food_frozen_mashed_potato', 'Eat Frozen mashed potato', 'food', 'ate', 'kg', 0.826643, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(98, 'food_frozen_onion_rings', 'Eat Frozen onion rings', 'food', 'ate', 'kg', 0.771175, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(99, 'food_frozen_potato_wedges', 'Eat Frozen potato wedges', 'food', 'ate', 'kg', 0.664775, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(100, 'food_frozen_roast_potatoes', 'Eat Frozen roast potatoes', 'food', 'ate', 'kg', 1.203417, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(101, 'food_frozen_sweet_potato_fries', 'Eat Frozen sweet potato fries', 'food', 'ate', 'kg', 0.409885, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(102, 'food_fruit_cake', 'Eat Fruit cake', 'food', 'ate', 'kg', 3.452116, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(103, 'food_fruit_smoothies', 'Drink Fruit smoothies', 'food', 'drank', 'litres', 1.648915, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(104, 'food_garden_peas', 'Eat Garden peas', 'food', 'ate', 'kg', 1.003837, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(105, 'food_goats_cheese', 'Eat Goat\'s cheese', 'food', 'ate', 'kg', 19.312073, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(106, 'food_granola', 'Eat Granola', 'food', 'ate', 'kg', 1.781193, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(107, 'food_grapes', 'Eat Grapes', 'food', 'ate', 'kg', 8.278876, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(108, 'food_haddock_risotto', 'Eat Haddock risotto', 'food', 'ate', 'kg', 4.898891, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(109, 'food_halloumi_cheese', 'Eat Halloumi cheese', 'food', 'ate', 'kg', 16.172452, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(110, 'food_ice_cream', 'Eat Ice cream', 'food', 'ate', 'kg', 3.661809, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(111, 'food_ice_lollies', 'Eat Ice lollies', 'food', 'ate', 'kg', 1.314393, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(112, 'food_instant_coffee', 'Drink Instant coffee', 'food', 'drank', 'litres', 28.783641, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(113, 'food_kale', 'Drink Kale', 'food', 'drank', 'litres', 0.903419, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(114, 'food_kiwis', 'Eat Kiwis', 'food', 'ate', 'kg', 1.613707, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(115, 'food_lamb_leg', 'Eat Lamb (leg)', 'food', 'ate', 'kg', 30.740947, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(116, 'food_lamb_burgers', 'Eat Lamb burgers', 'food', 'ate', 'kg', 26.928289, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(117, 'food_lamb_casserole', 'Eat Lamb casserole', 'food', 'ate', 'kg', 30.87731, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(118, 'food_lamb_chops', 'Eat Lamb chops', 'food', 'ate', 'kg', 30.901993, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(119, 'food_lamb_curry', 'Eat Lamb curry', 'food', 'ate', 'kg', 10.192565, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(120, 'food_lamb_hotpot', 'Eat Lamb Hotpot', 'food', 'ate', 'kg', 11.226254, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(121, 'food_lamb_moussaka', 'Eat Lamb moussaka', 'food', 'ate', 'kg', 7.259162, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(122, 'food_lasagne_sheets', 'Eat Lasagne sheets', 'food', 'ate', 'kg', 1.961382, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(123, 'food_lemons', 'Eat Lemons', 'food', 'ate', 'kg', 0.470153, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(124, 'food_lentils', 'Eat Lentils', 'food', 'ate', 'kg', 2.53652, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(125, 'food_lettuce', 'Eat Lettuce', 'food', 'ate', 'kg', 4.926023, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(126, 'food_limes', 'Eat Limes', 'food', 'ate', 'kg', 0.463008, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(127, 'food_macaroni_cheese', 'Eat Macaroni cheese', 'food', 'ate', 'kg', 16.849313, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(128, 'food_mackerel', 'Eat Mackerel', 'food', 'ate', 'kg', 13.606384, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(129, 'food_marmalade', 'Use Marmalade', 'food', 'used', 'kg', 1.548921, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(130, 'food_meat_pizza', 'Eat Meat pizza', 'food', 'ate', 'kg', 7.40066, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(131, 'food_meat-free_burger', 'Eat Meat-free burger', 'food', 'ate', 'kg', 1.018329, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(132, 'food_meat-free_mince', 'Eat Meat-free mince', 'food', 'ate', 'kg', 0.877038, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(133, 'food_meat-free_nuggets', 'Eat Meat-free nuggets', 'food', 'ate', 'kg', 0.861847, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(134, 'food_meat-free_sausages', 'Eat Meat-free sausages', 'food', 'ate', 'kg', 0.962558, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(135, 'food_melon', 'Eat Melon', 'food', 'ate', 'kg', 1.056536, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(136, 'food_milk_chocolate', 'Eat Milk chocolate', 'food', 'ate', 'kg', 10.800275, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(137, 'food_mixed_salad', 'Eat Mixed salad', 'food', 'ate', 'kg', 0.9209, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(138, 'food_mozzarella_cheese', 'Eat Mozzarella cheese', 'food', 'ate', 'kg', 16.2332, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(139, 'food_muesli', 'Eat Muesli', 'food', 'ate', 'kg', 2.271911, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(140, 'food_muffins', 'Eat Muffins', 'food', 'ate', 'kg', 2.583631, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(141, 'food_mushrooms', 'Eat Mushrooms', 'food', 'ate', 'kg', 2.352917, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(142, 'food_naan', 'Eat Naan', 'food', 'ate', 'kg', 1.013234, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(143, 'food_nut_loaf', 'Eat Nut loaf', 'food', 'ate', 'kg', 0.716131, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(144, 'food_oat_milk', 'Drink Oat milk', 'food', 'drank', 'litres', 0.453281, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(145, 'food_olive_oil', 'Use Olive oil', 'food', 'used', 'kg', 5.184628, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(146, 'food_onions', 'Eat Onions', 'food', 'ate', 'kg', 0.36286, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(147, 'food_orange_juice', 'Drink Orange juice', 'food', 'drank', 'litres', 0.488848, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(148, 'food_oranges', 'Eat Oranges', 'food', 'ate', 'kg', 0.46655, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(149, 'food_pain_au_chocolat', 'Eat Pain au chocolat', 'food', 'ate', 'kg', 2.809512, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(150, 'food_pancakes', 'Eat Pancakes', 'food', 'ate', 'kg', 1.547809, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(151, 'food_parmesan_cheese', 'Eat Parmesan cheese', 'food', 'ate', 'kg', 24.01648, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(152, 'food_parsnips', 'Eat Parsnips', 'food', 'ate', 'kg', 0.989607, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(153, 'food_pasta_shells', 'Eat Pasta shells', 'food', 'ate', 'kg', 1.025583, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(154, 'food_peanut_butter', 'Eat Peanut butter', 'food', 'ate', 'kg', 3.43496, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(155, 'food_peanuts', 'Eat Peanuts', 'food', 'ate', 'kg', 3.146227, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(156, 'food_pears', 'Eat Pears', 'food', 'ate', 'kg', 0.925555, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(157, 'food_pecan_nuts', 'Eat Pecan nuts', 'food', 'ate', 'kg', 2.515942, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(158, 'food_penne_pasta', 'Eat Penne pasta', 'food', 'ate', 'kg', 1.625107, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(159, 'food_peppers', 'Eat Peppers', 'food', 'ate', 'kg', 0.918662, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(160, 'food_pineapple', 'Eat Pineapple', 'food', 'ate', 'kg', 0.932008, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(161, 'food_pitta_bread', 'Eat Pitta bread', 'food', 'ate', 'kg', 0.563561, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(162, 'food_popcorn', 'Eat Popcorn', 'food', 'ate', 'kg', 1.813626, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(163, 'food_poppadoms', 'Eat Poppadoms', 'food', 'ate', 'kg', 1.500618, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(164, 'food_pork_chops', 'Eat Pork chops', 'food', 'ate', 'kg', 12.163891, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(165, 'food_pork_loin', 'Eat Pork loin', 'food', 'ate', 'kg', 11.976514, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(166, 'food_pork_sausage_rolls', 'Eat Pork sausage rolls', 'food', 'ate', 'kg', 6.186894, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(167, 'food_pork_sausages', 'Eat Pork sausages', 'food', 'ate', 'kg', 9.767878, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(168, 'food_porridge_oatmeal', 'Eat Porridge (oatmeal)', 'food', 'ate', 'kg', 1.555169, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(169, 'food_potato_croquettes', 'Eat Potato croquettes', 'food', 'ate', 'kg', 0.774225, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(170, 'food_potatoes', 'Eat Potatoes', 'food', 'ate', 'kg', 0.207276, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(171, 'food_prawn_crackers', 'Consume Prawn crackers', 'food', 'other', 'kg', 4.932853, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(172, 'food_prawns', 'Eat Prawns', 'food', 'ate', 'kg', 20.911283, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(173, 'food_protein_bar', 'Eat Protein bar', 'food', 'ate', 'kg', 3.372851, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(174, 'food_protein_shake', 'Drink Protein shake', 'food', 'drank', 'litres', 1.743729, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(175, 'food_pumpkin_seeds', 'Consume Pumpkin seeds', 'food', 'other', 'kg', 1.323975, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(176, 'food_quiche', 'Eat Quiche', 'food', 'ate', 'kg', 4.666833, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(177, 'food_quinoa', 'Eat Quinoa', 'food', 'ate', 'kg', 1.138642, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(178, 'food_rapeseed_oil', 'Use Rapeseed oil', 'food', 'used', 'kg', 3.288695, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(179, 'food_raspberries', 'Eat Raspberries', 'food', 'ate', 'kg', 8.370972, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(180, 'food_raspberry_jam', 'Use Raspberry jam', 'food', 'used', 'kg', 5.107338, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(181, 'food_rice', 'Eat Rice', 'food', 'ate', 'kg', 3.92591, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(182, 'food_rice_milk', 'Drink Rice milk', 'food', 'drank', 'litres', 1.441797, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(183, 'food_rice_noodles', 'Eat Rice noodles', 'food', 'ate', 'kg', 3.411126, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(184, 'food_ricotta_cheese', 'Eat Ricotta cheese', 'food', 'ate', 'kg', 16.294974, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(185, 'food_salmon', 'Eat Salmon', 'food', 'ate', 'kg', 10.412581, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(186, 'food_salmon_fishcakes', 'Eat Salmon fishcakes', 'food', 'ate', 'kg', 6.505735, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(187, 'food_sausage_rolls', 'Eat Sausage rolls', 'food', 'ate', 'kg', 5.849549, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(188, 'food_shepherds_pie', 'Eat Shepherd\'s pie', 'food', 'ate', 'kg', 7.737125, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(189, 'food_shortbread_biscuits', 'Eat Shortbread biscuits', 'food', 'ate', 'kg', 2.223783, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(190, 'food_sourdough_bread', 'Eat Sourdough bread', 'food', 'ate', 'kg', 0.851167, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(191, 'food_soy_desert', 'Eat Soy desert', 'food', 'ate', 'kg', 1.087264, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(192, 'food_soy_milk', 'Drink Soy milk', 'food', 'drank', 'litres', 0.893108, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(193, 'food_soy_yoghurt', 'Eat Soy yoghurt', 'food', 'ate', 'kg', 0.49602, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(194, 'food_spaghetti', 'Eat Spaghetti', 'food', 'ate', 'kg', 1.646015, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(195, 'food_spaghetti_bolognese', 'Eat Spaghetti bolognese', 'food', 'ate', 'kg', 7.834703, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(196, 'food_spinach', 'Eat Spinach', 'food', 'ate', 'kg', 1.009128, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(197, 'food_sponge_cake', 'Eat Sponge cake', 'food', 'ate', 'kg', 1.877448, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(198, 'food_steak_pie', 'Drink Steak pie', 'food', 'drank', 'litres', 7.101864, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(199, 'food_strawberries', 'Eat Strawberries', 'food', 'ate', 'kg', 3.241715, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(200, 'food_strawberry_jam', 'Eat Strawberry jam', 'food', 'ate', 'kg', 2.596663, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(201, 'food_sugar', 'Eat Sugar', 'food', 'ate', 'kg', 1.851686, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(202, 'food_sunflower_oil', 'Use Sunflower oil', 'food', 'used', 'kg', 3.661397, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(203, 'food_sunflower_seeds', 'Consume Sunflower seeds', 'food', 'other', 'kg', 1.934424, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(204, 'food_sweetcorn', 'Eat Sweetcorn', 'food', 'ate', 'kg', 0.971203, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(205, 'food_tea', 'Drink Tea', 'food', 'drank', 'litres', 17.621044, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(206, 'food_tofu', 'Eat Tofu', 'food', 'ate', 'kg', 1.020865, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(207, 'food_tomato_ketchup', 'Eat Tomato ketchup', 'food', 'ate', 'kg', 2.609794, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(208, 'food_tomatoes', 'Eat Tomatoes', 'food', 'ate', 'kg', 2.271515, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(209, 'food_tortilla_wraps', 'Eat Tortilla wraps', 'food', 'ate', 'kg', 0.948584, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(210, 'food_tuna', 'Eat Tuna', 'food', 'ate', 'kg', 13.075355, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(211, 'food_vegan_pizza', 'Eat Vegan pizza', 'food', 'ate', 'kg', 1.948104, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(212, 'food_vegetable_lasagne', 'Eat Vegetable lasagne', 'food', 'ate', 'kg', 3.376141, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(213, 'food_vegetarian_chilli_con_carne', 'Eat Vegetarian chilli con carne', 'food', 'ate', 'kg', 1.429291, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(214, 'food_vegetarian_curry', 'Eat Vegetarian curry', 'food', 'ate', 'kg', 1.309165, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(215, 'food_vegetarian_pizza', 'Eat Vegetarian pizza', 'food', 'ate', 'kg', 5.232976, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(216, 'food_walnuts', 'Eat Walnuts', 'food', 'ate', 'kg', 2.416308, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(217, 'food_watermelon', 'Eat Watermelon', 'food', 'ate', 'kg', 0.969403, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(218, 'food_wine', 'Drink Wine', 'food', 'drank', 'litres', 1.722881, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(219, 'food_yoghurt', 'Eat Yoghurt', 'food', 'ate', 'kg', 3.111811, 'Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)', 1),
+(220, 'shower_hot_per_min', 'Take a Hot Shower', 'general', 'general', 'minutes', 1.115584, 'Estimated using DEFRA 2025 water and electricity factors', 1),
+(221, 'bath_hot_avg', 'Take a Hot Bath (Full Tub)', 'general', 'general', 'uses', 7.958785, 'Estimated using DEFRA 2025 water and electricity factors', 1),
+(222, 'boil_kettle_full', 'Boil Electric Kettle (Full 1.5L)', 'general', 'general', 'uses', 0.0177, 'Estimated using DEFRA 2025 electricity factor', 1),
+(223, 'microwave_per_min', 'Use Microwave', 'general', 'general', 'minutes', 0.0177, 'Estimated using DEFRA 2025 electricity factor', 1),
+(224, 'electric_hob_per_min', 'Cook Using Electric Hob', 'general', 'general', 'minutes', 0.02832, 'Estimated using DEFRA 2025 electricity factor', 1),
+(225, 'gas_hob_per_min', 'Cook Using Gas Hob', 'general', 'general', 'minutes', 0.019186, 'Estimated using DEFRA 2025 natural gas factor', 1),
+(226, 'dishwasher_use', 'Run Dishwasher', 'general', 'general', 'uses', 1.101048, 'Estimated using DEFRA 2025 electricity and water factors', 1),
+(227, 'washing_machine_use', 'Run Washing Machine', 'general', 'general', 'uses', 4.67334, 'Estimated using DEFRA 2025 electricity and water factors', 1),
+(228, 'tumble_dryer_use', 'Use Tumble Dryer', 'general', 'general', 'uses', 0.3894, 'Estimated using DEFRA 2025 electricity factor', 1),
+(229, 'charge_phone', 'Charge Smartphone', 'general', 'general', 'charges', 0.00708, 'Estimated using DEFRA 2025 electricity factor', 1),
+(230, 'use_tv_per_min', 'Watch TV', 'general', 'general', 'minutes', 0.00177, 'Estimated using DEFRA 2025 electricity factor', 1),
+(231, 'use_laptop_per_min', 'Use Laptop', 'general', 'general', 'minutes', 0.000531, 'Estimated using DEFRA 2025 electricity factor', 1),
+(232, 'use_desktop_pc_per_min', 'Use Desktop PC', 'general', 'general', 'minutes', 0.000708, 'Estimated using DEFRA 2025 electricity factor', 1),
+(233, 'hairdryer_10_min', 'Dry Hair with Hairdryer', 'general', 'general', '10 minutes', 0.0354, 'Estimated using DEFRA 2025 electricity factor', 1),
+(234, 'brush_teeth_tap_per_min', 'Brush Teeth with Tap Running', 'general', 'general', 'minutes', 0.543809, 'Estimated using DEFRA 2025 water factor', 1),
+(235, 'electric_toothbrush_charge', 'Use Electric Toothbrush', 'general', 'general', 'charges', 0.000531, 'Estimated using DEFRA 2025 electricity factor', 1),
+(236, 'vacuum_clean_per_room', 'Vacuum a Room', 'general', 'general', 'uses', 0.0531, 'Estimated using DEFRA 2025 electricity factor', 1),
+(237, 'iron_clothes_per_hour', 'Iron Clothes', 'general', 'general', 'hours', 0.4248, 'Estimated using DEFRA 2025 electricity factor', 1),
+(238, 'use_ac_heater_per_hour', 'Use Air Conditioner or Heater', 'general', 'general', 'hours', 0.354, 'Estimated using DEFRA 2025 electricity factor', 1),
+(239, 'fridge_daily', 'Use Fridge (Daily)', 'general', 'general', 'days', 0.2124, 'Estimated using DEFRA 2025 electricity factor', 1),
+(240, 'freezer_daily', 'Use Freezer (Daily)', 'general', 'general', 'days', 0.177, 'Estimated using DEFRA 2025 electricity factor', 1),
+(241, 'toaster_use', 'Use Toaster', 'general', 'general', 'uses', 0.00885, 'Estimated using DEFRA 2025 electricity factor', 1),
+(242, 'oven_electric_per_min', 'Use Electric Oven', 'general', 'general', 'minutes', 0.00885, 'Estimated using DEFRA 2025 electricity factor', 1),
+(243, 'coffee_machine_use', 'Use Coffee Machine', 'general', 'general', 'uses', 0.00885, 'Estimated using DEFRA 2025 electricity factor', 1),
+(244, 'hair_straighteners_10min', 'Use Hair Straighteners', 'general', 'general', '10 minutes', 0.0177, 'Estimated using DEFRA 2025 electricity factor', 1),
+(245, 'gaming_console_per_hour', 'Use Gaming Console', 'general', 'general', 'hours', 0.0177, 'Estimated using DEFRA 2025 electricity factor', 1),
+(246, 'wifi_router_daily', 'Use Wi-Fi Router', 'general', 'general', 'days', 0.02124, 'Estimated using DEFRA 2025 electricity factor', 1),
+(247, 'charge_tablet', 'Charge Tablet', 'general', 'general', 'charges', 0.00354, 'Estimated using DEFRA 2025 electricity factor', 1),
+(248, 'smart_speaker_daily', 'Use Smart Speaker (Daily)', 'general', 'general', 'days', 0.012744, 'Estimated using DEFRA 2025 electricity factor', 1),
+(249, 'smart_tv_per_hour', 'Use Smart TV', 'general', 'general', 'hours', 0.02124, 'Estimated using DEFRA 2025 electricity factor', 1),
+(250, 'streaming_video_per_hour', 'Stream Video Content', 'general', 'general', 'hours', 0.002655, 'Estimated using DEFRA 2025 electricity factor', 1),
+(251, 'lighting_led_per_hour', 'Use LED Lighting', 'general', 'general', 'hours', 0.001593, 'Estimated using DEFRA 2025 electricity factor', 1),
+(252, 'lighting_incandescent_per_hour', 'Use Incandescent Lighting', 'general', 'general', 'hours', 0.01062, 'Estimated using DEFRA 2025 electricity factor', 1),
+(253, 'printer_use', 'Use Home Printer', 'general', 'general', 'uses', 0.00885, 'Estimated using DEFRA 2025 electricity factor', 1),
+(254, 'fan_per_hour', 'Use Electric Fan', 'general', 'general', 'hours', 0.00885, 'Estimated using DEFRA 2025 electricity factor', 1),
+(255, 'robot_vacuum_per_use', 'Use Robot Vacuum', 'general', 'general', 'uses', 0.0531, 'Estimated using DEFRA 2025 electricity factor', 1),
+(256, 'dish_handwash_hot_per_min', 'Handwash Dishes with Hot Water', 'general', 'general', 'minutes', 0.20251, 'Estimated using DEFRA 2025 water and electricity factors', 1),
+(257, 'shower_cold_per_min', 'Take a Cold Shower', 'general', 'general', 'minutes', 1.087618, 'Estimated using DEFRA 2025 water factor', 1),
+(258, 'bidet_use', 'Use Smart Toilet/Bidet', 'general', 'general', 'uses', 0.00531, 'Estimated using DEFRA 2025 electricity factor', 1),
+(259, 'humidifier_per_hour', 'Run Humidifier/Dehumidifier', 'general', 'general', 'hours', 0.0354, 'Estimated using DEFRA 2025 electricity factor', 1),
+(260, 'homeworking_unspecified_fte_working_hour', 'Homeworking', 'homeworking', 'general', 'FTE working hour', 0.22252, 'DEFRA 2025', 1),
+(261, 'hotel_stay_unspecified_room_per_night', 'Stay in a hotel', 'hotel_stay', 'general', 'Room per night', 38.78205128, 'DEFRA 2025', 1),
+(262, 'passenger_vehicles_battery_electric_vehicle_km', 'Drive an electric car', 'passenger_vehicles', 'general', 'km', 0.0, 'DEFRA 2025', 1),
+(263, 'passenger_vehicles_cng_km', 'Drive a CNG car', 'passenger_vehicles', 'general', 'km', 0.33889698, 'DEFRA 2025', 1),
+(264, 'passenger_vehicles_diesel_km', 'Drive a diesel car', 'passenger_vehicles', 'general', 'km', 0.30111059, 'DEFRA 2025', 1),
+(265, 'passenger_vehicles_hybrid_km', 'Drive a hybrid car', 'passenger_vehicles', 'general', 'km', 0.23160519, 'DEFRA 2025', 1),
+(266, 'passenger_vehicles_lpg_km', 'Drive a LPG car', 'passenger_vehicles', 'general', 'km', 0.38171132, 'DEFRA 2025', 1),
+(267, 'passenger_vehicles_petrol_km', 'Drive a petrol car', 'passenger_vehicles', 'general', 'km', 0.3427334, 'DEFRA 2025', 1),
+(268, 'passenger_vehicles_plugin_hybrid_electric_vehicle_km', 'Drive a plug-in hybrid car', 'passenger_vehicles', 'general', 'km', 0.15115101, 'DEFRA 2025', 1),
+(269, 'uk_electricity_wh_wh', 'Use electricity', 'uk_electricity', 'general', 'wh', 0.000177, 'DEFRA 2025', 1),
+(270, 'uk_electricity_for_evs_electric_car', 'Drive an electric car', 'uk_electricity_for_evs', 'general', 'km', 0.07588624, 'DEFRA 2025', 1),
+(271, 'uk_electricity_for_evs_electric_freight_bev', 'Electric freight (BEV)', 'uk_electricity_for_evs', 'general', 'tonne.km', 0.1808175, 'DEFRA 2025', 1),
+(272, 'uk_electricity_for_evs_plugin_hybrid_car', 'Drive a plug-in hybrid', 'uk_electricity_for_evs', 'general', 'km', 0.02335936, 'DEFRA 2025', 1),
+(273, 'uk_electricity_for_evs_plugin_hybrid_freight', 'Plug-in hybrid freight', 'uk_electricity_for_evs', 'general', 'tonne.km', 0.03527, 'DEFRA 2025', 1),
+(274, 'waste_disposal_anaerobic_digestion_kilograms', 'Dispose via anaerobic digestion', 'waste_disposal', 'general', 'kilograms', 0.00898311, 'DEFRA 2025', 1),
+(275, 'waste_disposal_closedloop_kilograms', 'Recycle (closed-loop)', 'waste_disposal', 'general', 'kilograms', 0.00382764, 'DEFRA 2025', 1),
+(276, 'waste_disposal_composting_kilograms', 'Compost waste', 'waste_disposal', 'general', 'kilograms', 0.00898311, 'DEFRA 2025', 1),
+(277, 'waste_disposal_incineration_with_energy_recovery_kilograms', 'Incinerate waste (with energy recovery)', 'waste_disposal', 'general', 'kilograms', 0.00468568, 'DEFRA 2025', 1),
+(278, 'waste_disposal_landfill_kilograms', 'Send to landfill', 'waste_disposal', 'general', 'kilograms', 0.24042712, 'DEFRA 2025', 1),
+(279, 'waste_disposal_openloop_kilograms', 'Recycle (open-loop)', 'waste_disposal', 'general', 'kilograms', 0.00391957, 'DEFRA 2025', 1),
+(280, 'water_supply_unspecified_litres', 'Use water', 'water_supply', 'general', 'litres', 0.0001913, 'DEFRA 2025', 1)
+ON DUPLICATE KEY UPDATE `activity_name` = VALUES(`activity_name`), `category` = VALUES(`category`), `type` = VALUES(`type`), `unit` = VALUES(`unit`), `emission_factor` = VALUES(`emission_factor`), `source` = VALUES(`source`), `active` = VALUES(`active`);
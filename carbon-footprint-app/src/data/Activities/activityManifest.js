@@ -0,0 +1,35 @@
+// Generated by activity_manifest.py - do not edit.
+import manifest from "./activityManifest.json";
+
+// One dynamic import per chunk so bundlers split the catalogue by category
+export const chunkLoaders = {
+  "business_travel_airActivities.js": () => import("./business_travel_airActivities.js"),
+  "business_travel_seaActivities.js": () => import("./business_travel_seaActivities.js"),
+  "delivery_vehiclesActivities.js": () => import("./delivery_vehiclesActivities.js"),
+  "foodActivities.js": () => import("./foodActivities.js"),
+  "generalActivities.js": () => import("./generalActivities.js"),
+  "homeworkingActivities.js": () => import("./homeworkingActivities.js"),
+  "hotel_stayActivities.js": () => import("./hotel_stayActivities.js"),
+  "passenger_vehiclesActivities.js": () => import("./passenger_vehiclesActivities.js"),
+  "uk_electricityActivities.js": () => import("./uk_electricityActivities.js"),
+  "uk_electricity_for_evsActivities.js": () => import("./uk_electricity_for_evsActivities.js"),
+  "waste_disposalActivities.js": () => import("./waste_disposalActivities.js"),
+  "water_supplyActivities.js": () => import("./water_supplyActivities.js"),
+};
+
+export async function loadChunk(chunk) {
+  const load = chunkLoaders[chunk];
+  return load ? (await load()).default : [];
+}
+
+export async function loadCategories(categories) {
+  const chunks = new Set(categories.flatMap((c) => manifest.categories[c]?.chunks ?? []));
+  return (await Promise.all([...chunks].map(loadChunk))).flat();
+}
+
+export async function loadActivity(id) {
+  const chunk = manifest.ids[id];
+  return chunk ? (await loadChunk(chunk)).find((a) => a.id === id) : undefined;
+}
+
+export default manifest;
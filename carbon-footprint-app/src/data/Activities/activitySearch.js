@@ -0,0 +1,52 @@
+// Generated by search_index.py - do not edit.
+import index from "./activitySearchIndex.json";
+
+const decoded = new Map();
+function postings(gram) {
+  let list = decoded.get(gram);
+  if (!list) {
+    const deltas = index.grams[gram] || [];
+    list = new Array(deltas.length);
+    for (let i = 0, v = 0; i < deltas.length; i++) list[i] = v += deltas[i];
+    decoded.set(gram, list);
+  }
+  return list;
+}
+
+function intersect(a, b) {
+  const out = [];
+  for (let i = 0, j = 0; i < a.length && j < b.length; ) {
+    if (a[i] === b[j]) { out.push(a[i]); i++; j++; }
+    else if (a[i] < b[j]) i++;
+    else j++;
+  }
+  return out;
+}
+
+// Index positions (into allActivities) whose name contains `query`, in order
+export function searchPositions(query) {
+  const q = query.toLowerCase();
+  if (q.length <= index.gram) return postings(q);
+  const lists = [];
+  for (let i = 0; i + index.gram <= q.length; i++) lists.push(postings(q.slice(i, i + index.gram)));
+  lists.sort((a, b) => a.length - b.length);
+  return lists.reduce(intersect);
+}
+
+// Same result as activities.filter((a) => a.activity.toLowerCase().includes(query)).
+// Falls back to that scan if `activities` is not the array the index was built from.
+export function searchActivities(activities, query) {
+  if (!query) return activities;
+  const q = query.toLowerCase();
+  const matches = (a) => a.activity.toLowerCase().includes(q);
+  if (activities.length !== index.ids.length) return activities.filter(matches);
+  const out = [];
+  for (const i of searchPositions(q)) {
+    const a = activities[i];
+    if (a.id !== index.ids[i]) return activities.filter(matches);
+    if (q.length <= index.gram || matches(a)) out.push(a);
+  }
+  return out;
+}
+
+export default index;
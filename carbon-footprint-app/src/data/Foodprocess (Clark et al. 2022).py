@@ -7,91 +7,52 @@
 #  Each food or drink item is converted into a structured activity object
 #  suitable for use in web based carbon calculators or sustainability apps.
 #
+#  --stream reads the CSV in chunks and writes the module incrementally
+#  (memory bounded by the chunk size, for catalogues with millions of rows);
+#  the output is identical to the in-memory path.
+#
 #  Author: Finlay Shaw
 # =============================================================================
 
 
 import pandas as pd
 import os
-import json
+import sys
 
-# Load the CSV file
-csv_path = "Environmental impacts of food (Clark et al. 2022).csv"
-df = pd.read_csv(csv_path)
+from activity_aggregates import refresh
+from compact_emitter import emit_compact
+from factor_uncertainty import point_rows
+from food_classifier import FoodClassifier, TYPE_KEYWORDS, UNIT_MAP, VERB_MAP
+from js_modules import ModuleStreamWriter, render_module, write_if_changed
+from pipeline_trace import step
 
-# Normalise column names: lowercase, underscores instead of spaces
-df.columns = [col.strip().lower().replace(" ", "_") for col in df.columns]
+csv_path = "Environmental impacts of food (Clark et al. 2022).csv"
+output_dir = "Activities"
+SOURCE_LABEL = "Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)"
+CHUNK_ROWS = 50_000  # rows per chunk in streaming mode
 
 # === Classification rules ===
-# Ordered list of food type keywords.
-# Each tuple maps a verb (e.g., "ate") to a list of keywords that define it.
-# The first match found determines the classification.
-type_keywords = [
-    ("drank", [
-        # Alcoholic beverages
-        "ale", "beer", "cider", "wine",
-        # Juices & smoothies
-        "apple juice", "orange juice", "grape juice", "pineapple juice", "fruit smoothies",
-        # Milk & plant-based milks
-        "almond milk", "coconut milk", "cow's milk", "oat milk", "rice milk", "soy milk",
-        # Hot drinks
-        "coffee beans", "coffee pods", "instant coffee", "tea",
-        # Other drinks
-        "protein shake", "milkshake"
-    ]),
-    ("ate", [
-        # General food and meals 
-        "almond butter", "almonds", "apple pie", "apples", "asparagus", "avocados", "bagels", "baguette",
-        "bacon", "banana loaf", "bananas", "beans", "beef burger", "beef curry", "beef meatballs",
-        "beef mince", "beef noodles", "beef steak", "beetroot", "biscuits", "blue cheese", "brazil nuts",
-        "bread", "breakfast cereal", "brie", "broccoli", "butter", "cabbage", "caesar salad", "camembert",
-        "carrot cake", "carrots", "cashew nuts", "cauliflower", "cereal bars", "cheddar cheese",
-        "cheesecake", "cherry tomatoes", "chia seeds", "chicken breast", "chicken burger", "chicken curry",
-        "chicken noodles", "chicken pasta", "chicken sausages", "chicken thighs", "chicken wings",
-        "chickpeas", "chilli con carne", "chocolate biscuits", "chocolate cake", "chocolate cereals",
-        "chocolate cheesecake", "cookies", "cottage cheese", "courgettes", "cracker biscuits", "crisps",
-        "croissants", "dark chocolate", "doughnuts", "egg noodles", "eggs", "falafels", "feta cheese",
-        "flapjack", "frozen jacket potatoes", "frozen mashed potato", "frozen onion rings",
-        "frozen potato wedges", "frozen roast potatoes", "frozen sweet potato fries", "fruit cake",
-        "garden peas", "goat's cheese", "grapes", "granola", "haddock risotto", "halloumi cheese",
-        "ice cream", "ice lollies", "kale", "kiwis", "lamb (leg)", "lamb burgers", "lamb casserole",
-        "lamb chops", "lamb curry", "lamb hotpot", "lamb moussaka", "lasagne sheets", "lemon", "lentils",
-        "lettuce", "lime", "macaroni cheese", "mackerel", "meat pizza", "meat-free burger",
-        "meat-free mince", "meat-free nuggets", "meat-free sausages", "melon", "milk chocolate", "mixed salad",
-        "mozzarella cheese", "muesli", "muffins", "mushrooms", "naan", "nut loaf", "onions", "oranges",
-        "pain au chocolat", "pancakes", "parmesan cheese", "parsnips", "pasta shells", "peanut butter",
-        "peanuts", "pears", "pecan nuts", "penne pasta", "peppers", "pineapple", "pitta bread", "pizza",
-        "poppadoms", "popcorn", "pork chops", "pork loin", "pork sausage rolls", "pork sausages",
-        "porridge (oatmeal)", "potato croquettes", "potatoes", "prawns", "protein bar", "quiche", "quinoa",
-        "raspberries", "rice", "rice noodles", "ricotta cheese", "salmon", "salmon fishcakes", "sandwich",
-        "sausage", "sausage rolls", "shepherd's pie", "shortbread biscuits", "sourdough bread", "soy desert",
-        "soy yoghurt", "spaghetti", "spaghetti bolognese", "spinach", "sponge cake", "strawberries",
-        "strawberry jam", "sugar", "sweetcorn", "tofu", "tomato ketchup", "tomatoes", "tortilla wraps",
-        "tuna", "vegetable lasagne", "vegetarian chilli con carne", "vegetarian curry", "vegetarian pizza",
-        "walnuts", "watermelon", "yoghurt", "steak pie"
-    ]),
-    ("used", [
-        # Condiments and oils
-        "apricot jam", "raspberry jam", "jam", "marmalade", "olive oil", "rapeseed oil", "sunflower oil",
-        "chocolate spread", "coconut oil", "spread"
-    ])
-]
-
-# === Verb and unit mapping ===
-# Maps the classification type to a display verb and measurement unit
-verb_map = {"ate": "Eat", "drank": "Drink", "used": "Use"}
-unit_map = {"drank": "litres", "ate": "kg", "used": "kg"}
-
-# === Build structured list of activities ===
-activities = []
-for _, row in df.iterrows():
-    entity = str(row["entity"]).strip()  # Food or drink name
-    ghg = row["ghg_kg"]                  # GHG emissions per kg
-    if pd.isna(ghg):
-        continue  # Skip missing emission factors
-
-    # Clean the entity name into a consistent ID format
-    clean_id = "food_" + (
+# Keyword lists (drank / ate / used, first match wins) and the verb/unit maps
+# live in food_classifier.py, compiled into a single-pass matcher.
+verb_map = VERB_MAP
+unit_map = UNIT_MAP
+
+
+def load_clark(path=csv_path) -> pd.DataFrame:
+    """Load the CSV file with normalised column names (lowercase, underscores)."""
+    with step("food.read_csv") as s:
+        df = s.done(pd.read_csv(path))
+    df.columns = [column_key(col) for col in df.columns]
+    return df
+
+
+def column_key(col: str) -> str:
+    return col.strip().lower().replace(" ", "_")
+
+
+def clean_id(entity: str) -> str:
+    """Clean the entity name into a consistent ID format."""
+    return "food_" + (
         entity.lower()
         .replace(" ", "_")
         .replace(",", "")
@@ -100,43 +61,107 @@ for _, row in df.iterrows():
         .replace("'", "")
     )
 
-    # Determine food type based on keywords
-    entity_lower = entity.lower()
-    food_type = "other"
-    for t_type, keywords in type_keywords:
-        if any(keyword in entity_lower for keyword in keywords):
-            food_type = t_type
-            break
-
-    # Determine the correct verb and unit
-    verb = verb_map.get(food_type, "Consume")
-    unit = unit_map.get(food_type, "kg")
-
-    # Construct activity dictionary
-    activity = {
-        "id": clean_id,
-        "activity": f"{verb} {entity}",
-        "unit": unit,
-        "emissionFactor": round(ghg, 6),
-        "source": "Clark et al. 2022 (kg CO₂e per kg product; litres assumed equivalent for drinks)",
-        "category": "food",
-        "type": food_type
-    }
-    activities.append(activity)
-
-# === Export to JavaScript ===
-# Creates a file `foodActivities.js` containing a const array of all activities
 
-output_dir = "Activities"
-os.makedirs(output_dir, exist_ok=True)
-output_file = os.path.join(output_dir, "foodActivities.js")
-
-# Write JS array declaration and export
-with open(output_file, "w", encoding="utf-8") as f:
-    f.write("const foodActivities = [\n")
-    for i, act in enumerate(activities):
-        is_last = i == len(activities) - 1
-        f.write("  " + json.dumps(act, indent=2) + (",\n" if not is_last else "\n"))
-    f.write("];\n\nexport default foodActivities;\n")
-
-print(f"JS file created: {output_file}")
+def build_activities(df: pd.DataFrame, classifier=None):
+    """Build structured list of activities (one per entity with a GHG factor)."""
+    classifier = classifier or FoodClassifier(TYPE_KEYWORDS)
+    with step("food.build_activities", df) as s:
+        return s.done(activities_for(df["entity"].tolist(), df["ghg_kg"].tolist(), classifier))
+
+
+def activities_for(entities, ghgs, classifier):
+    """Activity dicts for parallel lists of entity names and GHG factors."""
+    activities = []
+    for entity, ghg in zip(entities, ghgs):
+        entity = str(entity).strip()  # Food or drink name
+        if pd.isna(ghg):
+            continue  # Skip missing emission factors
+
+        # Determine food type based on keywords
+        food_type = classifier.classify(entity)
+
+        # Determine the correct verb and unit
+        verb = verb_map.get(food_type, "Consume")
+        unit = unit_map.get(food_type, "kg")
+
+        # Construct activity dictionary
+        activity = {
+            "id": clean_id(entity),
+            "activity": f"{verb} {entity}",
+            "unit": unit,
+            "emissionFactor": round(ghg, 6),
+            "source": SOURCE_LABEL,
+            "category": "food",
+            "type": food_type
+        }
+        activities.append(activity)
+    return activities
+
+
+def write_module(activities, out_dir=output_dir, compact=False):
+    """
+    Export to JavaScript
+    Creates a file `foodActivities.js` containing a const array of all activities
+    (written atomically, and left untouched if the bytes are unchanged)
+    """
+    output_file = os.path.join(out_dir, "foodActivities.js")
+    with step("food.render", activities):
+        text = render_module("foodActivities", activities, comma_after_last=False)
+    if write_if_changed(output_file, text):
+        print(f"JS file created: {output_file}")
+    else:
+        print(f"JS file unchanged: {output_file}")
+    if compact:
+        emit_compact(output_file)
+    return output_file
+
+
+# =========================
+# Streaming mode
+# =========================
+def iter_activity_chunks(path=csv_path, chunk_rows=CHUNK_ROWS, classifier=None):
+    """Yield one list of activities per `chunk_rows` CSV rows (only the two columns used are parsed)."""
+    classifier = classifier or FoodClassifier(TYPE_KEYWORDS)
+    reader = pd.read_csv(path, chunksize=chunk_rows, usecols=lambda c: column_key(c) in ("entity", "ghg_kg"))
+    for chunk in reader:
+        chunk.columns = [column_key(col) for col in chunk.columns]
+        yield activities_for(chunk["entity"].tolist(), chunk["ghg_kg"].tolist(), classifier)
+        classifier.clear_cache()  # keep memory bounded by the chunk, not the catalogue
+
+
+def stream_module(path=csv_path, out_dir=output_dir, chunk_rows=CHUNK_ROWS, fmt="js", compact=False):
+    """
+    Streaming counterpart of build_activities + write_module: the module (or,
+    with fmt="json", foodActivities.json) is written chunk by chunk. No
+    factorDistributions.json entries are written: Clark factors are single
+    estimates, which factor_uncertainty treats as it does missing entries.
+    Returns (output file, activity count).
+    """
+    output_file = os.path.join(out_dir, "foodActivities." + fmt)
+    with step("food.stream_module") as s:
+        with ModuleStreamWriter(output_file, "foodActivities", comma_after_last=False, fmt=fmt) as writer:
+            for activities in iter_activity_chunks(path, chunk_rows):
+                writer.write(activities)
+        s.done(range(writer.count))
+    print(f"{'JS' if fmt == 'js' else 'JSON'} file {'created' if writer.changed else 'unchanged'}: "
+          f"{output_file} ({writer.count:,} activities)")
+    if fmt == "js" and compact:
+        emit_compact(output_file)
+    return output_file, writer.count
+
+
+def main():
+    if "--stream" in sys.argv:
+        fmt = "json" if "--json" in sys.argv else "js"
+        result = stream_module(csv_path, output_dir, fmt=fmt, compact="--compact" in sys.argv)
+        if fmt == "js":
+            refresh(output_dir)
+        return result
+    activities = build_activities(load_clark(csv_path))
+    write_module(activities, output_dir, compact="--compact" in sys.argv)
+    refresh(output_dir, {"food": point_rows(activities)})
+    return activities
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+# =============================================================================
+#  Script/Module: activity_aggregates.py
+#
+#  Description:
+#  Rebuilds the files derived from all of the Activities/*.js modules
+#  together, once, after the generators have written theirs:
+#    factorDistributions.json  spread behind each factor (factor_uncertainty.py)
+#    activityManifest.*        chunk loaders (activity_manifest.py)
+#    activityFactors.*         the activity_factors table (activity_factors.py)
+#    activitySearch*           the picker's search index (search_index.py)
+#
+#  pipeline.py runs refresh() as the final stage, after all three generators;
+#  each generator's standalone main() calls it once for its own modules.
+#
+#  Usage (from src/data):
+#    python activity_aggregates.py    # rebuild from the modules on disk
+#
+#  Author: Finlay Shaw
+# =============================================================================
+
+from activity_factors import update_activity_factors
+from activity_manifest import ACTIVITIES_DIR, update_manifest
+from factor_uncertainty import update_distributions
+from search_index import update_search_index
+
+
+def refresh(activities_dir=ACTIVITIES_DIR, distributions=None) -> dict:
+    """
+    Rebuild every aggregate from the modules on disk. `distributions` maps
+    generator name -> (id, mean, min, max, std, count) rows; generators not
+    listed keep their entries in factorDistributions.json.
+    """
+    if distributions:
+        update_distributions(activities_dir, distributions)
+    manifest = update_manifest(activities_dir)
+    rows = update_activity_factors(activities_dir)
+    index = update_search_index(activities_dir)
+    return {"modules": len(manifest["chunks"]), "activity_factors": len(rows), "indexed": len(index["ids"])}
+
+
+def main():
+    stats = refresh(ACTIVITIES_DIR)
+    print(f"Aggregates rebuilt: {stats['modules']} modules, {stats['activity_factors']} activity_factors rows, "
+          f"{stats['indexed']} activities indexed")
+    return stats
+
+
+if __name__ == "__main__":
+    main()
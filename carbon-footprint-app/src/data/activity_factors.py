@@ -0,0 +1,187 @@
+# =============================================================================
+#  Script/Module: activity_factors.py
+#
+#  Description:
+#  The activity catalogue as an `activity_factors` dimension table with
+#  stable integer surrogate keys, so user_activities rows can reference an
+#  activity by a 4-byte key instead of copying its id, name, category, type
+#  and unit strings (see activity_key_migration.py).
+#
+#  Writes two files next to the modules (rebuilt with the other aggregates
+#  by activity_aggregates.refresh()):
+#    activityFactors.json  the table: one row per activity id with its key;
+#                          keys already handed out are read back from here,
+#                          so they never change or get reused. Ids that
+#                          drop out of the catalogue stay, with active = 0
+#                          and their last attributes, for rows that still
+#                          point at them
+#    activityFactors.sql   MariaDB bulk load: CREATE TABLE IF NOT EXISTS plus
+#                          multi-row upserts (safe to re-run after each build)
+#
+#  Usage (from src/data):
+#    python activity_factors.py                 # rebuild both files
+#    python activity_factors.py --db mysql      # ... and load the table
+#    mysql carbon_app < Activities/activityFactors.sql
+#
+#  Author: Finlay Shaw
+# =============================================================================
+
+import argparse
+import json
+from pathlib import Path
+
+from activity_manifest import ACTIVITIES_DIR
+from js_modules import write_if_changed
+from pipeline_trace import step
+
+TABLE = "activity_factors"
+TABLE_JSON = "activityFactors.json"
+TABLE_SQL = "activityFactors.sql"
+TABLE_VERSION = 1
+COLUMNS = ("activity_key", "activity_id", "activity_name", "category", "type", "unit",
+           "emission_factor", "source", "active")
+INSERT_ROWS = 1_000  # rows per INSERT in the bulk-load SQL
+
+# Column types follow user_activities in db/carbon_app.sql
+SCHEMA = {
+    "sqlite": f"""CREATE TABLE IF NOT EXISTS {TABLE} (
+  activity_key INTEGER PRIMARY KEY,
+  activity_id TEXT NOT NULL UNIQUE,
+  activity_name TEXT NOT NULL,
+  category TEXT NOT NULL,
+  type TEXT NOT NULL,
+  unit TEXT NOT NULL,
+  emission_factor REAL NOT NULL,
+  source TEXT NOT NULL,
+  active INTEGER NOT NULL DEFAULT 1
+)""",
+    "mysql": f"""CREATE TABLE IF NOT EXISTS `{TABLE}` (
+  `activity_key` int(10) UNSIGNED NOT NULL,
+  `activity_id` varchar(64) NOT NULL,
+  `activity_name` varchar(150) NOT NULL,
+  `category` varchar(40) NOT NULL,
+  `type` varchar(30) NOT NULL,
+  `unit` varchar(20) NOT NULL,
+  `emission_factor` decimal(12,6) NOT NULL,
+  `source` varchar(255) NOT NULL,
+  `active` tinyint(1) NOT NULL DEFAULT 1,
+  PRIMARY KEY (`activity_key`),
+  UNIQUE KEY `uq_activity_factors_id` (`activity_id`),
+  KEY `idx_activity_factors_category` (`category`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci""",
+}
+
+UPDATED = COLUMNS[2:]  # everything but the key and the id it stands for
+UPSERT = {
+    "sqlite": " ON CONFLICT (activity_key) DO UPDATE SET "
+              + ", ".join(f"{c} = excluded.{c}" for c in UPDATED),
+    "mysql": " ON DUPLICATE KEY UPDATE " + ", ".join(f"`{c}` = VALUES(`{c}`)" for c in UPDATED),
+}
+
+
+# =========================
+# Build
+# =========================
+def read_table(activities_dir=ACTIVITIES_DIR) -> list:
+    """Rows (tuples in COLUMNS order) from activityFactors.json; [] if there is none yet."""
+    path = Path(activities_dir) / TABLE_JSON
+    if not path.exists():
+        return []
+    return [tuple(row) for row in json.loads(path.read_text(encoding="utf-8"))["rows"]]
+
+
+def build_table(registry, previous=()) -> list:
+    """
+    Catalogue -> rows. Ids in `previous` keep their key; new ids get the next
+    keys in catalogue order; previous ids missing from the catalogue are kept
+    inactive. Rows are returned in key order.
+    """
+    keys = {row[1]: row[0] for row in previous}
+    next_key = max(keys.values(), default=0) + 1
+    rows = {}
+    for f in registry:
+        key = keys.get(f.id)
+        if key is None:
+            key, next_key = next_key, next_key + 1
+        rows[f.id] = (key, f.id, f.activity, f.category, f.type, f.unit, f.emission_factor, f.source, 1)
+    for row in previous:
+        if row[1] not in rows:
+            rows[row[1]] = (*row[:-1], 0)
+    return sorted(rows.values())
+
+
+def render_json(rows) -> str:
+    """One row per line, so diffs between builds show just the activities that changed."""
+    body = ",\n".join(f"    {json.dumps(list(row), ensure_ascii=False)}" for row in rows)
+    return (f'{{\n  "version": {TABLE_VERSION},\n  "columns": {json.dumps(list(COLUMNS))},\n'
+            f'  "rows": [\n{body}\n  ]\n}}\n')
+
+
+def sql_literal(value) -> str:
+    if isinstance(value, str):
+        return "'" + value.replace("\\", "\\\\").replace("'", "\\'") + "'"
+    return repr(value)
+
+
+def render_sql(rows) -> str:
+    """MariaDB bulk load for the table (idempotent)."""
+    parts = [
+        f"-- Generated by activity_factors.py - do not edit.\n"
+        f"-- mysql carbon_app < {TABLE_SQL}\n"
+        f"SET NAMES utf8mb4;\n\n{SCHEMA['mysql']};\n"
+    ]
+    head = f"INSERT INTO `{TABLE}` ({', '.join(f'`{c}`' for c in COLUMNS)}) VALUES\n"
+    for start in range(0, len(rows), INSERT_ROWS):
+        values = ",\n".join("(" + ", ".join(sql_literal(v) for v in row) + ")"
+                            for row in rows[start:start + INSERT_ROWS])
+        parts.append(f"\n{head}{values}\n{UPSERT['mysql'].strip()};\n")
+    return "".join(parts)
+
+
+def update_activity_factors(activities_dir=ACTIVITIES_DIR) -> list:
+    """Rebuild both files from the modules on disk (no-op writes if unchanged); returns the rows."""
+    from factor_registry import FactorRegistry
+
+    with step("activity_factors.update") as s:
+        rows = build_table(FactorRegistry.from_modules(activities_dir), read_table(activities_dir))
+        out = Path(activities_dir)
+        write_if_changed(out / TABLE_JSON, render_json(rows))
+        write_if_changed(out / TABLE_SQL, render_sql(rows))
+        s.done(rows)
+    return rows
+
+
+# =========================
+# Database
+# =========================
+def load_table(db, rows) -> int:
+    """Create the table if needed and upsert `rows` into it (one commit)."""
+    db.execute(SCHEMA[db.dialect]).close()
+    for start in range(0, len(rows), INSERT_ROWS):
+        db.insert_rows(TABLE, COLUMNS, rows[start:start + INSERT_ROWS], suffix=UPSERT[db.dialect])
+    db.commit()
+    return len(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build (and optionally load) the activity_factors table.")
+    parser.add_argument("--db", help="also load it into 'mysql' or 'sqlite:<path>'")
+    args = parser.parse_args(argv)
+
+    rows = update_activity_factors(ACTIVITIES_DIR)
+    active = sum(row[-1] for row in rows)
+    print(f"{TABLE}: {len(rows)} rows ({active} active, {len(rows) - active} retired), "
+          f"keys 1-{rows[-1][0] if rows else 0} -> {ACTIVITIES_DIR}/{TABLE_JSON}, {TABLE_SQL}")
+    if args.db:
+        from db import connect
+
+        db = connect(args.db)
+        try:
+            print(f"Loaded {load_table(db, rows)} rows into {args.db}")
+        finally:
+            db.close()
+    return rows
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+# =============================================================================
+#  Script: activity_importer.py
+#
+#  Description:
+#  Bulk importer for user_activities (backfills from CSV / JSONL exports and
+#  other trackers), instead of one log_activity.php request per row.
+#
+#  Each input row needs user_id, activity_id, quantity and occurred_at (meta
+#  optional). Rows are streamed in chunks; activity_id is resolved against
+#  the generated catalogue (factor_registry) to fill activity_name,
+#  category, type, unit and emission_factor; each chunk is validated as a
+#  whole with the same rules as log_activity.php plus the column limits of
+#  db/carbon_app.sql; valid rows are written as multi-row INSERTs (or
+#  LOAD DATA LOCAL INFILE on MariaDB) in batches, one commit per batch.
+#  Rejected rows can be written to a CSV with the reason.
+#
+#  Usage (from src/data):
+#    python activity_importer.py export.csv --db sqlite:import.db
+#    python activity_importer.py export.jsonl --db mysql --batch-size 5000
+#    python activity_importer.py export.csv --db mysql --load-data --rejects rejects.csv
+#
+#  Author: Finlay Shaw
+# =============================================================================
+
+import argparse
+import csv
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from db import USER_ACTIVITY_COLUMNS, connect
+from factor_registry import FactorRegistry
+
+REQUIRED = ("user_id", "activity_id", "quantity", "occurred_at")
+CHUNK_ROWS = 50_000
+BATCH_SIZE = 1_000
+
+# Column limits from db/carbon_app.sql
+MAX_USER_ID = 2**32 - 1                 # int(10) unsigned
+MAX_QUANTITY = 1e9 - 0.001              # decimal(12,3)
+MAX_EMISSIONS = 1e9 - 0.001             # decimal(12,3) generated column
+
+
+# =========================
+# Input
+# =========================
+def read_chunks(path, chunk_rows=CHUNK_ROWS):
+    """Stream a CSV or JSONL file as DataFrame chunks (values left as read)."""
+    path = Path(path)
+    if path.suffix.lower() in (".jsonl", ".ndjson"):
+        return pd.read_json(path, lines=True, chunksize=chunk_rows, dtype=False)
+    return pd.read_csv(path, chunksize=chunk_rows, dtype=str, keep_default_na=False)
+
+
+def catalogue_frame(registry: FactorRegistry) -> pd.DataFrame:
+    """Registry -> lookup frame indexed by activity id."""
+    rows = [(f.id, f.activity, f.category, f.type, f.unit, f.emission_factor) for f in registry]
+    frame = pd.DataFrame(rows, columns=["activity_id", "activity_name", "category", "type", "unit", "emission_factor"])
+    return frame.set_index("activity_id")
+
+
+# =========================
+# Validation
+# =========================
+def _meta_json(value):
+    """meta cell -> JSON text, None for empty, or False if it is not valid JSON."""
+    if value is None or (isinstance(value, float) and np.isnan(value)) or value == "":
+        return None
+    if isinstance(value, str):
+        try:
+            json.loads(value)
+        except ValueError:
+            return False
+        return value
+    return json.dumps(value, ensure_ascii=False)
+
+
+def parse_timestamps(values: pd.Series) -> pd.Series:
+    """
+    Timestamps -> UTC datetimes (NaT if unparseable). ISO 8601 (what the app
+    sends) is parsed vectorised; anything else falls back to per-value parsing,
+    like strtotime() in log_activity.php.
+    """
+    text = values.astype(str).str.strip()
+    out = pd.to_datetime(text, errors="coerce", format="ISO8601", utc=True)
+    retry = out.isna() & (text != "")
+    if retry.any():
+        out[retry] = pd.to_datetime(text[retry], errors="coerce", format="mixed", utc=True)
+    return out
+
+
+def format_datetimes(values: pd.Series) -> pd.Series:
+    """UTC datetimes -> 'Y-m-d H:i:s' strings (numpy formatting, much faster than strftime)."""
+    seconds = values.dt.tz_localize(None).to_numpy(dtype="datetime64[s]")
+    text = pd.Series(np.datetime_as_string(seconds, unit="s"), index=values.index, dtype=object)
+    return text.str.slice_replace(10, 11, " ")
+
+
+def map_distinct(values: pd.Series, fn) -> pd.Series:
+    """values.map(fn), calling fn once per distinct value (exports repeat meta a lot)."""
+    as_key = values.map(lambda v: v if isinstance(v, (str, int, float, type(None))) else json.dumps(v, sort_keys=True))
+    codes, _ = pd.factorize(as_key, use_na_sentinel=False)
+    _, first = np.unique(codes, return_index=True)  # first row of each distinct value
+    mapped = np.array([fn(values.iat[i]) for i in first], dtype=object)
+    return pd.Series(mapped[codes], index=values.index, dtype=object)
+
+
+def validate_chunk(chunk: pd.DataFrame, catalogue: pd.DataFrame, first_row: int):
+    """
+    chunk -> (rows ready to insert as a DataFrame in USER_ACTIVITY_COLUMNS order,
+    rejects DataFrame with row number and reason). Checks run column-wise.
+    """
+    n = len(chunk)
+    reason = pd.Series("", index=chunk.index, dtype=object)
+
+    def reject(mask, why):
+        reason.loc[mask & (reason == "")] = why
+
+    for col in REQUIRED:
+        if col not in chunk.columns:
+            chunk[col] = ""
+
+    user_id = pd.to_numeric(chunk["user_id"], errors="coerce")
+    reject(user_id.isna() | (user_id <= 0) | (user_id > MAX_USER_ID) | (user_id % 1 != 0), "invalid user_id")
+
+    activity_id = chunk["activity_id"].astype(str).str.strip()
+    resolved = catalogue.reindex(activity_id.to_numpy())
+    resolved.index = chunk.index
+    reject(resolved["emission_factor"].isna(), "unknown activity_id")
+
+    quantity = pd.to_numeric(chunk["quantity"], errors="coerce").round(3)
+    reject(quantity.isna() | (quantity < 0) | (quantity > MAX_QUANTITY), "invalid quantity")
+
+    emission_factor = resolved["emission_factor"].round(6)  # decimal(12,6)
+    reject((quantity * emission_factor) > MAX_EMISSIONS, "emissions out of range")
+
+    occurred = parse_timestamps(chunk["occurred_at"])
+    reject(occurred.isna(), "invalid occurred_at")
+
+    if "meta" in chunk.columns:
+        meta = map_distinct(chunk["meta"], _meta_json)
+        reject(meta.map(lambda m: m is False), "invalid meta")
+    else:
+        meta = pd.Series(None, index=chunk.index, dtype=object)
+
+    ok = reason == ""
+    good = pd.DataFrame({
+        "user_id": user_id[ok].astype(np.int64),
+        "activity_id": activity_id[ok],
+        "activity_name": resolved.loc[ok, "activity_name"],
+        "category": resolved.loc[ok, "category"],
+        "type": resolved.loc[ok, "type"],
+        "unit": resolved.loc[ok, "unit"],
+        "emission_factor": emission_factor[ok],
+        "quantity": quantity[ok],
+        "occurred_at": format_datetimes(occurred[ok]),
+        "meta": meta[ok],
+    }, columns=list(USER_ACTIVITY_COLUMNS))
+
+    bad = ~ok
+    rejects = pd.DataFrame({
+        "row": np.arange(first_row, first_row + n)[bad.to_numpy()],
+        "reason": reason[bad].to_numpy(),
+        "activity_id": chunk.loc[bad, "activity_id"].astype(str).to_numpy(),
+    })
+    return good, rejects
+
+
+def to_records(frame: pd.DataFrame):
+    """DataFrame -> list of tuples of plain Python values (NaN/None -> None)."""
+    cols = [frame[c].astype(object).where(frame[c].notna(), None).tolist() for c in frame.columns]
+    return list(zip(*cols))
+
+
+# =========================
+# Writing
+# =========================
+def load_data_infile(db, rows):
+    """MariaDB LOAD DATA LOCAL INFILE from a temporary TSV (needs local_infile enabled)."""
+    fd, tmp = tempfile.mkstemp(suffix=".tsv")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            for row in rows:
+                f.write("\t".join(r"\N" if v is None else str(v).replace("\\", "\\\\").replace("\t", "\\t")
+                                  .replace("\n", "\\n") for v in row) + "\n")
+        db.execute(
+            f"LOAD DATA LOCAL INFILE %s INTO TABLE user_activities CHARACTER SET utf8mb4 "
+            f"FIELDS TERMINATED BY '\\t' LINES TERMINATED BY '\\n' ({', '.join(USER_ACTIVITY_COLUMNS)})",
+            (tmp,),
+        ).close()
+    finally:
+        os.unlink(tmp)
+    return len(rows)
+
+
+def import_file(path, db, registry=None, batch_size=BATCH_SIZE, chunk_rows=CHUNK_ROWS,
+                load_data=False, rejects_path=None):
+    """Import one file into user_activities; returns a stats dict."""
+    registry = registry or FactorRegistry.from_modules()
+    catalogue = catalogue_frame(registry)
+    stats = {"read": 0, "inserted": 0, "rejected": 0, "read_s": 0.0, "validate_s": 0.0, "write_s": 0.0}
+    rejects_file = open(rejects_path, "w", encoding="utf-8", newline="") if rejects_path else None
+    rejects_writer = csv.writer(rejects_file) if rejects_file else None
+    if rejects_writer:
+        rejects_writer.writerow(["row", "reason", "activity_id"])
+
+    t0 = time.perf_counter()
+    try:
+        chunks = iter(read_chunks(path, chunk_rows))
+        while True:
+            t = time.perf_counter()
+            chunk = next(chunks, None)
+            stats["read_s"] += time.perf_counter() - t
+            if chunk is None:
+                break
+
+            t = time.perf_counter()
+            good, rejects = validate_chunk(chunk, catalogue, first_row=stats["read"] + 1)
+            records = to_records(good)
+            stats["validate_s"] += time.perf_counter() - t
+            stats["read"] += len(chunk)
+            stats["rejected"] += len(rejects)
+            if rejects_writer:
+                rejects_writer.writerows(rejects.itertuples(index=False))
+
+            t = time.perf_counter()
+            for start in range(0, len(records), batch_size):
+                batch = records[start:start + batch_size]
+                if load_data:
+                    stats["inserted"] += load_data_infile(db, batch)
+                else:
+                    stats["inserted"] += db.insert_rows("user_activities", USER_ACTIVITY_COLUMNS, batch)
+                db.commit()
+            stats["write_s"] += time.perf_counter() - t
+    finally:
+        if rejects_file:
+            rejects_file.close()
+    stats["seconds"] = time.perf_counter() - t0
+    return stats
+
+
+def format_stats(stats) -> str:
+    rate = stats["read"] / stats["seconds"] if stats["seconds"] else 0.0
+    return (f"Imported {stats['inserted']} of {stats['read']} rows ({stats['rejected']} rejected) "
+            f"in {stats['seconds']:.3f}s = {rate:,.0f} rows/s "
+            f"[read {stats['read_s']:.3f}s, validate {stats['validate_s']:.3f}s, write {stats['write_s']:.3f}s]")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk-import activity logs into user_activities.")
+    parser.add_argument("input", help="CSV or JSONL file")
+    parser.add_argument("--db", required=True, help="'mysql' (DB_* env settings) or 'sqlite:<path>'")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="rows per INSERT / commit")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS, help="rows read and validated at a time")
+    parser.add_argument("--load-data", action="store_true", help="MariaDB only: LOAD DATA LOCAL INFILE per batch")
+    parser.add_argument("--rejects", help="write rejected rows (row, reason, activity_id) to this CSV")
+    args = parser.parse_args(argv)
+
+    if args.load_data and args.db != "mysql":
+        parser.error("--load-data needs --db mysql")
+    db = connect(args.db, **({"local_infile": True} if args.load_data else {}))
+    try:
+        stats = import_file(args.input, db, batch_size=args.batch_size, chunk_rows=args.chunk_rows,
+                            load_data=args.load_data, rejects_path=args.rejects)
+    finally:
+        db.close()
+    print(format_stats(stats))
+    return stats
+
+
+if __name__ == "__main__":
+    main()
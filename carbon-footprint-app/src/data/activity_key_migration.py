@@ -0,0 +1,212 @@
+# =============================================================================
+#  Script: activity_key_migration.py
+#
+#  Description:
+#  Migrates user_activities to reference the activity_factors dimension
+#  table (activity_factors.py) by integer key:
+#    1. loads / refreshes activity_factors from Activities/activityFactors.json
+#    2. adds user_activities.activity_key (nullable; FK + index on MariaDB)
+#    3. installs an insert trigger that fills the key for new rows, so
+#       log_activity.php keeps working unchanged and nothing logged during
+#       the backfill is missed
+#    4. backfills existing rows in id ranges of --chunk-rows, one commit per
+#       chunk, so locks stay short and an interrupted run resumes where it
+#       stopped (only rows still without a key are touched). updated_at is
+#       left alone: it is the app's edit time and activity_rollups.py's
+#       change watermark; verify() reports rows whose timestamp moved
+#  Rows whose activity_id is not in the catalogue keep a NULL key and are
+#  reported.
+#
+#  The copied activity_name / category / type / unit columns are left in
+#  place for the PHP endpoints; benchmarks/bench_activity_factors.py
+#  measures the row size and GROUP BY speed with and without them.
+#
+#  Usage (from src/data):
+#    python activity_key_migration.py --db sqlite:app.db
+#    python activity_key_migration.py --db mysql --chunk-rows 20000
+#    python activity_key_migration.py --db mysql --verify
+#    python activity_key_migration.py --db mysql --verify --since "2026-10-17 19:00:00"
+#
+#  Author: Finlay Shaw
+# =============================================================================
+
+import argparse
+import time
+
+from activity_factors import TABLE, load_table, read_table
+from activity_manifest import ACTIVITIES_DIR
+from db import connect
+
+KEY_COLUMN = "activity_key"
+CHUNK_ROWS = 50_000
+TRIGGER = "user_activities_bi_activity_key"
+
+ADD_COLUMN = {
+    "sqlite": [
+        f"ALTER TABLE user_activities ADD COLUMN {KEY_COLUMN} INTEGER DEFAULT NULL "
+        f"REFERENCES {TABLE} (activity_key)",
+    ],
+    "mysql": [
+        f"""ALTER TABLE `user_activities`
+          ADD COLUMN `{KEY_COLUMN}` int(10) UNSIGNED DEFAULT NULL AFTER `user_id`,
+          ADD KEY `idx_ua_activity_key` (`{KEY_COLUMN}`),
+          ADD CONSTRAINT `fk_user_activity_factor` FOREIGN KEY (`{KEY_COLUMN}`)
+            REFERENCES `{TABLE}` (`activity_key`)""",
+    ],
+}
+
+# SQLite triggers cannot assign NEW, so the row is keyed right after insert
+# (db.py's updated_at trigger ignores activity_key-only updates)
+TRIGGERS = {
+    "sqlite": f"""CREATE TRIGGER IF NOT EXISTS {TRIGGER} AFTER INSERT ON user_activities
+        FOR EACH ROW WHEN NEW.{KEY_COLUMN} IS NULL BEGIN
+          UPDATE user_activities SET {KEY_COLUMN} =
+            (SELECT activity_key FROM {TABLE} WHERE activity_id = NEW.activity_id) WHERE id = NEW.id;
+        END""",
+    "mysql": f"""CREATE TRIGGER IF NOT EXISTS `{TRIGGER}` BEFORE INSERT ON `user_activities`
+        FOR EACH ROW SET NEW.`{KEY_COLUMN}` = COALESCE(NEW.`{KEY_COLUMN}`,
+          (SELECT `activity_key` FROM `{TABLE}` WHERE `activity_id` = NEW.`activity_id`))""",
+}
+
+# One id range; placeholders are filled in by backfill(). Neither keeps
+# updated_at from moving by itself: MariaDB's ON UPDATE is suppressed by
+# assigning the column its own value, and the SQLite stand-in's trigger
+# only fires for the app's columns
+BACKFILL = {
+    "sqlite": f"""UPDATE user_activities SET {KEY_COLUMN} =
+          (SELECT activity_key FROM {TABLE} f WHERE f.activity_id = user_activities.activity_id)
+        WHERE id >= ? AND id < ? AND {KEY_COLUMN} IS NULL
+          AND activity_id IN (SELECT activity_id FROM {TABLE})""",
+    "mysql": f"""UPDATE `user_activities` ua JOIN `{TABLE}` f ON f.`activity_id` = ua.`activity_id`
+        SET ua.`{KEY_COLUMN}` = f.`activity_key`, ua.`updated_at` = ua.`updated_at`
+        WHERE ua.`id` >= %s AND ua.`id` < %s AND ua.`{KEY_COLUMN}` IS NULL""",
+}
+
+
+# =========================
+# Schema
+# =========================
+def has_key_column(db) -> bool:
+    if db.dialect == "sqlite":
+        return any(row[1] == KEY_COLUMN for row in db.query("PRAGMA table_info(user_activities)"))
+    return bool(db.query(
+        "SELECT 1 FROM information_schema.COLUMNS WHERE TABLE_SCHEMA = DATABASE() "
+        "AND TABLE_NAME = 'user_activities' AND COLUMN_NAME = %s", (KEY_COLUMN,)))
+
+
+def prepare(db, activities_dir=ACTIVITIES_DIR) -> dict:
+    """Steps 1-3 (idempotent)."""
+    rows = read_table(activities_dir)
+    if not rows:
+        raise FileNotFoundError(f"No activity_factors table in {activities_dir} - run activity_factors.py first")
+    loaded = load_table(db, rows)
+    added = not has_key_column(db)
+    if added:
+        for sql in ADD_COLUMN[db.dialect]:
+            db.execute(sql).close()
+    db.execute(TRIGGERS[db.dialect]).close()
+    db.commit()
+    return {"factors": loaded, "column_added": added}
+
+
+def add_sqlite_index(db):
+    """SQLite: index the key once it is filled (cheaper than maintaining it during the backfill)."""
+    if db.dialect == "sqlite":
+        db.execute(f"CREATE INDEX IF NOT EXISTS idx_ua_activity_key ON user_activities ({KEY_COLUMN})").close()
+        db.commit()
+
+
+# =========================
+# Backfill
+# =========================
+def backfill(db, chunk_rows=CHUNK_ROWS, progress=None) -> dict:
+    """Step 4: key rows with a NULL activity_key, one id range and commit at a time."""
+    lo, hi = db.query(f"SELECT MIN(id), MAX(id) FROM user_activities WHERE {KEY_COLUMN} IS NULL")[0]
+    updated, chunks = 0, 0
+    started = db.query("SELECT CURRENT_TIMESTAMP")[0][0]
+    t0 = time.perf_counter()
+    if lo is not None:
+        for start in range(int(lo), int(hi) + 1, chunk_rows):
+            cur = db.execute(BACKFILL[db.dialect], (start, start + chunk_rows))
+            updated += max(cur.rowcount, 0)
+            cur.close()
+            db.commit()
+            chunks += 1
+            if progress:
+                progress(start + chunk_rows - 1, hi, updated, time.perf_counter() - t0)
+    unmatched = db.query(
+        f"SELECT activity_id, COUNT(*) FROM user_activities WHERE {KEY_COLUMN} IS NULL "
+        f"GROUP BY activity_id ORDER BY COUNT(*) DESC")
+    return {"updated": updated, "chunks": chunks, "seconds": time.perf_counter() - t0, "started_at": str(started),
+            "unmatched_rows": sum(n for _, n in unmatched), "unmatched_ids": unmatched}
+
+
+def verify(db, since=None) -> dict:
+    """
+    Rows still without a key, and keyed rows whose copied columns differ from
+    the dimension. With `since` (the backfill's start, UTC), also keyed rows
+    created before it whose updated_at is at or after it: the backfill must
+    not move them, so anything beyond the app's own edits in that window
+    means edit times were overwritten.
+    """
+    missing = db.query(f"SELECT COUNT(*) FROM user_activities WHERE {KEY_COLUMN} IS NULL")[0][0]
+    drift = db.query(
+        f"SELECT f.activity_id, COUNT(*) FROM user_activities ua JOIN {TABLE} f ON f.activity_key = ua.{KEY_COLUMN} "
+        f"WHERE ua.activity_id <> f.activity_id OR ua.category <> f.category OR ua.unit <> f.unit "
+        f"GROUP BY f.activity_id")
+    report = {"missing": int(missing), "drift": drift}
+    if since is not None:
+        report["touched"] = int(db.query(
+            f"SELECT COUNT(*) FROM user_activities WHERE {KEY_COLUMN} IS NOT NULL "
+            f"AND created_at < {db.ph} AND updated_at >= {db.ph}", (since, since))[0][0])
+    return report
+
+
+def migrate(db, activities_dir=ACTIVITIES_DIR, chunk_rows=CHUNK_ROWS, progress=None) -> dict:
+    stats = prepare(db, activities_dir)
+    stats.update(backfill(db, chunk_rows, progress))
+    add_sqlite_index(db)
+    stats["touched"] = verify(db, stats["started_at"])["touched"]
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backfill user_activities.activity_key from activity_factors.")
+    parser.add_argument("--db", required=True, help="'mysql' or 'sqlite:<path>'")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS, help="ids per UPDATE / commit")
+    parser.add_argument("--verify", action="store_true", help="only report missing keys and drift")
+    parser.add_argument("--since", help="--verify: also count rows whose updated_at moved after this (UTC)")
+    args = parser.parse_args(argv)
+
+    db = connect(args.db)
+    try:
+        if args.verify:
+            report = verify(db, args.since)
+            print(f"{report['missing']:,} rows without a key")
+            if args.since:
+                print(f"{report['touched']:,} keyed rows with updated_at moved since {args.since}")
+            for activity_id, n in report["drift"]:
+                print(f"  {activity_id}: {n:,} rows whose category / unit differ from {TABLE}")
+            return report
+
+        def progress(upto, last, updated, seconds):
+            print(f"  ids <= {min(upto, last):,} of {last:,}: {updated:,} rows keyed ({updated / max(seconds, 1e-9):,.0f}/s)")
+
+        stats = migrate(db, ACTIVITIES_DIR, args.chunk_rows, progress)
+    finally:
+        db.close()
+    print(f"{TABLE}: {stats['factors']} rows loaded; activity_key column "
+          f"{'added' if stats['column_added'] else 'already present'}")
+    print(f"Backfilled {stats['updated']:,} rows in {stats['chunks']} chunks, {stats['seconds']:.2f}s")
+    if stats["touched"]:
+        print(f"WARNING: {stats['touched']:,} keyed rows have updated_at at or after the backfill start "
+              f"({stats['started_at']}); only the app's own edits should be in that window")
+    if stats["unmatched_rows"]:
+        print(f"{stats['unmatched_rows']:,} rows left without a key (activity ids not in the catalogue):")
+        for activity_id, n in stats["unmatched_ids"][:10]:
+            print(f"  {activity_id}: {n:,}")
+    return stats
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+# =============================================================================
+#  Module: activity_manifest.py
+#
+#  Description:
+#  Build-time manifest for the generated Activities/*.js modules, so the app
+#  can load only the categories it needs and fetch the rest on demand.
+#
+#  Writes two files next to the modules:
+#    activityManifest.json  per-chunk category / count / content hash,
+#                           per-category counts and an id -> chunk map
+#    activityManifest.js    imports the JSON and exposes dynamic-import
+#                           loaders per chunk (Vite splits each into its own
+#                           chunk) plus loadActivity / loadCategories helpers
+#
+#  Rebuilt with the other aggregates by activity_aggregates.refresh(); run
+#  this script with --check to confirm the manifest matches the modules.
+#
+#  Usage (from src/data):
+#    python activity_manifest.py           # rebuild the manifest
+#    python activity_manifest.py --check   # verify it, exit 1 on mismatch
+#
+#  Author: Finlay Shaw
+# =============================================================================
+
+import hashlib
+import json
+import sys
+from pathlib import Path
+
+from compact_emitter import module_paths
+from js_modules import parse_module, write_if_changed
+from pipeline_trace import step
+
+ACTIVITIES_DIR = "Activities"
+MANIFEST_JSON = "activityManifest.json"
+MANIFEST_JS = "activityManifest.js"
+MANIFEST_VERSION = 1
+HASH_LENGTH = 16
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+
+
+# =========================
+# Build
+# =========================
+def build_manifest(activities_dir=ACTIVITIES_DIR) -> dict:
+    """Scan the modules on disk and describe them."""
+    chunks, categories, ids = {}, {}, {}
+    for path in module_paths(activities_dir):
+        data = path.read_bytes()
+        _, activities = parse_module(data.decode("utf-8"))
+        cats = sorted({a.get("category", "") for a in activities})
+        chunks[path.name] = {"categories": cats, "count": len(activities), "hash": content_hash(data)}
+        for a in activities:
+            cat = categories.setdefault(a.get("category", ""), {"count": 0, "chunks": []})
+            cat["count"] += 1
+            if path.name not in cat["chunks"]:
+                cat["chunks"].append(path.name)
+            ids.setdefault(a["id"], path.name)  # duplicates are reported by check_manifest
+    return {
+        "version": MANIFEST_VERSION,
+        "total": sum(c["count"] for c in chunks.values()),
+        "chunks": chunks,
+        "categories": dict(sorted(categories.items())),
+        "ids": ids,
+    }
+
+
+def render_manifest_js(manifest: dict) -> str:
+    loaders = "\n".join(
+        f'  "{name}": () => import("./{name}"),' for name in manifest["chunks"]
+    )
+    return f"""// Generated by activity_manifest.py - do not edit.
+import manifest from "./{MANIFEST_JSON}";
+
+// One dynamic import per chunk so bundlers split the catalogue by category
+export const chunkLoaders = {{
+{loaders}
+}};
+
+export async function loadChunk(chunk) {{
+  const load = chunkLoaders[chunk];
+  return load ? (await load()).default : [];
+}}
+
+export async function loadCategories(categories) {{
+  const chunks = new Set(categories.flatMap((c) => manifest.categories[c]?.chunks ?? []));
+  return (await Promise.all([...chunks].map(loadChunk))).flat();
+}}
+
+export async function loadActivity(id) {{
+  const chunk = manifest.ids[id];
+  return chunk ? (await loadChunk(chunk)).find((a) => a.id === id) : undefined;
+}}
+
+export default manifest;
+"""
+
+
+def update_manifest(activities_dir=ACTIVITIES_DIR) -> dict:
+    """Rebuild both manifest files from the modules on disk (no-op writes if unchanged)."""
+    with step("activity_manifest.update") as s:
+        manifest = build_manifest(activities_dir)
+        out = Path(activities_dir)
+        write_if_changed(out / MANIFEST_JSON, json.dumps(manifest, indent=2, ensure_ascii=False) + "\n")
+        write_if_changed(out / MANIFEST_JS, render_manifest_js(manifest))
+        s.done(manifest["ids"])
+    return manifest
+
+
+# =========================
+# Check
+# =========================
+def check_manifest(activities_dir=ACTIVITIES_DIR):
+    """Return a list of problems (empty when the manifest matches the modules)."""
+    out = Path(activities_dir)
+    try:
+        stored = json.loads((out / MANIFEST_JSON).read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return [f"{MANIFEST_JSON} is missing"]
+
+    problems = []
+    for path in module_paths(activities_dir):
+        try:
+            parse_module(path.read_text(encoding="utf-8"))
+        except ValueError as e:
+            problems.append(f"{path.name}: cannot parse module ({e})")
+    if problems:
+        return problems
+
+    fresh = build_manifest(activities_dir)
+    for name in sorted(set(stored.get("chunks", {})) | set(fresh["chunks"])):
+        s, f = stored.get("chunks", {}).get(name), fresh["chunks"].get(name)
+        if s is None:
+            problems.append(f"{name}: module not in manifest")
+        elif f is None:
+            problems.append(f"{name}: in manifest but module is missing")
+        elif s != f:
+            problems.append(f"{name}: manifest {s} != module {f}")
+    if stored.get("categories") != fresh["categories"]:
+        problems.append("per-category counts/chunks differ from the modules")
+    if stored.get("ids") != fresh["ids"]:
+        missing = set(fresh["ids"]) - set(stored.get("ids", {}))
+        extra = set(stored.get("ids", {})) - set(fresh["ids"])
+        problems.append(f"id map differs ({len(missing)} missing, {len(extra)} stale)")
+
+    # Ids must be unique across chunks for id -> chunk lookups to be exact
+    seen = {}
+    for path in module_paths(activities_dir):
+        for a in parse_module(path.read_text(encoding="utf-8"))[1]:
+            if a["id"] in seen and seen[a["id"]] != path.name:
+                problems.append(f"duplicate id {a['id']} in {seen[a['id']]} and {path.name}")
+            seen.setdefault(a["id"], path.name)
+
+    js = out / MANIFEST_JS
+    if not js.exists() or js.read_text(encoding="utf-8") != render_manifest_js(fresh):
+        problems.append(f"{MANIFEST_JS} is out of date")
+    return problems
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if "--check" in argv:
+        problems = check_manifest(ACTIVITIES_DIR)
+        for p in problems:
+            print(f" ✗ {p}")
+        print("Manifest OK" if not problems else f"Manifest check failed: {len(problems)} problem(s)")
+        sys.exit(1 if problems else 0)
+    manifest = update_manifest(ACTIVITIES_DIR)
+    print(f"Manifest written: {len(manifest['chunks'])} chunks, {manifest['total']} activities")
+
+
+if __name__ == "__main__":
+    main()
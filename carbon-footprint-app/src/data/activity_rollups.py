@@ -0,0 +1,386 @@
+# =============================================================================
+#  Script: activity_rollups.py
+#
+#  Description:
+#  Maintains a (user_id, day, category) rollup of user_activities so the
+#  summary.php / daily.php aggregates read a few rollup rows instead of the
+#  user's whole activity history.
+#
+#  Tables (created on first run):
+#    user_activity_daily_rollups   (user_id, day, category) -> total_kg, entries
+#    user_activity_rollup_ledger   what each source row currently contributes
+#    user_activity_deletions       ids of deleted rows, filled by a trigger
+#    rollup_state                  (updated_at, id) watermark of the last refresh
+#
+#  A refresh reads rows changed since the watermark (ORDER BY updated_at, id,
+#  keyset paging) plus the deletion tombstones, diffs them against the ledger
+#  (so edits from update.php move totals, and re-reading a row is harmless),
+#  and applies the net deltas to the rollup with one upsert. The last
+#  watermark second is always re-read, because updated_at only has second
+#  resolution. Deletes made by FK cascades (user deletion) bypass triggers,
+#  so --reconcile also checks the ledger for vanished rows.
+#
+#  Usage (from src/data):
+#    python activity_rollups.py --db sqlite:app.db              # incremental refresh
+#    python activity_rollups.py --db mysql --rebuild            # rebuild from scratch
+#    python activity_rollups.py --db mysql --reconcile          # refresh + orphan check
+#
+#  Author: Finlay Shaw
+# =============================================================================
+
+import argparse
+import time
+from collections import defaultdict, namedtuple
+from datetime import datetime, timedelta
+
+from db import connect
+
+ROLLUPS = "user_activity_daily_rollups"
+LEDGER = "user_activity_rollup_ledger"
+DELETIONS = "user_activity_deletions"
+STATE = "rollup_state"
+STATE_NAME = "daily_category"
+BATCH_SIZE = 10_000
+EPOCH = "1970-01-01 00:00:00"
+
+# Reported to refresh(on_change=...) listeners (e.g. leaderboard.py): one per touched
+# (user, day, category) and one per touched (user, day) with category None (all categories)
+DayChange = namedtuple("DayChange", ["user_id", "day", "category", "before_kg", "before_entries",
+                                     "after_kg", "after_entries"])
+
+SCHEMA = {
+    "sqlite": [
+        f"""CREATE TABLE IF NOT EXISTS {ROLLUPS} (
+          user_id INTEGER NOT NULL, day TEXT NOT NULL, category TEXT NOT NULL,
+          total_kg REAL NOT NULL DEFAULT 0, entries INTEGER NOT NULL DEFAULT 0,
+          PRIMARY KEY (user_id, day, category))""",
+        f"""CREATE TABLE IF NOT EXISTS {LEDGER} (
+          id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL, day TEXT NOT NULL,
+          category TEXT NOT NULL, emissions_kg_co2e REAL NOT NULL)""",
+        f"""CREATE TABLE IF NOT EXISTS {DELETIONS} (
+          id INTEGER PRIMARY KEY, deleted_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP)""",
+        f"""CREATE TRIGGER IF NOT EXISTS user_activities_ad_rollup AFTER DELETE ON user_activities
+          FOR EACH ROW BEGIN INSERT OR REPLACE INTO {DELETIONS} (id) VALUES (OLD.id); END""",
+        f"""CREATE TABLE IF NOT EXISTS {STATE} (
+          name TEXT PRIMARY KEY, updated_at TEXT NOT NULL, last_id INTEGER NOT NULL)""",
+        "CREATE INDEX IF NOT EXISTS idx_user_activities_updated ON user_activities (updated_at, id)",
+    ],
+    "mysql": [
+        f"""CREATE TABLE IF NOT EXISTS `{ROLLUPS}` (
+          `user_id` int(10) UNSIGNED NOT NULL, `day` date NOT NULL, `category` varchar(40) NOT NULL,
+          `total_kg` decimal(16,3) NOT NULL DEFAULT 0, `entries` int(10) UNSIGNED NOT NULL DEFAULT 0,
+          PRIMARY KEY (`user_id`, `day`, `category`)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci""",
+        f"""CREATE TABLE IF NOT EXISTS `{LEDGER}` (
+          `id` bigint(20) UNSIGNED NOT NULL PRIMARY KEY, `user_id` int(10) UNSIGNED NOT NULL,
+          `day` date NOT NULL, `category` varchar(40) NOT NULL, `emissions_kg_co2e` decimal(12,3) NOT NULL
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci""",
+        f"""CREATE TABLE IF NOT EXISTS `{DELETIONS}` (
+          `id` bigint(20) UNSIGNED NOT NULL PRIMARY KEY, `deleted_at` datetime NOT NULL DEFAULT current_timestamp()
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci""",
+        f"""CREATE TRIGGER IF NOT EXISTS `user_activities_ad_rollup` AFTER DELETE ON `user_activities`
+          FOR EACH ROW REPLACE INTO `{DELETIONS}` (`id`) VALUES (OLD.`id`)""",
+        f"""CREATE TABLE IF NOT EXISTS `{STATE}` (
+          `name` varchar(40) NOT NULL PRIMARY KEY, `updated_at` datetime NOT NULL, `last_id` bigint(20) UNSIGNED NOT NULL
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci""",
+        "CREATE INDEX IF NOT EXISTS `idx_user_activities_updated` ON `user_activities` (`updated_at`, `id`)",
+    ],
+}
+
+UPSERT_ROLLUP = {
+    "sqlite": " ON CONFLICT (user_id, day, category) DO UPDATE SET "
+              "total_kg = total_kg + excluded.total_kg, entries = entries + excluded.entries",
+    "mysql": " ON DUPLICATE KEY UPDATE total_kg = total_kg + VALUES(total_kg), entries = entries + VALUES(entries)",
+}
+UPSERT_LEDGER = {
+    "sqlite": " ON CONFLICT (id) DO UPDATE SET user_id = excluded.user_id, day = excluded.day, "
+              "category = excluded.category, emissions_kg_co2e = excluded.emissions_kg_co2e",
+    "mysql": " ON DUPLICATE KEY UPDATE user_id = VALUES(user_id), day = VALUES(day), "
+             "category = VALUES(category), emissions_kg_co2e = VALUES(emissions_kg_co2e)",
+}
+
+
+def ensure_schema(db):
+    for sql in SCHEMA[db.dialect]:
+        db.execute(sql).close()
+    db.commit()
+
+
+# =========================
+# Watermark
+# =========================
+def load_watermark(db):
+    rows = db.query(f"SELECT updated_at, last_id FROM {STATE} WHERE name = {db.ph}", (STATE_NAME,))
+    return (str(rows[0][0]), int(rows[0][1])) if rows else None
+
+
+def save_watermark(db, updated_at, last_id):
+    db.execute(f"DELETE FROM {STATE} WHERE name = {db.ph}", (STATE_NAME,)).close()
+    db.insert_rows(STATE, ("name", "updated_at", "last_id"), [(STATE_NAME, str(updated_at), int(last_id))])
+
+
+# =========================
+# Rebuild
+# =========================
+def rebuild(db):
+    """Recompute ledger and rollups from user_activities; returns a stats dict."""
+    t0 = time.perf_counter()
+    ensure_schema(db)
+    # Watermark first: rows changed while copying are re-read (and diffed) next refresh
+    latest = db.query("SELECT updated_at, id FROM user_activities ORDER BY updated_at DESC, id DESC LIMIT 1")
+    for table in (ROLLUPS, LEDGER, DELETIONS):
+        db.execute(f"DELETE FROM {table}").close()
+    db.execute(
+        f"INSERT INTO {LEDGER} (id, user_id, day, category, emissions_kg_co2e) "
+        f"SELECT id, user_id, DATE(occurred_at), category, emissions_kg_co2e FROM user_activities"
+    ).close()
+    db.execute(
+        f"INSERT INTO {ROLLUPS} (user_id, day, category, total_kg, entries) "
+        f"SELECT user_id, day, category, SUM(emissions_kg_co2e), COUNT(*) FROM {LEDGER} "
+        f"GROUP BY user_id, day, category"
+    ).close()
+    save_watermark(db, *(latest[0] if latest else (EPOCH, 0)))
+    db.commit()
+    rows = db.query(f"SELECT COUNT(*) FROM {LEDGER}")[0][0]
+    return {"mode": "rebuild", "rows": rows, "seconds": time.perf_counter() - t0}
+
+
+# =========================
+# Incremental refresh
+# =========================
+def _ledger_rows(db, ids):
+    out = {}
+    for start in range(0, len(ids), 500):
+        part = ids[start:start + 500]
+        sql = (f"SELECT id, user_id, day, category, emissions_kg_co2e FROM {LEDGER} "
+               f"WHERE id IN ({', '.join([db.ph] * len(part))})")
+        for row in db.query(sql, part):
+            out[row[0]] = (row[1], str(row[2]), row[3], float(row[4]))
+    return out
+
+
+def _delete_ids(db, table, ids):
+    for start in range(0, len(ids), 500):
+        part = ids[start:start + 500]
+        db.execute(f"DELETE FROM {table} WHERE id IN ({', '.join([db.ph] * len(part))})", part).close()
+
+
+def _delete_empty(db, keys):
+    """Drop rollup rows for (user_id, day, category) keys whose entries fell to zero (primary-key lookups)."""
+    for start in range(0, len(keys), 200):
+        part = keys[start:start + 200]
+        where = " OR ".join([f"(user_id = {db.ph} AND day = {db.ph} AND category = {db.ph})"] * len(part))
+        db.execute(f"DELETE FROM {ROLLUPS} WHERE entries <= 0 AND ({where})", [v for key in part for v in key]).close()
+
+
+def _rollup_state(db, pairs):
+    """Current rollup values for (user_id, day) pairs: ({(user, day, category): (kg, n)}, {(user, day): (kg, n)})."""
+    by_key, by_day = {}, {}
+    for start in range(0, len(pairs), 200):
+        part = pairs[start:start + 200]
+        where = " OR ".join([f"(user_id = {db.ph} AND day = {db.ph})"] * len(part))
+        sql = f"SELECT user_id, day, category, total_kg, entries FROM {ROLLUPS} WHERE {where}"
+        for user_id, day, category, kg, n in db.query(sql, [v for pair in part for v in pair]):
+            by_key[(user_id, str(day), category)] = (float(kg), int(n))
+            prev = by_day.get((user_id, str(day)), (0.0, 0))
+            by_day[(user_id, str(day))] = (prev[0] + float(kg), prev[1] + int(n))
+    return by_key, by_day
+
+
+def _day_changes(keys, before, after):
+    zero = (0.0, 0)
+    out = [DayChange(*k, *before[0].get(k, zero), *after[0].get(k, zero)) for k in keys]
+    out += [DayChange(*pair, None, *before[1].get(pair, zero), *after[1].get(pair, zero))
+            for pair in sorted({k[:2] for k in keys})]
+    return out
+
+
+def refresh(db, batch_size=BATCH_SIZE, reconcile=False, on_change=None):
+    """
+    Apply changes since the watermark; rebuilds if there is no watermark yet.
+    on_change, if given, is called with the list of DayChange after the commit.
+    """
+    ensure_schema(db)
+    watermark = load_watermark(db)
+    if watermark is None:
+        return rebuild(db)
+
+    t0 = time.perf_counter()
+    deltas = defaultdict(lambda: [0.0, 0])  # (user_id, day, category) -> [kg, entries]
+    stats = {"mode": "refresh", "changed": 0, "unchanged": 0, "deleted": 0}
+
+    def move(old, new):
+        if old is not None:
+            d = deltas[old[:3]]
+            d[0] -= old[3]
+            d[1] -= 1
+        if new is not None:
+            d = deltas[new[:3]]
+            d[0] += new[3]
+            d[1] += 1
+
+    # Deletes: trigger tombstones (plus ledger orphans when reconciling)
+    gone = [r[0] for r in db.query(f"SELECT id FROM {DELETIONS}")]
+    if reconcile:
+        gone += [r[0] for r in db.query(
+            f"SELECT l.id FROM {LEDGER} l LEFT JOIN user_activities u ON u.id = l.id WHERE u.id IS NULL")]
+    gone = sorted(set(gone))
+    for old in _ledger_rows(db, gone).values():
+        move(old, None)
+        stats["deleted"] += 1
+    _delete_ids(db, LEDGER, gone)
+    _delete_ids(db, DELETIONS, gone)
+
+    # Inserts and edits: keyset scan from the start of the watermark second
+    last_ts, last_id = watermark[0], -1
+    while True:
+        rows = db.query(
+            f"SELECT id, user_id, DATE(occurred_at), category, emissions_kg_co2e, updated_at FROM user_activities "
+            f"WHERE updated_at > {db.ph} OR (updated_at = {db.ph} AND id > {db.ph}) "
+            f"ORDER BY updated_at, id LIMIT {int(batch_size)}",
+            (last_ts, last_ts, last_id),
+        )
+        if not rows:
+            break
+        current = _ledger_rows(db, [r[0] for r in rows])
+        upserts = []
+        for row_id, user_id, day, category, kg, _ in rows:
+            new = (user_id, str(day), category, float(kg))
+            old = current.get(row_id)
+            if old == new:
+                stats["unchanged"] += 1
+                continue
+            move(old, new)
+            upserts.append((row_id, *new))
+            stats["changed"] += 1
+        db.insert_rows(LEDGER, ("id", "user_id", "day", "category", "emissions_kg_co2e"), upserts,
+                       suffix=UPSERT_LEDGER[db.dialect])
+        last_ts, last_id = rows[-1][5], rows[-1][0]
+
+    changes = [(k[0], k[1], k[2], kg, n) for k, (kg, n) in deltas.items() if n or abs(kg) > 1e-9]
+    pairs = sorted({c[:2] for c in changes}) if on_change else []
+    before = _rollup_state(db, pairs) if pairs else None
+    db.insert_rows(ROLLUPS, ("user_id", "day", "category", "total_kg", "entries"), changes,
+                   suffix=UPSERT_ROLLUP[db.dialect])
+    _delete_empty(db, [c[:3] for c in changes if c[4] < 0])  # only net removals can empty a row
+    after = _rollup_state(db, pairs) if pairs else None
+    if last_id != -1:
+        save_watermark(db, last_ts, last_id)
+    db.commit()
+    if pairs:
+        on_change(_day_changes([c[:3] for c in changes], before, after))
+    stats.update(rollup_rows_touched=len(changes), seconds=time.perf_counter() - t0)
+    return stats
+
+
+# =========================
+# Endpoint queries (summary.php / daily.php semantics)
+# =========================
+RAW_TOTAL = ("SELECT ROUND(COALESCE(SUM(emissions_kg_co2e), 0), 3) FROM user_activities "
+             "WHERE user_id = {ph} AND occurred_at >= {ph} AND occurred_at < {ph}{cat}")
+RAW_BY_CATEGORY = ("SELECT category, SUM(emissions_kg_co2e) FROM user_activities "
+                   "WHERE user_id = {ph} AND occurred_at >= {ph} AND occurred_at < {ph}{cat} GROUP BY category")
+RAW_DAILY = ("SELECT DATE(occurred_at) AS day, SUM(emissions_kg_co2e), COUNT(*) FROM user_activities "
+             "WHERE user_id = {ph} AND occurred_at >= {ph} AND occurred_at < {ph}{cat} GROUP BY day")
+ROLLUP_BY_CATEGORY = ("SELECT category, SUM(total_kg) FROM " + ROLLUPS +
+                      " WHERE user_id = {ph} AND day >= {ph} AND day < {ph}{cat} GROUP BY category")
+ROLLUP_DAILY = ("SELECT day, SUM(total_kg), SUM(entries) FROM " + ROLLUPS +
+                " WHERE user_id = {ph} AND day >= {ph} AND day < {ph}{cat} GROUP BY day")
+
+
+def _sql(db, template, category):
+    return template.format(ph=db.ph, cat=f" AND category = {db.ph}" if category else "")
+
+
+def _params(uid, start, end, category):
+    return (uid, start, end, category) if category else (uid, start, end)
+
+
+def split_range(start, end):
+    """
+    [start, end) datetime strings -> (first full day, end of full days, edge ranges).
+    Whole days come from the rollup; partial days at either edge from the raw table.
+    """
+    s, e = datetime.fromisoformat(start), datetime.fromisoformat(end)
+    first = (s if s.time() == datetime.min.time() else s + timedelta(days=1)).replace(hour=0, minute=0, second=0)
+    last = e.replace(hour=0, minute=0, second=0)
+    fmt = "%Y-%m-%d %H:%M:%S"
+    if first >= last:
+        return None, None, [(start, end)]
+    edges = []
+    if s < first:
+        edges.append((start, first.strftime(fmt)))
+    if last < e:
+        edges.append((last.strftime(fmt), end))
+    return first.strftime("%Y-%m-%d"), last.strftime("%Y-%m-%d"), edges
+
+
+def by_category_raw(db, uid, start, end, category=None):
+    sql = _sql(db, RAW_BY_CATEGORY, category)
+    return {c: float(kg) for c, kg in db.query(sql, _params(uid, start, end, category))}
+
+
+def by_category_rollup(db, uid, start, end, category=None):
+    """{category: kg} for [start, end), from the rollup plus raw partial-day edges."""
+    first, last, edges = split_range(start, end)
+    out = defaultdict(float)
+    if first:
+        for c, kg in db.query(_sql(db, ROLLUP_BY_CATEGORY, category), _params(uid, first, last, category)):
+            out[c] += float(kg)
+    for a, b in edges:
+        for c, kg in by_category_raw(db, uid, a, b, category).items():
+            out[c] += kg
+    return dict(out)
+
+
+def daily_raw(db, uid, start, end, category=None):
+    rows = db.query(_sql(db, RAW_DAILY, category), _params(uid, start, end, category))
+    return {str(d): (float(kg), int(n)) for d, kg, n in rows}
+
+
+def daily_rollup(db, uid, start, end, category=None):
+    """{day: (kg, entries)} for [start, end), from the rollup plus raw partial-day edges."""
+    first, last, edges = split_range(start, end)
+    out = {}
+    if first:
+        for d, kg, n in db.query(_sql(db, ROLLUP_DAILY, category), _params(uid, first, last, category)):
+            out[str(d)] = (float(kg), int(n))
+    for a, b in edges:
+        for d, (kg, n) in daily_raw(db, uid, a, b, category).items():
+            prev = out.get(d, (0.0, 0))
+            out[d] = (prev[0] + kg, prev[1] + n)
+    return out
+
+
+def summary(by_category):
+    """summary.php response shape (group=category) from a {category: kg} map."""
+    items = sorted(({"label": c, "value": round(kg, 3)} for c, kg in by_category.items()),
+                   key=lambda i: -i["value"])
+    return {"totalKg": round(sum(by_category.values()), 3), "group": "category", "items": items}
+
+
+def daily(by_day):
+    """daily.php response shape from a {day: (kg, entries)} map."""
+    return [{"day": d, "total_kg": round(kg, 3), "entries": n} for d, (kg, n) in sorted(by_day.items())]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Maintain the (user, day, category) activity rollup.")
+    parser.add_argument("--db", required=True, help="'mysql' (DB_* env settings) or 'sqlite:<path>'")
+    parser.add_argument("--rebuild", action="store_true", help="recompute everything from user_activities")
+    parser.add_argument("--reconcile", action="store_true", help="also catch deletes that bypassed the trigger")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="rows read per keyset page")
+    args = parser.parse_args(argv)
+
+    db = connect(args.db)
+    try:
+        stats = rebuild(db) if args.rebuild else refresh(db, args.batch_size, args.reconcile)
+    finally:
+        db.close()
+    detail = ", ".join(f"{k} {v}" for k, v in stats.items() if k not in ("mode", "seconds"))
+    print(f"Rollup {stats['mode']}: {detail} in {stats['seconds']:.3f}s")
+    return stats
+
+
+if __name__ == "__main__":
+    main()
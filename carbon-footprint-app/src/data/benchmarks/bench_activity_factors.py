@@ -0,0 +1,144 @@
+# =============================================================================
+#  Script: benchmarks/bench_activity_factors.py
+#
+#  Description:
+#  user_activities size and aggregate speed before and after keying rows on
+#  the activity_factors dimension, on a synthetic SQLite stand-in database
+#  (workload_generator). Three layouts:
+#    wide      user_activities as db/carbon_app.sql has it (catalogue
+#              strings copied into every row)
+#    wide+key  after activity_key_migration.py (strings kept, key added)
+#    narrow    the strings dropped: id, user_id, activity_key, factor,
+#              quantity, emissions, meta and times (same user_id index)
+#  For each: table + index bytes (dbstat), a population GROUP BY category,
+#  and the summary.php per-category / per-activity breakdowns for a sample
+#  of users (keyed layouts group by key, then join the dimension for the
+#  labels). Answers are checked to agree; the migration's backfill rate is
+#  reported too.
+#
+#  Usage (from src/data):  python benchmarks/bench_activity_factors.py [USERS ...]
+#
+#  Author: Finlay Shaw
+# =============================================================================
+
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+DATA_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(DATA_DIR))
+
+import activity_key_migration as akm  # noqa: E402
+from db import connect_sqlite  # noqa: E402
+from factor_registry import FactorRegistry  # noqa: E402
+from workload_generator import DatabaseSink, generate  # noqa: E402
+
+SIZES = [1_000, 3_000]
+SAMPLE_USERS = 300
+REPEATS = 3
+RANGE = ("2024-04-01 00:00:00", "2024-10-01 00:00:00")
+
+NARROW = "user_activities_narrow"
+NARROW_SCHEMA = f"""CREATE TABLE {NARROW} (
+  id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL, activity_key INTEGER NOT NULL,
+  emission_factor REAL NOT NULL, quantity REAL NOT NULL, emissions_kg_co2e REAL NOT NULL,
+  meta TEXT DEFAULT NULL, occurred_at TEXT NOT NULL, created_at TEXT NOT NULL, updated_at TEXT NOT NULL)"""
+NARROW_COPY = f"""INSERT INTO {NARROW} SELECT id, user_id, activity_key, emission_factor, quantity,
+  emissions_kg_co2e, meta, occurred_at, created_at, updated_at FROM user_activities WHERE activity_key IS NOT NULL"""
+
+POPULATION = {
+    "wide": "SELECT category, SUM(emissions_kg_co2e) FROM user_activities GROUP BY category",
+    "wide+key": "SELECT f.category, SUM(t.kg) FROM (SELECT activity_key, SUM(emissions_kg_co2e) kg "
+                "FROM user_activities GROUP BY activity_key) t JOIN activity_factors f USING (activity_key) "
+                "GROUP BY f.category",
+    "narrow": f"SELECT f.category, SUM(t.kg) FROM (SELECT activity_key, SUM(emissions_kg_co2e) kg "
+              f"FROM {NARROW} GROUP BY activity_key) t JOIN activity_factors f USING (activity_key) "
+              f"GROUP BY f.category",
+}
+USER_WHERE = "WHERE user_id = ? AND occurred_at >= ? AND occurred_at < ?"
+BY_CATEGORY = {
+    "wide": f"SELECT category, SUM(emissions_kg_co2e) FROM user_activities {USER_WHERE} GROUP BY category",
+    "wide+key": f"SELECT f.category, SUM(t.kg) FROM (SELECT activity_key, SUM(emissions_kg_co2e) kg "
+                f"FROM user_activities {USER_WHERE} GROUP BY activity_key) t "
+                f"JOIN activity_factors f USING (activity_key) GROUP BY f.category",
+    "narrow": f"SELECT f.category, SUM(t.kg) FROM (SELECT activity_key, SUM(emissions_kg_co2e) kg "
+              f"FROM {NARROW} {USER_WHERE} GROUP BY activity_key) t "
+              f"JOIN activity_factors f USING (activity_key) GROUP BY f.category",
+}
+BY_ACTIVITY = {
+    "wide": f"SELECT activity_id, activity_name, SUM(emissions_kg_co2e) FROM user_activities {USER_WHERE} "
+            f"GROUP BY activity_id, activity_name",
+    "wide+key": f"SELECT f.activity_id, f.activity_name, t.kg FROM (SELECT activity_key, SUM(emissions_kg_co2e) kg "
+                f"FROM user_activities {USER_WHERE} GROUP BY activity_key) t JOIN activity_factors f USING (activity_key)",
+    "narrow": f"SELECT f.activity_id, f.activity_name, t.kg FROM (SELECT activity_key, SUM(emissions_kg_co2e) kg "
+              f"FROM {NARROW} {USER_WHERE} GROUP BY activity_key) t JOIN activity_factors f USING (activity_key)",
+}
+TABLES = {"wide": "user_activities", "wide+key": "user_activities", "narrow": NARROW}
+
+
+def table_bytes(db, table):
+    """Pages used by `table` and its indexes."""
+    names = [table] + [r[0] for r in db.query(
+        "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = ?", (table,))]
+    marks = ", ".join("?" * len(names))
+    return db.query(f"SELECT SUM(pgsize) FROM dbstat WHERE name IN ({marks})", names)[0][0]
+
+
+def best_of(fn):
+    best, result = float("inf"), None
+    for _ in range(REPEATS):
+        t = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t)
+    return best, result
+
+
+def answers(rows):
+    return {tuple(r[:-1]): round(r[-1], 6) for r in rows}
+
+
+def run_queries(db, layout, users):
+    t_pop, pop = best_of(lambda: db.query(POPULATION[layout]))
+    t_cat, cats = best_of(lambda: [db.query(BY_CATEGORY[layout], (u, *RANGE)) for u in users])
+    t_act, acts = best_of(lambda: [db.query(BY_ACTIVITY[layout], (u, *RANGE)) for u in users])
+    return (t_pop, t_cat, t_act), (answers(pop), [answers(r) for r in cats], [answers(r) for r in acts])
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    sizes = [int(a) for a in argv] or SIZES
+    registry = FactorRegistry.from_modules(DATA_DIR / "Activities")
+    for n_users in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            db = connect_sqlite(str(Path(tmp) / "bench.db"))
+            rows = generate(DatabaseSink(db), users=n_users, registry=registry)["user_activities"]
+            users = random.Random(7).sample(range(1, n_users + 1), min(SAMPLE_USERS, n_users))
+            print(f"{n_users:,} users, {rows:,} user_activities rows; breakdowns for {len(users)} users")
+
+            results = {"wide": (table_bytes(db, "user_activities"), *run_queries(db, "wide", users))}
+            stats = akm.migrate(db, DATA_DIR / "Activities")
+            assert stats["touched"] == 0, f"backfill moved updated_at on {stats['touched']:,} rows"
+            print(f"  migration: {stats['updated']:,} rows keyed in {stats['chunks']} chunks, "
+                  f"{stats['seconds']:.2f}s ({stats['updated'] / stats['seconds']:,.0f} rows/s)")
+            results["wide+key"] = (table_bytes(db, "user_activities"), *run_queries(db, "wide+key", users))
+            for sql in (NARROW_SCHEMA, NARROW_COPY, f"CREATE INDEX idx_narrow_user ON {NARROW} (user_id)"):
+                db.execute(sql).close()
+            db.commit()
+            results["narrow"] = (table_bytes(db, NARROW), *run_queries(db, "narrow", users))
+            db.close()
+
+        base_bytes, base_times, base_answers = results["wide"]
+        print(f"  {'layout':<9} {'table+index':>12} {'bytes/row':>10} {'GROUP BY category':>18} "
+              f"{'per-user category':>18} {'per-user activity':>18}")
+        for layout, (size, times, got) in results.items():
+            assert got == base_answers, f"{layout} answers differ from the wide table"
+            timings = "".join(f" {t:8.3f}s ({base / t:4.1f}x)" for t, base in zip(times, base_times))
+            print(f"  {layout:<9} {size / 2**20:9.1f} MB {size / rows:10.1f}{timings}  "
+                  f"({size / base_bytes:.0%} of wide)")
+        print("  answers identical across layouts")
+
+
+if __name__ == "__main__":
+    main()
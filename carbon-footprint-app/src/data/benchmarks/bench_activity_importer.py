@@ -0,0 +1,101 @@
+# =============================================================================
+#  Script: benchmarks/bench_activity_importer.py
+#
+#  Description:
+#  Rows/second for activity_importer on synthetic CSV and JSONL exports
+#  (random catalogue activities, ~1% invalid rows) into a fresh SQLite
+#  stand-in database, for several batch sizes. The baseline is what
+#  log_activity.php does per request: one single-row INSERT and one commit
+#  per row (run on a smaller sample, it is slow).
+#
+#  Usage (from src/data):  python benchmarks/bench_activity_importer.py [ROWS]
+#
+#  Author: Finlay Shaw
+# =============================================================================
+
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+DATA_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(DATA_DIR))
+
+from activity_importer import catalogue_frame, import_file, to_records, validate_chunk  # noqa: E402
+from db import USER_ACTIVITY_COLUMNS, connect_sqlite  # noqa: E402
+from factor_registry import FactorRegistry  # noqa: E402
+
+BATCH_SIZES = [100, 1_000, 10_000]
+BASELINE_ROWS = 2_000
+
+
+def synthetic_rows(registry, n, seed=42):
+    rng = random.Random(seed)
+    ids = list(registry.ids)
+    for i in range(n):
+        row = {
+            "user_id": rng.randint(1, 10_000),
+            "activity_id": rng.choice(ids),
+            "quantity": round(rng.uniform(0.1, 50), 3),
+            "occurred_at": f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} "
+                           f"{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:00",
+            "meta": "{}",
+        }
+        if i % 100 == 99:  # ~1% bad rows
+            row["activity_id"] = "no_such_activity"
+        yield row
+
+
+def write_inputs(registry, n, tmp):
+    csv_path, jsonl_path = tmp / "activities.csv", tmp / "activities.jsonl"
+    rows = list(synthetic_rows(registry, n))
+    pd.DataFrame(rows).to_csv(csv_path, index=False)
+    with open(jsonl_path, "w", encoding="utf-8") as f:
+        for row in rows:
+            f.write(json.dumps(row) + "\n")
+    return csv_path, jsonl_path
+
+
+def per_row_baseline(registry, csv_path, tmp):
+    """Single-row INSERT + commit per row, as one log_activity.php request each."""
+    chunk = pd.read_csv(csv_path, dtype=str, keep_default_na=False, nrows=BASELINE_ROWS)
+    good, _ = validate_chunk(chunk, catalogue_frame(registry), first_row=1)
+    records = to_records(good)
+    db = connect_sqlite(tmp / "baseline.db")
+    sql = (f"INSERT INTO user_activities ({', '.join(USER_ACTIVITY_COLUMNS)}) "
+           f"VALUES ({', '.join('?' * len(USER_ACTIVITY_COLUMNS))})")
+    t0 = time.perf_counter()
+    for record in records:
+        db.execute(sql, record).close()
+        db.commit()
+    seconds = time.perf_counter() - t0
+    db.close()
+    return len(chunk) / seconds
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    n = int(argv[0]) if argv else 200_000
+    registry = FactorRegistry.from_modules(DATA_DIR / "Activities")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        csv_path, jsonl_path = write_inputs(registry, n, tmp)
+        print(f"{n} synthetic rows, {len(registry)} catalogue activities, SQLite stand-in")
+        print(f"  per-row INSERT + commit ({BASELINE_ROWS} rows): {per_row_baseline(registry, csv_path, tmp):>10,.0f} rows/s")
+        for label, path in (("csv", csv_path), ("jsonl", jsonl_path)):
+            for batch in BATCH_SIZES:
+                db = connect_sqlite(tmp / f"{label}_{batch}.db")
+                stats = import_file(path, db, registry=registry, batch_size=batch)
+                db.close()
+                print(f"  {label:<5} batch {batch:>6}: {stats['read'] / stats['seconds']:>10,.0f} rows/s  "
+                      f"({stats['inserted']} inserted, {stats['rejected']} rejected; read {stats['read_s']:.2f}s, "
+                      f"validate {stats['validate_s']:.2f}s, write {stats['write_s']:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+# =============================================================================
+#  Script: benchmarks/bench_activity_rollups.py
+#
+#  Description:
+#  Endpoint query latency served from the (user, day, category) rollup
+#  versus the raw user_activities scans summary.php / daily.php run today,
+#  on a synthetic SQLite stand-in database (USERS users, ~ROWS_PER_USER
+#  activities each over two years). Every rollup answer is checked against
+#  the raw one. Also times a full rebuild and an incremental refresh after
+#  a mix of inserts, edits and deletes, and checks the refreshed rollup
+#  equals a fresh aggregate.
+#
+#  Usage (from src/data):  python benchmarks/bench_activity_rollups.py [USERS] [ROWS_PER_USER]
+#
+#  Author: Finlay Shaw
+# =============================================================================
+
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+DATA_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(DATA_DIR))
+
+import activity_rollups as ar  # noqa: E402
+from db import USER_ACTIVITY_COLUMNS, connect_sqlite  # noqa: E402
+from factor_registry import FactorRegistry  # noqa: E402
+
+START = datetime(2024, 1, 1)
+DAYS = 730
+NOW = START + timedelta(days=DAYS)
+FMT = "%Y-%m-%d %H:%M:%S"
+
+
+def populate(db, registry, users, per_user, rng):
+    catalogue = list(registry)
+    batch = []
+    for uid in range(1, users + 1):
+        for _ in range(max(1, int(rng.expovariate(1 / per_user)))):
+            f = rng.choice(catalogue)
+            occurred = START + timedelta(seconds=rng.randrange(DAYS * 86400))
+            batch.append((uid, f.id, f.activity, f.category, f.type, f.unit, f.emission_factor,
+                          round(rng.uniform(0.1, 20), 3), occurred.strftime(FMT), "{}"))
+            if len(batch) >= 10_000:
+                db.insert_rows("user_activities", USER_ACTIVITY_COLUMNS, batch)
+                batch = []
+    db.insert_rows("user_activities", USER_ACTIVITY_COLUMNS, batch)
+    db.commit()
+
+
+def windows(rng):
+    """(label, from, to) ranges like the Summary / Dashboard pages request."""
+    end = NOW - timedelta(days=rng.randrange(60))
+    aligned = end.replace(hour=0, minute=0, second=0)
+    return [
+        ("week", (aligned - timedelta(days=7)).strftime(FMT), aligned.strftime(FMT)),
+        ("month", (aligned - timedelta(days=30)).strftime(FMT), aligned.strftime(FMT)),
+        ("all", "1970-01-01 00:00:00", "2100-01-01 00:00:00"),
+        ("unaligned", (end - timedelta(days=45, hours=5)).strftime(FMT), end.strftime(FMT)),
+    ]
+
+
+def timed(fn, *args):
+    t = time.perf_counter()
+    out = fn(*args)
+    return out, (time.perf_counter() - t) * 1e3
+
+
+def same(a, b):
+    return a.keys() == b.keys() and all(
+        abs((a[k][0] if isinstance(a[k], tuple) else a[k]) - (b[k][0] if isinstance(b[k], tuple) else b[k])) < 5e-4
+        and (not isinstance(a[k], tuple) or a[k][1] == b[k][1]) for k in a)
+
+
+def check_rollup_matches_source(db):
+    fresh = db.query("SELECT user_id, DATE(occurred_at), category, ROUND(SUM(emissions_kg_co2e), 3), COUNT(*) "
+                     "FROM user_activities GROUP BY 1, 2, 3")
+    rolled = db.query(f"SELECT user_id, day, category, ROUND(total_kg, 3), entries FROM {ar.ROLLUPS}")
+    assert sorted(fresh) == sorted(rolled), "rollup differs from a fresh aggregate"
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    users = int(argv[0]) if argv else 300
+    per_user = int(argv[1]) if len(argv) > 1 else 4_000
+    rng = random.Random(42)
+    registry = FactorRegistry.from_modules(DATA_DIR / "Activities")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = connect_sqlite(Path(tmp) / "bench.db")
+        t = time.perf_counter()
+        populate(db, registry, users, per_user, rng)
+        n_rows = db.query("SELECT COUNT(*) FROM user_activities")[0][0]
+        print(f"{n_rows} activities for {users} users (populated in {time.perf_counter() - t:.1f}s)")
+
+        stats = ar.rebuild(db)
+        n_roll = db.query(f"SELECT COUNT(*) FROM {ar.ROLLUPS}")[0][0]
+        print(f"  rebuild: {stats['seconds']:.2f}s -> {n_roll} rollup rows")
+
+        timings = {}
+        for _ in range(300):
+            uid = rng.randint(1, users)
+            category = rng.choice([None, None, "food", "passenger_vehicles"])
+            for label, start, end in windows(rng):
+                for kind, raw_fn, roll_fn in (("summary", ar.by_category_raw, ar.by_category_rollup),
+                                              ("daily", ar.daily_raw, ar.daily_rollup)):
+                    raw, raw_ms = timed(raw_fn, db, uid, start, end, category)
+                    roll, roll_ms = timed(roll_fn, db, uid, start, end, category)
+                    assert same(raw, roll), (kind, uid, start, end, category)
+                    t = timings.setdefault((kind, label), ([], []))
+                    t[0].append(raw_ms)
+                    t[1].append(roll_ms)
+        print(f"  {'endpoint':<9} {'range':<10} {'raw p50 ms':>11} {'rollup p50 ms':>14} {'raw p95':>9} {'rollup p95':>11}")
+        for (kind, label), (raw, roll) in timings.items():
+            p95 = lambda xs: statistics.quantiles(xs, n=20)[-1]
+            print(f"  {kind:<9} {label:<10} {statistics.median(raw):>11.3f} {statistics.median(roll):>14.3f} "
+                  f"{p95(raw):>9.3f} {p95(roll):>11.3f}")
+
+        # Incremental maintenance after a burst of app traffic
+        ids = [r[0] for r in db.query("SELECT id FROM user_activities ORDER BY RANDOM() LIMIT 1500")]
+        populate(db, registry, 1_000, 1, rng)                        # ~1000 new rows
+        for row_id in ids[:1000]:                                   # update.php
+            db.execute("UPDATE user_activities SET quantity = quantity + 1 WHERE id = ?", (row_id,)).close()
+        for row_id in ids[1000:]:                                   # delete.php
+            db.execute("DELETE FROM user_activities WHERE id = ?", (row_id,)).close()
+        db.commit()
+        stats = ar.refresh(db)
+        print(f"  refresh: {stats['seconds']:.3f}s ({stats['changed']} changed, {stats['deleted']} deleted, "
+              f"{stats['rollup_rows_touched']} rollup rows touched)")
+        check_rollup_matches_source(db)
+        stats = ar.refresh(db)
+        print(f"  no-op refresh: {stats['seconds']:.3f}s ({stats['unchanged']} rows re-read from the last second)")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# =============================================================================
+#  Script: benchmarks/bench_defra_frames.py
+#
+#  Description:
+#  Load + clean cost of "pre-processed-defra.csv" for the two generators,
+#  comparing plain string columns (pd.read_csv) with the typed loader in
+#  defra_frames.py (categorical text, float64 or float32 factors), on
+#  synthetic multi-year inputs: the CSV stacked once per year with the
+#  factors nudged, as a real multi-year factor set repeats the same
+#  categories, units and descriptions every year.
+#
+#  Reports tracemalloc peak, the cleaned frame's deep memory and wall time
+#  per variant, and checks the typed frames give the same activity frame
+#  (generate_js_from_defra) and base factors (general_activities).
+#
+#  Usage (from src/data):  python benchmarks/bench_defra_frames.py [YEARS ...]
+#
+#  Author: Finlay Shaw
+# =============================================================================
+
+import gc
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import pandas as pd
+
+DATA_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(DATA_DIR))
+
+import general_activities as ga  # noqa: E402
+import generate_js_from_defra as gen  # noqa: E402
+from defra_frames import memory_report, read_defra  # noqa: E402
+
+YEARS = [1, 10, 50]
+LOADERS = {
+    "plain": pd.read_csv,
+    "typed": read_defra,
+    "typed f32": lambda path: read_defra(path, factor_dtype="float32"),
+}
+
+
+def multi_year_csv(years, dest):
+    df = pd.read_csv(DATA_DIR / gen.INPUT_CSV)
+    copies = []
+    for k in range(years):
+        c = df.copy()
+        c["EmissionFactor"] = c["EmissionFactor"] * (1 - k / 100)
+        copies.append(c)
+    pd.concat(copies, ignore_index=True).to_csv(dest, index=False)
+
+
+def load_and_clean(load, path):
+    """Both generators' load + clean, as the pipeline runs them from the CSV."""
+    df = load(path)
+    return gen.clean_defra(df), ga.clean_defra(df)
+
+
+def measure(load, path):
+    gc.collect()
+    t = time.perf_counter()
+    frames = load_and_clean(load, path)
+    seconds = time.perf_counter() - t
+    del frames
+    gc.collect()
+    tracemalloc.start()
+    frames = load_and_clean(load, path)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    held = sum(f.memory_usage(deep=True).sum() for f in frames)
+    return seconds, peak, held, frames
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    years_list = [int(a) for a in argv] or YEARS
+    with tempfile.TemporaryDirectory() as tmp:
+        for years in years_list:
+            path = Path(tmp) / f"defra-{years}y.csv"
+            multi_year_csv(years, path)
+            print(f"{years} year(s): {years * len(pd.read_csv(DATA_DIR / gen.INPUT_CSV)):,} rows")
+            results = {name: measure(load, path) for name, load in LOADERS.items()}
+
+            plain_gen, plain_ga = results["plain"][3]
+            expected = gen.build_activity_frame(plain_gen).reset_index(drop=True)
+            base = ga.base_factors(plain_ga)
+            for name, (seconds, peak, held, (typed_gen, typed_ga)) in results.items():
+                if name == "typed":
+                    pd.testing.assert_frame_equal(gen.build_activity_frame(typed_gen).reset_index(drop=True), expected)
+                    assert ga.base_factors(typed_ga) == base
+                ratio = results["plain"][1] / peak
+                print(f"  {name:<10} peak {peak / 2**20:8.2f} MB ({ratio:4.1f}x less)  "
+                      f"cleaned frames {held / 2**20:8.2f} MB  {seconds:6.3f}s")
+            print("  typed: same activity frame and base factors as plain")
+        print()
+        print(memory_report(results["plain"][3][0], "plain, generate_js_from_defra.clean_defra"))
+        print(memory_report(results["typed"][3][0], "typed, generate_js_from_defra.clean_defra"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+# =============================================================================
+#  Script: benchmarks/bench_defra_transforms.py
+#
+#  Description:
+#  Times the DEFRA normalisation stages of generate_js_from_defra.py on
+#  synthetic 1x / 10x / 100x copies of "pre-processed-defra.csv", comparing
+#  the original row-by-row df.apply implementation against the column-wise
+#  steps in defra_transforms.py, and checks both produce the same frame.
+#
+#  Usage (from src/data):  python benchmarks/bench_defra_transforms.py [1 10 100]
+#
+#  Author: Finlay Shaw
+# =============================================================================
+
+import re
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+DATA_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(DATA_DIR))
+
+import generate_js_from_defra as gen  # noqa: E402
+
+
+# =========================
+# Synthetic inputs
+# =========================
+def scaled_defra(df: pd.DataFrame, factor: int) -> pd.DataFrame:
+    """
+    Stack `factor` copies of the cleaned frame. Copies after the first get a
+    suffix on their Description/Activity so they survive the groupby as
+    distinct activities (as extra years / countries would).
+    """
+    copies = [df]
+    for k in range(1, factor):
+        c = df.copy()
+        suffix = f" v{k}"
+        for col in ("Description", "Activity"):
+            text = c[col].astype(object)  # may be categorical (defra_frames.read_defra)
+            c[col] = text.where(text.isna(), text.astype(str) + suffix)
+        c["EmissionFactor"] = c["EmissionFactor"] * (1 + k / 1000)
+        copies.append(c)
+    return pd.concat(copies, ignore_index=True)
+
+
+# =========================
+# Row-wise reference (the pre-vectorisation implementation)
+# =========================
+def rowwise_build(df: pd.DataFrame) -> pd.DataFrame:
+    def determine_label(row):
+        if pd.notna(row.get("Description")) and str(row["Description"]).strip():
+            return row["Description"]
+        if pd.notna(row.get("Activity")) and str(row["Activity"]).strip():
+            return row["Activity"]
+        return "Unspecified"
+    df = df.copy()
+    df["Label"] = df.apply(determine_label, axis=1)
+
+    def is_useless(label):
+        return bool(re.match(gen.USELESS_LABEL_RE, str(label) or ""))
+    keep_mask = df["Category"].str.strip().str.lower().isin(gen.KEEP_UNSPECIFIED_CATEGORIES)
+    df = df[~(df["Label"].apply(is_useless) & ~keep_mask)]
+    excluded = {s.lower() for s in gen.EXCLUDED_CATEGORIES}
+    df = df[~df["Category"].str.strip().str.lower().isin(excluded)]
+
+    g = df.groupby(["Category", "Label", "Unit"], as_index=False)["EmissionFactor"].mean()
+
+    def convert_miles_to_km(row):
+        if str(row["Unit"]).strip().lower() == "miles":
+            row["EmissionFactor"] /= 0.621371
+            row["Unit"] = "km"
+        return row
+    g = g.apply(convert_miles_to_km, axis=1)
+
+    def normalise_units(row):
+        unit_original = str(row["Unit"]).strip().lower()
+        if unit_original in gen.UNIT_CONVERSIONS:
+            new_unit, mult = gen.UNIT_CONVERSIONS[unit_original]
+            row["Unit"] = new_unit
+            row["EmissionFactor"] *= mult
+            lbl = str(row["Label"])
+            if unit_original in lbl.lower():
+                row["Label"] = re.sub(re.escape(unit_original), new_unit, lbl, flags=re.IGNORECASE)
+        if unit_original in gen.UNIT_NORMALISATIONS:
+            row["Unit"] = gen.UNIT_NORMALISATIONS[unit_original]
+        return row
+    g = g.apply(normalise_units, axis=1)
+
+    def convert_to_kgkm_if_delivery(row):
+        if str(row["Category"]).strip().lower() == "delivery vehicles" and str(row["Unit"]).strip().lower() == "km":
+            row["EmissionFactor"] /= gen.AVERAGE_VAN_PAYLOAD_KG
+            row["Unit"] = "kg·km"
+        return row
+    g = g.apply(convert_to_kgkm_if_delivery, axis=1)
+
+    def merge_electric_vans(row):
+        if row["Category"].strip().lower() == "delivery vehicles":
+            if any(k in row["Label"].lower() for k in gen.ELECTRIC_VAN_KEYWORDS):
+                row["Label"] = "electric van"
+        return row
+    g = g.apply(merge_electric_vans, axis=1)
+    g = g.groupby(["Category", "Label", "Unit"], as_index=False)["EmissionFactor"].mean()
+
+    def is_fuel_based_delivery(row):
+        if str(row["Category"]).strip().lower() != "delivery vehicles":
+            return True
+        return any(fuel in str(row["Label"]).lower() for fuel in gen.FUEL_KEYWORDS)
+    g = g[g.apply(is_fuel_based_delivery, axis=1)]
+
+    g["EmissionFactor"] = g["EmissionFactor"].round(8)
+    return g.drop_duplicates(subset=["Category", "Label", "Unit", "EmissionFactor"])
+
+
+# =========================
+# Runner
+# =========================
+def best_of(fn, arg, repeats):
+    best, result = float("inf"), None
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        result = fn(arg)
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def main(factors):
+    base = gen.load_defra(DATA_DIR / gen.INPUT_CSV)
+    print(f"{'scale':>6} {'rows':>9} {'row-wise s':>11} {'columnar s':>11} {'speedup':>8}  same")
+    for factor in factors:
+        df = scaled_defra(base, factor)
+        repeats = 3 if factor < 100 else 1
+        t_row, ref = best_of(rowwise_build, df, repeats)
+        t_col, out = best_of(gen.build_activity_frame, df, repeats)
+        out = out[list(ref.columns)]  # the spread columns have no row-wise counterpart
+        same = ref.reset_index(drop=True).astype(object).equals(out.reset_index(drop=True).astype(object))
+        print(f"{factor:>5}x {len(df):>9} {t_row:>11.3f} {t_col:>11.3f} {t_row / t_col:>7.1f}x  {same}")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [1, 10, 100])
@@ -0,0 +1,91 @@
+# =============================================================================
+#  Script: benchmarks/bench_factor_registry.py
+#
+#  Description:
+#  Lookup throughput and memory of factor_registry.FactorRegistry against
+#  the obvious alternative (the parsed activity dicts indexed by id), on the
+#  real catalogue and on larger synthetic catalogues (the real activities
+#  repeated with suffixed ids/labels). Both must return the same factors.
+#
+#  Usage (from src/data):  python benchmarks/bench_factor_registry.py [SCALES...]
+#
+#  Author: Finlay Shaw
+# =============================================================================
+
+import gc
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+DATA_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(DATA_DIR))
+
+from activity_manifest import module_paths  # noqa: E402
+from factor_registry import FactorRegistry  # noqa: E402
+from js_modules import read_module  # noqa: E402
+
+ACTIVITIES_DIR = DATA_DIR / "Activities"
+N_LOOKUPS = 1_000_000
+
+
+def scaled_activities(base, scale):
+    out = []
+    for k in range(scale):
+        for a in base:
+            a = dict(a)
+            if k:
+                a["id"] = f"{a['id']}_{k}"
+                a["activity"] = f"{a['activity']} ({k})"
+            out.append(a)
+    return out
+
+
+def measure(build):
+    """(object, bytes allocated while building it)."""
+    gc.collect()
+    tracemalloc.start()
+    obj = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, size
+
+
+def rate(fn, items):
+    t0 = time.perf_counter()
+    fn(items)
+    return len(items) / (time.perf_counter() - t0)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    scales = [int(a) for a in argv] or [1, 100, 1000]
+    base = [a for p in module_paths(ACTIVITIES_DIR) for a in read_module(p)[1]]
+    rng = random.Random(42)
+
+    print(f"{'scale':>6} {'entries':>9} | {'dicts MB':>9} {'registry MB':>12} | "
+          f"{'dict id/s':>12} {'factor()/s':>12} {'factor_for/s':>13} {'factor_many/s':>14}")
+    for scale in scales:
+        rows = scaled_activities(base, scale)
+        # The baseline holds its own copy of the dicts, as a JSON load would
+        baseline, dict_bytes = measure(lambda: {a["id"]: dict(a) for a in rows})
+        reg, reg_bytes = measure(lambda: FactorRegistry.from_activities(rows))
+
+        ids = [rng.choice(rows)["id"] for _ in range(N_LOOKUPS)]
+        keys = [(a["category"], a["activity"], a["unit"]) for a in (rng.choice(rows) for _ in range(N_LOOKUPS // 4))]
+        assert all(reg.factor(i) == baseline[i]["emissionFactor"] for i in ids[:10_000])
+
+        dict_rate = rate(lambda xs: [baseline[i]["emissionFactor"] for i in xs], ids)
+        factor = reg.factor
+        single_rate = rate(lambda xs: [factor(i) for i in xs], ids)
+        factor_for = reg.factor_for
+        key_rate = rate(lambda xs: [factor_for(*k) for k in xs], keys)
+        many_rate = rate(reg.factor_many, ids)
+        print(f"{scale:>6} {len(rows):>9} | {dict_bytes / 1e6:>9.2f} {reg_bytes / 1e6:>12.2f} | "
+              f"{dict_rate:>12,.0f} {single_rate:>12,.0f} {key_rate:>13,.0f} {many_rate:>14,.0f}")
+        del baseline, reg, rows
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+# =============================================================================
+#  Script: benchmarks/bench_factor_store.py
+#
+#  Description:
+#  Times multi-year DEFRA ingestion (factor_store.ingest) one year at a time
+#  and with one worker process per year, from a cold parse cache, then times
+#  factor(id, year) lookups against the resulting store.
+#
+#  Only the 2025 workbook ships with the repo, so earlier years are
+#  synthesised from it: the workbook is copied per year with its
+#  "GHG Conversion Factor 2025" header renamed in sharedStrings.xml. Parse
+#  cost per year is therefore realistic; the factors themselves are not.
+#
+#  Usage (from src/data):  python benchmarks/bench_factor_store.py [FIRST_YEAR]
+#
+#  Author: Finlay Shaw
+# =============================================================================
+
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+DATA_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(DATA_DIR))
+
+import pre_process_defra_2025 as pp  # noqa: E402
+from factor_store import discover_workbooks, ingest  # noqa: E402
+
+SOURCE_YEAR = 2025
+
+
+def synthesise_workbook(source, year, dest):
+    """Copy `source` as the `year` workbook, renaming the factor column header."""
+    old = pp.factor_column(SOURCE_YEAR).encode("utf-8")
+    new = pp.factor_column(year).encode("utf-8")
+    with zipfile.ZipFile(source) as zin, zipfile.ZipFile(dest, "w", zipfile.ZIP_DEFLATED) as zout:
+        for item in zin.infolist():
+            data = zin.read(item.filename)
+            if item.filename == "xl/sharedStrings.xml":
+                data = data.replace(old, new)
+            zout.writestr(item, data)
+
+
+def time_ingest(workbooks, workers, tmp):
+    cache_dir = Path(tempfile.mkdtemp(dir=tmp))  # cold cache: every year parses its XLSX
+    t0 = time.perf_counter()
+    store, stats = ingest(workbooks, workers=workers, cache_dir=cache_dir)
+    wall = time.perf_counter() - t0
+    warm0 = time.perf_counter()
+    ingest(workbooks, workers=workers, cache_dir=cache_dir)
+    return store, stats, wall, time.perf_counter() - warm0
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    first_year = int(argv[0]) if argv else 2019
+    source = DATA_DIR / pp.workbook_name(SOURCE_YEAR)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        shutil.copy(source, tmp / source.name)
+        for year in range(first_year, SOURCE_YEAR):
+            synthesise_workbook(source, year, tmp / pp.workbook_name(year))
+        workbooks = discover_workbooks(tmp)
+        n = len(workbooks)
+        print(f"{n} workbooks ({min(workbooks)}-{max(workbooks)}), {os.cpu_count()} CPU(s)")
+
+        _, stats, serial, serial_warm = time_ingest(workbooks, 1, tmp)
+        store, _, parallel, parallel_warm = time_ingest(workbooks, n, tmp)
+        busy = sum(s["seconds"] for s in stats.values())
+        print(f"  serial    : cold {serial:7.3f}s  warm {serial_warm:7.3f}s  (sum of years {busy:.3f}s)")
+        print(f"  {n} workers : cold {parallel:7.3f}s  warm {parallel_warm:7.3f}s  "
+              f"({serial / parallel:.2f}x cold, {serial_warm / parallel_warm:.2f}x warm)")
+
+    rng = random.Random(42)
+    queries = [(rng.choice(store.ids), rng.randint(first_year - 2, SOURCE_YEAR + 1)) for _ in range(200_000)]
+    t0 = time.perf_counter()
+    for activity_id, year in queries:
+        store.factor(activity_id, year)
+    single = time.perf_counter() - t0
+    ids, years = zip(*queries)
+    t0 = time.perf_counter()
+    store.factor_many(ids, years)
+    many = time.perf_counter() - t0
+    print(f"  store: {len(store)} ids x {len(store.years)} years")
+    print(f"  factor(id, year): {len(queries) / single:,.0f} lookups/s; "
+          f"factor_many: {len(queries) / many:,.0f} lookups/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# =============================================================================
+#  Script: benchmarks/bench_factor_uncertainty.py
+#
+#  Description:
+#  Throughput of factor_uncertainty.user_intervals: Monte Carlo intervals on
+#  every user's logged total in one pass (blocks of users as one matrix
+#  product against the activity x sample multipliers), against looping over
+#  users with the same multipliers. Synthetic populations log a log-normal
+#  number of distinct activities each, drawn from the generated catalogue,
+#  with the spreads in Activities/factorDistributions.json.
+#
+#  Usage (from src/data):  python benchmarks/bench_factor_uncertainty.py [USERS ...]
+#
+#  Author: Finlay Shaw
+# =============================================================================
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+DATA_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(DATA_DIR))
+
+from factor_registry import FactorRegistry  # noqa: E402
+from factor_uncertainty import LEVEL, SAMPLES, SEED, FactorUncertainty, user_intervals  # noqa: E402
+
+SIZES = [10_000, 100_000, 500_000]
+LOOP_SAMPLE = 2_000
+
+
+def synthetic_pairs(users, registry, seed=17):
+    """(user_id, activity_id, kg) per (user, activity), ~20 activities per user."""
+    rng = np.random.default_rng(seed)
+    ids = np.array(registry.ids, dtype=object)
+    per_user = np.clip(rng.lognormal(np.log(20), 0.6, users).astype(int), 1, len(ids))
+    user_ids = np.repeat(np.arange(1, users + 1), per_user)
+    activity_ids = ids[rng.integers(0, len(ids), len(user_ids))]
+    kg = rng.lognormal(1.5, 1.2, len(user_ids))
+    return user_ids, activity_ids, kg
+
+
+def loop_intervals(user_ids, activity_ids, kg, model, samples=SAMPLES, level=LEVEL, seed=SEED):
+    """Reference: one user at a time, with the multipliers user_intervals draws."""
+    import pandas as pd
+    codes, acts = pd.factorize(np.asarray(activity_ids, dtype=object))
+    multipliers = model.multipliers(acts, samples, np.random.default_rng(seed))
+    quantiles = [(1 - level) / 2, 0.5, (1 + level) / 2]
+    rows = []
+    for user in np.unique(user_ids):
+        mine = user_ids == user
+        sampled = kg[mine] @ multipliers[codes[mine]]
+        rows.append([user, kg[mine].sum(), sampled.mean(), *np.quantile(sampled, quantiles)])
+    return np.array(rows)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    sizes = [int(a) for a in argv] or SIZES
+    registry = FactorRegistry.from_modules(DATA_DIR / "Activities")
+    model = FactorUncertainty.load(DATA_DIR / "Activities")
+    cv = model.cv_of(registry.ids)
+    print(f"{len(registry)} activities, {int((cv != model.default_cv).sum())} with a recorded spread "
+          f"(median cv {np.median(cv[cv != model.default_cv]):.2f}); {SAMPLES:,} samples, {LEVEL:.0%} intervals")
+
+    user_ids, activity_ids, kg = synthetic_pairs(LOOP_SAMPLE, registry)
+    t = time.perf_counter()
+    looped = loop_intervals(user_ids, activity_ids, kg, model)
+    loop_rate = LOOP_SAMPLE / (time.perf_counter() - t)
+    frame, _ = user_intervals(user_ids, activity_ids, kg, model)
+    assert np.allclose(frame.to_numpy(), looped, rtol=1e-9, atol=1e-9)
+    print(f"  per-user loop: {loop_rate:12,.0f} users/s (same intervals)")
+
+    for users in sizes:
+        user_ids, activity_ids, kg = synthetic_pairs(users, registry)
+        t = time.perf_counter()
+        frame, population = user_intervals(user_ids, activity_ids, kg, model)
+        seconds = time.perf_counter() - t
+        width = ((frame["high_kg"] - frame["low_kg"]) / frame["total_kg"]).median()
+        low, high = np.quantile(population, [(1 - LEVEL) / 2, (1 + LEVEL) / 2])
+        print(f"  {users:>9,} users ({len(kg):,} pairs): {users / seconds:12,.0f} users/s  {seconds:6.2f}s "
+              f"({users / seconds / loop_rate:,.0f}x)  median width {width:.1%}; "
+              f"population {kg.sum():,.0f} kg in [{low:,.0f}, {high:,.0f}]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# =============================================================================
+#  Script: benchmarks/bench_food_classifier.py
+#
+#  Description:
+#  Classifies a synthetic retailer-style catalogue (product names built from
+#  Clark et al. entities plus filler words) with the original
+#  any(keyword in name) loop and with food_classifier.FoodClassifier, and
+#  reports names/second for each. Both must agree on every name.
+#
+#  Usage (from src/data):  python benchmarks/bench_food_classifier.py [N]
+#
+#  Author: Finlay Shaw
+# =============================================================================
+
+import random
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+DATA_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(DATA_DIR))
+
+from food_classifier import FoodClassifier, TYPE_KEYWORDS  # noqa: E402
+
+CLARK_CSV = DATA_DIR / "Environmental impacts of food (Clark et al. 2022).csv"
+FILLER = [
+    "organic", "British", "family pack", "value", "finest", "free range", "reduced sugar",
+    "400g", "1kg", "6 x 330ml", "multipack", "frozen", "chilled", "smoked", "ready meal",
+]
+
+
+def reference_classify(name):
+    """Pre-automaton rule: first list with any substring match wins."""
+    name_lower = str(name).strip().lower()
+    for t_type, keywords in TYPE_KEYWORDS:
+        if any(keyword in name_lower for keyword in keywords):
+            return t_type
+    return "other"
+
+
+def synthetic_catalogue(n, seed=7):
+    rng = random.Random(seed)
+    entities = [str(e).strip() for e in pd.read_csv(CLARK_CSV)["Entity"]]
+    names = []
+    for i in range(n):
+        parts = rng.sample(FILLER, rng.randint(0, 3)) + [rng.choice(entities)]
+        rng.shuffle(parts)
+        names.append(" ".join(parts) + f" #{i}")  # unique names defeat the cache
+    return names
+
+
+def main(n):
+    names = synthetic_catalogue(n)
+
+    t0 = time.perf_counter()
+    ref = [reference_classify(x) for x in names]
+    t_ref = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    clf = FoodClassifier(TYPE_KEYWORDS)
+    t_build = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    out = clf.classify_many(names)
+    t_ac = time.perf_counter() - t0
+
+    print(f"names: {n:,}  automaton states: {len(clf._delta):,}  build: {t_build * 1000:.1f} ms")
+    print(f"  substring loop : {t_ref:7.3f}s  {n / t_ref:>12,.0f} names/s")
+    print(f"  aho-corasick   : {t_ac:7.3f}s  {n / t_ac:>12,.0f} names/s  ({t_ref / t_ac:.1f}x)")
+    print(f"  identical      : {ref == out}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 300_000)
@@ -0,0 +1,113 @@
+# =============================================================================
+#  Script: benchmarks/bench_food_stream.py
+#
+#  Description:
+#  Throughput and peak RSS of the food catalogue processor, in memory
+#  (load_clark -> build_activities -> render_module) against the streaming
+#  path (iter_activity_chunks -> ModuleStreamWriter), on synthetic
+#  Clark-shaped CSVs with millions of distinct product names. Each run is a
+#  forked child so its peak RSS is its own; the manifest / search index
+#  updates both paths share are left out.
+#
+#  First checks that --stream reproduces Activities/foodActivities.js byte
+#  for byte from the Clark CSV.
+#
+#  Usage (from src/data):  python benchmarks/bench_food_stream.py [ROWS ...]
+#
+#  Author: Finlay Shaw
+# =============================================================================
+
+import multiprocessing as mp
+import os
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+DATA_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(DATA_DIR))
+
+from bench_food_classifier import synthetic_catalogue  # noqa: E402
+from js_modules import ModuleStreamWriter, render_module, write_if_changed  # noqa: E402
+from pipeline import food_script  # noqa: E402
+
+SIZES = [100_000, 1_000_000]
+CHUNK_ROWS = 50_000
+
+
+def synthetic_csv(rows, dest, seed=5):
+    """Clark rows resampled to `rows`, with unique retailer-style Entity names."""
+    clark = pd.read_csv(DATA_DIR / food_script().csv_path)
+    picks = np.random.default_rng(seed).integers(0, len(clark), size=rows)
+    df = clark.iloc[picks].reset_index(drop=True)
+    df["Entity"] = synthetic_catalogue(rows)
+    df.to_csv(dest, index=False)
+
+
+def in_memory(csv, out):
+    fp = food_script()
+    activities = fp.build_activities(fp.load_clark(csv))
+    write_if_changed(out, render_module("foodActivities", activities, comma_after_last=False))
+    return len(activities)
+
+
+def streaming(csv, out, chunk_rows=CHUNK_ROWS):
+    fp = food_script()
+    with ModuleStreamWriter(out, "foodActivities", comma_after_last=False) as writer:
+        for activities in fp.iter_activity_chunks(csv, chunk_rows):
+            writer.write(activities)
+    return writer.count
+
+
+def _child(fn, args, conn):
+    start_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    t = time.perf_counter()
+    count = fn(*args)
+    conn.send((time.perf_counter() - t, count, start_kb, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss))
+
+
+def run_forked(fn, *args):
+    """(seconds, count, peak RSS MB, growth over the forked baseline MB)."""
+    ctx = mp.get_context("fork")
+    parent, child = ctx.Pipe()
+    proc = ctx.Process(target=_child, args=(fn, args, child))
+    proc.start()
+    seconds, count, start_kb, peak_kb = parent.recv()
+    proc.join()
+    return seconds, count, peak_kb / 1024, (peak_kb - start_kb) / 1024
+
+
+def check_identical(tmp):
+    fp = food_script()
+    out = Path(tmp) / "foodActivities.js"
+    streaming(DATA_DIR / fp.csv_path, out, chunk_rows=50)  # several chunks even for 211 rows
+    expected = (DATA_DIR / fp.output_dir / "foodActivities.js").read_bytes()
+    assert out.read_bytes() == expected, "streamed module differs from Activities/foodActivities.js"
+    print("Clark CSV: streamed module identical to Activities/foodActivities.js")
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    sizes = [int(a) for a in argv] or SIZES
+    food_script()  # import once, before forking
+    with tempfile.TemporaryDirectory() as tmp:
+        check_identical(tmp)
+        for rows in sizes:
+            csv = Path(tmp) / f"food-{rows}.csv"
+            synthetic_csv(rows, csv)
+            print(f"{rows:,} rows ({os.path.getsize(csv) / 2**20:.0f} MB CSV), chunks of {CHUNK_ROWS:,}")
+            for name, fn in (("in memory", in_memory), ("streaming", streaming)):
+                out = Path(tmp) / f"{name.replace(' ', '_')}.js"
+                seconds, count, peak, growth = run_forked(fn, csv, out)
+                print(f"  {name:<10} {count / seconds:>10,.0f} rows/s  {seconds:7.2f}s  "
+                      f"peak RSS {peak:7.0f} MB (+{growth:.0f} MB)")
+            assert (Path(tmp) / "in_memory.js").read_bytes() == (Path(tmp) / "streaming.js").read_bytes()
+            print("  outputs identical")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+# =============================================================================
+#  Script: benchmarks/bench_grid_intensity.py
+#
+#  Description:
+#  Repricing throughput of grid_intensity.GridRepricer on millions of
+#  synthetic user_activities rows (ids drawn from the generated catalogue,
+#  occurred_at as the 'YYYY-MM-DD HH:MM:SS' text the database returns)
+#  against a memory-mapped two-year half-hourly profile with daily and
+#  seasonal swings, imported through import_profile() from a CSV in gCO2/kWh.
+#
+#  Checks first that a per-row Python loop gives the same emissions on a
+#  sample, and that a flat profile at DEFRA's electricity factor reproduces
+#  quantity * emission_factor.
+#
+#  Usage (from src/data):  python benchmarks/bench_grid_intensity.py [ROWS ...]
+#
+#  Author: Finlay Shaw
+# =============================================================================
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+DATA_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(DATA_DIR))
+
+import general_activities as ga  # noqa: E402
+from factor_registry import FactorRegistry  # noqa: E402
+from grid_intensity import STEP_SECONDS, GridProfile, GridRepricer, epoch_seconds, import_profile  # noqa: E402
+from household_scenarios import HouseholdModel  # noqa: E402
+
+SIZES = [1_000_000, 5_000_000]
+START, END = "2024-01-01", "2026-01-01"
+ELECTRIC_SHARE = 0.3  # share of synthetic rows with an electricity-based id
+LOOP_SAMPLE = 20_000
+
+
+def synthetic_profile_csv(dest, seed=11):
+    """Half-hourly gCO2/kWh: evening peak, winter high, noise, and a one-day gap."""
+    rng = np.random.default_rng(seed)
+    times = pd.date_range(START, END, freq=f"{STEP_SECONDS}s", inclusive="left", tz="UTC")
+    hour = times.hour + times.minute / 60
+    day = times.dayofyear.to_numpy()
+    g = 150 + 45 * np.cos(2 * np.pi * (hour - 18) / 24) + 40 * np.cos(2 * np.pi * day / 365)
+    g = np.clip(g + rng.normal(0, 15, len(times)), 20, None)
+    df = pd.DataFrame({"datetime": times.strftime("%Y-%m-%dT%H:%MZ"), "actual": g.round(1)})
+    df.drop(index=range(4800, 4848)).to_csv(dest, index=False)
+
+
+def synthetic_rows(n, registry, shares, seed=13):
+    """Columns as read from user_activities: activity_id, quantity, emission_factor, occurred_at."""
+    rng = np.random.default_rng(seed)
+    electric = np.array(list(shares), dtype=object)
+    other = np.array([f.id for f in registry if f.id not in shares], dtype=object)
+    is_electric = rng.random(n) < ELECTRIC_SHARE
+    ids = np.where(is_electric, electric[rng.integers(0, len(electric), n)], other[rng.integers(0, len(other), n)])
+    factors = np.asarray(registry.factor_many(ids))
+    quantities = rng.lognormal(1.0, 0.8, n).round(2)
+    # a few rows fall a week either side of the profile, to exercise the flat fallback
+    lo, hi = epoch_seconds([START, END]) + np.array([-7, 7]) * 86_400
+    occurred = rng.integers(lo, hi, n).astype("datetime64[s]").astype(str)
+    occurred = np.char.replace(occurred, "T", " ").astype(object)
+    return ids, quantities, factors, occurred
+
+
+def loop_reprice(repricer, ids, quantities, factors, occurred):
+    """Reference: one row at a time."""
+    profile, out = repricer.profile, []
+    for activity_id, q, ef, when in zip(ids, quantities, factors, occurred):
+        share = repricer.shares.get(activity_id, 0.0)
+        idx = (int(np.datetime64(when, "s").astype(np.int64)) - profile.start) // profile.step
+        value = float(profile.values[idx]) if 0 <= idx < len(profile) else float("nan")
+        ratio = 1.0 if value != value else value / repricer.flat
+        out.append(q * ef * (1.0 + share * (ratio - 1.0)))
+    return np.array(out)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    sizes = [int(a) for a in argv] or SIZES
+    registry = FactorRegistry.from_modules(DATA_DIR / "Activities")
+    model = HouseholdModel.load(DATA_DIR / "household-assumptions.csv")
+    base = ga.base_factors(ga.load_defra(DATA_DIR / ga.INPUT_CSV))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv = Path(tmp) / "intensity.csv"
+        synthetic_profile_csv(csv)
+        t = time.perf_counter()
+        import_profile(csv, Path(tmp) / "profile", value_column="actual", unit="g")
+        profile = GridProfile.load(Path(tmp) / "profile")
+        print(f"profile: {len(profile):,} half hours imported in {time.perf_counter() - t:.2f}s "
+              f"({type(profile.values).__name__}, mean {np.nanmean(profile.values):.4f} kg/kWh)")
+        repricer = GridRepricer.from_sources(profile, registry=registry, model=model, base=base)
+        print(f"{len(repricer.shares)} electricity-based activity ids, flat factor {repricer.flat:g} kg/kWh")
+
+        ids, quantities, factors, occurred = synthetic_rows(LOOP_SAMPLE, registry, repricer.shares)
+        t = time.perf_counter()
+        looped = loop_reprice(repricer, ids, quantities, factors, occurred)
+        loop_rate = LOOP_SAMPLE / (time.perf_counter() - t)
+        assert np.allclose(repricer.reprice(ids, quantities, factors, occurred), looped, rtol=1e-12, atol=0)
+        flat = GridRepricer(GridProfile(np.full(len(profile), repricer.flat, dtype=np.float32), profile.start),
+                            repricer.shares, repricer.flat)
+        assert np.allclose(flat.reprice(ids, quantities, factors, occurred), quantities * factors, rtol=1e-7, atol=0)
+        print(f"  per-row loop: {loop_rate:12,.0f} rows/s (same emissions; flat profile = quantity * factor)")
+
+        for n in sizes:
+            ids, quantities, factors, occurred = synthetic_rows(n, registry, repricer.shares)
+            t = time.perf_counter()
+            seconds = epoch_seconds(occurred)
+            parse_s = time.perf_counter() - t
+            t = time.perf_counter()
+            timed = repricer.reprice(ids, quantities, factors, occurred)
+            total_s = time.perf_counter() - t
+            flat_kg, timed_kg = float((quantities * factors).sum()), float(timed.sum())
+            outside = int(((seconds < profile.start) | (seconds >= profile.start + len(profile) * STEP_SECONDS)).sum())
+            print(f"  {n:>9,} rows: {n / total_s:12,.0f} rows/s  {total_s:6.2f}s "
+                  f"(time parsing {parse_s:.2f}s; {n / total_s / loop_rate:,.0f}x)  "
+                  f"{outside:,} outside profile; total {flat_kg:,.0f} -> {timed_kg:,.0f} kg")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# =============================================================================
+#  Script: benchmarks/bench_household_scenarios.py
+#
+#  Description:
+#  Scenario-sweep throughput of household_scenarios.HouseholdModel: S sets
+#  of base factors (electricity / gas / water, e.g. regional grids) with
+#  per-scenario appliance usage multipliers, evaluated in one scenarios()
+#  call, against rebuilding the activity list once per scenario as
+#  general_activities.build_activities does. Results are checked to agree.
+#
+#  Usage (from src/data):  python benchmarks/bench_household_scenarios.py [S ...]
+#
+#  Author: Finlay Shaw
+# =============================================================================
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+DATA_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(DATA_DIR))
+
+import general_activities as ga  # noqa: E402
+from household_scenarios import HouseholdModel  # noqa: E402
+
+SIZES = [10_000, 100_000, 1_000_000]
+LOOP_SAMPLE = 5_000  # scenarios timed through the per-scenario path
+
+
+def sweep(n, defaults, seed=3):
+    """n scenarios: base factors within +-50% of DEFRA's, usage within +-20%."""
+    rng = np.random.default_rng(seed)
+    base = np.asarray(defaults) * rng.uniform(0.5, 1.5, size=(n, 3))
+    return base, rng.uniform(0.8, 1.2, size=(n, 1))
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    sizes = [int(a) for a in argv] or SIZES
+    model = HouseholdModel.load(DATA_DIR / "household-assumptions.csv")
+    defaults = ga.base_factors(ga.load_defra(DATA_DIR / ga.INPUT_CSV))
+    print(f"{len(model)} activities; DEFRA base factors {tuple(round(float(f), 6) for f in defaults)}")
+
+    base, scale = sweep(LOOP_SAMPLE, defaults)
+    t = time.perf_counter()
+    looped = np.array([[a["emissionFactor"] for a in ga.build_activities(*row, model=model)] for row in base]) * scale
+    loop_rate = LOOP_SAMPLE / (time.perf_counter() - t)
+    assert np.array_equal(model.scenarios(base, scale), looped)
+    print(f"  per-scenario build_activities: {loop_rate:12,.0f} scenarios/s")
+
+    for n in sizes:
+        base, scale = sweep(n, defaults)
+        t = time.perf_counter()
+        out = model.scenarios(base, scale)
+        seconds = time.perf_counter() - t
+        print(f"  {n:>9,} scenarios in one call: {n / seconds:12,.0f} scenarios/s  "
+              f"({out.size / seconds / 1e6:,.0f}M factors/s, {seconds * 1e3:7.1f} ms, "
+              f"{n / seconds / loop_rate:,.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
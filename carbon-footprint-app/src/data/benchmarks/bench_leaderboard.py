@@ -0,0 +1,184 @@
+# =============================================================================
+#  Script: benchmarks/bench_leaderboard.py
+#
+#  Description:
+#  Latency of leaderboard.LeaderboardEngine at several user counts (default
+#  10k, 100k, 1M): bulk load from per-(user, day) totals, friends and global
+#  top-50 queries (p50 / p95), and incremental apply() throughput followed
+#  by the first global query (which patches the cached order).
+#  Synthetic data: ~20 friends and a few blocks per user, 60% public
+#  profiles, activity on about half of the last 60 days.
+#
+#  Baseline: on a SQLite stand-in with BASELINE_USERS users, the query
+#  leaderboard.php runs today (translated to SQLite) against the engine
+#  built from the same data through the rollup; every answer is checked
+#  to rank the same users
+#  in the same order with the same totals.
+#
+#  Usage (from src/data):  python benchmarks/bench_leaderboard.py [USERS ...]
+#
+#  Author: Finlay Shaw
+# =============================================================================
+
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+
+DATA_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(DATA_DIR))
+
+import activity_rollups as ar  # noqa: E402
+from db import USER_ACTIVITY_COLUMNS, connect_sqlite  # noqa: E402
+from index_advisor import leaderboard_sql  # noqa: E402
+from leaderboard import PERIODS, LeaderboardEngine, min_active_days  # noqa: E402
+
+TODAY = date(2025, 2, 27)
+SIZES = [10_000, 100_000, 1_000_000]
+DEGREE = 20
+HISTORY_DAYS = 60
+BASELINE_USERS = 2_000
+QUERIES = 200
+
+
+def synthetic(n, seed=42):
+    rng = np.random.default_rng(seed)
+    ids = np.arange(1, n + 1)
+    names = [f"user{i:07d}" for i in ids]
+    public = rng.random(n) < 0.6
+    friends = rng.integers(1, n + 1, size=(n * DEGREE // 2, 2))
+    friends = np.unique(np.sort(friends[friends[:, 0] != friends[:, 1]], axis=1), axis=0)
+    blocks = rng.integers(1, n + 1, size=(n // 50, 2))
+    blocks = np.unique(blocks[blocks[:, 0] != blocks[:, 1]], axis=0)
+    active = rng.random((n, HISTORY_DAYS)) < 0.5
+    user_idx, day_idx = np.nonzero(active)
+    days = np.datetime64(TODAY, "D") - HISTORY_DAYS + 1 + day_idx
+    kg = np.round(rng.gamma(2.0, 4.0, size=len(user_idx)), 3)
+    return ids, names, public, friends, blocks, (ids[user_idx], days, kg, np.ones(len(kg), dtype=np.int64))
+
+
+def percentiles(ms):
+    return statistics.median(ms), statistics.quantiles(ms, n=20)[-1]
+
+
+def timed_queries(engine, scope, period, rng):
+    ms = []
+    for me in rng.integers(1, len(engine) + 1, size=QUERIES).tolist():
+        t = time.perf_counter()
+        engine.top(me, period, scope)
+        ms.append((time.perf_counter() - t) * 1e3)
+    return ms
+
+
+def day_changes(engine, count, rng):
+    """Random edits in the current week, as activity_rollups.refresh reports them."""
+    start = engine.windows["week"].start
+    users = rng.integers(1, len(engine) + 1, size=count).tolist()
+    offsets = rng.integers(0, 7, size=count).tolist()
+    before = rng.random(count).tolist()
+    out = []
+    for u, o, b in zip(users, offsets, before):
+        had = b < 0.5
+        out.append(ar.DayChange(u, str(start + o), None, 5.0 if had else 0.0, int(had), 6.5, 1 + int(had)))
+    return out
+
+
+def bench_engine(n):
+    ids, names, public, friends, blocks, day_rows = synthetic(n)
+    t = time.perf_counter()
+    engine = LeaderboardEngine(ids, names, public, friends, blocks, TODAY)
+    graph_s = time.perf_counter() - t
+    t = time.perf_counter()
+    engine.load_days(*day_rows)
+    load_s = time.perf_counter() - t
+    print(f"{n:,} users, {len(friends):,} friendships, {len(blocks):,} blocks, {len(day_rows[0]):,} user-days")
+    print(f"  build: graph + names {graph_s:.2f}s, period totals {load_s:.2f}s")
+
+    rng = np.random.default_rng(7)
+    for period in PERIODS:
+        t = time.perf_counter()
+        engine.top(1, period, "global")
+        first_ms = (time.perf_counter() - t) * 1e3
+        for scope in ("friends", "global"):
+            p50, p95 = percentiles(timed_queries(engine, scope, period, rng))
+            print(f"  {period:<5} {scope:<7} p50 {p50:7.3f} ms  p95 {p95:7.3f} ms"
+                  + (f"  (first query sorts: {first_ms:.1f} ms)" if scope == "global" else ""))
+
+    changes = day_changes(engine, 50_000, rng)
+    t = time.perf_counter()
+    engine.apply(changes)
+    apply_s = time.perf_counter() - t
+    print(f"  apply: {len(changes) / apply_s:,.0f} day changes/s")
+    engine.top(1, "week", "global")  # settle the cached order after the burst
+    for batch in (10, 1_000):
+        engine.apply(day_changes(engine, batch, rng))
+        t = time.perf_counter()
+        engine.top(1, "week", "global")
+        print(f"  week global after {batch} changes: {(time.perf_counter() - t) * 1e3:.2f} ms (patched order)")
+
+
+# =========================
+# SQLite baseline: the leaderboard.php query
+# =========================
+def php_query(db, engine, me, period, scope, limit=50):
+    w = engine.windows[period]
+    params = {"me": me, "wd": w.days, "start": f"{w.start} 00:00:00", "end": f"{w.end} 00:00:00",
+              "pstart": f"{w.prev_start} 00:00:00", "pend": f"{w.start} 00:00:00",
+              "min_active": min_active_days(w.days), "lim": limit}
+    rows = db.query(leaderboard_sql(scope), params)
+    return [(uid, round(kg, 3), round(pkg, 3), days) for uid, _, kg, pkg, days in rows]
+
+
+def bench_baseline(n):
+    ids, names, public, friends, blocks, (users, days, kg, _) = synthetic(n, seed=3)
+    with tempfile.TemporaryDirectory() as tmp:
+        db = connect_sqlite(Path(tmp) / "bench.db")
+        db.insert_rows("users", ("id", "name", "email", "privacy_public", "password"),
+                       [(int(i), nm, f"{nm}@example.com", int(p), "x") for i, nm, p in zip(ids, names, public)])
+        db.insert_rows("friendships", ("user_id_low", "user_id_high"), friends.tolist())
+        db.insert_rows("blocks", ("blocker_id", "blocked_id"), blocks.tolist())
+        # One activity per user-day (emission factor 1, so emissions = quantity)
+        db.insert_rows("user_activities", USER_ACTIVITY_COLUMNS, [
+            (int(u), "bench", "bench", "food", "general", "kg", 1.0, float(k), f"{d} 12:00:00", "{}")
+            for u, d, k in zip(users.tolist(), days.astype(str).tolist(), kg.tolist())])
+        db.commit()
+        ar.rebuild(db)
+        t = time.perf_counter()
+        engine = LeaderboardEngine.from_database(db, TODAY)
+        print(f"SQLite baseline, {n:,} users ({len(users):,} activities): engine loaded in "
+              f"{time.perf_counter() - t:.2f}s")
+
+        rng = np.random.default_rng(11)
+        for period in PERIODS:
+            for scope in ("friends", "global"):
+                php_ms, engine_ms = [], []
+                for me in rng.integers(1, n + 1, size=20).tolist():
+                    t = time.perf_counter()
+                    expected = php_query(db, engine, me, period, scope)
+                    php_ms.append((time.perf_counter() - t) * 1e3)
+                    t = time.perf_counter()
+                    got = engine.top(me, period, scope)["rows"]
+                    engine_ms.append((time.perf_counter() - t) * 1e3)
+                    # Rounded to 3 dp by both, but summed in a different order: allow the last digit
+                    assert [r["id"] for r in got] == [e[0] for e in expected], (period, scope, me)
+                    assert all(abs(r["total_kg"] - e[1]) <= 1.5e-3 and abs(r["prev_total_kg"] - e[2]) <= 1.5e-3
+                               and r["active_days"] == e[3] for r, e in zip(got, expected)), (period, scope, me)
+                print(f"  {period:<5} {scope:<7} leaderboard.php SQL p50 {statistics.median(php_ms):8.2f} ms   "
+                      f"engine p50 {statistics.median(engine_ms):6.3f} ms   (same rankings)")
+        db.close()
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    sizes = [int(a) for a in argv] or SIZES
+    bench_baseline(BASELINE_USERS)
+    for n in sizes:
+        bench_engine(n)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+# =============================================================================
+#  Script: benchmarks/bench_naming_engine.py
+#
+#  Description:
+#  Names a large synthetic (Category, Label, Unit) set with the original
+#  friendly_name / format_js logic (full RULES scan, uncompiled re.search,
+#  repeated slugify) and with naming_engine.NamingEngine, and checks that
+#  every title and id comes out the same.
+#
+#  Usage (from src/data):  python benchmarks/bench_naming_engine.py [N]
+#
+#  Author: Finlay Shaw
+# =============================================================================
+
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+DATA_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(DATA_DIR))
+
+import generate_js_from_defra as gen  # noqa: E402
+from naming_engine import NamingEngine, a_or_an, normalise_text, title_tidy  # noqa: E402
+
+
+# =========================
+# Reference (pre-engine) implementation
+# =========================
+def ref_slugify(text):
+    return re.sub(r'[^a-z0-9_]', '', re.sub(r'\s+', '_', str(text).strip().lower()))
+
+def ref_category_slug(category):
+    c = str(category).strip().lower()
+    if c in gen.CATEGORY_SLUG_OVERRIDES:
+        return gen.CATEGORY_SLUG_OVERRIDES[c]
+    return ref_slugify(category)
+
+def ref_friendly_name(row):
+    category = normalise_text(row["Category"])
+    label = normalise_text(row["Label"])
+    unit = normalise_text(row["Unit"])
+    label_clean = "" if label in {"unspecified", "unknown", "nan"} else label
+    if "passenger vehicle" in category:
+        for key, nice in gen.VEHICLE_TERMS.items():
+            if key in label:
+                return title_tidy(f"Drive {a_or_an(nice)} {nice}")
+        return title_tidy(f"Drive {a_or_an(label_clean)} {label_clean} car") if label_clean else "Drive a car"
+    if category == "uk electricity for evs":
+        if "tonne" in unit:
+            for cat_pat, lbl_pat, template in gen.RULES:
+                if re.search(cat_pat, category) and (lbl_pat is None or re.search(lbl_pat, label)):
+                    if callable(template):
+                        return title_tidy(template(row))
+                    return title_tidy(template)
+            return "Electric freight"
+        if re.search(r"battery electric", label):
+            return "Drive an electric car"
+        if re.search(r"plug-?in hybrid", label):
+            return "Drive a plug-in hybrid"
+        return "Drive an EV"
+    for cat_pat, lbl_pat, template in gen.RULES:
+        if not re.search(cat_pat, category):
+            continue
+        if lbl_pat is not None and not re.search(lbl_pat, label):
+            continue
+        if callable(template):
+            return title_tidy(template(row))
+        return title_tidy(template.replace(" – per {unit}", "").format(unit=unit, label=label_clean))
+    return title_tidy(label_clean) if label_clean else "Other activity"
+
+def ref_id(row):
+    cat_slug = ref_category_slug(row["Category"])
+    unit_slug = ref_slugify(row["Unit"])
+    label = str(row["Label"]).lower()
+    if cat_slug == "uk_electricity_for_evs":
+        if "battery electric" in label:
+            id_str = "electric_freight_bev" if "tonne" in unit_slug else "electric_car"
+        elif "plugin hybrid" in label or "plug-in hybrid" in label:
+            id_str = "plugin_hybrid_freight" if "tonne" in unit_slug else "plugin_hybrid_car"
+        else:
+            id_str = f"{ref_slugify(label)}_{unit_slug}"
+        return f"{cat_slug}_{id_str}"
+    return f"{cat_slug}_{ref_slugify(row['Label'])}_{unit_slug}"
+
+
+# =========================
+# Synthetic label set
+# =========================
+CATEGORIES = [
+    "Passenger vehicles", "Delivery vehicles", "UK electricity for EVs", "Business travel- air",
+    "Business travel- sea", "Homeworking", "Hotel stay", "UK electricity", "Water supply",
+    "Waste disposal", "Managed assets- vehicles", "Food and drink",
+]
+WORDS = [
+    "battery electric", "plug-in hybrid", "plugin hybrid", "diesel", "petrol", "hybrid", "cng", "lpg",
+    "with rf", "without rf", "economy", "landfill", "closed-loop", "open-loop", "compost",
+    "combustion", "anaerobic digestion", "heating", "electricity", "small car", "large van",
+    "foot passenger", "car passenger", "unspecified", "unknown", "average",
+]
+UNITS = ["km", "miles", "tonne.km", "kWh", "litres", "kilograms", "FTE working hour", "room per night"]
+
+
+def synthetic_keys(n, distinct, seed=42):
+    rng = random.Random(seed)
+    pool = []
+    for i in range(distinct):
+        label = " ".join(rng.sample(WORDS, rng.randint(1, 3)))
+        if i % 3:
+            label += f" {i}"
+        pool.append((rng.choice(CATEGORIES), label, rng.choice(UNITS)))
+    return [pool[rng.randrange(distinct)] for _ in range(n)]
+
+
+# =========================
+# Runner
+# =========================
+def main(n):
+    real = gen.build_activity_frame(gen.load_defra(DATA_DIR / gen.INPUT_CSV))
+    real_keys = list(zip(real["Category"], real["Label"], real["Unit"]))
+
+    for label, keys in [
+        ("real catalogue", real_keys),
+        (f"synthetic {n:,} (2k distinct)", synthetic_keys(n, 2_000)),
+        (f"synthetic {n:,} (all distinct)", synthetic_keys(n, n)),
+    ]:
+        rows = [{"Category": c, "Label": l, "Unit": u} for c, l, u in keys]
+        t0 = time.perf_counter()
+        ref = [(ref_id(r), ref_friendly_name(r)) for r in rows]
+        t_ref = time.perf_counter() - t0
+
+        engine = NamingEngine(gen.RULES, gen.VEHICLE_TERMS, gen.CATEGORY_SLUG_OVERRIDES)
+        t0 = time.perf_counter()
+        out = engine.name_many(keys)
+        t_eng = time.perf_counter() - t0
+
+        same = ref == out
+        print(f"{label:<32} rows={len(keys):>8,}  reference={t_ref:7.3f}s  engine={t_eng:7.3f}s  "
+              f"speedup={t_ref / t_eng:6.1f}x  same={same}")
+        if not same:
+            bad = next(i for i, (a, b) in enumerate(zip(ref, out)) if a != b)
+            print("  first mismatch:", keys[bad], ref[bad], out[bad])
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
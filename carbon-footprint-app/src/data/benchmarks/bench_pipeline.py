@@ -0,0 +1,267 @@
+# =============================================================================
+#  Script: benchmarks/bench_pipeline.py
+#
+#  Description:
+#  Per-stage benchmark of the data build on synthetic 1x / 10x / 100x inputs:
+#    - xlsx_ingest        pre_process_defra_2025: cold-cache workbook parse
+#                         + process_defra
+#    - defra_clean_group  generate_js_from_defra: load_defra (CSV + clean),
+#                         build_activity_frame
+#    - js_emission        generate_js_from_defra.write_modules into an empty
+#                         output folder (every module rendered and written)
+#    - general_activities general_activities: load_defra + generate
+#    - food               Foodprocess (Clark et al. 2022): load, classify,
+#                         write_module
+#  Wall time is the best of --repeat runs; peak memory is measured with
+#  tracemalloc in one extra run (tracing slows pandas down, so the two are
+#  kept apart). Generated modules go to a temporary folder; Activities/ and
+#  the build state are not touched.
+#
+#  Synthetic inputs:
+#    - workbook: the "Factors by Category" data rows are repeated in the
+#      sheet XML (rows renumbered), so the parse sees the real column layout
+#    - pre-processed-defra.csv / Clark CSV: stacked copies whose text gets a
+#      " v<k>" suffix (and factors a small nudge) so they stay distinct rows
+#
+#  Baseline: results are compared with benchmarks/pipeline_baseline.json
+#  (written with --save-baseline); a stage is flagged when its time grows
+#  by more than --time-tolerance or its peak memory by more than
+#  --memory-tolerance. The exit status is 1 if anything regressed.
+#
+#  Usage (from src/data):
+#    python benchmarks/bench_pipeline.py [--scales 1 10 100] [--stages ...]
+#    python benchmarks/bench_pipeline.py --save-baseline
+#
+#  Author: Finlay Shaw
+# =============================================================================
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import re
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+import zipfile
+from pathlib import Path
+
+import pandas as pd
+
+DATA_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(DATA_DIR))
+
+import general_activities as ga  # noqa: E402
+import generate_js_from_defra as gen  # noqa: E402
+import pre_process_defra_2025 as pp  # noqa: E402
+from pipeline import food_script  # noqa: E402
+from search_index import ALL_ACTIVITIES  # noqa: E402
+
+SCALES = [1, 10, 100]
+BASELINE_PATH = Path(__file__).resolve().parent / "pipeline_baseline.json"
+SHEET_XML = "xl/worksheets/sheet2.xml"  # "Factors by Category"
+HEADER_ROW = 6  # load_workbook_frame skips the 5 preamble rows
+
+
+# =========================
+# Synthetic inputs
+# =========================
+def scaled_workbook(source, factor, dest):
+    """Copy the workbook with the factor sheet's data rows repeated `factor` times."""
+    with zipfile.ZipFile(source) as zin:
+        xml = zin.read(SHEET_XML).decode("utf-8")
+        start = xml.index("<sheetData>") + len("<sheetData>")
+        end = xml.index("</sheetData>")
+        rows = re.findall(r"<row .*?</row>", xml[start:end], flags=re.S)
+        head = [r for r in rows if int(re.search(r'r="(\d+)"', r).group(1)) <= HEADER_ROW]
+        data = rows[len(head):]
+        last = int(re.search(r'r="(\d+)"', data[-1]).group(1))
+        span = last - HEADER_ROW
+        cell_ref = re.compile(r'(<(?:row|c) r=")([A-Z]*)(\d+)"')
+
+        prefix = re.sub(r'<dimension ref="([A-Z]+)1:([A-Z]+)\d+"/>',
+                        lambda m: f'<dimension ref="{m.group(1)}1:{m.group(2)}{HEADER_ROW + span * factor}"/>',
+                        xml[:start])
+        with zipfile.ZipFile(dest, "w", zipfile.ZIP_DEFLATED) as zout:
+            for item in zin.infolist():
+                if item.filename != SHEET_XML:
+                    zout.writestr(item, zin.read(item.filename))
+                    continue
+                with zout.open(SHEET_XML, "w", force_zip64=True) as out:
+                    out.write((prefix + "".join(head)).encode("utf-8"))
+                    block = "".join(data)
+                    for k in range(factor):
+                        shift = span * k
+                        out.write(cell_ref.sub(lambda m: f'{m.group(1)}{m.group(2)}{int(m.group(3)) + shift}"',
+                                               block).encode("utf-8"))
+                    out.write(xml[end:].encode("utf-8"))
+
+
+def scaled_copies(df: pd.DataFrame, factor: int, text_columns, number_column) -> pd.DataFrame:
+    """Stack `factor` copies; later copies get a " v<k>" text suffix and a nudged number."""
+    copies = [df]
+    for k in range(1, factor):
+        c = df.copy()
+        for col in text_columns:
+            text = c[col].astype(object)  # may be categorical (defra_frames.read_defra)
+            c[col] = text.where(text.isna(), text.astype(str) + f" v{k}")
+        c[number_column] = c[number_column] * (1 + k / 1000)
+        copies.append(c)
+    return pd.concat(copies, ignore_index=True)
+
+
+def build_inputs(factor, tmp):
+    """Write the scaled workbook and CSVs into `tmp`; returns their paths and row counts."""
+    fp = food_script()
+    workbook = tmp / f"defra-x{factor}.xlsx"
+    scaled_workbook(DATA_DIR / pp.excel_path, factor, workbook)
+
+    defra = scaled_copies(gen.load_defra(DATA_DIR / gen.INPUT_CSV), factor, ["Description", "Activity"],
+                          "EmissionFactor")
+    defra_csv = tmp / f"defra-x{factor}.csv"
+    defra.to_csv(defra_csv, index=False)
+
+    clark_raw = pd.read_csv(DATA_DIR / fp.csv_path)
+    entity = next(c for c in clark_raw.columns if c.strip().lower() == "entity")
+    ghg = next(c for c in clark_raw.columns if c.strip().lower() == "ghg_kg")
+    clark = scaled_copies(clark_raw, factor, [entity], ghg)
+    clark_csv = tmp / f"clark-x{factor}.csv"
+    clark.to_csv(clark_csv, index=False)
+    return {"workbook": workbook, "defra_csv": defra_csv, "clark_csv": clark_csv,
+            "defra_rows": len(defra), "clark_rows": len(clark)}
+
+
+# =========================
+# Stages
+# =========================
+def run_xlsx_ingest(inputs, out_dir):
+    df = pp.load_workbook_frame(inputs["workbook"], cache_dir=out_dir / "cache", verbose=False)
+    return len(pp.process_defra(df))
+
+
+def run_defra_clean_group(inputs, out_dir):
+    return len(gen.build_activity_frame(gen.load_defra(inputs["defra_csv"])))
+
+
+def run_js_emission(inputs, out_dir):
+    report = gen.write_modules(inputs["grouped"], out_dir, state_path=out_dir / "state.json")
+    return len(report["rebuilt"])
+
+
+def run_general_activities(inputs, out_dir):
+    return len(ga.generate(ga.load_defra(inputs["defra_csv"]), out_dir))
+
+
+def run_food(inputs, out_dir):
+    fp = food_script()
+    activities = fp.build_activities(fp.load_clark(inputs["clark_csv"]))
+    fp.write_module(activities, out_dir)
+    return len(activities)
+
+
+STAGES = {
+    "xlsx_ingest": run_xlsx_ingest,
+    "defra_clean_group": run_defra_clean_group,
+    "js_emission": run_js_emission,
+    "general_activities": run_general_activities,
+    "food": run_food,
+}
+
+
+# =========================
+# Measurement
+# =========================
+def run_once(fn, inputs, tmp, trace=False):
+    """One run in a fresh output folder with stdout silenced: (seconds, peak bytes or None, result)."""
+    out_dir = Path(tempfile.mkdtemp(dir=tmp))
+    # The search index follows the hand-written module list, as in Activities/
+    shutil.copy(DATA_DIR / gen.OUTPUT_DIR / ALL_ACTIVITIES, out_dir)
+    gc.collect()
+    if trace:
+        tracemalloc.start()
+    t = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = fn(inputs, out_dir)
+    seconds = time.perf_counter() - t
+    peak = None
+    if trace:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return seconds, peak, result
+
+
+def measure(stage, inputs, tmp, repeat):
+    fn = STAGES[stage]
+    seconds = min(run_once(fn, inputs, tmp)[0] for _ in range(repeat))
+    _, peak, result = run_once(fn, inputs, tmp, trace=True)
+    return {"seconds": round(seconds, 4), "peak_mb": round(peak / 2**20, 2), "output": result}
+
+
+# =========================
+# Baseline
+# =========================
+def load_baseline(path):
+    return json.loads(Path(path).read_text(encoding="utf-8")) if Path(path).exists() else {}
+
+
+def save_baseline(results, path):
+    data = {k: {"seconds": v["seconds"], "peak_mb": v["peak_mb"]} for k, v in results.items()}
+    Path(path).write_text(json.dumps(data, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def compare(result, base, time_tol, mem_tol):
+    """Ratios against the baseline entry and whether either exceeds its tolerance."""
+    if not base:
+        return "", False
+    t_ratio = result["seconds"] / base["seconds"] if base["seconds"] else float("inf")
+    m_ratio = result["peak_mb"] / base["peak_mb"] if base["peak_mb"] else float("inf")
+    regressed = t_ratio > 1 + time_tol or m_ratio > 1 + mem_tol
+    return f"  time x{t_ratio:5.2f}  mem x{m_ratio:5.2f}" + ("  REGRESSION" if regressed else ""), regressed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the data build stages on scaled synthetic inputs.")
+    parser.add_argument("--scales", type=int, nargs="+", default=SCALES)
+    parser.add_argument("--stages", nargs="+", choices=list(STAGES), default=list(STAGES))
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per stage (best is kept)")
+    parser.add_argument("--baseline", default=str(BASELINE_PATH))
+    parser.add_argument("--save-baseline", action="store_true", help="overwrite the baseline with this run")
+    parser.add_argument("--time-tolerance", type=float, default=0.25)
+    parser.add_argument("--memory-tolerance", type=float, default=0.10)
+    args = parser.parse_args(argv)
+
+    baseline = load_baseline(args.baseline)
+    results, regressions = {}, []
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        for factor in args.scales:
+            t = time.perf_counter()
+            inputs = build_inputs(factor, tmp)
+            inputs["grouped"] = gen.build_activity_frame(gen.load_defra(inputs["defra_csv"]))
+            print(f"x{factor}: {inputs['defra_rows']:,} DEFRA rows, {inputs['clark_rows']:,} Clark rows "
+                  f"(inputs built in {time.perf_counter() - t:.1f}s)")
+            for stage in args.stages:
+                key = f"{stage}@x{factor}"
+                results[key] = r = measure(stage, inputs, tmp, args.repeat)
+                note, regressed = compare(r, baseline.get(key), args.time_tolerance, args.memory_tolerance)
+                if regressed:
+                    regressions.append(key)
+                print(f"  {stage:<19} {r['seconds']:9.3f}s  peak {r['peak_mb']:9.1f} MB  "
+                      f"({r['output']:,} out){note}")
+
+    if args.save_baseline:
+        save_baseline({**baseline, **results}, args.baseline)
+        print(f"Baseline written: {args.baseline}")
+    elif not baseline:
+        print(f"No baseline at {args.baseline} (run with --save-baseline)")
+    if regressions:
+        print(f"Regressions: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
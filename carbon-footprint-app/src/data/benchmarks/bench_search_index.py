@@ -0,0 +1,162 @@
+# =============================================================================
+#  Script: benchmarks/bench_search_index.py
+#
+#  Description:
+#  Query latency of the prebuilt activity search index against the picker's
+#  linear `name.toLowerCase().includes(q)` scan, on the real catalogue and on
+#  larger synthetic catalogues (the real names repeated with variant
+#  suffixes). Queries are substrings of real names (1-12 characters) plus a
+#  few misses; both methods must return the same positions for every query.
+#
+#  Timings are taken in Python and, when node is installed, in node running
+#  the generated activitySearch.js runtime.
+#
+#  Usage (from src/data):  python benchmarks/bench_search_index.py [SCALES...]
+#
+#  Author: Finlay Shaw
+# =============================================================================
+
+import json
+import random
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+DATA_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(DATA_DIR))
+
+from search_index import INDEX_RUNTIME_JS, build_index, decode_postings, load_documents, search  # noqa: E402
+
+ACTIVITIES_DIR = DATA_DIR / "Activities"
+VARIANTS = ["", " (organic)", " - large", " (frozen)", " - per trip", " (imported)", " - small", " (UK)"]
+MISSES = ["zzz", "qx", "electric banana", "xylophone"]
+
+
+def scaled_documents(docs, scale):
+    """docs repeated `scale` times with distinct ids and suffixed names."""
+    out = []
+    for k in range(scale):
+        suffix = VARIANTS[k % len(VARIANTS)] + (f" {k}" if k >= len(VARIANTS) else "")
+        out.extend((f"{doc_id}_{k}", name + suffix) for doc_id, name in docs)
+    return out
+
+
+def make_queries(docs, n=300, seed=42):
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(n):
+        name = rng.choice(docs)[1].lower()
+        length = rng.choice([1, 2, 3, 4, 5, 6, 8, 12])
+        start = rng.randrange(max(1, len(name) - length + 1))
+        queries.append(name[start:start + length])
+    return queries + MISSES
+
+
+def linear(names_lower, q):
+    return [i for i, name in enumerate(names_lower) if q in name]
+
+
+def time_per_query(fn, queries, reps):
+    t0 = time.perf_counter()
+    for _ in range(reps):
+        for q in queries:
+            fn(q)
+    return (time.perf_counter() - t0) / (reps * len(queries)) * 1e6
+
+
+NODE_BENCH = r"""
+const fs = require("fs");
+const [runtimeFile, indexFile, namesFile, queriesFile, reps] = process.argv.slice(1);
+const index = JSON.parse(fs.readFileSync(indexFile, "utf8"));
+const src = fs.readFileSync(runtimeFile, "utf8")
+  .replace(/^import .*$/m, "")
+  .replace(/export function/g, "function")
+  .replace("export default index;", "return { searchPositions };");
+const { searchPositions } = new Function("index", src)(index);
+const names = JSON.parse(fs.readFileSync(namesFile, "utf8"));
+const activities = names.map((activity) => ({ activity }));
+const queries = JSON.parse(fs.readFileSync(queriesFile, "utf8"));
+
+const viaIndex = (q) => {
+  const out = [];
+  for (const i of searchPositions(q))
+    if (q.length <= index.gram || activities[i].activity.toLowerCase().includes(q)) out.push(i);
+  return out;
+};
+const viaScan = (q) => {
+  const out = [];
+  activities.forEach((a, i) => { if (a.activity.toLowerCase().includes(q)) out.push(i); });
+  return out;
+};
+for (const q of queries)
+  if (JSON.stringify(viaIndex(q)) !== JSON.stringify(viaScan(q))) throw new Error("mismatch for " + q);
+
+const time = (fn) => {
+  const t = process.hrtime.bigint();
+  for (let r = 0; r < +reps; r++) for (const q of queries) fn(q);
+  return Number(process.hrtime.bigint() - t) / 1e3 / (+reps * queries.length);
+};
+time(viaIndex); time(viaScan);  // warm up JIT and the decoded postings cache
+console.log(JSON.stringify({ scan: time(viaScan), index: time(viaIndex) }));
+"""
+
+
+def node_timings(index, names_lower, queries, tmp_dir, reps):
+    node = shutil.which("node")
+    if node is None:
+        return None
+    files = {
+        "runtime": INDEX_RUNTIME_JS,
+        "index": json.dumps(index),
+        "names": json.dumps(names_lower),
+        "queries": json.dumps(queries),
+    }
+    paths = []
+    for key, text in files.items():
+        path = tmp_dir / f"bench_search_{key}.json"
+        path.write_text(text, encoding="utf-8")
+        paths.append(str(path))
+    try:
+        res = subprocess.run([node, "-e", NODE_BENCH, *paths, str(reps)], capture_output=True, text=True, check=True)
+    finally:
+        for p in paths:
+            Path(p).unlink()
+    return json.loads(res.stdout)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    scales = [int(a) for a in argv] or [1, 10, 100]
+    base = load_documents(ACTIVITIES_DIR)
+    queries = make_queries(base)
+    tmp_dir = Path(__file__).resolve().parent
+
+    print(f"{len(queries)} queries, catalogue of {len(base)} activities")
+    print(f"{'scale':>6} {'docs':>8} {'index KB':>9} | {'py scan us':>11} {'py index us':>12} {'x':>6} | "
+          f"{'js scan us':>11} {'js index us':>12} {'x':>6}")
+    for scale in scales:
+        docs = scaled_documents(base, scale)
+        names_lower = [name.lower() for _, name in docs]
+        index = build_index(docs)
+        postings = decode_postings(index)
+
+        for q in queries:
+            assert search(postings, names_lower, q) == linear(names_lower, q), q
+        reps = max(1, 20 // scale)
+        py_scan = time_per_query(lambda q: linear(names_lower, q), queries, reps)
+        py_index = time_per_query(lambda q: search(postings, names_lower, q), queries, reps)
+
+        size_kb = len(json.dumps(index, separators=(",", ":"))) / 1024
+        js = node_timings(index, names_lower, queries, tmp_dir, max(1, 200 // scale))
+        js_cols = (f"{js['scan']:>11.2f} {js['index']:>12.2f} {js['scan'] / js['index']:>5.1f}x"
+                   if js else f"{'-':>11} {'-':>12} {'-':>6}")
+        print(f"{scale:>6} {len(docs):>8} {size_kb:>9.1f} | {py_scan:>11.2f} {py_index:>12.2f} "
+              f"{py_scan / py_index:>5.1f}x | {js_cols}")
+    if shutil.which("node") is None:
+        print(" (node not found: client-side timings skipped)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+# =============================================================================
+#  Module: compact_emitter.py
+#
+#  Description:
+#  Optional compact output for the Activities/*.js modules. For each
+#  generated module a minified, columnar twin is written to
+#  Activities/compact/ (same file name, same default export), together with
+#  precompressed .gz and, when the `brotli` package is installed, .br copies.
+#
+#  Columnar layout: one array per field, with category / unit / source /
+#  type / userInputs interned into small lookup tables, so repeated strings
+#  (e.g. the Clark source sentence) are stored once per module. The default
+#  export is still an array of the usual activity objects; each object is
+#  rebuilt lazily the first time its index is read (spread, map, filter and
+#  find all work unchanged).
+#
+#  Usage (from src/data):
+#    python compact_emitter.py            # compact copies of every module
+#    python compact_emitter.py --report   # ...plus size / parse-time report
+#
+#  Author: Finlay Shaw
+# =============================================================================
+
+import gzip
+import json
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+from js_modules import read_module, write_if_changed
+
+try:
+    import brotli
+except ImportError:  # optional: .br copies are skipped without it
+    brotli = None
+
+ACTIVITIES_DIR = "Activities"
+COMPACT_DIR = "compact"
+INTERNED_FIELDS = ("category", "unit", "source", "type", "userInputs")
+
+
+# =========================
+# Columnar encoding
+# =========================
+def _min_json(value) -> str:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+def columnar(objects):
+    """objects -> (keys, columns, tables); missing fields are null, interned fields are table indexes."""
+    keys = []
+    for obj in objects:
+        for k in obj:
+            if k not in keys:
+                keys.append(k)
+
+    tables, columns = {}, []
+    for k in keys:
+        values = [obj.get(k) for obj in objects]
+        if k in INTERNED_FIELDS:
+            table, index = [], {}
+            column = []
+            for v in values:
+                if v is None:
+                    column.append(None)
+                    continue
+                token = _min_json(v)
+                if token not in index:
+                    index[token] = len(table)
+                    table.append(v)
+                column.append(index[token])
+            tables[k] = table
+            values = column
+        columns.append(values)
+    return keys, columns, tables
+
+
+# Shared runtime (Activities/compact/inflate.js): rebuilds objects on first index access
+INFLATE_JS = """\
+// Generated by compact_emitter.py: lazy row view over columnar activity tables.
+export default function inflate(K, T, C) {
+  const N = C.length ? C[0].length : 0;
+  const row = (i) => {
+    const o = {};
+    for (let j = 0; j < K.length; j++) {
+      let v = C[j][i];
+      if (v === null) continue;
+      const t = T[K[j]];
+      if (t) { v = t[v]; if (Array.isArray(v)) v = v.slice(); }
+      o[K[j]] = v;
+    }
+    return o;
+  };
+  const isIndex = (k) => typeof k === "string" && String(k >>> 0) === k && (k >>> 0) < N;
+  return new Proxy(new Array(N), {
+    get: (a, k, p) => (isIndex(k) ? (a[k] || (a[k] = row(+k))) : Reflect.get(a, k, p)),
+    has: (a, k) => isIndex(k) || Reflect.has(a, k),
+  });
+}
+"""
+INFLATE_FILE = "inflate.js"
+
+
+def render_compact_module(var_name, objects) -> str:
+    """Minified columnar module whose default export rebuilds the original objects lazily."""
+    keys, columns, tables = columnar(objects)
+    return (
+        f'import inflate from "./{INFLATE_FILE}";\n'
+        f"const {var_name}=inflate({_min_json(keys)},{_min_json(tables)},{_min_json(columns)});\n"
+        f"export default {var_name};\n"
+    )
+
+
+# =========================
+# Writing
+# =========================
+def compact_path(module_path) -> Path:
+    module_path = Path(module_path)
+    return module_path.parent / COMPACT_DIR / module_path.name
+
+
+def precompress(path, text: str):
+    """Write deterministic .gz (and .br if available) siblings of `path`."""
+    data = text.encode("utf-8")
+    written = []
+    gz = Path(f"{path}.gz")
+    gz_bytes = gzip.compress(data, compresslevel=9, mtime=0)
+    if not gz.exists() or gz.read_bytes() != gz_bytes:
+        gz.write_bytes(gz_bytes)
+        written.append(gz)
+    if brotli is not None:
+        br = Path(f"{path}.br")
+        br_bytes = brotli.compress(data, quality=11)
+        if not br.exists() or br.read_bytes() != br_bytes:
+            br.write_bytes(br_bytes)
+            written.append(br)
+    return written
+
+
+def emit_compact(module_path) -> bool:
+    """Write the compact twin (+ compressed copies) of one standard module; True if it changed."""
+    var_name, objects = read_module(module_path)
+    text = render_compact_module(var_name, objects)
+    out = compact_path(module_path)
+    write_if_changed(out.parent / INFLATE_FILE, INFLATE_JS)
+    changed = write_if_changed(out, text)
+    precompress(out, text)
+    return changed
+
+
+def remove_compact(module_path):
+    """Delete the compact twin and compressed copies of a removed module."""
+    out = compact_path(module_path)
+    for p in (out, Path(f"{out}.gz"), Path(f"{out}.br")):  # inflate.js is shared and kept
+        if p.exists():
+            p.unlink()
+
+
+def module_paths(activities_dir=ACTIVITIES_DIR):
+    """Generated category modules (allActivities.js is hand-written and skipped)."""
+    return sorted(p for p in Path(activities_dir).glob("*Activities.js") if p.name != "allActivities.js")
+
+
+# =========================
+# Report
+# =========================
+NODE_TIMER = r"""
+const fs = require("fs");
+const [reps, inflateFile, ...files] = process.argv.slice(1);  // node -e: no script path in argv
+const inflate = new Function(
+  fs.readFileSync(inflateFile, "utf8").replace("export default function", "return function"))();
+const out = {};
+for (const f of files) {
+  const body = fs.readFileSync(f, "utf8")
+    .replace(/^import .*$/m, "")
+    .replace(/export default (\w+);/, "return $1;");
+  let evalMs = 0, fullMs = 0;
+  for (let i = 0; i < +reps; i++) {
+    const src = body + "\n//" + i;          // defeat V8's compilation cache
+    let t = process.hrtime.bigint();
+    const arr = new Function("inflate", src)(inflate);
+    evalMs += Number(process.hrtime.bigint() - t) / 1e6;
+    t = process.hrtime.bigint();
+    JSON.stringify([...arr]);                  // touch every object
+    fullMs += Number(process.hrtime.bigint() - t) / 1e6;
+  }
+  out[f] = [evalMs / reps, fullMs / reps];
+}
+console.log(JSON.stringify(out));
+"""
+
+
+def node_timings(paths, inflate_path, reps=200):
+    """{path: (load ms, materialise ms)} measured in node, or None if node is unavailable."""
+    node = shutil.which("node")
+    if node is None:
+        return None
+    res = subprocess.run([node, "-e", NODE_TIMER, str(reps), str(inflate_path), *map(str, paths)],
+                         capture_output=True, text=True, check=True)
+    return json.loads(res.stdout)
+
+
+def _sizes(path):
+    data = Path(path).read_bytes()
+    gz = len(gzip.compress(data, compresslevel=9, mtime=0))
+    br = len(brotli.compress(data, quality=11)) if brotli is not None else None
+    return len(data), gz, br
+
+
+def print_report(paths):
+    compact = [compact_path(p) for p in paths]
+    timings = node_timings(list(paths) + compact, compact[0].parent / INFLATE_FILE) if paths else None
+    timings = timings or {}
+    fmt_br = lambda v: f"{v:>7}" if v is not None else f"{'-':>7}"
+    print(f"{'module':<36} {'json':>8} {'gz':>7} {'br':>7} | {'compact':>8} {'gz':>7} {'br':>7} | "
+          f"{'load ms':>15} {'load+all ms':>15}")
+    totals = [0] * 6
+    for p, c in zip(paths, compact):
+        a, b = _sizes(p), _sizes(c)
+        for i, v in enumerate(a + b):
+            totals[i] += v or 0
+        tp, tc = timings.get(str(p)), timings.get(str(c))
+        load = f"{tp[0]:.3f}/{tc[0]:.3f}" if tp else "-"
+        full = f"{tp[0] + tp[1]:.3f}/{tc[0] + tc[1]:.3f}" if tp else "-"
+        print(f"{p.name:<36} {a[0]:>8} {a[1]:>7} {fmt_br(a[2])} | {b[0]:>8} {b[1]:>7} {fmt_br(b[2])} | "
+              f"{load:>15} {full:>15}")
+    print(f"{'total':<36} {totals[0]:>8} {totals[1]:>7} {fmt_br(totals[2] or None)} | "
+          f"{totals[3]:>8} {totals[4]:>7} {fmt_br(totals[5] or None)} |")
+    shared = len(INFLATE_JS.encode("utf-8"))
+    print(f" compact/json: raw {totals[3] / totals[0]:.1%}, gzip {totals[4] / totals[1]:.1%} "
+          f"(+{shared} bytes shared {INFLATE_FILE})")
+    if brotli is None:
+        print(" (brotli not installed: .br copies and sizes skipped)")
+    if not timings:
+        print(" (node not found: parse timings skipped)")
+    else:
+        print(" load = evaluate module (standard/compact), load+all = plus reading every object")
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    paths = module_paths(ACTIVITIES_DIR)
+    changed = [p.name for p in paths if emit_compact(p)]
+    print(f"Compact modules written to {Path(ACTIVITIES_DIR) / COMPACT_DIR}: "
+          f"{len(paths)} modules, {len(changed)} changed")
+    if "--report" in argv:
+        print_report(paths)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+# =============================================================================
+#  Module: db.py
+#
+#  Description:
+#  Database access for the Python tools that read or write the app's tables
+#  (bulk imports, benchmarks). Two backends:
+#    - MariaDB/MySQL, configured from the same DB_HOST / DB_PORT / DB_NAME /
+#      DB_USER / DB_PASS environment variables (and XAMPP defaults) as
+#      carbon_app_api/config.php; needs the optional `pymysql` package
+#    - SQLite, as a local stand-in with the same table and column names as
+#      db/carbon_app.sql (types mapped to SQLite affinities)
+#
+#  Targets are given as "mysql" (environment settings) or "sqlite:<path>".
+#
+#  Author: Finlay Shaw
+# =============================================================================
+
+import os
+import sqlite3
+
+try:
+    import pymysql
+except ImportError:  # optional: only needed for a real MariaDB
+    pymysql = None
+
+# Stand-in for db/carbon_app.sql (user_activities, users, friendships, blocks,
+# friend_requests, user_goals, v_user_friends): same columns, keys and
+# generated emissions column;
+# updated_at is maintained by a trigger as MariaDB's ON UPDATE
+# current_timestamp() would, for edits to the app's own columns (so
+# maintenance writes such as the activity_key backfill keep the edit
+# time). The trigger is re-created on connect so older files pick up the
+# column list.
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS user_activities (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  user_id INTEGER NOT NULL,
+  activity_id TEXT NOT NULL,
+  activity_name TEXT NOT NULL,
+  category TEXT NOT NULL,
+  type TEXT NOT NULL,
+  unit TEXT NOT NULL,
+  emission_factor REAL NOT NULL,
+  quantity REAL NOT NULL,
+  emissions_kg_co2e REAL GENERATED ALWAYS AS (round(quantity * emission_factor, 3)) STORED,
+  meta TEXT DEFAULT NULL CHECK (meta IS NULL OR json_valid(meta)),
+  occurred_at TEXT NOT NULL,
+  created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS fk_user_activity_user ON user_activities (user_id);
+DROP TRIGGER IF EXISTS user_activities_bu_updated;
+CREATE TRIGGER user_activities_bu_updated AFTER UPDATE OF
+  user_id, activity_id, activity_name, category, type, unit, emission_factor, quantity, meta, occurred_at
+  ON user_activities
+FOR EACH ROW WHEN NEW.updated_at = OLD.updated_at BEGIN
+  UPDATE user_activities SET updated_at = CURRENT_TIMESTAMP WHERE id = NEW.id;
+END;
+
+CREATE TABLE IF NOT EXISTS users (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  name TEXT NOT NULL,
+  email TEXT NOT NULL UNIQUE,
+  units TEXT NOT NULL DEFAULT 'kg',
+  privacy_public INTEGER NOT NULL DEFAULT 0,
+  password TEXT NOT NULL,
+  created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_users_name ON users (name);
+
+-- Pairs are stored normalised (low < high), as the MariaDB insert trigger enforces
+CREATE TABLE IF NOT EXISTS friendships (
+  user_id_low INTEGER NOT NULL,
+  user_id_high INTEGER NOT NULL,
+  created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (user_id_low, user_id_high),
+  CHECK (user_id_low < user_id_high)
+);
+CREATE INDEX IF NOT EXISTS idx_friend_high ON friendships (user_id_high);
+
+CREATE TABLE IF NOT EXISTS blocks (
+  blocker_id INTEGER NOT NULL,
+  blocked_id INTEGER NOT NULL,
+  created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (blocker_id, blocked_id)
+);
+CREATE INDEX IF NOT EXISTS idx_blocked_lookup ON blocks (blocked_id);
+
+-- Accepted requests are deleted by friend_request_act.php once the friendship exists
+CREATE TABLE IF NOT EXISTS friend_requests (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  requester_id INTEGER NOT NULL,
+  addressee_id INTEGER NOT NULL,
+  status TEXT NOT NULL DEFAULT 'pending' CHECK (status IN ('pending', 'accepted', 'declined', 'canceled')),
+  created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  responded_at TEXT DEFAULT NULL,
+  UNIQUE (requester_id, addressee_id)
+);
+CREATE INDEX IF NOT EXISTS idx_fr_incoming ON friend_requests (addressee_id, status, created_at);
+CREATE INDEX IF NOT EXISTS idx_fr_outgoing ON friend_requests (requester_id, status, created_at);
+
+CREATE TABLE IF NOT EXISTS user_goals (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  user_id INTEGER NOT NULL,
+  name TEXT NOT NULL,
+  type TEXT NOT NULL DEFAULT 'cap' CHECK (type IN ('cap')),
+  period TEXT NOT NULL CHECK (period IN ('week', 'month', 'year')),
+  category TEXT DEFAULT NULL,
+  target_kg REAL NOT NULL,
+  is_active INTEGER NOT NULL DEFAULT 1,
+  created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_goals_user ON user_goals (user_id);
+CREATE INDEX IF NOT EXISTS idx_goals_category ON user_goals (category);
+
+CREATE VIEW IF NOT EXISTS v_user_friends AS
+  SELECT f.user_id_low AS user_id, f.user_id_high AS friend_id, f.created_at AS created_at FROM friendships f
+  UNION ALL
+  SELECT f.user_id_high AS user_id, f.user_id_low AS friend_id, f.created_at AS created_at FROM friendships f;
+"""
+
+USER_ACTIVITY_COLUMNS = (
+    "user_id", "activity_id", "activity_name", "category", "type", "unit",
+    "emission_factor", "quantity", "occurred_at", "meta",
+)
+
+
+class Database:
+    """Thin DB-API wrapper that knows its placeholder style and how to batch inserts."""
+
+    def __init__(self, conn, dialect):
+        self.conn = conn
+        self.dialect = dialect  # "sqlite" | "mysql"
+        self.ph = "?" if dialect == "sqlite" else "%s"
+        # SQLite caps bound parameters per statement (32766 since 3.32, 999 before)
+        self.max_params = 32766 if sqlite3.sqlite_version_info >= (3, 32) else 999
+
+    def execute(self, sql, params=()):
+        cur = self.conn.cursor()
+        cur.execute(sql, params)
+        return cur
+
+    def query(self, sql, params=()):
+        cur = self.execute(sql, params)
+        rows = cur.fetchall()
+        cur.close()
+        return rows
+
+    def insert_rows(self, table, columns, rows, suffix="") -> int:
+        """
+        One multi-row INSERT per call (split only if it would exceed the parameter
+        cap); `suffix` is appended to each statement, e.g. an upsert clause.
+        """
+        if not rows:
+            return 0
+        per_stmt = len(rows) if self.dialect == "mysql" else max(1, self.max_params // len(columns))
+        group = "(" + ", ".join([self.ph] * len(columns)) + ")"
+        head = f"INSERT INTO {table} ({', '.join(columns)}) VALUES "
+        cur = self.conn.cursor()
+        for start in range(0, len(rows), per_stmt):
+            part = rows[start:start + per_stmt]
+            cur.execute(head + ", ".join([group] * len(part)) + suffix, [v for row in part for v in row])
+        cur.close()
+        return len(rows)
+
+    def commit(self):
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+
+def connect_sqlite(path) -> Database:
+    conn = sqlite3.connect(path)
+    conn.executescript(SQLITE_SCHEMA)
+    return Database(conn, "sqlite")
+
+
+def connect_mysql(local_infile=False) -> Database:
+    if pymysql is None:
+        raise RuntimeError("pymysql is not installed (pip install pymysql) - use sqlite:<path> instead")
+    conn = pymysql.connect(
+        host=os.environ.get("DB_HOST") or "127.0.0.1",
+        port=int(os.environ.get("DB_PORT") or 3306),
+        database=os.environ.get("DB_NAME") or "carbon_app",
+        user=os.environ.get("DB_USER") or "root",
+        password=os.environ.get("DB_PASS") or "",
+        charset="utf8mb4",
+        init_command="SET time_zone = '+00:00'",
+        local_infile=local_infile,
+    )
+    return Database(conn, "mysql")
+
+
+def connect(target, **kwargs) -> Database:
+    """'mysql' or 'sqlite:<path>' -> Database."""
+    if target == "mysql":
+        return connect_mysql(**kwargs)
+    if target.startswith("sqlite:"):
+        return connect_sqlite(target[len("sqlite:"):])
+    raise ValueError(f"Unknown database target {target!r} (use 'mysql' or 'sqlite:<path>')")
@@ -0,0 +1,151 @@
+# =============================================================================
+#  Module: defra_cache.py
+#
+#  Description:
+#  Content-hashed cache for the DEFRA "flat format" workbook parse.
+#
+#  On a miss the sheet is streamed with openpyxl (read-only, values only)
+#  keeping just the requested columns, run through the same pandas text
+#  parser pd.read_excel uses (so dtypes and NA handling match), and saved as
+#  a NumPy .npz column store keyed by the SHA-256 of the workbook bytes plus
+#  the sheet / header / column selection. On a hit the XLSX is not opened.
+#
+#  Author: Finlay Shaw
+# =============================================================================
+
+import hashlib
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from pandas.io.parsers import TextParser
+
+CACHE_DIR = ".defra_cache"
+CACHE_VERSION = 2
+
+
+# =========================
+# Keys
+# =========================
+def file_sha256(path, chunk_size=1 << 20) -> str:
+    """SHA-256 of a file's bytes, read in chunks."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def cache_key(workbook_hash, sheet_name, skiprows, columns) -> str:
+    """Cache key = workbook content + everything that changes the parsed frame."""
+    spec = f"v{CACHE_VERSION}|{workbook_hash}|{sheet_name}|{skiprows}|{'|'.join(columns)}"
+    return hashlib.sha256(spec.encode("utf-8")).hexdigest()
+
+
+# =========================
+# Streaming XLSX parse
+# =========================
+def _excel_value(v):
+    """Mirror pandas' openpyxl cell conversion (integral floats -> int, blanks -> '')."""
+    if v is None:
+        return ""
+    if isinstance(v, float) and v.is_integer():
+        return int(v)
+    return v
+
+
+def stream_sheet_columns(excel_path, sheet_name, columns, skiprows=0) -> pd.DataFrame:
+    """Read only `columns` from a sheet in streaming mode, header row after `skiprows`."""
+    import openpyxl
+
+    wb = openpyxl.load_workbook(excel_path, read_only=True, data_only=True)
+    try:
+        rows = wb[sheet_name].iter_rows(min_row=skiprows + 1, values_only=True)
+        header = [_excel_value(v) for v in next(rows)]
+        missing = [c for c in columns if c not in header]
+        if missing:
+            raise KeyError(f"Columns not found in '{sheet_name}': {missing}")
+        idx = [header.index(c) for c in columns]
+
+        data = [list(columns)]
+        for row in rows:
+            data.append([_excel_value(row[i]) if i < len(row) else "" for i in idx])
+    finally:
+        wb.close()
+
+    # Trailing blank rows are dropped by pd.read_excel too
+    while len(data) > 1 and all(v == "" for v in data[-1]):
+        data.pop()
+    return TextParser(data, header=0).read()
+
+
+# =========================
+# Column store
+# =========================
+def save_frame(df: pd.DataFrame, path):
+    """Write a frame as an .npz column store (numeric columns native, text dictionary-encoded)."""
+    arrays = {"__columns__": np.array(list(df.columns), dtype=str)}
+    for i, col in enumerate(df.columns):
+        s = df[col]
+        if pd.api.types.is_numeric_dtype(s) and not pd.api.types.is_bool_dtype(s):
+            arrays[f"num{i}"] = s.to_numpy()
+        else:
+            # Few distinct values per column: store uniques once + int32 codes (-1 = NA)
+            codes, uniques = pd.factorize(s, use_na_sentinel=True)
+            arrays[f"codes{i}"] = codes.astype(np.int32)
+            arrays[f"uniques{i}"] = np.array([str(v) for v in uniques], dtype=str)
+    tmp = Path(path).with_suffix(".tmp.npz")
+    np.savez(tmp, **arrays)
+    tmp.replace(path)
+
+
+def load_frame(path) -> pd.DataFrame:
+    """Inverse of save_frame."""
+    with np.load(path, allow_pickle=False) as z:
+        columns = list(z["__columns__"])
+        data = {}
+        for i, col in enumerate(columns):
+            if f"num{i}" in z:
+                data[col] = z[f"num{i}"]
+            else:
+                codes = z[f"codes{i}"]
+                uniques = np.append(z[f"uniques{i}"].astype(object), np.nan)
+                data[col] = uniques[codes]  # code -1 picks the trailing NaN
+    return pd.DataFrame(data, columns=columns)
+
+
+# =========================
+# Public API
+# =========================
+def read_sheet_cached(excel_path, sheet_name, columns, skiprows=0, cache_dir=CACHE_DIR):
+    """
+    Return (df, stats) for `columns` of a workbook sheet, using the content-hashed
+    cache when possible. stats holds hit/miss, key, rows and elapsed seconds.
+    """
+    t0 = time.perf_counter()
+    excel_path = Path(excel_path)
+    key = cache_key(file_sha256(excel_path), sheet_name, skiprows, columns)
+    cache_path = Path(cache_dir) / f"{excel_path.stem}-{key[:16]}.npz"
+
+    if cache_path.exists():
+        df, hit = load_frame(cache_path), True
+    else:
+        df, hit = stream_sheet_columns(excel_path, sheet_name, columns, skiprows), False
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        save_frame(df, cache_path)
+
+    stats = {
+        "hit": hit,
+        "key": key[:16],
+        "rows": len(df),
+        "path": str(cache_path),
+        "seconds": time.perf_counter() - t0,
+    }
+    return df, stats
+
+
+def format_stats(stats) -> str:
+    """One-line cache report for the console."""
+    state = "hit" if stats["hit"] else "miss (parsed XLSX)"
+    return f"DEFRA cache {state}: key {stats['key']}, {stats['rows']} rows in {stats['seconds']:.3f}s"
@@ -0,0 +1,95 @@
+# =============================================================================
+#  Module: defra_frames.py
+#
+#  Description:
+#  Typed loader for "pre-processed-defra.csv" shared by the generators.
+#  The text columns (Category, Subcategory, Detail, Activity, Description,
+#  Unit) hold a few dozen distinct values across thousands of rows, so they
+#  are read straight into categorical dtypes: one small array of codes per
+#  column plus the distinct strings once. Cleaning (strip / lower) is then
+#  applied to the categories rather than to every row. EmissionFactor is
+#  read at a configurable float width (float64 by default, which keeps the
+#  generated modules byte-identical).
+#
+#  memory_report() lists per-column memory; benchmarks/bench_defra_frames.py
+#  compares load + clean peaks against plain string columns for multi-year
+#  inputs.
+#
+#  Author: Finlay Shaw
+# =============================================================================
+
+import numpy as np
+import pandas as pd
+
+TEXT_COLUMNS = ["Category", "Subcategory", "Detail", "Activity", "Description", "Unit"]
+FACTOR_COLUMN = "EmissionFactor"
+FACTOR_DTYPE = "float64"  # "float32" halves the factor column, at the cost of precision
+
+
+# =========================
+# Load
+# =========================
+def read_defra(path, factor_dtype=FACTOR_DTYPE) -> pd.DataFrame:
+    """Read the DEFRA CSV with categorical text columns and a `factor_dtype` EmissionFactor."""
+    dtypes = {col: "category" for col in TEXT_COLUMNS}
+    dtypes[FACTOR_COLUMN] = factor_dtype
+    return pd.read_csv(path, dtype=dtypes)
+
+
+def is_categorical(series: pd.Series) -> bool:
+    return isinstance(series.dtype, pd.CategoricalDtype)
+
+
+# =========================
+# Cleaning
+# =========================
+def clean_text(series: pd.Series, lower=False, nan_to_na=False) -> pd.Series:
+    """
+    Column-wise str(x).strip() (and .lower()); with nan_to_na the text "nan"
+    becomes missing. Categorical columns are normalised on their categories
+    (values that collide after cleaning are merged) and stay categorical;
+    other columns get the plain per-row string methods.
+    """
+    if not is_categorical(series):
+        out = series.astype(str).str.strip()
+        if lower:
+            out = out.str.lower()
+        return out.replace({"nan": pd.NA}) if nan_to_na else out
+
+    cats = pd.Index(series.cat.categories.astype(str)).str.strip()
+    if lower:
+        cats = cats.str.lower()
+    cats = np.asarray(cats, dtype=object)
+    if nan_to_na:
+        cats = np.where(cats == "nan", None, cats)
+
+    # Old category -> position in the sorted, de-duplicated cleaned categories
+    present = pd.notna(cats)
+    uniques = np.array(sorted(set(cats[present])), dtype=object)
+    remap = np.full(len(cats) + 1, -1, dtype=np.int32)  # last slot: missing values (code -1)
+    remap[:-1][present] = np.searchsorted(uniques, cats[present])
+    codes = remap[series.cat.codes.to_numpy()]
+    categories = pd.Index(list(uniques))  # same string dtype read_csv gives plain columns
+    return pd.Series(pd.Categorical.from_codes(codes, categories=categories), index=series.index, name=series.name)
+
+
+def plain_columns(df: pd.DataFrame, columns) -> pd.DataFrame:
+    """Convert categorical `columns` back to plain strings (for steps that assign new values)."""
+    out = df.copy()
+    for col in columns:
+        if col in out.columns and is_categorical(out[col]):
+            out[col] = out[col].astype(out[col].cat.categories.dtype)
+    return out
+
+
+# =========================
+# Report
+# =========================
+def memory_report(df: pd.DataFrame, title="frame") -> str:
+    """Per-column dtype and deep memory, plus the total."""
+    usage = df.memory_usage(deep=True, index=False)
+    lines = [f"{title}: {len(df):,} rows, {usage.sum() / 2**20:.2f} MB"]
+    for col in df.columns:
+        kind = f"category[{len(df[col].cat.categories)}]" if is_categorical(df[col]) else str(df[col].dtype)
+        lines.append(f"  {col:<16} {kind:<16} {usage[col] / 2**20:9.3f} MB")
+    return "\n".join(lines)
@@ -0,0 +1,227 @@
+# =============================================================================
+#  Module: defra_transforms.py
+#
+#  Description:
+#  Column-wise transform steps used by generate_js_from_defra.py. Each step
+#  takes a DataFrame and returns a new one, applying its rule as a boolean
+#  mask over whole columns rather than a row-by-row df.apply, so the cost of
+#  a stage stays flat as multi-year / multi-country factor sets are fed in.
+#
+#  Steps are plain functions; configuration is passed in as arguments so the
+#  same steps can be reused by other generators and by the benchmarks.
+#
+#  Author: Finlay Shaw
+# =============================================================================
+
+import re
+
+import numpy as np
+import pandas as pd
+
+from defra_frames import plain_columns
+from pipeline_trace import traced_steps
+
+GROUP_COLS = ["Category", "Label", "Unit"]
+# Spread of the DEFRA rows averaged into each factor, kept alongside EmissionFactor
+SPREAD_COLS = ["FactorMin", "FactorMax", "FactorStd", "FactorCount"]
+SCALED_COLS = ["EmissionFactor", "FactorMin", "FactorMax", "FactorStd"]  # rescaled with the unit
+MILES_PER_KM = 0.621371
+
+
+# =========================
+# Helpers
+# =========================
+def norm(series: pd.Series) -> pd.Series:
+    """Column-wise str(x).strip().lower()."""
+    return series.astype(str).str.strip().str.lower()
+
+
+def contains_any(series: pd.Series, keywords) -> pd.Series:
+    """True where the lowercased value contains any of the (plain) keywords."""
+    pattern = "|".join(re.escape(k) for k in keywords)
+    return series.astype(str).str.lower().str.contains(pattern, regex=True)
+
+
+def scale_factors(out: pd.DataFrame, mask: pd.Series, fn) -> None:
+    """Apply fn to EmissionFactor (and any spread columns in its units) where mask is set, in place."""
+    rows = np.asarray(mask, dtype=bool)
+    for col in SCALED_COLS:
+        if col in out.columns:
+            values = out[col].to_numpy(dtype=np.float64, copy=True)
+            values[rows] = fn(values[rows])
+            out[col] = values  # whole-column swap: much cheaper than a .loc write per column
+
+
+def run_steps(df: pd.DataFrame, steps) -> pd.DataFrame:
+    """Apply (name, step) pairs in order and return the final frame (each traced when enabled)."""
+    for _, step in traced_steps(steps):
+        df = step(df)
+    return df
+
+
+# =========================
+# Row filters / labels
+# =========================
+def add_label(df: pd.DataFrame, fallback: str = "Unspecified") -> pd.DataFrame:
+    """Label = Description -> Activity -> fallback (first non-blank wins)."""
+    out = df.copy()
+    missing = pd.Series(pd.NA, index=out.index, dtype=object)
+    desc = out["Description"] if "Description" in out.columns else missing
+    act = out["Activity"] if "Activity" in out.columns else missing
+    has_desc = desc.notna() & desc.astype(str).str.strip().ne("")
+    has_act = act.notna() & act.astype(str).str.strip().ne("")
+    label = act.astype(object).where(has_act, fallback)
+    out["Label"] = desc.astype(object).where(has_desc, label)
+    return out
+
+
+def drop_useless_labels(df: pd.DataFrame, pattern: str, keep_categories) -> pd.DataFrame:
+    """Drop rows whose Label matches `pattern` unless the category is kept."""
+    useless = df["Label"].astype(str).str.match(pattern)
+    kept = df["Category"].str.strip().str.lower().isin(keep_categories)
+    return df[~(useless & ~kept)]
+
+
+def drop_categories(df: pd.DataFrame, categories) -> pd.DataFrame:
+    """Exclude whole categories (case-insensitive)."""
+    excluded = {c.lower() for c in categories}
+    return df[~df["Category"].str.strip().str.lower().isin(excluded)]
+
+
+def group_mean(df: pd.DataFrame, cols=GROUP_COLS) -> pd.DataFrame:
+    """
+    Average EmissionFactor over duplicate (Category, Label, Unit) rows (keys
+    as plain strings), keeping the spread of the DEFRA rows behind each
+    average: min, max, population std and count. Regrouping rows that
+    already carry a spread pools the underlying rows; the std is taken
+    around the EmissionFactor written (the mean of the rows regrouped).
+
+    The keys are factorized once; the mean is groupby's (compensated) mean,
+    the rest plain sums and min / max over the group codes in numpy.
+    """
+    cols = list(cols)
+    by = df.groupby(cols, observed=True)
+    means = by["EmissionFactor"].mean()
+    mean = means.to_numpy()
+    codes = by.ngroup().to_numpy()
+    keep = codes >= 0  # rows with a missing key belong to no group (as in groupby)
+    if not keep.all():
+        df, codes = df[keep], codes[keep].astype(np.intp)
+    first, rows = np.unique(codes, return_index=True, return_counts=True)[1:]
+    k = len(first)
+
+    ef = df["EmissionFactor"].to_numpy(dtype=np.float64)
+    grouped = "FactorCount" in df.columns
+    n = df["FactorCount"].to_numpy(dtype=np.float64) if grouped else np.ones(len(ef))
+    lo = df["FactorMin"].to_numpy(dtype=np.float64) if grouped else ef
+    hi = df["FactorMax"].to_numpy(dtype=np.float64) if grouped else ef
+    # Offsets from each group's first factor, so the sums below do not cancel
+    ref = ef[first]
+    d = ef - ref[codes]
+    nd = n * d
+    sq = nd * d + n * df["FactorStd"].to_numpy(dtype=np.float64) ** 2 if grouped else nd * d
+
+    def total(values):
+        return np.bincount(codes, weights=values, minlength=k)
+
+    count = total(n)
+    # Sum of squares about the mean from plain sums: sum(n*s^2 + n*d^2) - 2m*sum(n*d) + m^2*sum(n),
+    # with d and m measured from the reference
+    shift = mean - ref
+    ss = total(sq) - 2 * shift * total(nd) + shift ** 2 * count
+    order = np.argsort(codes, kind="stable")
+    starts = np.concatenate(([0], np.cumsum(rows)[:-1]))
+    low = np.minimum.reduceat(lo[order], starts) if k else lo[:0]
+    high = np.maximum.reduceat(hi[order], starts) if k else hi[:0]
+    std = np.where(high > low, np.sqrt(np.clip(ss, 0, None) / count), 0.0)
+
+    keys = means.index
+    out = pd.DataFrame({
+        **{c: keys.get_level_values(c) for c in cols},
+        "EmissionFactor": mean, "FactorMin": low, "FactorMax": high, "FactorStd": std,
+        "FactorCount": count.astype(np.int64),
+    })
+    return plain_columns(out, cols)
+
+
+# =========================
+# Unit handling
+# =========================
+def convert_miles_to_km(df: pd.DataFrame) -> pd.DataFrame:
+    """Per-mile factors -> per-km factors."""
+    out = df.copy()
+    mask = norm(out["Unit"]).eq("miles")
+    scale_factors(out, mask, lambda f: f / MILES_PER_KM)
+    out.loc[mask, "Unit"] = "km"
+    return out
+
+
+def normalise_units(df: pd.DataFrame, conversions, normalisations) -> pd.DataFrame:
+    """
+    Scale EFs to harmonised base units and rename unit labels.
+
+    conversions maps unit -> (new unit, EF multiplier); when the old unit text
+    appears inside the Label it is rewritten too. normalisations is a plain
+    unit relabelling. Both are keyed on the *original* lowercased unit.
+    """
+    out = df.copy()
+    unit_original = norm(out["Unit"])
+    label_lower = out["Label"].astype(str).str.lower()
+
+    for unit, (new_unit, mult) in conversions.items():
+        mask = unit_original.eq(unit)
+        if not mask.any():
+            continue
+        out.loc[mask, "Unit"] = new_unit
+        scale_factors(out, mask, lambda f: f * mult)
+        relabel = mask & label_lower.str.contains(unit, regex=False)
+        if relabel.any():
+            out.loc[relabel, "Label"] = (
+                out.loc[relabel, "Label"].astype(str)
+                .str.replace(re.escape(unit), new_unit, case=False, regex=True)
+            )
+
+    mask = unit_original.isin(list(normalisations))
+    if mask.any():
+        out.loc[mask, "Unit"] = unit_original[mask].map(normalisations)
+    return out
+
+
+# =========================
+# Delivery vehicles
+# =========================
+def is_delivery(df: pd.DataFrame, category: str = "delivery vehicles") -> pd.Series:
+    return norm(df["Category"]).eq(category)
+
+
+def convert_to_kgkm_if_delivery(df: pd.DataFrame, payload_kg: float) -> pd.DataFrame:
+    """Delivery per km -> per kg·km using an average van payload."""
+    out = df.copy()
+    mask = is_delivery(out) & norm(out["Unit"]).eq("km")
+    scale_factors(out, mask, lambda f: f / payload_kg)
+    out.loc[mask, "Unit"] = "kg·km"
+    return out
+
+
+def merge_electric_vans(df: pd.DataFrame, keywords, label: str = "electric van") -> pd.DataFrame:
+    """Fold every electric/hybrid delivery flavour into one label."""
+    out = df.copy()
+    mask = is_delivery(out) & contains_any(out["Label"], keywords)
+    out.loc[mask, "Label"] = label
+    return out
+
+
+def keep_fuel_based_delivery(df: pd.DataFrame, fuel_keywords) -> pd.DataFrame:
+    """Keep non-delivery rows, and delivery rows naming a specific fuel."""
+    keep = ~is_delivery(df) | contains_any(df["Label"], fuel_keywords)
+    return df[keep]
+
+
+# =========================
+# Finishing
+# =========================
+def round_and_dedupe(df: pd.DataFrame, decimals: int = 8) -> pd.DataFrame:
+    """Round EFs for stability and drop absolute duplicates."""
+    out = df.copy()
+    out["EmissionFactor"] = out["EmissionFactor"].round(decimals)
+    return out.drop_duplicates(subset=GROUP_COLS + ["EmissionFactor"])
@@ -0,0 +1,169 @@
+# =============================================================================
+#  Module: factor_registry.py
+#
+#  Description:
+#  In-memory emission factor registry built from the pipeline's outputs (the
+#  generated Activities/*.js modules: DEFRA categories, generalActivities,
+#  foodActivities), so Python code can answer "what is the factor for
+#  activity X" without re-running the pandas scripts, e.g. to check the
+#  emission_factor a client submits.
+#
+#  Layout: one array per field (factors in an array('d'), category / type /
+#  unit / source interned to small integer codes) with two hashed indexes:
+#    id                          -> position
+#    (category, activity, unit)  -> position   (activity = display label)
+#  Lookups are a dict hit plus an array read; rows are only materialised
+#  as Factor objects when asked for.
+#
+#  Usage (from src/data):
+#    python factor_registry.py                  # summary
+#    python factor_registry.py <activity id>    # show one factor
+#
+#  Author: Finlay Shaw
+# =============================================================================
+
+import math
+import sys
+from array import array
+
+from activity_manifest import ACTIVITIES_DIR, module_paths
+from js_modules import read_module
+
+DEFAULT_TYPE = "general"  # what LogActivity sends when an activity has no type
+
+
+class Factor:
+    """One registry row (materialised on demand)."""
+
+    __slots__ = ("id", "activity", "category", "type", "unit", "emission_factor", "source")
+
+    def __init__(self, id, activity, category, type, unit, emission_factor, source):
+        self.id = id
+        self.activity = activity
+        self.category = category
+        self.type = type
+        self.unit = unit
+        self.emission_factor = emission_factor
+        self.source = source
+
+    def __repr__(self):
+        return f"Factor({self.id!r}, {self.emission_factor} kg CO2e/{self.unit}, {self.category})"
+
+
+class FactorRegistry:
+    """Array-backed factor table with id and (category, activity, unit) indexes."""
+
+    __slots__ = ("ids", "activities", "factors", "_category", "_type", "_unit", "_source",
+                 "categories", "types", "units", "sources", "_by_id", "_by_key")
+
+    def __init__(self):
+        self.ids = []
+        self.activities = []
+        self.factors = array("d")
+        self._category, self._type, self._unit, self._source = array("H"), array("H"), array("H"), array("H")
+        self.categories, self.types, self.units, self.sources = [], [], [], []  # code -> string
+        self._by_id = {}
+        self._by_key = {}
+
+    @staticmethod
+    def _intern(value, table, codes):
+        try:
+            return codes[value]
+        except KeyError:
+            codes[value] = len(table)
+            table.append(value)
+            return codes[value]
+
+    @classmethod
+    def from_activities(cls, activities):
+        """Build from activity dicts as written to the JS modules; first occurrence of an id wins."""
+        reg = cls()
+        cat_codes, type_codes, unit_codes, src_codes = {}, {}, {}, {}
+        for a in activities:
+            if a["id"] in reg._by_id:
+                continue
+            pos = len(reg.ids)
+            reg.ids.append(a["id"])
+            reg.activities.append(a["activity"])
+            reg.factors.append(float(a["emissionFactor"]))
+            reg._category.append(cls._intern(a.get("category", ""), reg.categories, cat_codes))
+            reg._type.append(cls._intern(a.get("type") or DEFAULT_TYPE, reg.types, type_codes))
+            reg._unit.append(cls._intern(a.get("unit", ""), reg.units, unit_codes))
+            reg._source.append(cls._intern(a.get("source", ""), reg.sources, src_codes))
+            reg._by_id[a["id"]] = pos
+            reg._by_key.setdefault((a.get("category", ""), a["activity"], a.get("unit", "")), pos)
+        return reg
+
+    @classmethod
+    def from_modules(cls, activities_dir=ACTIVITIES_DIR):
+        """Build from every generated module in Activities/."""
+        def activities():
+            for path in module_paths(activities_dir):
+                yield from read_module(path)[1]
+        return cls.from_activities(activities())
+
+    # -------------------------
+    # Lookups
+    # -------------------------
+    def factor(self, activity_id) -> float:
+        """kg CO₂e per unit for `activity_id` (KeyError if unknown)."""
+        return self.factors[self._by_id[activity_id]]
+
+    def factor_for(self, category, activity, unit) -> float:
+        """kg CO₂e per unit by (category, activity label, unit) (KeyError if unknown)."""
+        return self.factors[self._by_key[(category, activity, unit)]]
+
+    def get(self, activity_id, default=None):
+        pos = self._by_id.get(activity_id)
+        return default if pos is None else self._row(pos)
+
+    def factor_many(self, activity_ids):
+        """Factors for a sequence of ids, as an array('d')."""
+        by_id, factors = self._by_id, self.factors
+        return array("d", [factors[by_id[a]] for a in activity_ids])
+
+    def check(self, activity_id, emission_factor, rel_tol=1e-6):
+        """
+        Validate a client-submitted factor: None if it matches the registry,
+        otherwise a short reason.
+        """
+        pos = self._by_id.get(activity_id)
+        if pos is None:
+            return f"unknown activity id {activity_id!r}"
+        expected = self.factors[pos]
+        if not math.isclose(float(emission_factor), expected, rel_tol=rel_tol, abs_tol=1e-12):
+            return f"emission factor {emission_factor} != {expected} for {activity_id!r}"
+        return None
+
+    def _row(self, pos):
+        return Factor(self.ids[pos], self.activities[pos], self.categories[self._category[pos]],
+                      self.types[self._type[pos]], self.units[self._unit[pos]], self.factors[pos],
+                      self.sources[self._source[pos]])
+
+    def __getitem__(self, activity_id):
+        return self._row(self._by_id[activity_id])
+
+    def __contains__(self, activity_id):
+        return activity_id in self._by_id
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __iter__(self):
+        return (self._row(pos) for pos in range(len(self.ids)))
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    reg = FactorRegistry.from_modules(ACTIVITIES_DIR)
+    if argv:
+        for activity_id in argv:
+            print(reg.get(activity_id, f"{activity_id}: not in registry"))
+        return reg
+    print(f"Factor registry: {len(reg)} activities, {len(reg.categories)} categories, "
+          f"{len(reg.types)} types, {len(reg.units)} units, {len(reg.sources)} sources")
+    return reg
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+# =============================================================================
+#  Script/Module: factor_store.py
+#
+#  Description:
+#  Multi-year DEFRA ingestion. Finds the yearly flat-format workbooks
+#  (ghg-conversion-factors-<year>-flat-format.xlsx), runs each one through
+#  the same pre-processing and activity build as the 2025 pipeline in its
+#  own worker process, and combines the results into one year-versioned
+#  factor store: activity id x year -> kg CO₂e per unit.
+#
+#  Lookups use the factor for the activity's own year; if that year has no
+#  factor for the id (workbook missing, activity not published that year)
+#  the nearest earlier year is used, then the earliest later one.
+#
+#  Usage (from src/data):
+#    python factor_store.py                    # every workbook found here
+#    python factor_store.py --years 2019-2025  # a range (missing years are reported)
+#    python factor_store.py --workers 1        # ingest one year at a time
+#
+#  Author: Finlay Shaw
+# =============================================================================
+
+import argparse
+import os
+import re
+import time
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from defra_cache import CACHE_DIR
+
+STORE_PATH = "defra_factor_store.npz"
+WORKBOOK_PATTERN = re.compile(r"ghg-conversion-factors-(\d{4})-flat-format\.xlsx$")
+
+
+# =========================
+# Ingestion
+# =========================
+def discover_workbooks(directory=".") -> dict:
+    """{year: path} for every yearly flat-format workbook in `directory`."""
+    found = {}
+    for path in Path(directory).iterdir():
+        m = WORKBOOK_PATTERN.match(path.name)
+        if m:
+            found[int(m.group(1))] = path
+    return dict(sorted(found.items()))
+
+
+def ingest_year(year, path, cache_dir=CACHE_DIR):
+    """One workbook -> (year, activity ids, factors, stats). Runs in a worker process."""
+    import generate_js_from_defra as gen
+    import pre_process_defra_2025 as pp
+
+    t0 = time.perf_counter()
+    df = pp.process_defra(pp.load_workbook_frame(path, year=year, cache_dir=cache_dir, verbose=False), year=year)
+    named = gen.NAMING.name_frame(gen.build_activity_frame(gen.clean_defra(df)))
+    ids = named["id"].tolist()
+    factors = np.array([round(float(v), 8) for v in named["EmissionFactor"]])  # as written to the JS modules
+    stats = {"rows": len(df), "activities": len(ids), "seconds": time.perf_counter() - t0, "pid": os.getpid()}
+    return year, ids, factors, stats
+
+
+def ingest(workbooks: dict, workers=None, cache_dir=CACHE_DIR):
+    """
+    Ingest {year: path} workbooks, one process per year (workers=1 runs them
+    in this process). Returns (FactorStore, {year: stats}).
+    """
+    jobs = sorted(workbooks.items())
+    if workers == 1 or len(jobs) <= 1:
+        results = [ingest_year(year, path, cache_dir) for year, path in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers or min(len(jobs), os.cpu_count() or 1)) as pool:
+            futures = [pool.submit(ingest_year, year, path, cache_dir) for year, path in jobs]
+            results = [f.result() for f in futures]
+    store = FactorStore.from_years({year: dict(zip(ids, factors)) for year, ids, factors, _ in results})
+    return store, {year: stats for year, _, _, stats in results}
+
+
+# =========================
+# Store
+# =========================
+class FactorStore:
+    """Dense id x year factor matrix with the year fallback resolved up front."""
+
+    def __init__(self, ids, years, factors):
+        self.ids = list(ids)
+        self.years = [int(y) for y in years]
+        self.factors = np.asarray(factors, dtype=np.float64)  # NaN = not published that year
+        self._row = {activity_id: i for i, activity_id in enumerate(self.ids)}
+        self._years = np.asarray(self.years)
+        self._resolved, self._source_col = self._resolve(self.factors)
+
+    @staticmethod
+    def _resolve(factors):
+        """Fill each NaN from the nearest earlier year, else the earliest later one."""
+        n_ids, n_years = factors.shape
+        cols = np.where(np.isnan(factors), -1, np.arange(n_years))
+        cols = np.maximum.accumulate(cols, axis=1)  # last published column so far
+        first = np.argmax(~np.isnan(factors), axis=1)
+        cols = np.where(cols < 0, first[:, None], cols)
+        rows = np.arange(n_ids)[:, None]
+        return factors[rows, cols], cols
+
+    @classmethod
+    def from_years(cls, by_year: dict):
+        """{year: {id: factor}} -> FactorStore."""
+        years = sorted(by_year)
+        ids = sorted({activity_id for factors in by_year.values() for activity_id in factors})
+        row = {activity_id: i for i, activity_id in enumerate(ids)}
+        matrix = np.full((len(ids), len(years)), np.nan)
+        for j, year in enumerate(years):
+            for activity_id, value in by_year[year].items():
+                matrix[row[activity_id], j] = value
+        return cls(ids, years, matrix)
+
+    def _col(self, year):
+        return max(bisect_right(self.years, year) - 1, 0)
+
+    def factor(self, activity_id, year) -> float:
+        """kg CO₂e per unit for `activity_id` in `year` (KeyError for unknown ids)."""
+        return float(self._resolved[self._row[activity_id], self._col(year)])
+
+    def lookup(self, activity_id, year):
+        """(factor, year the factor was published for)."""
+        row, col = self._row[activity_id], self._col(year)
+        return float(self._resolved[row, col]), self.years[self._source_col[row, col]]
+
+    def factor_many(self, activity_ids, years) -> np.ndarray:
+        """Vectorised factor() over paired sequences of ids and years."""
+        rows = np.fromiter((self._row[a] for a in activity_ids), dtype=np.intp, count=len(activity_ids))
+        cols = np.maximum(np.searchsorted(self._years, np.asarray(years), side="right") - 1, 0)
+        return self._resolved[rows, cols]
+
+    def save(self, path=STORE_PATH):
+        tmp = Path(path).with_suffix(".tmp.npz")
+        np.savez(tmp, ids=np.array(self.ids, dtype=str), years=self._years, factors=self.factors)
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path=STORE_PATH):
+        with np.load(path, allow_pickle=False) as z:
+            return cls(z["ids"].tolist(), z["years"], z["factors"])
+
+    def __len__(self):
+        return len(self.ids)
+
+
+# =========================
+# CLI
+# =========================
+def parse_years(text):
+    """'2019-2025' or '2019,2021,2025' -> sorted list of years."""
+    years = set()
+    for part in text.split(","):
+        lo, _, hi = part.partition("-")
+        years.update(range(int(lo), int(hi or lo) + 1))
+    return sorted(years)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ingest yearly DEFRA workbooks into a versioned factor store.")
+    parser.add_argument("--years", help="e.g. 2019-2025 (default: every workbook found)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per year, up to the CPU count)")
+    parser.add_argument("--out", default=STORE_PATH, help="store path")
+    args = parser.parse_args(argv)
+
+    workbooks = discover_workbooks(".")
+    if args.years:
+        wanted = parse_years(args.years)
+        missing = [y for y in wanted if y not in workbooks]
+        if missing:
+            print(f"No workbook for: {', '.join(map(str, missing))}")
+        workbooks = {y: p for y, p in workbooks.items() if y in wanted}
+    if not workbooks:
+        raise SystemExit("No DEFRA workbooks to ingest")
+
+    t0 = time.perf_counter()
+    store, stats = ingest(workbooks, args.workers)
+    wall = time.perf_counter() - t0
+    store.save(args.out)
+
+    for year, s in stats.items():
+        print(f"  {year}: {s['rows']} factor rows -> {s['activities']} activities in {s['seconds']:.3f}s (pid {s['pid']})")
+    busy = sum(s["seconds"] for s in stats.values())
+    print(f"Factor store saved to {args.out}: {len(store)} ids x {len(store.years)} years "
+          f"in {wall:.3f}s (sum of years {busy:.3f}s)")
+    return store
+
+
+if __name__ == "__main__":
+    main()
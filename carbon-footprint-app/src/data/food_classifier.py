@@ -0,0 +1,170 @@
+# =============================================================================
+#  Module: food_classifier.py
+#
+#  Description:
+#  Keyword classifier for food and drink names (drank / ate / used / other),
+#  used by "Foodprocess (Clark et al. 2022).py" and usable on its own for
+#  large product catalogues.
+#
+#  All keyword lists are compiled into one Aho-Corasick automaton, so each
+#  name is scanned once, character by character, instead of being tested
+#  against every keyword with a separate substring search. Every automaton
+#  state records the highest-priority list any keyword ending there belongs
+#  to, which keeps the original rule: the first list with a match wins.
+#
+#  Author: Finlay Shaw
+# =============================================================================
+
+from collections import deque
+
+# === Classification rules ===
+# Ordered list of food type keywords.
+# Each tuple maps a verb (e.g., "ate") to a list of keywords that define it.
+# The first match found determines the classification.
+TYPE_KEYWORDS = [
+    ("drank", [
+        # Alcoholic beverages
+        "ale", "beer", "cider", "wine",
+        # Juices & smoothies
+        "apple juice", "orange juice", "grape juice", "pineapple juice", "fruit smoothies",
+        # Milk & plant-based milks
+        "almond milk", "coconut milk", "cow's milk", "oat milk", "rice milk", "soy milk",
+        # Hot drinks
+        "coffee beans", "coffee pods", "instant coffee", "tea",
+        # Other drinks
+        "protein shake", "milkshake"
+    ]),
+    ("ate", [
+        # General food and meals
+        "almond butter", "almonds", "apple pie", "apples", "asparagus", "avocados", "bagels", "baguette",
+        "bacon", "banana loaf", "bananas", "beans", "beef burger", "beef curry", "beef meatballs",
+        "beef mince", "beef noodles", "beef steak", "beetroot", "biscuits", "blue cheese", "brazil nuts",
+        "bread", "breakfast cereal", "brie", "broccoli", "butter", "cabbage", "caesar salad", "camembert",
+        "carrot cake", "carrots", "cashew nuts", "cauliflower", "cereal bars", "cheddar cheese",
+        "cheesecake", "cherry tomatoes", "chia seeds", "chicken breast", "chicken burger", "chicken curry",
+        "chicken noodles", "chicken pasta", "chicken sausages", "chicken thighs", "chicken wings",
+        "chickpeas", "chilli con carne", "chocolate biscuits", "chocolate cake", "chocolate cereals",
+        "chocolate cheesecake", "cookies", "cottage cheese", "courgettes", "cracker biscuits", "crisps",
+        "croissants", "dark chocolate", "doughnuts", "egg noodles", "eggs", "falafels", "feta cheese",
+        "flapjack", "frozen jacket potatoes", "frozen mashed potato", "frozen onion rings",
+        "frozen potato wedges", "frozen roast potatoes", "frozen sweet potato fries", "fruit cake",
+        "garden peas", "goat's cheese", "grapes", "granola", "haddock risotto", "halloumi cheese",
+        "ice cream", "ice lollies", "kale", "kiwis", "lamb (leg)", "lamb burgers", "lamb casserole",
+        "lamb chops", "lamb curry", "lamb hotpot", "lamb moussaka", "lasagne sheets", "lemon", "lentils",
+        "lettuce", "lime", "macaroni cheese", "mackerel", "meat pizza", "meat-free burger",
+        "meat-free mince", "meat-free nuggets", "meat-free sausages", "melon", "milk chocolate", "mixed salad",
+        "mozzarella cheese", "muesli", "muffins", "mushrooms", "naan", "nut loaf", "onions", "oranges",
+        "pain au chocolat", "pancakes", "parmesan cheese", "parsnips", "pasta shells", "peanut butter",
+        "peanuts", "pears", "pecan nuts", "penne pasta", "peppers", "pineapple", "pitta bread", "pizza",
+        "poppadoms", "popcorn", "pork chops", "pork loin", "pork sausage rolls", "pork sausages",
+        "porridge (oatmeal)", "potato croquettes", "potatoes", "prawns", "protein bar", "quiche", "quinoa",
+        "raspberries", "rice", "rice noodles", "ricotta cheese", "salmon", "salmon fishcakes", "sandwich",
+        "sausage", "sausage rolls", "shepherd's pie", "shortbread biscuits", "sourdough bread", "soy desert",
+        "soy yoghurt", "spaghetti", "spaghetti bolognese", "spinach", "sponge cake", "strawberries",
+        "strawberry jam", "sugar", "sweetcorn", "tofu", "tomato ketchup", "tomatoes", "tortilla wraps",
+        "tuna", "vegetable lasagne", "vegetarian chilli con carne", "vegetarian curry", "vegetarian pizza",
+        "walnuts", "watermelon", "yoghurt", "steak pie"
+    ]),
+    ("used", [
+        # Condiments and oils
+        "apricot jam", "raspberry jam", "jam", "marmalade", "olive oil", "rapeseed oil", "sunflower oil",
+        "chocolate spread", "coconut oil", "spread"
+    ])
+]
+
+# === Verb and unit mapping ===
+# Maps the classification type to a display verb and measurement unit
+VERB_MAP = {"ate": "Eat", "drank": "Drink", "used": "Use"}
+UNIT_MAP = {"drank": "litres", "ate": "kg", "used": "kg"}
+
+DEFAULT_TYPE = "other"
+
+
+class FoodClassifier:
+    """Single-pass multi-keyword classifier (Aho-Corasick automaton)."""
+
+    def __init__(self, type_keywords=TYPE_KEYWORDS, default=DEFAULT_TYPE):
+        self.types = [t_type for t_type, _ in type_keywords]
+        self.default = default
+        self._build(type_keywords)
+        self._cache = {}
+
+    def _build(self, type_keywords):
+        none = len(self.types)  # priority meaning "no match"
+        goto = [{}]
+        best = [none]
+
+        # Trie of all keywords; a node's priority is its lowest list index
+        for priority, (_, keywords) in enumerate(type_keywords):
+            for keyword in keywords:
+                node = 0
+                for ch in keyword.lower():
+                    nxt = goto[node].get(ch)
+                    if nxt is None:
+                        nxt = len(goto)
+                        goto[node][ch] = nxt
+                        goto.append({})
+                        best.append(none)
+                    node = nxt
+                best[node] = min(best[node], priority)
+
+        # BFS for failure links, folding them into a full transition table
+        # (delta) so scanning never has to walk the failure chain.
+        fail = [0] * len(goto)
+        delta = [dict(g) for g in goto]
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            best[node] = min(best[node], best[fail[node]])
+            for ch, child in goto[node].items():
+                queue.append(child)
+                f = fail[node]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[child] = goto[f].get(ch, 0)
+            # Inherit the failure state's transitions for missing characters
+            if node:
+                for ch, target in delta[fail[node]].items():
+                    delta[node].setdefault(ch, target)
+
+        self._delta = delta
+        self._best = best
+        self._none = none
+
+    def _scan(self, text: str) -> int:
+        """Lowest list index with a keyword occurring in `text` (or len(types))."""
+        delta, best = self._delta, self._best
+        found = best[0]  # an empty keyword matches everything
+        state = 0
+        for ch in text:
+            state = delta[state].get(ch, 0)
+            p = best[state]
+            if p < found:
+                found = p
+                if found == 0:
+                    break
+        return found
+
+    def classify(self, name: str) -> str:
+        """Food type for one name; results are cached per lowercased name."""
+        key = str(name).strip().lower()
+        t_type = self._cache.get(key)
+        if t_type is None:
+            p = self._scan(key)
+            t_type = self.types[p] if p < self._none else self.default
+            self._cache[key] = t_type
+        return t_type
+
+    def classify_many(self, names):
+        """Batch API: list of food types, one per name."""
+        classify = self.classify
+        return [classify(n) for n in names]
+
+    def clear_cache(self):
+        """Forget cached names (streaming callers bound memory by clearing per chunk)."""
+        self._cache.clear()
+
+    def describe(self, name: str):
+        """(food_type, display verb, unit) for one name."""
+        t_type = self.classify(name)
+        return t_type, VERB_MAP.get(t_type, "Consume"), UNIT_MAP.get(t_type, "kg")
@@ -6,20 +6,37 @@
 #  ("pre-processed-defra.csv") into category-scoped JavaScript modules that
 #  export arrays of normalised activity objects (stable IDs, user-friendly
 #  names, standardised units, averaged CO₂e factors) for front-end calculators.
+#  The spread behind each averaged factor is recorded in
+#  factorDistributions.json (see factor_uncertainty.py).
 #
 #  Author: Finlay Shaw
 # =============================================================================
 
 import pandas as pd
-import os, json, re
+import sys
+from functools import partial
 from pathlib import Path
 
+import defra_transforms as tx
+from defra_frames import clean_text, read_defra
+from activity_aggregates import refresh
+from compact_emitter import emit_compact, remove_compact
+from factor_uncertainty import spread_rows
+import naming_engine
+from js_modules import (
+    BUILD_STATE, load_state, render_module, save_state, sha256_file, sha256_text,
+    source_fingerprint, write_if_changed,
+)
+from naming_engine import NamingEngine, a_or_an
+from pipeline_trace import step
+
 # =========================
 # Config
 # =========================
 INPUT_CSV = "pre-processed-defra.csv"   # input: cleaned DEFRA factors
 OUTPUT_DIR = "Activities"               # output folder for JS modules
 SOURCE_LABEL = "DEFRA 2025"             # source label written into JS objects
+STATE_KEY = "generate_js_from_defra"    # section of the build-state file for these modules
 
 # Categories to exclude entirely
 EXCLUDED_CATEGORIES = [
@@ -58,6 +75,9 @@ UNIT_NORMALISATIONS = {
     "fte working hour": "FTE working hour",
 }
 
+# Delivery label keywords folded into a single "electric van" bucket
+ELECTRIC_VAN_KEYWORDS = ["battery electric", "plugin hybrid", "plug-in hybrid"]
+
 # Keywords used to detect fuel specific delivery vehicle rows
 FUEL_KEYWORDS = ["electric", "diesel", "petrol", "plug-in hybrid", "plugin hybrid", "cng", "lpg"]
 
@@ -83,32 +103,9 @@ USELESS_LABEL_RE = r'(?i)^\s*(unspecified|unknown|na|n/?a|not\s+applicable|not\s
 # =========================
 # Helpers
 # =========================
-def slugify(text):
-    """Lowercase, replace spaces with underscores, keep [a-z0-9_] only."""
-    return re.sub(r'[^a-z0-9_]', '', re.sub(r'\s+', '_', str(text).strip().lower()))
-
 def category_slug(category: str) -> str:
     """Category -> filesystem-friendly slug, honoring overrides."""
-    c = str(category).strip().lower()
-    if c in CATEGORY_SLUG_OVERRIDES:
-        return CATEGORY_SLUG_OVERRIDES[c]
-    return slugify(category)
-
-def normalise_text(x: str) -> str:
-    """Normalise text for matching: lowercase, single spaces, trimmed."""
-    x = str(x or "").strip().lower()
-    x = re.sub(r"\s+", " ", x)
-    return x
-
-def a_or_an(noun: str) -> str:
-    """Simple 'a'/'an' helper for nicer titles."""
-    return "an" if re.match(r"^[aeiou]", noun) else "a"
-
-def title_tidy(s: str) -> str:
-    """Capitalise first letter and tidy after en-dashes."""
-    if not s: return s
-    s = s[:1].upper() + s[1:]
-    return re.sub(r"(–\s*)(\w)", lambda m: m.group(1) + m.group(2).upper(), s)
+    return NAMING.category_slug(category)
 
 def passenger_vehicle_name(label: str, unit: str) -> str:
     """Human title for passenger vehicles by fuel type."""
@@ -163,166 +160,88 @@ RULES = [
     (r"waste", None,             "Dispose of waste"),
 ]
 
+# Compiled + memoised rule engine used for titles and ids
+NAMING = NamingEngine(RULES, VEHICLE_TERMS, CATEGORY_SLUG_OVERRIDES)
+
 
 # =========================
 # Load + clean
 # =========================
-in_path = Path(INPUT_CSV)
-if not in_path.exists():
-    raise FileNotFoundError(f"Couldn’t find {in_path.resolve()}")
-df = pd.read_csv(in_path)
-
-# Basic trimming + NA handling for key columns
-df.columns = [c.strip() for c in df.columns]
-for col in ["Category", "Activity", "Description", "Unit"]:
-    if col in df.columns:
-        df[col] = df[col].astype(str).str.strip().replace({"nan": pd.NA})
-
-# Keep only rows with a category and a numeric EF
-df = df[df["Category"].notna() & df["EmissionFactor"].notna()]
-
-# Build a user-facing Label from Description -> Activity -> "Unspecified"
-def determine_label(row):
-    if pd.notna(row.get("Description")) and str(row["Description"]).strip():
-        return row["Description"]
-    if pd.notna(row.get("Activity")) and str(row["Activity"]).strip():
-        return row["Activity"]
-    return "Unspecified"
-df["Label"] = df.apply(determine_label, axis=1)
-
-# Drop “useless” labels unless category is explicitly whitelisted
-def is_useless(label: str) -> bool:
-    return bool(re.match(USELESS_LABEL_RE, str(label) or "", flags=0))
-
-df["_catnorm"] = df["Category"].str.strip().str.lower()
-keep_mask = df["_catnorm"].isin(KEEP_UNSPECIFIED_CATEGORIES)
-drop_mask = df["Label"].apply(is_useless) & ~keep_mask
-df = df[~drop_mask].drop(columns=["_catnorm"])
-
-# Exclude entire categories
-df["_catnorm"] = df["Category"].str.strip().str.lower()
-excluded = {s.lower() for s in EXCLUDED_CATEGORIES}
-df = df[~df["_catnorm"].isin(excluded)].drop(columns=["_catnorm"])
+def load_defra(path=INPUT_CSV) -> pd.DataFrame:
+    """Read the cleaned DEFRA CSV (categorical text columns) and apply clean_defra."""
+    in_path = Path(path)
+    if not in_path.exists():
+        raise FileNotFoundError(f"Couldn’t find {in_path.resolve()}")
+    with step("generate_js.read_csv") as s:
+        df = s.done(read_defra(in_path))
+    return clean_defra(df)
+
+
+def clean_defra(df: pd.DataFrame) -> pd.DataFrame:
+    """Trim key columns and keep rows with a category + EF (does not modify `df`)."""
+    with step("generate_js.clean_defra", df) as s:
+        df = df.copy()
+
+        # Basic trimming + NA handling for key columns
+        df.columns = [c.strip() for c in df.columns]
+        for col in ["Category", "Activity", "Description", "Unit"]:
+            if col in df.columns:
+                df[col] = clean_text(df[col], nan_to_na=True)
+
+        # Keep only rows with a category and a numeric EF
+        return s.done(df[df["Category"].notna() & df["EmissionFactor"].notna()])
+
 
 # =========================
-# Group / average EF
+# Transform steps
 # =========================
-group_cols = ["Category", "Label", "Unit"]
-df_grouped = df.groupby(group_cols, as_index=False)["EmissionFactor"].mean()
-
-# Convert miles -> km for travel related rows
-def convert_miles_to_km(row):
-    unit = str(row["Unit"]).strip().lower()
-    if unit == "miles":
-        row["EmissionFactor"] /= 0.621371  # per mile -> per km
-        row["Unit"] = "km"
-    return row
-df_grouped = df_grouped.apply(convert_miles_to_km, axis=1)
-
-# Normalise / scale units to harmonise EF base units and labels
-def normalise_units(row):
-    unit_original = str(row["Unit"]).strip().lower()
-    if unit_original in UNIT_CONVERSIONS:
-        new_unit, mult = UNIT_CONVERSIONS[unit_original]
-        row["Unit"] = new_unit
-        row["EmissionFactor"] *= mult
-        lbl = str(row["Label"])
-        # If the unit text appears inside the label, update it to the new unit
-        if unit_original in lbl.lower():
-            row["Label"] = re.sub(re.escape(unit_original), new_unit, lbl, flags=re.IGNORECASE)
-    if unit_original in UNIT_NORMALISATIONS:
-        row["Unit"] = UNIT_NORMALISATIONS[unit_original]
-    return row
-df_grouped = df_grouped.apply(normalise_units, axis=1)
-
-# Delivery per km -> per kg·km using average van payload
-def convert_to_kgkm_if_delivery(row):
-    if str(row["Category"]).strip().lower() == "delivery vehicles" and str(row["Unit"]).strip().lower() == "km":
-        row["EmissionFactor"] /= AVERAGE_VAN_PAYLOAD_KG
-        row["Unit"] = "kg·km"
-    return row
-df_grouped = df_grouped.apply(convert_to_kgkm_if_delivery, axis=1)
-
-# === Merge all electric van flavors into a single "electric van" bucket ===
-def merge_electric_vans(row):
-    if row["Category"].strip().lower() == "delivery vehicles":
-        if any(keyword in row["Label"].lower() for keyword in [
-            "battery electric", "plugin hybrid", "plug-in hybrid"
-        ]):
-            row["Label"] = "electric van"
-    return row
-df_grouped = df_grouped.apply(merge_electric_vans, axis=1)
-
-
-df_grouped = (
-    df_grouped
-    .groupby(["Category", "Label", "Unit"], as_index=False)["EmissionFactor"]
-    .mean()
-)
+def transform_steps():
+    """Ordered (name, step) pairs taking the cleaned frame to final activity rows."""
+    return [
+        # Build a user-facing Label from Description -> Activity -> "Unspecified"
+        ("determine_label", tx.add_label),
+        # Drop “useless” labels unless category is explicitly whitelisted
+        ("drop_useless_labels", partial(
+            tx.drop_useless_labels,
+            pattern=USELESS_LABEL_RE, keep_categories=KEEP_UNSPECIFIED_CATEGORIES,
+        )),
+        # Exclude entire categories
+        ("drop_excluded_categories", partial(tx.drop_categories, categories=EXCLUDED_CATEGORIES)),
+        # Group / average EF
+        ("group_mean", tx.group_mean),
+        # Convert miles -> km for travel related rows
+        ("convert_miles_to_km", tx.convert_miles_to_km),
+        # Normalise / scale units to harmonise EF base units and labels
+        ("normalise_units", partial(
+            tx.normalise_units,
+            conversions=UNIT_CONVERSIONS, normalisations=UNIT_NORMALISATIONS,
+        )),
+        # Delivery per km -> per kg·km using average van payload
+        ("convert_to_kgkm_if_delivery", partial(
+            tx.convert_to_kgkm_if_delivery, payload_kg=AVERAGE_VAN_PAYLOAD_KG,
+        )),
+        # Merge all electric van flavors into a single "electric van" bucket
+        ("merge_electric_vans", partial(tx.merge_electric_vans, keywords=ELECTRIC_VAN_KEYWORDS)),
+        ("regroup_mean", tx.group_mean),
+        # Keep only fuel-specific delivery rows (filter out generic “delivery vehicles”)
+        ("keep_fuel_based_delivery", partial(tx.keep_fuel_based_delivery, fuel_keywords=FUEL_KEYWORDS)),
+        # Round for stability and drop absolute duplicates
+        ("round_and_dedupe", tx.round_and_dedupe),
+    ]
+
+
+def build_activity_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Cleaned DEFRA rows -> one row per (Category, Label, Unit) with an averaged EF."""
+    with step("generate_js.build_activity_frame", df) as s:
+        return s.done(tx.run_steps(df, transform_steps()))
 
-# Keep only fuel-specific delivery rows (filter out generic “delivery vehicles”)
-def is_fuel_based_delivery(row):
-    if str(row["Category"]).strip().lower() != "delivery vehicles":
-        return True
-    label = str(row["Label"]).lower()
-    return any(fuel in label for fuel in FUEL_KEYWORDS)
-df_grouped = df_grouped[df_grouped.apply(is_fuel_based_delivery, axis=1)]
-
-# Round for stability and drop absolute duplicates
-df_grouped["EmissionFactor"] = df_grouped["EmissionFactor"].round(8)
-df_grouped = df_grouped.drop_duplicates(subset=["Category", "Label", "Unit", "EmissionFactor"])
 
 # =========================
 # Friendly names
 # =========================
 def friendly_name(row):
     """Generate a human-readable activity title using rules + fallbacks."""
-    category = normalise_text(row["Category"])
-    label = normalise_text(row["Label"])
-    unit = normalise_text(row["Unit"])
-
-    # If the label is useless, suppress it in names
-    if label in {"unspecified", "unknown", "nan"}:
-        label_clean = ""
-    else:
-        label_clean = label
-
-    # Passenger vehicles by fuel type
-    if "passenger vehicle" in category:
-        for key, nice in VEHICLE_TERMS.items():
-            if key in label:
-                return title_tidy(f"Drive {a_or_an(nice)} {nice}")
-        return title_tidy(f"Drive {a_or_an(label_clean)} {label_clean} car") if label_clean else "Drive a car"
-
-    # UK electricity for EVs: distinguish freight vs passenger
-    if category == "uk electricity for evs":
-        if "tonne" in unit:  # freight
-            for cat_pat, lbl_pat, template in RULES:
-                if re.search(cat_pat, category) and (lbl_pat is None or re.search(lbl_pat, label)):
-                    if callable(template):
-                        return title_tidy(template(row))
-                    return title_tidy(template)
-            return "Electric freight"
-        else:  # passenger EVs
-            if re.search(r"battery electric", label):
-                return "Drive an electric car"
-            if re.search(r"plug-?in hybrid", label):
-                return "Drive a plug-in hybrid"
-            return "Drive an EV"
-
-    # General rules
-    for cat_pat, lbl_pat, template in RULES:
-        if not re.search(cat_pat, category):
-            continue
-        if lbl_pat is not None and not re.search(lbl_pat, label):
-            continue
-
-        if callable(template):
-            return title_tidy(template(row))
-        return title_tidy(template.replace(" – per {unit}", "").format(unit=unit, label=label_clean))
-
-    # Fallback
-    return title_tidy(label_clean) if label_clean else "Other activity"
+    return NAMING.title(row["Category"], row["Label"], row["Unit"])
 
 
 # =========================
@@ -330,27 +249,10 @@ def friendly_name(row):
 # =========================
 def format_js(row):
     """Row -> JS activity object (with deterministic id, title, units, EF, etc.)."""
-    cat_slug = category_slug(row["Category"])
-    unit_slug = slugify(row["Unit"])
-    label = str(row["Label"]).lower()
-    activity = friendly_name(row)
-
-    # Special handling for UK electricity for EVs to keep IDs stable/meaningful
-    if cat_slug == "uk_electricity_for_evs":
-        if "battery electric" in label:
-            id_str = "electric_freight_bev" if "tonne" in unit_slug else "electric_car"
-        elif "plugin hybrid" in label or "plug-in hybrid" in label:
-            id_str = "plugin_hybrid_freight" if "tonne" in unit_slug else "plugin_hybrid_car"
-        else:
-            id_str = f"{slugify(label)}_{unit_slug}"
-        final_id = f"{cat_slug}_{id_str}"
-    else:
-        final_id = f"{cat_slug}_{slugify(row['Label'])}_{unit_slug}"
-
     js_obj = {
-        "id": final_id,
-        "activity": activity,
-        "category": cat_slug,
+        "id": NAMING.activity_id(row["Category"], row["Label"], row["Unit"]),
+        "activity": friendly_name(row),
+        "category": category_slug(row["Category"]),
         "unit": row["Unit"],
         "emissionFactor": round(float(row["EmissionFactor"]), 8),
         "source": SOURCE_LABEL,
@@ -360,31 +262,102 @@ def format_js(row):
         js_obj["userInputs"] = ["weight_kg", "distance_km"]
     return js_obj
 
-# Prepare output directory
-out_dir = Path(OUTPUT_DIR)
-out_dir.mkdir(parents=True, exist_ok=True)
-
-# Small console summary
-print(f" Final rows: {len(df_grouped)}")
-print(f" Unique categories: {df_grouped['Category'].nunique()}")
-print(" Category breakdown:\n", df_grouped["Category"].value_counts())
-
-# Write one JS module per category
-written = []
-for category, group in df_grouped.groupby("Category"):
-    cat_slug = category_slug(category)
-    written.append(cat_slug)
-    js_filename = f"{cat_slug}Activities.js"
-    filepath = out_dir / js_filename
-
+def render_category(cat_slug: str, group: pd.DataFrame) -> str:
+    """One category group -> JS module text."""
     js_objects = [format_js(row) for _, row in group.iterrows()]
-    with open(filepath, "w", encoding="utf-8") as f:
-        f.write(f"const {cat_slug}Activities = [\n")
-        for obj in js_objects:
-            f.write("  " + json.dumps(obj, indent=2) + ",\n")
-        f.write("];\n\n")
-        f.write(f"export default {cat_slug}Activities;\n")
-    print(f" JS file created: {filepath}")
-
-
-
+    return render_module(f"{cat_slug}Activities", js_objects)
+
+
+def group_content_hash(group: pd.DataFrame, fingerprint: str) -> str:
+    """Hash of a category's normalised rows plus the generator code that renders them."""
+    rows = group[["Category", "Label", "Unit", "EmissionFactor"]].to_csv(index=False)
+    return sha256_text(fingerprint + "\n" + rows)
+
+
+def distribution_rows(df_grouped: pd.DataFrame):
+    """(id, mean, min, max, std, count) per activity: the spread group_mean kept, mean as written."""
+    ids = [NAMING.activity_id(*key) for key in zip(df_grouped["Category"], df_grouped["Label"], df_grouped["Unit"])]
+    means = [round(float(v), 8) for v in df_grouped["EmissionFactor"]]
+    return spread_rows(ids, means, *(df_grouped[col] for col in tx.SPREAD_COLS))
+
+
+def write_modules(df_grouped: pd.DataFrame, output_dir=OUTPUT_DIR, state_path=BUILD_STATE, compact=False):
+    """
+    Write one JS module per category, incrementally: a module is only rendered
+    when its group's content hash (or the file on disk) changed, only written
+    when the bytes differ, and modules for categories that disappeared are
+    deleted. With compact=True the compact twins are kept in step as well.
+    Returns {"rebuilt": [...], "skipped": [...], "deleted": [...]}.
+    """
+    out_dir = Path(output_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    fingerprint = source_fingerprint(__file__, naming_engine.__file__, tx.__file__)
+
+    state = load_state(state_path)
+    previous = state.get(STATE_KEY, {})
+    current = {}
+    report = {"rebuilt": [], "skipped": [], "deleted": []}
+
+    for category, group in df_grouped.groupby("Category"):
+        cat_slug = category_slug(category)
+        js_filename = f"{cat_slug}Activities.js"
+        filepath = out_dir / js_filename
+        content_hash = group_content_hash(group, fingerprint)
+
+        prev = previous.get(js_filename, {})
+        up_to_date = (
+            prev.get("content") == content_hash
+            and filepath.exists()
+            and sha256_file(filepath) == prev.get("output")
+        )
+        if up_to_date:
+            output_hash = prev["output"]
+            report["skipped"].append(js_filename)
+        else:
+            with step(f"generate_js.render {js_filename}", group):
+                text = render_category(cat_slug, group)
+            output_hash = sha256_text(text)
+            if write_if_changed(filepath, text):
+                report["rebuilt"].append(js_filename)
+                print(f" JS file created: {filepath}")
+            else:
+                report["skipped"].append(js_filename)
+        current[js_filename] = {"content": content_hash, "output": output_hash}
+        if compact:
+            emit_compact(filepath)
+
+    # Modules this generator wrote last time whose category no longer exists
+    for js_filename in sorted(set(previous) - set(current)):
+        stale = out_dir / js_filename
+        if stale.exists():
+            stale.unlink()
+            remove_compact(stale)
+            report["deleted"].append(js_filename)
+            print(f" JS file deleted: {stale}")
+
+    state[STATE_KEY] = current
+    save_state(state, state_path)
+    print(
+        f" Modules rebuilt: {len(report['rebuilt'])}, skipped: {len(report['skipped'])}, "
+        f"deleted: {len(report['deleted'])}"
+        + "".join(f"\n   {k}: {', '.join(v)}" for k, v in report.items() if v and k != "skipped")
+    )
+    return report
+
+
+def print_summary(df_grouped: pd.DataFrame):
+    """Small console summary."""
+    print(f" Final rows: {len(df_grouped)}")
+    print(f" Unique categories: {df_grouped['Category'].nunique()}")
+    print(" Category breakdown:\n", df_grouped["Category"].value_counts())
+
+
+def main():
+    df_grouped = build_activity_frame(load_defra(INPUT_CSV))
+    print_summary(df_grouped)
+    write_modules(df_grouped, OUTPUT_DIR, compact="--compact" in sys.argv)
+    refresh(OUTPUT_DIR, {"defra": distribution_rows(df_grouped)})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+# =============================================================================
+#  Script: grid_intensity.py
+#
+#  Description:
+#  Time-resolved grid carbon intensity for electricity-based activities.
+#  The generated factors price every kWh at DEFRA's annual UK average; here
+#  a half-hourly intensity profile (e.g. a National Grid carbon intensity
+#  export) prices each logged activity at the grid mix of the half hour it
+#  occurred in.
+#
+#  Profiles:
+#    `import` turns a CSV of (UTC time, intensity) readings into a dense
+#    half-hourly float32 array, saved as <name>.npy (kg CO2e per kWh, NaN
+#    for gaps) with a <name>.json sidecar (start, step, unit, source).
+#    GridProfile.load() memory-maps the array, so years of readings are
+#    paged in only where activities fall, and the lookup for a timestamp is
+#    one subtraction and division: (t - start) // 1800.
+#
+#  Pricing:
+#    Each activity id has an electricity share s, the part of its factor
+#    that is grid electricity: 1 for the uk_electricity and
+#    uk_electricity_for_evs modules, electricity_kwh * electricity / factor
+#    for the household activities (household_scenarios), 0 otherwise. A
+#    row is repriced as
+#
+#        quantity * emission_factor * (1 + s * (intensity(t) / flat - 1))
+#
+#    with flat the DEFRA electricity factor, so gas / water parts and the
+#    row's own (logged) factor are kept, and times outside the profile or in
+#    a gap fall back to the flat price. A batch is priced with whole-array
+#    operations: ids are factorised once, times parsed to epoch seconds and
+#    the profile gathered by index.
+#
+#  Usage (from src/data):
+#    python grid_intensity.py import carbon-intensity-2024.csv grid-profiles/gb-2024 \
+#        --time-column datetime --value-column actual --unit g
+#    python grid_intensity.py reprice --db sqlite:app.db --profile grid-profiles/gb-2024
+#    python grid_intensity.py reprice --db mysql --profile grid-profiles/gb-2024 --out repriced.csv
+#
+#  Author: Finlay Shaw
+# =============================================================================
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+STEP_SECONDS = 1800  # half-hourly settlement periods
+UNIT = "kg CO2e/kWh"
+UNIT_SCALE = {"g": 1e-3, "kg": 1.0}  # CSV unit -> kg CO2e per kWh
+ELECTRICITY_CATEGORIES = ("uk_electricity", "uk_electricity_for_evs")
+CHUNK_ROWS = 500_000
+
+
+# =========================
+# Times
+# =========================
+def epoch_seconds(times) -> np.ndarray:
+    """UTC epoch seconds (int64) for datetime64s, datetimes or 'YYYY-MM-DD HH:MM:SS' strings."""
+    values = np.asarray(times)
+    if values.dtype.kind != "M":
+        values = values.astype("datetime64[s]")
+    return values.astype("datetime64[s]").astype(np.int64)
+
+
+# =========================
+# Profiles
+# =========================
+class GridProfile:
+    """Dense intensity array (kg CO2e/kWh) starting at `start` (epoch s), one value per `step` seconds."""
+
+    def __init__(self, values, start, step=STEP_SECONDS, source=""):
+        self.values = values
+        self.start = int(start)
+        self.step = int(step)
+        self.source = source
+
+    @staticmethod
+    def paths(path):
+        path = Path(path)
+        base = path.with_suffix("") if path.suffix in (".npy", ".json") else path
+        return base.with_suffix(".npy"), base.with_suffix(".json")
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """Open <path>.npy / <path>.json; the array is memory-mapped unless mmap=False."""
+        npy, meta_path = cls.paths(path)
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        if meta.get("unit", UNIT) != UNIT:
+            raise ValueError(f"{meta_path}: unit {meta['unit']!r}, expected {UNIT!r}")
+        values = np.load(npy, mmap_mode="r" if mmap else None)
+        return cls(values, epoch_seconds([meta["start"].rstrip("Z")])[0], meta.get("step_seconds", STEP_SECONDS),
+                   meta.get("source", ""))
+
+    def save(self, path):
+        npy, meta_path = self.paths(path)
+        npy.parent.mkdir(parents=True, exist_ok=True)
+        np.save(npy, np.asarray(self.values, dtype=np.float32))
+        meta = {
+            "start": str(np.datetime64(self.start, "s")) + "Z",
+            "end": str(np.datetime64(self.start + len(self) * self.step, "s")) + "Z",
+            "step_seconds": self.step,
+            "unit": UNIT,
+            "points": len(self),
+            "gaps": int(np.isnan(self.values).sum()),
+            "source": self.source,
+        }
+        meta_path.write_text(json.dumps(meta, indent=2) + "\n", encoding="utf-8")
+        return npy, meta_path
+
+    def __len__(self):
+        return len(self.values)
+
+    def intensity_at(self, seconds) -> np.ndarray:
+        """Intensity (float64) for each epoch second; NaN outside the profile or in a gap."""
+        idx = (np.asarray(seconds, dtype=np.int64) - self.start) // self.step
+        inside = (idx >= 0) & (idx < len(self))
+        out = np.full(idx.shape, np.nan)
+        out[inside] = self.values[idx[inside]]
+        return out
+
+
+def import_profile(csv_path, dest, time_column="datetime", value_column="intensity", unit="g") -> GridProfile:
+    """
+    CSV of readings -> half-hourly GridProfile saved at `dest`. Times are
+    parsed as UTC (offsets honoured), floored to the half hour and averaged
+    within it; missing half hours are stored as NaN.
+    """
+    df = pd.read_csv(csv_path, usecols=[time_column, value_column])
+    times = pd.to_datetime(df[time_column], utc=True).dt.tz_localize(None).dt.floor(f"{STEP_SECONDS}s")
+    readings = pd.to_numeric(df[value_column], errors="coerce") * UNIT_SCALE[unit]
+    per_slot = readings.groupby(times).mean().dropna()
+    if per_slot.empty:
+        raise ValueError(f"No readings in {csv_path} ({time_column!r}, {value_column!r})")
+
+    seconds = epoch_seconds(per_slot.index.to_numpy())
+    start = seconds[0]
+    values = np.full((seconds[-1] - start) // STEP_SECONDS + 1, np.nan, dtype=np.float32)
+    values[(seconds - start) // STEP_SECONDS] = per_slot.to_numpy()
+    profile = GridProfile(values, start, STEP_SECONDS, source=Path(csv_path).name)
+    profile.save(dest)
+    return profile
+
+
+# =========================
+# Electricity shares
+# =========================
+def electricity_shares(registry, model, base) -> dict:
+    """
+    {activity id: share of its factor that is grid electricity} for ids
+    with any electricity; `base` is the (electricity, gas, water) factors
+    the household activities were generated with.
+    """
+    shares = {f.id: 1.0 for f in registry if f.category in ELECTRICITY_CATEGORIES}
+    electricity = np.float64(base[0]) * model.usage[:, 0]
+    factors = model.factors(*base)
+    for activity_id, part, factor in zip(model.ids, electricity, factors):
+        if part > 0 and factor > 0:
+            shares[activity_id] = float(part / factor)
+    return shares
+
+
+class GridRepricer:
+    """Prices batches of (activity id, quantity, logged factor, time) against a GridProfile."""
+
+    def __init__(self, profile: GridProfile, shares: dict, flat_electricity: float):
+        self.profile = profile
+        self.shares = shares
+        self.flat = float(flat_electricity)
+        self._ids = pd.Index(list(shares), dtype=object)
+        self._share = np.append(np.fromiter(shares.values(), dtype=np.float64, count=len(shares)), 0.0)
+
+    @classmethod
+    def from_sources(cls, profile, registry=None, model=None, base=None):
+        """Shares from the generated modules, household assumptions and DEFRA base factors."""
+        import general_activities as ga
+        from factor_registry import FactorRegistry
+        from household_scenarios import HouseholdModel
+
+        registry = FactorRegistry.from_modules() if registry is None else registry
+        model = HouseholdModel.load() if model is None else model
+        base = ga.base_factors(ga.load_defra()) if base is None else base
+        return cls(profile, electricity_shares(registry, model, base), base[0])
+
+    def categories(self, registry) -> list:
+        """Categories holding any electricity-based id (to narrow a query)."""
+        return sorted({registry[a].category for a in self.shares if a in registry})
+
+    def share_of(self, activity_ids) -> np.ndarray:
+        """Electricity share per row (0 for ids without electricity)."""
+        codes, uniques = pd.factorize(np.asarray(activity_ids, dtype=object))
+        positions = self._ids.get_indexer(uniques)  # -1 -> trailing 0.0
+        return self._share[positions][codes]
+
+    def reprice(self, activity_ids, quantities, emission_factors, occurred_at) -> np.ndarray:
+        """Time-resolved kg CO2e per row (unrounded); rows without electricity keep quantity * factor."""
+        share = self.share_of(activity_ids)
+        ratio = self.profile.intensity_at(epoch_seconds(occurred_at)) / self.flat
+        ratio[np.isnan(ratio)] = 1.0
+        flat = np.asarray(quantities, dtype=np.float64) * np.asarray(emission_factors, dtype=np.float64)
+        return flat * (1.0 + share * (ratio - 1.0))
+
+
+# =========================
+# Database
+# =========================
+def iter_activity_chunks(db, categories, since=None, until=None, chunk_rows=CHUNK_ROWS):
+    """user_activities rows in `categories` as DataFrames, keyset-paged by id."""
+    columns = ["id", "user_id", "activity_id", "quantity", "emission_factor", "occurred_at"]
+    where = [f"category IN ({', '.join([db.ph] * len(categories))})"]
+    params = list(categories)
+    if since:
+        where.append(f"occurred_at >= {db.ph}")
+        params.append(since)
+    if until:
+        where.append(f"occurred_at < {db.ph}")
+        params.append(until)
+    sql = (f"SELECT {', '.join(columns)} FROM user_activities WHERE {' AND '.join(where)} "
+           f"AND id > {db.ph} ORDER BY id LIMIT {int(chunk_rows)}")
+    last_id = 0
+    while True:
+        rows = db.query(sql, (*params, last_id))
+        if not rows:
+            return
+        yield pd.DataFrame(rows, columns=columns)
+        last_id = rows[-1][0]
+
+
+def reprice_db(db, repricer, registry, since=None, until=None, out=None, chunk_rows=CHUNK_ROWS):
+    """Reprice electricity-based user_activities; returns (rows, flat kg, time-resolved kg, query s, price s)."""
+    rows, flat_kg, timed_kg, query_s, price_s = 0, 0.0, 0.0, 0.0, 0.0
+    header = True
+    chunks = iter_activity_chunks(db, repricer.categories(registry), since, until, chunk_rows)
+    while True:
+        t = time.perf_counter()
+        chunk = next(chunks, None)
+        query_s += time.perf_counter() - t
+        if chunk is None:
+            break
+        t = time.perf_counter()
+        timed = repricer.reprice(chunk["activity_id"], chunk["quantity"], chunk["emission_factor"],
+                                 chunk["occurred_at"])
+        price_s += time.perf_counter() - t
+        flat = chunk["quantity"].to_numpy(dtype=np.float64) * chunk["emission_factor"].to_numpy(dtype=np.float64)
+        rows += len(chunk)
+        flat_kg += float(flat.sum())
+        timed_kg += float(timed.sum())
+        if out:
+            chunk.assign(flat_kg_co2e=flat.round(3), repriced_kg_co2e=timed.round(3)).to_csv(
+                out, mode="w" if header else "a", header=header, index=False)
+            header = False
+    return rows, flat_kg, timed_kg, query_s, price_s
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Half-hourly grid intensity profiles and repricing.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    imp = sub.add_parser("import", help="Convert a CSV of intensity readings to a profile.")
+    imp.add_argument("csv")
+    imp.add_argument("dest", help="Profile path without extension (writes .npy and .json)")
+    imp.add_argument("--time-column", default="datetime")
+    imp.add_argument("--value-column", default="intensity")
+    imp.add_argument("--unit", choices=sorted(UNIT_SCALE), default="g", help="CSV unit: g or kg CO2e per kWh")
+
+    rep = sub.add_parser("reprice", help="Reprice user_activities against a profile.")
+    rep.add_argument("--db", required=True, help="'mysql' or 'sqlite:<path>'")
+    rep.add_argument("--profile", required=True)
+    rep.add_argument("--since", help="occurred_at lower bound (UTC, inclusive)")
+    rep.add_argument("--until", help="occurred_at upper bound (UTC, exclusive)")
+    rep.add_argument("--out", help="Write per-row flat and repriced kg CO2e to this CSV")
+    rep.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    args = parser.parse_args(argv)
+
+    if args.command == "import":
+        profile = import_profile(args.csv, args.dest, args.time_column, args.value_column, args.unit)
+        values = np.asarray(profile.values)
+        print(f"{len(profile):,} half hours from {np.datetime64(profile.start, 's')} UTC, "
+              f"{int(np.isnan(values).sum()):,} gaps, mean {np.nanmean(values):.4f} {UNIT} -> {args.dest}.npy")
+        return profile
+
+    from db import connect
+    from factor_registry import FactorRegistry
+
+    registry = FactorRegistry.from_modules()
+    repricer = GridRepricer.from_sources(GridProfile.load(args.profile), registry=registry)
+    db = connect(args.db)
+    try:
+        rows, flat_kg, timed_kg, query_s, price_s = reprice_db(db, repricer, registry, args.since, args.until,
+                                                               args.out, args.chunk_rows)
+    finally:
+        db.close()
+    change = (timed_kg / flat_kg - 1) * 100 if flat_kg else 0.0
+    print(f"{rows:,} rows in {', '.join(repricer.categories(registry))}")
+    print(f"  flat {flat_kg:,.3f} kg CO2e -> time-resolved {timed_kg:,.3f} kg CO2e ({change:+.2f}%)")
+    print(f"  query {query_s:.2f}s, pricing {price_s:.2f}s"
+          + (f" ({rows / price_s:,.0f} rows/s)" if price_s else ""))
+    return rows, flat_kg, timed_kg
+
+
+if __name__ == "__main__":
+    main()
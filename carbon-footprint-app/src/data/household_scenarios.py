@@ -0,0 +1,127 @@
+# =============================================================================
+#  Module: household_scenarios.py
+#
+#  Description:
+#  Household activity factors (generalActivities.js) as a declarative
+#  assumptions table, "household-assumptions.csv": one row per activity with
+#  the electricity kWh, gas kWh and litres of water it uses per unit, plus
+#  the notes behind those numbers. An activity's factor is
+#
+#      electricity_kwh * electricity + gas_kwh * gas + water_litres * water
+#
+#  so the whole catalogue is one matrix product, usage (N x 3) against a
+#  vector of base factors (3). Passing a (S x 3) matrix of base factors
+#  evaluates S what-if scenarios (other grid factors, regions) in one call;
+#  per-scenario usage multipliers cover appliance assumptions.
+#
+#  The product is accumulated term by term in the order above rather than
+#  through BLAS, whose fused multiply-adds can differ in the last bit; so
+#  with DEFRA's base factors the defaults reproduce generalActivities.js
+#  exactly, unrounded values included.
+#
+#  Usage (from src/data):
+#    python household_scenarios.py --electricity 0.12 0.2 --gas 0.18 --water 0.0003
+#
+#  Author: Finlay Shaw
+# =============================================================================
+
+import argparse
+import itertools
+
+import numpy as np
+import pandas as pd
+
+ASSUMPTIONS_CSV = "household-assumptions.csv"
+BASE_FACTORS = ("electricity", "gas", "water")  # order of general_activities.base_factors()
+USAGE_COLUMNS = ("electricity_kwh", "gas_kwh", "water_litres")
+
+
+def load_assumptions(path=ASSUMPTIONS_CSV) -> pd.DataFrame:
+    """Read the assumptions table; blank usage cells mean 0."""
+    df = pd.read_csv(path)
+    missing = [c for c in ("id", "activity", "unit", "source", *USAGE_COLUMNS) if c not in df.columns]
+    if missing:
+        raise KeyError(f"Assumption columns missing from {path}: {missing}")
+    if df["id"].duplicated().any():
+        raise ValueError(f"Duplicate activity ids in {path}: {sorted(df.loc[df['id'].duplicated(), 'id'])}")
+    df[list(USAGE_COLUMNS)] = df[list(USAGE_COLUMNS)].fillna(0.0).astype("float64")
+    return df
+
+
+class HouseholdModel:
+    """Activity ids, labels and an (N x 3) usage matrix; factors are usage @ base."""
+
+    def __init__(self, table: pd.DataFrame):
+        self.table = table.reset_index(drop=True)
+        self.ids = self.table["id"].tolist()
+        self.usage = np.ascontiguousarray(self.table[list(USAGE_COLUMNS)].to_numpy(dtype=np.float64))
+        self._index = {activity_id: i for i, activity_id in enumerate(self.ids)}
+
+    @classmethod
+    def load(cls, path=ASSUMPTIONS_CSV):
+        return cls(load_assumptions(path))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def index_of(self, activity_id) -> int:
+        return self._index[activity_id]
+
+    def factors(self, electricity, gas, water) -> np.ndarray:
+        """Emission factor per activity (N,) for one set of base factors."""
+        return self.scenarios([[electricity, gas, water]])[0]
+
+    def scenarios(self, base, usage_scale=None) -> np.ndarray:
+        """
+        Factors for S scenarios in one product: base is (S, 3) base factors,
+        usage_scale an optional (N,) or (S, N) multiplier on each activity's
+        usage (e.g. a more efficient dishwasher). Returns (S, N).
+        """
+        base = np.asarray(base, dtype=np.float64)
+        if base.ndim != 2 or base.shape[1] != len(BASE_FACTORS):
+            raise ValueError(f"base must be (S, {len(BASE_FACTORS)}), got {base.shape}")
+        out = np.multiply.outer(base[:, 0], self.usage[:, 0])
+        for k in range(1, len(BASE_FACTORS)):
+            out += np.multiply.outer(base[:, k], self.usage[:, k])
+        if usage_scale is not None:
+            out *= usage_scale
+        return out
+
+    def with_usage(self, changes) -> "HouseholdModel":
+        """Copy with {activity id: {usage column: value}} applied (appliance what-ifs)."""
+        table = self.table.copy()
+        for activity_id, values in changes.items():
+            for col, value in values.items():
+                if col not in USAGE_COLUMNS:
+                    raise KeyError(f"Unknown usage column {col!r} (expected one of {USAGE_COLUMNS})")
+                table.loc[self.index_of(activity_id), col] = float(value)
+        return HouseholdModel(table)
+
+    def activities(self, electricity, gas, water):
+        """Activity dicts in generalActivities.js order and layout (before finalise)."""
+        # numpy scalars, as the hand-written expressions gave: finalise() rounds with them
+        factors = list(self.factors(electricity, gas, water))
+        return [
+            {"id": row.id, "activity": row.activity, "unit": row.unit, "emissionFactor": ef, "source": row.source}
+            for row, ef in zip(self.table.itertuples(index=False), factors)
+        ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Household activity factors for a grid of base factors.")
+    for name in BASE_FACTORS:
+        parser.add_argument(f"--{name}", type=float, nargs="+", required=True,
+                            help=f"{name} factor(s) (kg CO2e per {'litre' if name == 'water' else 'kWh'})")
+    parser.add_argument("--assumptions", default=ASSUMPTIONS_CSV)
+    args = parser.parse_args(argv)
+
+    model = HouseholdModel.load(args.assumptions)
+    base = np.array(list(itertools.product(args.electricity, args.gas, args.water)))
+    table = pd.DataFrame(model.scenarios(base).T.round(6), index=model.ids,
+                         columns=[f"e={e:g} g={g:g} w={w:g}" for e, g, w in base])
+    print(table.to_string())
+    return table
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,465 @@
+# =============================================================================
+#  Script: index_advisor.py
+#
+#  Description:
+#  Replays the SQL that summary.php, daily.php, recent.php and
+#  leaderboard.php issue against a local database and compares candidate
+#  composite indexes on user_activities (which has only fk_user_activity_user).
+#
+#  For each index configuration (none, each candidate, then greedy
+#  combinations of the ones that help) it:
+#    - creates the indexes and refreshes optimizer statistics
+#    - captures the query plan of every endpoint query (EXPLAIN QUERY PLAN on
+#      SQLite, EXPLAIN on MariaDB)
+#    - times the same seeded request mix (users weighted by how much they
+#      log, the Dashboard / Summary date ranges, with and without category)
+#      and reports p50 / p95 / p99
+#    - times a batch insert, so the write cost of each index shows too
+#  and repeats the mix and the insert --runs times, keeping the median.
+#
+#  A candidate is kept when its net gain clears MIN_GAIN: the drop in the
+#  (median) geometric mean of p95 over all endpoint queries, less
+#  WRITE_WEIGHT x the drop in insert rows/s it causes. The report
+#  (markdown) and the MariaDB migration for the kept indexes are written
+#  to files.
+#
+#  The candidates are dropped while measuring; any that existed beforehand
+#  (e.g. from an earlier user_activities_indexes.sql) are re-created on
+#  exit. As this is DDL, a MariaDB target also needs --allow-ddl: point it
+#  at a copy, not the live database.
+#
+#  With --users, an empty SQLite database is first filled with
+#  workload_generator (same seed, same data).
+#
+#  Usage (from src/data):
+#    python index_advisor.py --db sqlite:synthetic.db --users 3000
+#    python index_advisor.py --db mysql --allow-ddl --report report.md --migration indexes.sql
+#
+#  Author: Finlay Shaw
+# =============================================================================
+
+import argparse
+import math
+import random
+import re
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from db import USER_ACTIVITY_COLUMNS, connect
+from workload_generator import DatabaseSink, generate
+
+SEED = 42
+REPS = 200
+RUNS = 3            # passes over the mix per configuration; medians are compared
+MIN_GAIN = 0.05
+WRITE_WEIGHT = 1.0  # read gain given up per unit of insert-rate loss
+WRITE_ROWS = 5_000
+
+# Candidate indexes on user_activities: name -> columns
+CANDIDATES = {
+    "idx_ua_user_time": ("user_id", "occurred_at"),
+    "idx_ua_user_cat_time": ("user_id", "category", "occurred_at"),
+    "idx_ua_user_time_cover": ("user_id", "occurred_at", "category", "emissions_kg_co2e"),
+    "idx_ua_time": ("occurred_at",),
+}
+
+# =========================
+# Endpoint SQL (as issued by carbon_app_api/*.php; {cat} = optional category filter)
+# =========================
+CATEGORY_FILTER = " AND category = :category"
+
+SUMMARY_TOTAL = """
+SELECT ROUND(COALESCE(SUM(emissions_kg_co2e), 0), 3) AS total_kg
+FROM user_activities
+WHERE user_id = :uid AND occurred_at >= :from AND occurred_at < :to{cat}"""
+
+SUMMARY_BY_CATEGORY = """
+SELECT category AS label, ROUND(SUM(emissions_kg_co2e), 3) AS value
+FROM user_activities
+WHERE user_id = :uid AND occurred_at >= :from AND occurred_at < :to{cat}
+GROUP BY category ORDER BY value DESC"""
+
+SUMMARY_BY_ACTIVITY = """
+SELECT activity_id, activity_name AS label, ROUND(SUM(emissions_kg_co2e), 3) AS value
+FROM user_activities
+WHERE user_id = :uid AND occurred_at >= :from AND occurred_at < :to{cat}
+GROUP BY activity_id, activity_name ORDER BY value DESC"""
+
+DAILY = """
+SELECT DATE(occurred_at) AS day, ROUND(SUM(emissions_kg_co2e), 3) AS total_kg, COUNT(*) AS entries
+FROM user_activities
+WHERE user_id = :uid AND occurred_at >= :from AND occurred_at < :to{cat}
+GROUP BY day ORDER BY day"""
+
+RECENT = """
+SELECT id, category, activity_id, activity_name, ROUND(emissions_kg_co2e, 3) AS emissions_kg_co2e, occurred_at
+FROM user_activities
+WHERE user_id = :uid{cat}
+ORDER BY occurred_at DESC, id DESC LIMIT :lim"""
+
+# leaderboard.php (its unique-per-occurrence placeholders folded into one name each)
+LEADERBOARD_SCOPES = {
+    "friends": "(u.id = :me OR EXISTS (SELECT 1 FROM v_user_friends vf WHERE vf.user_id = :me AND vf.friend_id = u.id))",
+    "global": "u.privacy_public = 1",
+}
+LEADERBOARD_BLOCKS = ("NOT EXISTS (SELECT 1 FROM blocks b WHERE (b.blocker_id = :me AND b.blocked_id = u.id) "
+                      "OR (b.blocker_id = u.id AND b.blocked_id = :me))")
+LEADERBOARD = """
+SELECT c.id, c.name,
+  COALESCE((ag.total_kg / NULLIF(ag.active_days, 0)) * :wd, 0) AS total_kg,
+  COALESCE((agp.total_kg / NULLIF(agp.active_days, 0)) * :wd, 0) AS prev_total_kg,
+  COALESCE(ag.active_days, 0) AS active_days
+FROM (SELECT u.id, u.name FROM users u WHERE {scope} AND {blocks}) AS c
+LEFT JOIN (
+  SELECT d.user_id, SUM(d.kg) AS total_kg, COUNT(*) AS active_days FROM (
+    SELECT a.user_id, DATE(a.occurred_at) AS d, SUM(a.emissions_kg_co2e) AS kg FROM user_activities a
+    WHERE a.occurred_at >= :start AND a.occurred_at < :end{cat_a}
+      AND a.user_id IN (SELECT u.id FROM users u WHERE {scope} AND {blocks})
+    GROUP BY a.user_id, DATE(a.occurred_at)) AS d
+  GROUP BY d.user_id) AS ag ON ag.user_id = c.id
+LEFT JOIN (
+  SELECT dp.user_id, SUM(dp.kg) AS total_kg, COUNT(*) AS active_days FROM (
+    SELECT ap.user_id, DATE(ap.occurred_at) AS d, SUM(ap.emissions_kg_co2e) AS kg FROM user_activities ap
+    WHERE ap.occurred_at >= :pstart AND ap.occurred_at < :pend{cat_p}
+      AND ap.user_id IN (SELECT u.id FROM users u WHERE {scope} AND {blocks})
+    GROUP BY ap.user_id, DATE(ap.occurred_at)) AS dp
+  GROUP BY dp.user_id) AS agp ON agp.user_id = c.id
+WHERE COALESCE(ag.active_days, 0) >= :min_active
+ORDER BY total_kg ASC, c.name ASC
+LIMIT :lim"""
+
+
+def leaderboard_sql(scope, category=False):
+    cat = " AND {}.category = :category"
+    return LEADERBOARD.format(scope=LEADERBOARD_SCOPES[scope], blocks=LEADERBOARD_BLOCKS,
+                              cat_a=cat.format("a") if category else "", cat_p=cat.format("ap") if category else "")
+
+
+def endpoint_queries():
+    """(name, sql, kind) for every endpoint query and its category variant."""
+    out = []
+    for name, template, kind in (("summary_total", SUMMARY_TOTAL, "range"),
+                                 ("summary_by_category", SUMMARY_BY_CATEGORY, "range"),
+                                 ("summary_by_activity", SUMMARY_BY_ACTIVITY, "range"),
+                                 ("daily", DAILY, "range"),
+                                 ("recent", RECENT, "recent")):
+        out.append((name, template.format(cat=""), kind))
+        out.append((f"{name}+category", template.format(cat=CATEGORY_FILTER), kind))
+    for scope in ("friends", "global"):
+        out.append((f"leaderboard_{scope}", leaderboard_sql(scope), "leaderboard"))
+    return out
+
+
+def bind(db, sql):
+    """:name placeholders -> the driver's named style."""
+    return sql if db.dialect == "sqlite" else re.sub(r":(\w+)", r"%(\1)s", sql)
+
+
+# =========================
+# Request mix
+# =========================
+def windows(anchor):
+    """Date ranges the Dashboard / Summary pages request, ending around `anchor`."""
+    day = anchor.replace(hour=0, minute=0, second=0, microsecond=0)
+    week = day - timedelta(days=day.weekday())
+    month = day.replace(day=1)
+    return [
+        (day, day + timedelta(days=1)),
+        (week, week + timedelta(days=7)),
+        (month, (month + timedelta(days=32)).replace(day=1)),
+        (day.replace(month=1, day=1), day + timedelta(days=1)),
+        (datetime(1970, 1, 1), datetime(2100, 1, 1)),
+    ]
+
+
+def leaderboard_params(anchor, rng):
+    start, end = rng.choice(windows(anchor)[1:4])
+    days = (end - start).days
+    fmt = "%Y-%m-%d %H:%M:%S"
+    return {"wd": days, "start": start.strftime(fmt), "end": end.strftime(fmt),
+            "pstart": (start - timedelta(days=days)).strftime(fmt), "pend": start.strftime(fmt),
+            "min_active": math.ceil(days * 0.3333), "lim": 50}
+
+
+def request_mix(db, reps, seed=SEED):
+    """{query name: [params, ...]}, the same for every configuration."""
+    rng = random.Random(seed)
+    counts = db.query("SELECT user_id, COUNT(*) FROM user_activities GROUP BY user_id")
+    if not counts:
+        raise SystemExit("user_activities is empty - fill it first (e.g. --users 3000)")
+    users, weights = zip(*counts)
+    categories = [r[0] for r in db.query("SELECT DISTINCT category FROM user_activities")]
+    anchor = datetime.fromisoformat(str(db.query("SELECT MAX(occurred_at) FROM user_activities")[0][0]))
+    fmt = "%Y-%m-%d %H:%M:%S"
+    mix = {}
+    for name, _, kind in endpoint_queries():
+        n = reps if kind != "leaderboard" else max(5, reps // 20)
+        params = []
+        for _ in range(n):
+            p = {"uid": rng.choices(users, weights)[0]}
+            if kind == "range":
+                start, end = rng.choice(windows(anchor - timedelta(days=rng.randrange(60))))
+                p.update({"from": start.strftime(fmt), "to": end.strftime(fmt)})
+            elif kind == "recent":
+                p["lim"] = rng.choice([5, 5, 10, 20])
+            else:
+                p = {"me": p["uid"], **leaderboard_params(anchor, rng)}
+            if name.endswith("+category"):
+                p["category"] = rng.choice(categories)
+            params.append(p)
+        mix[name] = params
+    return mix
+
+
+# =========================
+# Measurement
+# =========================
+def create_indexes(db, names):
+    for name in names:
+        cols = ", ".join(CANDIDATES[name])
+        if db.dialect == "sqlite":
+            db.execute(f"CREATE INDEX IF NOT EXISTS {name} ON user_activities ({cols})").close()
+        else:
+            db.execute(f"CREATE INDEX IF NOT EXISTS `{name}` ON `user_activities` ({cols})").close()
+    db.execute("ANALYZE" if db.dialect == "sqlite" else "ANALYZE TABLE user_activities").close()
+    db.commit()
+
+
+def drop_indexes(db, names):
+    for name in names:
+        if db.dialect == "sqlite":
+            db.execute(f"DROP INDEX IF EXISTS {name}").close()
+        else:
+            db.execute(f"DROP INDEX IF EXISTS `{name}` ON `user_activities`").close()
+    db.commit()
+
+
+def existing_indexes(db, names):
+    """CREATE statements for those of `names` that exist on user_activities now."""
+    if db.dialect == "sqlite":
+        rows = db.query("SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = 'user_activities'")
+        return [sql for name, sql in rows if name in names and sql]
+    rows = db.query(
+        "SELECT INDEX_NAME, NON_UNIQUE, COLUMN_NAME, SUB_PART FROM information_schema.STATISTICS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'user_activities' ORDER BY INDEX_NAME, SEQ_IN_INDEX")
+    found = {}
+    for name, non_unique, column, sub_part in rows:
+        if name in names:
+            unique = "" if int(non_unique) else "UNIQUE "
+            found.setdefault(name, [unique, []])[1].append(f"`{column}`" + (f"({sub_part})" if sub_part else ""))
+    return [f"CREATE {unique}INDEX `{name}` ON `user_activities` ({', '.join(cols)})"
+            for name, (unique, cols) in found.items()]
+
+
+def restore_indexes(db, statements):
+    """Drop whatever candidates are left and re-create the indexes that were there at the start."""
+    db.conn.rollback()
+    drop_indexes(db, CANDIDATES)
+    for sql in statements:
+        db.execute(sql).close()
+    db.commit()
+
+
+def explain(db, sql, params):
+    if db.dialect == "sqlite":
+        return [row[3] for row in db.query("EXPLAIN QUERY PLAN " + sql, params)]
+    cur = db.execute("EXPLAIN " + bind(db, sql), params)
+    cols = [c[0] for c in cur.description]
+    rows = cur.fetchall()
+    cur.close()
+    keep = ("table", "type", "key", "rows", "Extra")
+    return [" ".join(f"{k}={r[cols.index(k)]}" for k in keep if k in cols) for r in rows]
+
+
+def percentiles(ms):
+    q = statistics.quantiles(ms, n=100) if len(ms) > 1 else ms * 99
+    return {"p50": statistics.median(ms), "p95": q[94], "p99": q[98]}
+
+
+def write_cost(db, rows=WRITE_ROWS):
+    """Rows/s for one batch insert (rolled back), to show what each index costs writers."""
+    sample = db.query(f"SELECT {', '.join(USER_ACTIVITY_COLUMNS)} FROM user_activities LIMIT {int(rows)}")
+    t = time.perf_counter()
+    db.insert_rows("user_activities", USER_ACTIVITY_COLUMNS, sample)
+    seconds = time.perf_counter() - t
+    db.conn.rollback()
+    return len(sample) / seconds if seconds else 0.0
+
+
+def run_mix(db, mix):
+    """One pass over the mix: {query name: percentiles}."""
+    out = {}
+    for name, sql, _ in endpoint_queries():
+        params = mix[name]
+        for p in params[:3]:  # warm the cache
+            db.query(bind(db, sql), p)
+        ms = []
+        for p in params:
+            t = time.perf_counter()
+            db.query(bind(db, sql), p)
+            ms.append((time.perf_counter() - t) * 1e3)
+        out[name] = percentiles(ms)
+    return out
+
+
+def measure(db, indexes, mix, runs=RUNS):
+    """
+    Create `indexes`, capture plans, then time the mix and an insert `runs`
+    times; per-query percentiles and the insert rate are the medians over
+    the runs. Drops the indexes again.
+    """
+    t = time.perf_counter()
+    create_indexes(db, indexes)
+    result = {"indexes": tuple(indexes), "build_s": time.perf_counter() - t, "queries": {}}
+    passes, writes = [], []
+    for _ in range(runs):
+        passes.append(run_mix(db, mix))
+        writes.append(write_cost(db))
+    for name, sql, _ in endpoint_queries():
+        result["queries"][name] = {"plan": explain(db, sql, mix[name][0]),
+                                   **{k: statistics.median(p[name][k] for p in passes) for k in ("p50", "p95", "p99")}}
+    result["geomean_runs"] = [_geomean(p) for p in passes]
+    result["write_rows_s"] = statistics.median(writes)
+    drop_indexes(db, indexes)
+    return result
+
+
+def _geomean(queries):
+    return math.exp(statistics.fmean(math.log(max(q["p95"], 1e-6)) for q in queries.values()))
+
+
+def geomean_p95(result):
+    """Median over the runs of the geometric mean of p95 across endpoint queries."""
+    return statistics.median(result["geomean_runs"])
+
+
+def net_gain(trial, base, write_weight=WRITE_WEIGHT):
+    """Relative read gain of `trial` over `base`, less write_weight x its relative insert-rate loss."""
+    read = 1 - geomean_p95(trial) / geomean_p95(base)
+    write_loss = max(0.0, 1 - trial["write_rows_s"] / base["write_rows_s"]) if base["write_rows_s"] else 0.0
+    return read - write_weight * write_loss
+
+
+def advise(db, mix, candidates=CANDIDATES, min_gain=MIN_GAIN, runs=RUNS, write_weight=WRITE_WEIGHT, log=print):
+    """
+    Baseline, each candidate, then greedy additions; returns (results, kept
+    index names). Each step adds the candidate with the best net gain over
+    the current set, if that gain is at least min_gain.
+    """
+    best = None
+
+    def run(indexes):
+        r = measure(db, indexes, mix, runs)
+        spread = f"{min(r['geomean_runs']):.3f}-{max(r['geomean_runs']):.3f}"
+        gain = f"  net gain {net_gain(r, best, write_weight):+.1%}" if best else ""
+        log(f"  {label(indexes):<60} geomean p95 {geomean_p95(r):8.3f} ms ({spread})  "
+            f"insert {r['write_rows_s']:>9,.0f} rows/s{gain}  (index build {r['build_s']:.1f}s)")
+        return r
+
+    results = [run([])]
+    kept, best = [], results[0]
+    remaining = list(candidates)
+    while remaining:
+        trials = [run(kept + [c]) for c in remaining]
+        results += trials
+        trial = max(trials, key=lambda r: net_gain(r, best, write_weight))
+        if net_gain(trial, best, write_weight) < min_gain:
+            break
+        best = trial
+        kept = list(trial["indexes"])
+        remaining = [c for c in remaining if c not in kept]
+    return results, kept
+
+
+def label(indexes):
+    return " + ".join(indexes) if indexes else "(no extra index)"
+
+
+# =========================
+# Output
+# =========================
+def render_report(target, stats, results, kept):
+    lines = [f"# user_activities index advisor: {target}", "",
+             f"{stats['activities']:,} activities, {stats['users']:,} users; p50 / p95 / p99 in ms.", ""]
+    configs = [r for r in results if len(r["indexes"]) <= 1] + [r for r in results if len(r["indexes"]) > 1]
+    lines.append("| query | " + " | ".join(label(r["indexes"]) for r in configs) + " |")
+    lines.append("|---" * (len(configs) + 1) + "|")
+    for name in results[0]["queries"]:
+        cells = [" / ".join(f"{r['queries'][name][k]:.2f}" for k in ("p50", "p95", "p99")) for r in configs]
+        lines.append(f"| {name} | " + " | ".join(cells) + " |")
+    lines.append("| geomean p95 (median run) | " + " | ".join(f"{geomean_p95(r):.3f}" for r in configs) + " |")
+    lines.append("| geomean p95 range | " + " | ".join(
+        f"{min(r['geomean_runs']):.3f}-{max(r['geomean_runs']):.3f}" for r in configs) + " |")
+    lines.append("| insert rows/s | " + " | ".join(f"{r['write_rows_s']:,.0f}" for r in configs) + " |")
+    lines += ["", f"Kept: {label(kept)}", "", "## Query plans", ""]
+    for name in results[0]["queries"]:
+        lines.append(f"### {name}")
+        for r in configs:
+            lines.append(f"- {label(r['indexes'])}: " + "; ".join(r["queries"][name]["plan"]))
+        lines.append("")
+    return "\n".join(lines)
+
+
+def render_migration(kept, target):
+    if not kept:
+        return f"-- index_advisor.py ({target}): no candidate index paid for itself; nothing to add.\n"
+    adds = ",\n".join(f"  ADD KEY `{name}` ({', '.join(f'`{c}`' for c in CANDIDATES[name])})" for name in kept)
+    return (f"-- Generated by index_advisor.py from {target}\n"
+            f"-- Composite indexes for the summary / daily / recent / leaderboard queries.\n"
+            f"-- Any of them leading with user_id also serves fk_user_activity_user.\n"
+            f"ALTER TABLE `user_activities`\n{adds};\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark endpoint queries and candidate indexes on user_activities.")
+    parser.add_argument("--db", required=True, help="'mysql' (DB_* env settings) or 'sqlite:<path>'")
+    parser.add_argument("--users", type=int, default=0, help="first fill an empty database with this many synthetic users")
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--reps", type=int, default=REPS, help="requests per query and configuration")
+    parser.add_argument("--runs", type=int, default=RUNS, help="passes over the mix per configuration (medians kept)")
+    parser.add_argument("--min-gain", type=float, default=MIN_GAIN,
+                        help="keep an index if its net gain (read gain less weighted insert loss) is this much")
+    parser.add_argument("--write-weight", type=float, default=WRITE_WEIGHT,
+                        help="read gain an index must make up per unit of insert-rate loss")
+    parser.add_argument("--allow-ddl", action="store_true",
+                        help="required for MariaDB targets: indexes are dropped and created while measuring")
+    parser.add_argument("--report", default="index_report.md")
+    parser.add_argument("--migration", default="user_activities_indexes.sql")
+    args = parser.parse_args(argv)
+
+    if not args.db.startswith("sqlite:") and not args.allow_ddl:
+        parser.error("this drops and creates indexes on user_activities; run it against a copy and pass --allow-ddl")
+
+    db = connect(args.db)
+    original = None
+    try:
+        if args.users and not db.query("SELECT 1 FROM user_activities LIMIT 1"):
+            print(f"Generating {args.users} synthetic users ...")
+            generate(DatabaseSink(db), users=args.users, seed=args.seed)
+        stats = {"activities": db.query("SELECT COUNT(*) FROM user_activities")[0][0],
+                 "users": db.query("SELECT COUNT(*) FROM users")[0][0]}
+        original = existing_indexes(db, CANDIDATES)
+        drop_indexes(db, CANDIDATES)
+        mix = request_mix(db, args.reps, args.seed)
+        print(f"{stats['activities']:,} activities, {stats['users']:,} users; "
+              f"{args.reps} requests per query, {args.runs} runs per configuration")
+        results, kept = advise(db, mix, min_gain=args.min_gain, runs=args.runs, write_weight=args.write_weight)
+    finally:
+        if original is not None:
+            restore_indexes(db, original)
+            if original:
+                print(f"Re-created the indexes that were there: {len(original)}")
+        db.close()
+
+    with open(args.report, "w", encoding="utf-8") as f:
+        f.write(render_report(args.db, stats, results, kept))
+    with open(args.migration, "w", encoding="utf-8") as f:
+        f.write(render_migration(kept, args.db))
+    print(f"Kept: {label(kept)}")
+    print(f"Report -> {args.report}, migration -> {args.migration}")
+    return kept
+
+
+if __name__ == "__main__":
+    main()
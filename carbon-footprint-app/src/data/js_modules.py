@@ -0,0 +1,170 @@
+# =============================================================================
+#  Module: js_modules.py
+#
+#  Description:
+#  Shared helpers for writing the Activities/*.js modules: rendering an
+#  activity list in the generators' existing layout, atomic writes that are
+#  skipped when the bytes would not change (so Vite's cache survives), and a
+#  small build-state file recording what each generator last produced.
+#
+#  Author: Finlay Shaw
+# =============================================================================
+
+import filecmp
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+BUILD_STATE = ".build_state.json"
+
+
+# =========================
+# Rendering
+# =========================
+def render_module(var_name, objects, comma_after_last=True) -> str:
+    """`const X = [ ... ]; export default X;` with one json.dumps(indent=2) object per entry."""
+    parts = [f"const {var_name} = [\n"]
+    last = len(objects) - 1
+    for i, obj in enumerate(objects):
+        sep = ",\n" if (comma_after_last or i != last) else "\n"
+        parts.append("  " + json.dumps(obj, indent=2) + sep)
+    parts.append(f"];\n\nexport default {var_name};\n")
+    return "".join(parts)
+
+
+class ModuleStreamWriter:
+    """
+    render_module written incrementally: objects are appended one at a time to
+    a temp file next to `path`, so memory does not grow with the module. On
+    close the file replaces `path` atomically, unless the bytes are unchanged
+    (then `path` is left untouched, as write_if_changed does). fmt="json"
+    writes a plain JSON array in the same layout.
+    """
+
+    def __init__(self, path, var_name, comma_after_last=True, fmt="js"):
+        self.path = Path(path)
+        self.var_name = var_name
+        self.comma_after_last = comma_after_last and fmt == "js"  # JSON has no trailing commas
+        self.fmt = fmt
+        self.count = 0
+        self.changed = None
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, self._tmp = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp")
+        self._f = os.fdopen(fd, "w", encoding="utf-8", newline="")
+        self._f.write(f"const {var_name} = [\n" if fmt == "js" else "[\n")
+
+    def write(self, objects):
+        parts = []
+        for obj in objects:
+            if self.comma_after_last:
+                parts.append("  " + json.dumps(obj, indent=2) + ",\n")
+            else:
+                parts.append((",\n  " if self.count else "  ") + json.dumps(obj, indent=2))
+            self.count += 1
+        self._f.write("".join(parts))
+
+    def close(self) -> bool:
+        """Finish the file; returns True if `path` was (re)written."""
+        if not self.comma_after_last and self.count:
+            self._f.write("\n")
+        self._f.write(f"];\n\nexport default {self.var_name};\n" if self.fmt == "js" else "]\n")
+        self._f.close()
+        if self.path.exists() and filecmp.cmp(self._tmp, self.path, shallow=False):
+            os.unlink(self._tmp)
+            self.changed = False
+        else:
+            os.replace(self._tmp, self.path)
+            self.changed = True
+        return self.changed
+
+    def abort(self):
+        self._f.close()
+        if os.path.exists(self._tmp):
+            os.unlink(self._tmp)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+
+def parse_module(text: str):
+    """Inverse of render_module: module text -> (var_name, list of activity dicts)."""
+    head, _, rest = text.partition(" = [")
+    var_name = head.replace("const", "", 1).strip()
+    body = rest[: rest.rindex("];")].rstrip()
+    if body.endswith(","):
+        body = body[:-1]
+    return var_name, json.loads("[" + body + "]")
+
+
+def read_module(path):
+    with open(path, encoding="utf-8") as f:
+        return parse_module(f.read())
+
+
+def sha256_text(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def sha256_file(path) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+# =========================
+# Writing
+# =========================
+def atomic_write(path, text: str):
+    """Write via a temp file in the same directory, then rename over the target."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            f.write(text)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def write_if_changed(path, text: str) -> bool:
+    """Atomically write `text` unless the file already holds exactly these bytes."""
+    path = Path(path)
+    data = text.encode("utf-8")
+    if path.exists() and path.stat().st_size == len(data) and path.read_bytes() == data:
+        return False
+    atomic_write(path, text)
+    return True
+
+
+# =========================
+# Build state
+# =========================
+def load_state(path=BUILD_STATE) -> dict:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_state(state: dict, path=BUILD_STATE):
+    atomic_write(path, json.dumps(state, indent=2, sort_keys=True) + "\n")
+
+
+def source_fingerprint(*paths) -> str:
+    """Hash of generator source files, so code/config edits invalidate stored content hashes."""
+    h = hashlib.sha256()
+    for p in paths:
+        h.update(Path(p).read_bytes())
+    return h.hexdigest()
@@ -0,0 +1,453 @@
+# =============================================================================
+#  Module: leaderboard.py
+#
+#  Description:
+#  Precomputed leaderboard engine with the semantics of leaderboard.php
+#  (week / month / ytd windows, friends or global scope, blocks excluded in
+#  both directions, filled daily average score, minimum active days, dense
+#  rank), served from memory instead of one correlated query per request.
+#
+#  State:
+#    - per period, per user: current and previous window kg and active days
+#      (numpy arrays), bulk-loaded from the daily rollup (activity_rollups.py)
+#      and kept up to date by apply(), fed with refresh(on_change=...)
+#    - friends and blocks as CSR adjacency (indptr / indices per user),
+#      with per-user added / removed overflow sets on top for edits made
+#      after the build (add_friend, remove_friend, block)
+#    - users added after the build (add_user) are appended past the
+#      id-sorted block and found through an id -> index map
+#    - per (period, min active days): global order of eligible public users
+#      sorted by (score, name); changed users are removed and re-inserted
+#      by binary search instead of re-sorting
+#
+#  Friends lists are the k smallest of me + friends (heapq); global lists
+#  walk the cached order, skipping users blocked either way.
+#
+#  Only activity reaches the engine through refresh(on_change=...). Sign-ups,
+#  new / removed friendships, blocks and privacy changes must be mirrored
+#  with add_user / add_friend / remove_friend / block / set_public by
+#  whoever makes them; unblocks and renames need a rebuild (from_database).
+#  Day changes for users the engine does not know are skipped, counted and
+#  logged by apply().
+#
+#  Usage (from src/data):
+#    python leaderboard.py --db sqlite:app.db --me 42
+#    python leaderboard.py --db mysql --me 42 --period month --scope global --limit 20
+#
+#  Author: Finlay Shaw
+# =============================================================================
+
+import argparse
+import heapq
+import json
+import math
+import time
+from collections import namedtuple
+from datetime import date, datetime, timedelta, timezone
+
+import numpy as np
+
+from activity_rollups import ROLLUPS, ensure_schema, refresh
+from db import connect
+
+PERIODS = ("week", "month", "ytd")
+MIN_ACTIVE_RATIO = 0.3333
+MIN_LIMIT, MAX_LIMIT = 5, 100
+
+# [start, end) and the previous window of the same length, as numpy days
+Window = namedtuple("Window", ["start", "end", "prev_start", "days"])
+
+
+def period_window(period, today) -> Window:
+    """leaderboard.php windows: week from Monday, calendar month, ytd up to and including today."""
+    if period == "month":
+        start = today.replace(day=1)
+        end = (start + timedelta(days=32)).replace(day=1)
+    elif period in ("ytd", "year"):
+        start, end = today.replace(month=1, day=1), today + timedelta(days=1)
+    else:
+        start = today - timedelta(days=today.weekday())
+        end = start + timedelta(days=7)
+    days = (end - start).days
+    start, end = np.datetime64(start, "D"), np.datetime64(end, "D")
+    return Window(start, end, start - days, days)
+
+
+def min_active_days(window_days, min_days=0, ratio=MIN_ACTIVE_RATIO):
+    """Same rule as leaderboard.php: explicit day count, else ceil(window * ratio)."""
+    if min_days > 0:
+        return min(window_days, min_days)
+    return math.ceil(window_days * max(0.0, min(1.0, ratio)))
+
+
+def csr(n, src, dst):
+    """Edge list over user indexes 0..n-1 -> (indptr, indices) with neighbours sorted."""
+    order = np.lexsort((dst, src))
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+    return indptr, dst[order].astype(np.int32)
+
+
+# =========================
+# Engine
+# =========================
+class LeaderboardEngine:
+    """In-memory leaderboards for one category filter (None = all categories)."""
+
+    def __init__(self, ids, names, public, friend_pairs, block_pairs, today, category=None, log=print):
+        order = np.argsort(ids, kind="stable")
+        self.ids = np.asarray(ids, dtype=np.int64)[order]
+        self.names = np.asarray(names, dtype=object)[order]
+        self.public = np.asarray(public, dtype=bool)[order]
+        self.category = category
+        self.log = log
+        self._sorted = len(self.ids)  # ids[:_sorted] are sorted; later ones are in _added
+        self._added = {}              # user id -> index, for add_user
+        self._rank_names()
+        self.friends = self._adjacency(friend_pairs)
+        self.blocks = self._adjacency(block_pairs)  # either direction excludes
+        # Edits since the build: {"friends" | "blocks": (added, removed)}, each {index: set of indexes}
+        self._overflow = {"friends": ({}, {}), "blocks": ({}, {})}
+        self.skipped = 0  # day changes apply() could not place (unknown users)
+        self.today = today
+        self.windows = {p: period_window(p, today) for p in PERIODS}
+        n = len(self.ids)
+        self.stats = {p: {"cur_kg": np.zeros(n), "cur_days": np.zeros(n, dtype=np.int32),
+                          "prev_kg": np.zeros(n), "prev_days": np.zeros(n, dtype=np.int32)} for p in PERIODS}
+        self._orders = {}   # (period, min_active) -> (order, sorted scores, sorted name ranks)
+        self._dirty = {}    # (period, min_active) -> user indexes changed since the order was built
+
+    def _rank_names(self):
+        """
+        Ties on score are broken by name, case-insensitively like
+        utf8mb4_general_ci. Ranks are floats so add_user can slot a name
+        between two others; _name_keys / _name_ranks are the keys in order.
+        """
+        keys = np.array([n.casefold() for n in self.names], dtype=object)
+        by_name = np.argsort(keys, kind="stable")
+        self._name_keys = keys[by_name]
+        self._name_ranks = np.arange(len(keys), dtype=float)
+        self.name_rank = np.empty(len(keys))
+        self.name_rank[by_name] = self._name_ranks
+
+    def __len__(self):
+        return len(self.ids)
+
+    def index_of(self, user_ids):
+        """User ids -> indexes (-1 for unknown users)."""
+        user_ids = np.asarray(user_ids, dtype=np.int64)
+        base = self.ids[:self._sorted]
+        pos = np.minimum(np.searchsorted(base, user_ids), max(len(base) - 1, 0))
+        idx = np.where(base[pos] == user_ids, pos, -1) if len(base) else np.full(user_ids.shape, -1)
+        if self._added:
+            miss = np.flatnonzero(idx < 0)
+            idx[miss] = [self._added.get(u, -1) for u in user_ids[miss].tolist()]
+        return idx
+
+    def _adjacency(self, pairs):
+        pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+        a, b = self.index_of(pairs[:, 0]), self.index_of(pairs[:, 1])
+        keep = (a >= 0) & (b >= 0) & (a != b)
+        a, b = a[keep], b[keep]
+        return csr(len(self.ids), np.concatenate([a, b]), np.concatenate([b, a]))
+
+    def _neighbours(self, kind, i):
+        """Sorted neighbour indexes of user index `i`: the CSR row plus the overflow edits."""
+        indptr, indices = getattr(self, kind)
+        out = indices[indptr[i]:indptr[i + 1]] if i < len(indptr) - 1 else indices[:0]
+        added, removed = self._overflow[kind]
+        if i in removed:
+            out = out[~np.isin(out, list(removed[i]))]
+        if i in added:
+            out = np.union1d(out, list(added[i])).astype(indices.dtype)
+        return out
+
+    # -------------------------
+    # Loading
+    # -------------------------
+    def load_days(self, user_ids, days, kg, entries, periods=PERIODS):
+        """
+        Bulk load from per-(user, day) totals (one row per user and day, for
+        this engine's category filter); replaces the given periods' state.
+        """
+        idx = self.index_of(user_ids)
+        days = np.asarray(days, dtype="datetime64[D]")
+        kg, entries = np.asarray(kg, dtype=float), np.asarray(entries)
+        known = (idx >= 0) & (entries > 0)
+        n = len(self.ids)
+        for period in periods:
+            w = self.windows[period]
+            s = self.stats[period]
+            for prefix, lo, hi in (("cur", w.start, w.end), ("prev", w.prev_start, w.start)):
+                m = known & (days >= lo) & (days < hi)
+                s[f"{prefix}_kg"] = np.bincount(idx[m], weights=kg[m], minlength=n)
+                s[f"{prefix}_days"] = np.bincount(idx[m], minlength=n).astype(np.int32)
+            self._drop_orders(period)
+
+    def _load_from_rollup(self, db, periods=PERIODS):
+        lo = min(self.windows[p].prev_start for p in periods)
+        hi = max(self.windows[p].end for p in periods)
+        sql = (f"SELECT user_id, day, SUM(total_kg), SUM(entries) FROM {ROLLUPS} "
+               f"WHERE day >= {db.ph} AND day < {db.ph}")
+        params = [str(lo), str(hi)]
+        if self.category:
+            sql += f" AND category = {db.ph}"
+            params.append(self.category)
+        rows = db.query(sql + " GROUP BY user_id, day", params)
+        cols = list(zip(*rows)) or [(), (), (), ()]
+        self.load_days(np.array(cols[0], dtype=np.int64), np.array([str(d) for d in cols[1]], dtype="datetime64[D]"),
+                       np.array(cols[2], dtype=float), np.array(cols[3], dtype=np.int64), periods)
+
+    @classmethod
+    def from_database(cls, db, today=None, category=None):
+        """Users, friendships, blocks and the daily rollup -> engine."""
+        ensure_schema(db)
+        users = db.query("SELECT id, name, privacy_public FROM users")
+        ids, names, public = (list(c) for c in zip(*users)) if users else ([], [], [])
+        friends = db.query("SELECT user_id_low, user_id_high FROM friendships")
+        blocks = db.query("SELECT blocker_id, blocked_id FROM blocks")
+        today = today or datetime.now(timezone.utc).date()
+        engine = cls(ids, names, [bool(p) for p in public], friends, blocks, today, category)
+        engine._load_from_rollup(db)
+        return engine
+
+    def advance(self, db, today=None):
+        """Move to a new day: periods whose window changed are reloaded from the rollup."""
+        today = today or datetime.now(timezone.utc).date()
+        windows = {p: period_window(p, today) for p in PERIODS}
+        changed = [p for p in PERIODS if windows[p] != self.windows[p]]
+        self.today, self.windows = today, windows
+        if changed:
+            self._load_from_rollup(db, changed)
+        return changed
+
+    # -------------------------
+    # Users, friendships, blocks, privacy
+    # -------------------------
+    def _known(self, user_id):
+        i = int(self.index_of([user_id])[0])
+        if i < 0:
+            raise KeyError(f"user {user_id} is not loaded (add_user first)")
+        return i
+
+    def _mark_dirty(self, i):
+        """User index `i` may have entered, left or moved in every cached global order."""
+        for dirty in self._dirty.values():
+            dirty.add(i)
+
+    def add_user(self, user_id, name, public=False):
+        """A user created after the build (no activity yet); returns its index."""
+        if self.index_of([user_id])[0] >= 0:
+            raise ValueError(f"user {user_id} is already loaded")
+        i = len(self.ids)
+        key = name.casefold()
+        at = int(np.searchsorted(self._name_keys, key, "right"))
+        lo = self._name_ranks[at - 1] if at else -1.0
+        hi = self._name_ranks[at] if at < len(self._name_ranks) else lo + 2.0
+        rank = (lo + hi) / 2
+        self.ids = np.append(self.ids, np.int64(user_id))
+        self.names = np.append(self.names, np.array([name], dtype=object))
+        self.public = np.append(self.public, bool(public))
+        self._added[int(user_id)] = i
+        self._name_keys = np.insert(self._name_keys, at, key)
+        self._name_ranks = np.insert(self._name_ranks, at, rank)
+        self.name_rank = np.append(self.name_rank, rank)
+        if not lo < rank < hi:  # gap used up: renumber, which invalidates the cached orders
+            self._rank_names()
+            for period in PERIODS:
+                self._drop_orders(period)
+        for s in self.stats.values():
+            for k, v in s.items():
+                s[k] = np.append(v, v.dtype.type(0))
+        self._mark_dirty(i)
+        return i
+
+    def _edge(self, kind, a, b, present):
+        """Add (present=True) or remove the undirected edge a - b in the overflow sets."""
+        i, j = self._known(a), self._known(b)
+        if i == j:
+            return
+        added, removed = self._overflow[kind]
+        for x, y in ((i, j), (j, i)):
+            if present:
+                added.setdefault(x, set()).add(y)
+                removed.get(x, set()).discard(y)
+            else:
+                removed.setdefault(x, set()).add(y)
+                added.get(x, set()).discard(y)
+
+    def add_friend(self, a, b):
+        self._edge("friends", a, b, True)
+
+    def remove_friend(self, a, b):
+        self._edge("friends", a, b, False)
+
+    def block(self, blocker, blocked):
+        # Held undirected (either direction excludes), so there is no unblock:
+        # the other user may have blocked too. Rebuild after an unblock.
+        self._edge("blocks", blocker, blocked, True)
+
+    def set_public(self, user_id, public):
+        i = self._known(user_id)
+        if self.public[i] != bool(public):
+            self.public[i] = bool(public)
+            self._mark_dirty(i)
+
+    # -------------------------
+    # Incremental updates
+    # -------------------------
+    def apply(self, changes):
+        """
+        Apply activity_rollups.DayChange records (the ones for this engine's
+        category filter; category None = whole-day totals). Returns how many
+        applied. Changes for users not loaded are skipped and logged: they
+        signed up after the build, so add_user them first (or rebuild).
+        """
+        changes = [c for c in changes if c.category == self.category]
+        if not changes:
+            return 0
+        idx = self.index_of([c.user_id for c in changes])
+        days = np.array([str(c.day)[:10] for c in changes], dtype="datetime64[D]")
+        d_kg = np.array([c.after_kg - c.before_kg for c in changes], dtype=float)
+        d_days = np.array([(c.after_entries > 0) - (c.before_entries > 0) for c in changes], dtype=np.int32)
+        known = idx >= 0
+        if not known.all():
+            unknown = sorted({c.user_id for c, k in zip(changes, known.tolist()) if not k})
+            self.skipped += int((~known).sum())
+            self.log(f"leaderboard: skipped {int((~known).sum())} day change(s) for {len(unknown)} user(s) "
+                     f"not loaded ({', '.join(map(str, unknown[:10]))}{', ...' if len(unknown) > 10 else ''}); "
+                     f"add_user them or rebuild the engine")
+        applied = np.zeros(len(changes), dtype=bool)
+        for period, w in self.windows.items():
+            s = self.stats[period]
+            for prefix, lo, hi in (("cur", w.start, w.end), ("prev", w.prev_start, w.start)):
+                m = known & (days >= lo) & (days < hi)
+                if not m.any():
+                    continue
+                np.add.at(s[f"{prefix}_kg"], idx[m], d_kg[m])
+                np.add.at(s[f"{prefix}_days"], idx[m], d_days[m])
+                applied |= m
+                if prefix == "cur":
+                    for key, dirty in self._dirty.items():
+                        if key[0] == period:
+                            dirty.update(idx[m].tolist())
+        return int(applied.sum())
+
+    def _drop_orders(self, period):
+        for key in [k for k in self._orders if k[0] == period]:
+            del self._orders[key]
+            del self._dirty[key]
+
+    # -------------------------
+    # Queries
+    # -------------------------
+    def scores(self, period, idx=None):
+        """Filled daily average (kg per active day * window days; 0 without activity)."""
+        s, wd = self.stats[period], self.windows[period].days
+        kg, days = (s["cur_kg"], s["cur_days"]) if idx is None else (s["cur_kg"][idx], s["cur_days"][idx])
+        return np.where(days > 0, kg / np.maximum(days, 1) * wd, 0.0)
+
+    def _global_order(self, period, min_active):
+        key = (period, min_active)
+        cached, dirty = self._orders.get(key), self._dirty.get(key, set())
+        if cached is not None and len(dirty) > len(cached[0]) // 20:
+            cached = None
+        days = self.stats[period]["cur_days"]
+        if cached is None:
+            idx = np.flatnonzero(self.public & (days >= min_active))
+            score = self.scores(period, idx)
+            order = idx[np.lexsort((self.name_rank[idx], score))]
+            cached = (order, score[np.searchsorted(idx, order)], self.name_rank[order])
+        elif dirty:
+            order, sorted_score, sorted_name = cached
+            moved = np.fromiter(dirty, dtype=np.int64)
+            keep = ~np.isin(order, moved)
+            order, sorted_score, sorted_name = order[keep], sorted_score[keep], sorted_name[keep]
+            add = moved[self.public[moved] & (days[moved] >= min_active)]
+            add_score = self.scores(period, add)
+            rank = np.lexsort((self.name_rank[add], add_score))
+            add, add_score = add[rank], add_score[rank]
+            at = np.empty(len(add), dtype=np.int64)
+            for j, (sc, nr) in enumerate(zip(add_score, self.name_rank[add])):
+                lo = np.searchsorted(sorted_score, sc, "left")
+                hi = np.searchsorted(sorted_score, sc, "right")
+                at[j] = lo + np.searchsorted(sorted_name[lo:hi], nr)
+            cached = (np.insert(order, at, add), np.insert(sorted_score, at, add_score),
+                      np.insert(sorted_name, at, self.name_rank[add]))
+        self._orders[key] = cached
+        self._dirty[key] = set()
+        return cached[0]
+
+    def top(self, me, period="week", scope="friends", limit=50, min_days=0, ratio=MIN_ACTIVE_RATIO):
+        """leaderboard.php response (without the range strings) for user id `me`."""
+        w = self.windows[period]
+        limit = max(MIN_LIMIT, min(MAX_LIMIT, int(limit)))
+        min_active = min_active_days(w.days, min_days, ratio)
+        i = int(self.index_of([me])[0])
+        blocked = self._neighbours("blocks", i) if i >= 0 else np.empty(0, dtype=np.int32)
+        if scope == "global":
+            order = self._global_order(period, min_active)
+            head = order[:limit + len(blocked)]
+            picked = head[~np.isin(head, blocked)][:limit]
+        else:
+            members = self._neighbours("friends", i) if i >= 0 else np.empty(0, dtype=np.int32)
+            members = np.concatenate([[i], members]) if i >= 0 else members
+            members = members[~np.isin(members, blocked)]
+            members = members[self.stats[period]["cur_days"][members] >= min_active]
+            score = self.scores(period, members)
+            picked = np.array([m for _, _, m in heapq.nsmallest(
+                limit, zip(score.tolist(), self.name_rank[members].tolist(), members.tolist()))], dtype=np.int64)
+        return {"scope": scope, "min_active_days": min_active, "rows": self._rows(period, picked)}
+
+    def _rows(self, period, picked):
+        s, wd = self.stats[period], self.windows[period].days
+        rows, rank, last = [], 0, None
+        for i in picked.tolist():
+            kg, days = float(s["cur_kg"][i]), int(s["cur_days"][i])
+            pkg, pdays = float(s["prev_kg"][i]), int(s["prev_days"][i])
+            total = kg / days * wd if days else 0.0
+            prev_total = pkg / pdays * wd if pdays else 0.0
+            if last is None or total != last:
+                rank, last = rank + 1, total
+            rows.append({
+                "id": int(self.ids[i]), "name": self.names[i],
+                "total_kg": round(total, 3), "prev_total_kg": round(prev_total, 3),
+                "active_days": days, "window_days": wd,
+                "avg_active_day": round(kg / days, 3) if days else None,
+                "prev_avg_active_day": round(pkg / pdays, 3) if pdays else None,
+                "rank": rank, "delta_kg": round(round(total, 3) - round(prev_total, 3), 3),
+            })
+        return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve leaderboard.php rankings from the precomputed engine.")
+    parser.add_argument("--db", required=True, help="'mysql' (DB_* env settings) or 'sqlite:<path>'")
+    parser.add_argument("--me", type=int, required=True, help="viewing user id")
+    parser.add_argument("--period", choices=PERIODS, default="week")
+    parser.add_argument("--scope", choices=("friends", "global"), default="friends")
+    parser.add_argument("--category", default=None)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--today", type=date.fromisoformat, default=None, help="YYYY-MM-DD (default: today, UTC)")
+    parser.add_argument("--refresh", action="store_true", help="refresh the daily rollup first")
+    args = parser.parse_args(argv)
+
+    db = connect(args.db)
+    try:
+        if args.refresh:
+            refresh(db)
+        t = time.perf_counter()
+        engine = LeaderboardEngine.from_database(db, args.today, args.category)
+        load_s = time.perf_counter() - t
+    finally:
+        db.close()
+    t = time.perf_counter()
+    out = engine.top(args.me, args.period, args.scope, args.limit)
+    query_ms = (time.perf_counter() - t) * 1e3
+    print(json.dumps(out, indent=2))
+    print(f"{len(engine)} users loaded in {load_s:.3f}s, query {query_ms:.3f}ms")
+    return out
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+# =============================================================================
+#  Module: naming_engine.py
+#
+#  Description:
+#  Compiled, memoised naming rules for DEFRA activities. Turns a
+#  (Category, Label, Unit) key into the user-facing title and the stable
+#  activity id written into the JS modules.
+#
+#  The rule table (category regex, label regex, template) is compiled once
+#  and bucketed per category, so each key is only tested against the rules
+#  that can apply to it. Titles and ids are cached by key, which makes the
+#  engine cheap enough to name activities in bulk at runtime as well as at
+#  build time (see name_many / name_frame).
+#
+#  Author: Finlay Shaw
+# =============================================================================
+
+import re
+from functools import lru_cache
+
+USELESS_LABELS = {"unspecified", "unknown", "nan"}
+
+
+# =========================
+# Text helpers
+# =========================
+@lru_cache(maxsize=None)
+def slugify(text):
+    """Lowercase, replace spaces with underscores, keep [a-z0-9_] only."""
+    return re.sub(r'[^a-z0-9_]', '', re.sub(r'\s+', '_', str(text).strip().lower()))
+
+def normalise_text(x: str) -> str:
+    """Normalise text for matching: lowercase, single spaces, trimmed."""
+    x = str(x or "").strip().lower()
+    x = re.sub(r"\s+", " ", x)
+    return x
+
+def a_or_an(noun: str) -> str:
+    """Simple 'a'/'an' helper for nicer titles."""
+    return "an" if re.match(r"^[aeiou]", noun) else "a"
+
+def title_tidy(s: str) -> str:
+    """Capitalise first letter and tidy after en-dashes."""
+    if not s: return s
+    s = s[:1].upper() + s[1:]
+    return re.sub(r"(–\s*)(\w)", lambda m: m.group(1) + m.group(2).upper(), s)
+
+
+# =========================
+# Engine
+# =========================
+class NamingEngine:
+    """Names (Category, Label, Unit) keys using a compiled rule table."""
+
+    def __init__(self, rules, vehicle_terms, slug_overrides=None):
+        # (category_re, label_re or None, template) compiled once
+        self.rules = [
+            (re.compile(cat_pat), re.compile(lbl_pat) if lbl_pat is not None else None, template)
+            for cat_pat, lbl_pat, template in rules
+        ]
+        # Passenger vehicle titles only depend on the matched term
+        self.vehicle_titles = [
+            (key, title_tidy(f"Drive {a_or_an(nice)} {nice}")) for key, nice in vehicle_terms.items()
+        ]
+        self.slug_overrides = dict(slug_overrides or {})
+        self._rules_by_category = {}
+        self._titles = {}
+        self._ids = {}
+
+    # ----- rule dispatch -----
+    def rules_for(self, category: str):
+        """Rules whose category pattern matches a normalised category (cached)."""
+        bucket = self._rules_by_category.get(category)
+        if bucket is None:
+            bucket = [(lbl_re, template) for cat_re, lbl_re, template in self.rules if cat_re.search(category)]
+            self._rules_by_category[category] = bucket
+        return bucket
+
+    def _first_rule(self, category, label):
+        for lbl_re, template in self.rules_for(category):
+            if lbl_re is None or lbl_re.search(label):
+                return template
+        return None
+
+    # ----- titles -----
+    def title(self, category, label, unit) -> str:
+        """Human-readable activity title for a key (memoised)."""
+        key = (category, label, unit)
+        title = self._titles.get(key)
+        if title is None:
+            title = self._titles[key] = self._build_title(category, label, unit)
+        return title
+
+    def _build_title(self, raw_category, raw_label, raw_unit) -> str:
+        category = normalise_text(raw_category)
+        label = normalise_text(raw_label)
+        unit = normalise_text(raw_unit)
+        row = {"Category": raw_category, "Label": raw_label, "Unit": raw_unit}
+
+        # If the label is useless, suppress it in names
+        label_clean = "" if label in USELESS_LABELS else label
+
+        # Passenger vehicles by fuel type
+        if "passenger vehicle" in category:
+            for key, title in self.vehicle_titles:
+                if key in label:
+                    return title
+            return title_tidy(f"Drive {a_or_an(label_clean)} {label_clean} car") if label_clean else "Drive a car"
+
+        # UK electricity for EVs: distinguish freight vs passenger
+        if category == "uk electricity for evs":
+            if "tonne" in unit:  # freight
+                template = self._first_rule(category, label)
+                if template is None:
+                    return "Electric freight"
+                return title_tidy(template(row) if callable(template) else template)
+            # passenger EVs
+            if re.search(r"battery electric", label):
+                return "Drive an electric car"
+            if re.search(r"plug-?in hybrid", label):
+                return "Drive a plug-in hybrid"
+            return "Drive an EV"
+
+        # General rules
+        template = self._first_rule(category, label)
+        if template is not None:
+            if callable(template):
+                return title_tidy(template(row))
+            return title_tidy(template.replace(" – per {unit}", "").format(unit=unit, label=label_clean))
+
+        # Fallback
+        return title_tidy(label_clean) if label_clean else "Other activity"
+
+    # ----- ids -----
+    def category_slug(self, category) -> str:
+        """Category -> filesystem-friendly slug, honoring overrides."""
+        c = str(category).strip().lower()
+        if c in self.slug_overrides:
+            return self.slug_overrides[c]
+        return slugify(category)
+
+    def activity_id(self, category, label, unit) -> str:
+        """Deterministic activity id for a key (memoised)."""
+        key = (category, label, unit)
+        activity_id = self._ids.get(key)
+        if activity_id is None:
+            activity_id = self._ids[key] = self._build_id(category, label, unit)
+        return activity_id
+
+    def _build_id(self, category, raw_label, unit) -> str:
+        cat_slug = self.category_slug(category)
+        unit_slug = slugify(unit)
+        label = str(raw_label).lower()
+
+        # Special handling for UK electricity for EVs to keep IDs stable/meaningful
+        if cat_slug == "uk_electricity_for_evs":
+            if "battery electric" in label:
+                id_str = "electric_freight_bev" if "tonne" in unit_slug else "electric_car"
+            elif "plugin hybrid" in label or "plug-in hybrid" in label:
+                id_str = "plugin_hybrid_freight" if "tonne" in unit_slug else "plugin_hybrid_car"
+            else:
+                id_str = f"{slugify(label)}_{unit_slug}"
+            return f"{cat_slug}_{id_str}"
+        return f"{cat_slug}_{slugify(raw_label)}_{unit_slug}"
+
+    # ----- bulk -----
+    def name_many(self, keys):
+        """Iterable of (Category, Label, Unit) -> list of (id, title)."""
+        return [(self.activity_id(c, l, u), self.title(c, l, u)) for c, l, u in keys]
+
+    def name_frame(self, df, cols=("Category", "Label", "Unit")):
+        """Return a copy of `df` with `id` and `activity` columns, naming each distinct key once."""
+        keys = list(zip(*(df[c] for c in cols)))
+        out = df.copy()
+        out["id"] = [self.activity_id(*k) for k in keys]
+        out["activity"] = [self.title(*k) for k in keys]
+        return out
+
+    def cache_info(self):
+        return {"titles": len(self._titles), "ids": len(self._ids), "categories": len(self._rules_by_category)}
+
+
+_default_engine = None
+
+def default_engine() -> NamingEngine:
+    """Engine configured with the DEFRA generator's rules (built on first use)."""
+    global _default_engine
+    if _default_engine is None:
+        import generate_js_from_defra as gen
+        _default_engine = gen.NAMING
+    return _default_engine
+
+def name_activities(keys):
+    """Runtime helper: name many (Category, Label, Unit) keys with the default rules."""
+    return default_engine().name_many(keys)
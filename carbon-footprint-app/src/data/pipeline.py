@@ -0,0 +1,249 @@
+# =============================================================================
+#  Script: pipeline.py
+#
+#  Description:
+#  Single entry point for the data build. Declares the four data scripts as
+#  stages of a dependency graph, loads each input once, hands DataFrames
+#  between stages in memory and runs independent stages concurrently
+#  (threads, so frames are shared rather than pickled). The Clark food stage
+#  has no DEFRA dependency and starts straight away. A final stage rebuilds
+#  the files derived from all modules (activity_aggregates.py) once, after
+#  the three generators.
+#
+#  Reports per-stage timings, wall-clock time for the whole graph and the
+#  critical path (the dependency chain that bounds the wall-clock time).
+#
+#  Usage (from src/data):
+#    python pipeline.py                # XLSX -> CSV -> JS modules
+#    python pipeline.py --from-csv     # start from pre-processed-defra.csv
+#    python pipeline.py --workers 1    # run stages one at a time
+#    python pipeline.py --compact      # also write Activities/compact modules
+#    python pipeline.py --trace build-trace.json
+#                                      # per-step timings, rows and memory peaks
+#    python pipeline.py --watch        # stay up and rebuild what each edit affects
+#                                      # (pipeline_watch.py)
+#
+#  Author: Finlay Shaw
+# =============================================================================
+
+import argparse
+import importlib.util
+import os
+import sys
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import partial
+from pathlib import Path
+
+import pipeline_trace
+
+DATA_DIR = Path(__file__).resolve().parent
+FOOD_SCRIPT = "Foodprocess (Clark et al. 2022).py"
+
+# name: unique stage name; deps: names whose results are passed in;
+# run: callable(inputs: dict[name -> result]) -> result
+Stage = namedtuple("Stage", ["name", "deps", "run"])
+
+
+# =========================
+# Script loading
+# =========================
+def load_script(filename, module_name):
+    """Import a data script by file name (some names are not valid identifiers)."""
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    spec = importlib.util.spec_from_file_location(module_name, DATA_DIR / filename)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def food_script():
+    return load_script(FOOD_SCRIPT, "foodprocess_clark")
+
+
+# =========================
+# Stages
+# =========================
+def stage_pre_process(inputs):
+    import pre_process_defra_2025 as pp
+    df_final = pp.process_defra(pp.load_workbook_frame(pp.excel_path))
+    pp.export_csv(df_final, pp.output_path)  # still written for anyone running scripts by hand
+    return df_final
+
+
+def stage_load_csv(inputs):
+    import pre_process_defra_2025 as pp
+    from defra_frames import read_defra
+    return read_defra(pp.output_path)
+
+
+def stage_generate_js(inputs, compact=False):
+    import generate_js_from_defra as gen
+    df_grouped = gen.build_activity_frame(gen.clean_defra(inputs["pre_process_defra_2025"]))
+    gen.write_modules(df_grouped, gen.OUTPUT_DIR, compact=compact)
+    return df_grouped
+
+
+def stage_general(inputs, compact=False):
+    import general_activities as ga
+    return ga.generate(ga.clean_defra(inputs["pre_process_defra_2025"]), ga.OUTPUT_DIR, compact=compact)
+
+
+def stage_food(inputs, compact=False):
+    fp = food_script()
+    activities = fp.build_activities(fp.load_clark(fp.csv_path))
+    fp.write_module(activities, fp.output_dir, compact=compact)
+    return activities
+
+
+def stage_aggregates(inputs):
+    import generate_js_from_defra as gen
+    from activity_aggregates import refresh
+    from factor_uncertainty import point_rows
+    return refresh(gen.OUTPUT_DIR, {
+        "defra": gen.distribution_rows(inputs["generate_js_from_defra"]),
+        "general": point_rows(inputs["general_activities"]),
+        "food": point_rows(inputs["food"]),
+    })
+
+
+def default_stages(from_csv=False, compact=False):
+    """
+    The data build as a graph; with from_csv the XLSX stage is replaced by a CSV
+    load, with compact every generator also writes its compact module.
+    """
+    source = stage_load_csv if from_csv else stage_pre_process
+    return [
+        Stage("pre_process_defra_2025", [], source),
+        Stage("generate_js_from_defra", ["pre_process_defra_2025"], partial(stage_generate_js, compact=compact)),
+        Stage("general_activities", ["pre_process_defra_2025"], partial(stage_general, compact=compact)),
+        Stage("food", [], partial(stage_food, compact=compact)),
+        Stage("activity_aggregates", ["generate_js_from_defra", "general_activities", "food"], stage_aggregates),
+    ]
+
+
+# =========================
+# Scheduler
+# =========================
+def validate(stages):
+    """Check names are unique, deps exist and the graph is acyclic; return topological order."""
+    by_name = {s.name: s for s in stages}
+    if len(by_name) != len(stages):
+        raise ValueError("Duplicate stage names")
+    for s in stages:
+        for d in s.deps:
+            if d not in by_name:
+                raise ValueError(f"Stage '{s.name}' depends on unknown stage '{d}'")
+
+    order, state = [], {}
+    def visit(name):
+        if state.get(name) == "done":
+            return
+        if state.get(name) == "active":
+            raise ValueError(f"Dependency cycle through '{name}'")
+        state[name] = "active"
+        for d in by_name[name].deps:
+            visit(d)
+        state[name] = "done"
+        order.append(name)
+    for s in stages:
+        visit(s.name)
+    return order
+
+
+def run_graph(stages, max_workers=None):
+    """
+    Run stages as soon as their dependencies finish. Returns (results, timings, wall)
+    where timings maps name -> (start, end) in seconds from the start of the run.
+    """
+    validate(stages)
+    by_name = {s.name: s for s in stages}
+    results, timings = {}, {}
+    pending = [s.name for s in stages]
+    running = {}
+    t0 = time.perf_counter()
+
+    def execute(stage, inputs):
+        start = time.perf_counter() - t0
+        with pipeline_trace.step(f"stage:{stage.name}") as s:
+            result = s.done(stage.run(inputs))
+        return result, (start, time.perf_counter() - t0)
+
+    with ThreadPoolExecutor(max_workers=max_workers or len(stages)) as pool:
+        while pending or running:
+            for name in [n for n in pending if all(d in results for d in by_name[n].deps)]:
+                pending.remove(name)
+                stage = by_name[name]
+                inputs = {d: results[d] for d in stage.deps}
+                running[pool.submit(execute, stage, inputs)] = name
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in done:
+                name = running.pop(fut)
+                results[name], timings[name] = fut.result()
+
+    return results, timings, time.perf_counter() - t0
+
+
+def critical_path(stages, timings):
+    """Longest chain of stage durations through the graph: (names, seconds)."""
+    by_name = {s.name: s for s in stages}
+    best = {}  # name -> (chain seconds, chain)
+    for name in validate(stages):
+        start, end = timings[name]
+        prev = max((best[d] for d in by_name[name].deps), default=(0.0, []), key=lambda x: x[0])
+        best[name] = (prev[0] + (end - start), prev[1] + [name])
+    seconds, chain = max(best.values(), key=lambda x: x[0])
+    return chain, seconds
+
+
+def print_report(stages, timings, wall):
+    print("\nPipeline stage timings:")
+    for s in stages:
+        start, end = timings[s.name]
+        print(f"  {s.name:<26} {end - start:8.3f}s  (+{start:.3f}s -> +{end:.3f}s)")
+    chain, seconds = critical_path(stages, timings)
+    total = sum(end - start for start, end in timings.values())
+    print(f" Wall clock: {wall:.3f}s (sum of stages {total:.3f}s)")
+    print(f" Critical path: {' -> '.join(chain)} ({seconds:.3f}s)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the activity data build as a stage graph.")
+    parser.add_argument("--from-csv", action="store_true", help="start from pre-processed-defra.csv")
+    parser.add_argument("--workers", type=int, default=None, help="max concurrent stages")
+    parser.add_argument("--compact", action="store_true", help="also write Activities/compact modules")
+    parser.add_argument("--trace", metavar="JSON", help="record every named step and write the trace here")
+    parser.add_argument("--trace-no-memory", action="store_true", help="trace without tracemalloc (faster)")
+    parser.add_argument("--watch", action="store_true", help="poll inputs and modules, rebuild on change")
+    parser.add_argument("--interval", type=float, default=0.25, help="--watch: seconds between polls")
+    parser.add_argument("--target", type=float, default=1.0, help="--watch: flag rebuilds slower than this")
+    parser.add_argument("--max-rebuilds", type=int, default=None, help="--watch: exit after this many rebuilds")
+    parser.add_argument("--verbose", action="store_true", help="--watch: keep the scripts' own output")
+    args = parser.parse_args(argv)
+
+    os.chdir(DATA_DIR)  # the scripts use paths relative to src/data
+    if args.watch:
+        from pipeline_watch import Watcher
+        watcher = Watcher(from_csv=args.from_csv, compact=args.compact, interval=args.interval,
+                          target=args.target, verbose=args.verbose)
+        watcher.run(args.max_rebuilds)
+        return watcher.results
+    if args.trace:
+        pipeline_trace.enable(memory=not args.trace_no_memory)
+    stages = default_stages(from_csv=args.from_csv, compact=args.compact)
+    try:
+        results, timings, wall = run_graph(stages, args.workers)
+    finally:
+        trace = pipeline_trace.disable()
+    print_report(stages, timings, wall)
+    if trace is not None:
+        print("\nStep trace:\n" + trace.summary())
+        print(f" Trace written: {trace.save(args.trace)}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
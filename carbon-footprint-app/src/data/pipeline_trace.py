@@ -0,0 +1,232 @@
+# =============================================================================
+#  Module: pipeline_trace.py
+#
+#  Description:
+#  Opt-in instrumentation for the data scripts. Named steps (Steps 1-6 of
+#  pre_process_defra_2025.py, each transform of the generators, the pipeline
+#  stages) are wrapped in
+#
+#      with pipeline_trace.step("name", df_in) as s:
+#          df_out = ...
+#          s.done(df_out)
+#
+#  and, while a trace is enabled, record their duration, rows in / out and
+#  tracemalloc peak (memory allocated above what was live when the step
+#  started, nested steps included). Steps nest per thread; the trace is
+#  written as JSON and summarised as a console table.
+#
+#  Disabled (the default), step() returns one shared no-op object: no
+#  timing, no allocation, nothing recorded.
+#
+#  Note: tracemalloc is process-wide, so peaks of stages that run
+#  concurrently overlap; use `pipeline.py --workers 1` for exact per-stage
+#  peaks. Tracing memory slows pandas-heavy steps down noticeably.
+#
+#  Author: Finlay Shaw
+# =============================================================================
+
+import json
+import threading
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+TRACE_VERSION = 1
+
+_trace = None  # the Trace being recorded, or None when disabled
+
+
+# =========================
+# Steps
+# =========================
+class _NullStep:
+    """Stand-in returned while tracing is disabled."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def done(self, result=None):
+        return result
+
+
+_NULL_STEP = _NullStep()
+
+
+def _rows(data):
+    try:
+        return len(data)
+    except TypeError:
+        return None
+
+
+class _Step:
+    def __init__(self, trace, name, data):
+        self.trace = trace
+        self.name = name
+        self.rows_in = _rows(data) if data is not None else None
+        self.rows_out = None
+
+    def __enter__(self):
+        stack = self.trace._stack()
+        self.parent = stack[-1] if stack else None
+        self.id = self.trace._next_id()
+        stack.append(self)
+        if self.trace.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if self.parent is not None:
+                self.parent.peak = max(self.parent.peak, peak)
+            tracemalloc.reset_peak()
+            self.base = self.peak = current
+        self.start = time.perf_counter()
+        return self
+
+    def done(self, result=None):
+        """Record `result` as the step's output (rows = len(result)); returns it."""
+        self.rows_out = _rows(result)
+        return result
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self.start
+        peak_bytes = None
+        if self.trace.memory:
+            self.peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+            peak_bytes = self.peak - self.base
+            if self.parent is not None:
+                self.parent.peak = max(self.parent.peak, self.peak)
+        self.trace._stack().pop()
+        self.trace._record({
+            "id": self.id,
+            "parent": self.parent.id if self.parent is not None else None,
+            "name": self.name,
+            "depth": len(self.trace._stack()),
+            "thread": threading.current_thread().name,
+            "start": round(self.start - self.trace.t0, 6),
+            "seconds": round(seconds, 6),
+            "rows_in": self.rows_in,
+            "rows_out": self.rows_out,
+            "peak_bytes": peak_bytes,
+            "error": exc_type.__name__ if exc_type else None,
+        })
+        return False
+
+
+def step(name, data=None):
+    """Context manager for one named step; `data` (anything with len) gives rows in."""
+    if _trace is None:
+        return _NULL_STEP
+    return _Step(_trace, name, data)
+
+
+def traced_steps(steps):
+    """Wrap (name, fn) frame -> frame steps so each call is a traced step."""
+    if _trace is None:
+        return steps
+
+    def wrap(name, fn):
+        def run(df):
+            with step(name, df) as s:
+                return s.done(fn(df))
+        return run
+    return [(name, wrap(name, fn)) for name, fn in steps]
+
+
+# =========================
+# Trace
+# =========================
+class Trace:
+    """Steps recorded between enable() and disable(); ids are assigned as steps start."""
+
+    def __init__(self, memory=True):
+        self.memory = memory
+        self.records = []
+        self.started = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        self.t0 = time.perf_counter()
+        self.wall = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._ids = 0
+        self._owns_tracemalloc = False
+
+    def _stack(self):
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def _next_id(self):
+        with self._lock:
+            self._ids += 1
+            return self._ids
+
+    def _record(self, rec):
+        with self._lock:
+            self.records.append(rec)
+
+    def to_dict(self):
+        return {
+            "version": TRACE_VERSION,
+            "started": self.started,
+            "wall_seconds": round(self.wall if self.wall is not None else time.perf_counter() - self.t0, 6),
+            "memory": self.memory,
+            "steps": sorted(self.records, key=lambda r: r["id"]),
+        }
+
+    def save(self, path):
+        Path(path).write_text(json.dumps(self.to_dict(), indent=2) + "\n", encoding="utf-8")
+        return path
+
+    def summary(self) -> str:
+        """Console table: each top-level step followed by its nested steps, indented."""
+        children = {}
+        for r in self.to_dict()["steps"]:
+            children.setdefault(r["parent"], []).append(r)
+
+        steps = []
+        def walk(parent):
+            for r in children.get(parent, []):
+                steps.append(r)
+                walk(r["id"])
+        walk(None)
+        width = max([len(r["name"]) + 2 * r["depth"] for r in steps] + [4])
+        lines = [f"{'step':<{width}} {'seconds':>9} {'rows in':>9} {'rows out':>9} {'peak MB':>9}"]
+        for r in steps:
+            peak = f"{r['peak_bytes'] / 2**20:9.2f}" if r["peak_bytes"] is not None else f"{'-':>9}"
+            lines.append(
+                f"{'  ' * r['depth'] + r['name']:<{width}} {r['seconds']:9.3f} "
+                f"{_fmt_rows(r['rows_in'])} {_fmt_rows(r['rows_out'])} {peak}"
+                + (f"  ({r['error']})" if r["error"] else "")
+            )
+        return "\n".join(lines)
+
+
+def _fmt_rows(n):
+    return f"{n:>9,}" if n is not None else f"{'-':>9}"
+
+
+def enable(memory=True) -> Trace:
+    """Start recording steps (and tracemalloc if `memory`); returns the Trace."""
+    global _trace
+    trace = Trace(memory)
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        trace._owns_tracemalloc = True
+    _trace = trace
+    return trace
+
+
+def disable():
+    """Stop recording; returns the finished Trace (or None if none was enabled)."""
+    global _trace
+    trace, _trace = _trace, None
+    if trace is not None:
+        trace.wall = time.perf_counter() - trace.t0
+        if trace._owns_tracemalloc:
+            tracemalloc.stop()
+    return trace
+
+
+def enabled() -> bool:
+    return _trace is not None
@@ -0,0 +1,322 @@
+# =============================================================================
+#  Module: pipeline_watch.py
+#
+#  Description:
+#  Watch mode for pipeline.py: a long-running build that polls the DEFRA
+#  workbook (or pre-processed-defra.csv with --from-csv), the Clark CSV,
+#  household-assumptions.csv and the build's own Python modules (where the
+#  config lives: EXCLUDED_CATEGORIES, UNIT_CONVERSIONS, the food keyword
+#  lists, naming rules, ...), and rebuilds only what a change affects.
+#
+#  Between rebuilds the process stays up, so pandas and the modules stay
+#  imported, the parsed DEFRA frame is kept as the source stage's result
+#  and the Clark frame is kept until its CSV changes. On a change:
+#    - edited modules are reloaded, followed by every watched module that
+#      imports them (found by parsing their import statements), in
+#      dependency order
+#    - a stage is dirty when its input file changed or its module was
+#      reloaded; dirty stages and everything downstream rerun through
+#      pipeline.run_graph, upstream stages hand back their warm results
+#    - the generators' incremental writes then touch only modules whose
+#      content changed
+#  A config-only edit (e.g. EXCLUDED_CATEGORIES) reruns just that
+#  generator from the warm frame. Each rebuild logs one timing line; a
+#  failing rebuild logs the error, keeps the last good results and retries
+#  its stages on the next change.
+#
+#  Usage (from src/data):
+#    python pipeline.py --watch                 # XLSX source
+#    python pipeline.py --watch --from-csv      # CSV source
+#    python pipeline.py --watch --interval 0.1 --target 0.5 --verbose
+#
+#  Author: Finlay Shaw
+# =============================================================================
+
+import ast
+import contextlib
+import importlib
+import io
+import sys
+import time
+from datetime import datetime
+from functools import partial
+
+import pipeline
+from pipeline import DATA_DIR, FOOD_SCRIPT, Stage
+
+INTERVAL = 0.25  # seconds between polls
+SETTLE = 0.1     # a change must be quiet this long before rebuilding (editors save in steps)
+TARGET = 1.0     # rebuild latency target (seconds); slower rebuilds are flagged in the log
+
+FOOD_MODULE = "foodprocess_clark"  # name pipeline.food_script() loads the Clark script under
+# Build modules whose edits are picked up by reloading (pipeline.py and
+# pipeline_trace.py themselves need a restart)
+MODULES = {
+    "activity_aggregates": "activity_aggregates.py",
+    "activity_factors": "activity_factors.py",
+    "activity_manifest": "activity_manifest.py",
+    "compact_emitter": "compact_emitter.py",
+    "defra_cache": "defra_cache.py",
+    "defra_frames": "defra_frames.py",
+    "defra_transforms": "defra_transforms.py",
+    "factor_registry": "factor_registry.py",
+    "factor_uncertainty": "factor_uncertainty.py",
+    "food_classifier": "food_classifier.py",
+    FOOD_MODULE: FOOD_SCRIPT,
+    "general_activities": "general_activities.py",
+    "generate_js_from_defra": "generate_js_from_defra.py",
+    "household_scenarios": "household_scenarios.py",
+    "js_modules": "js_modules.py",
+    "naming_engine": "naming_engine.py",
+    "pre_process_defra_2025": "pre_process_defra_2025.py",
+    "search_index": "search_index.py",
+}
+SOURCE_STAGE = "pre_process_defra_2025"
+
+
+# =========================
+# Module graph
+# =========================
+def imported_names(path) -> set:
+    """
+    Top-level module names a file imports at import time. Imports inside
+    functions are skipped: they look the module up when called, so they
+    already see a reloaded module and hold no stale names.
+    """
+    names = set()
+    nodes = list(ast.parse(path.read_text(encoding="utf-8"), filename=str(path)).body)
+    while nodes:
+        node = nodes.pop()
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda)):
+            continue
+        if isinstance(node, ast.Import):
+            names.update(alias.name.split(".")[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.add(node.module.split(".")[0])
+        nodes.extend(ast.iter_child_nodes(node))
+    return names
+
+
+def module_graph(modules=MODULES) -> dict:
+    """{module: watched modules it imports}."""
+    return {name: imported_names(DATA_DIR / filename) & set(modules) - {name}
+            for name, filename in modules.items()}
+
+
+def reload_order(changed, graph) -> list:
+    """`changed` plus every module importing them (transitively), dependencies first."""
+    dependents = {name: set() for name in graph}
+    for name, deps in graph.items():
+        for d in deps:
+            dependents[d].add(name)
+    affected, queue = set(changed), list(changed)
+    while queue:
+        for d in dependents[queue.pop()]:
+            if d not in affected:
+                affected.add(d)
+                queue.append(d)
+
+    order, done = [], set()
+    def visit(name):
+        if name in done:
+            return
+        done.add(name)
+        for d in sorted(graph[name] & affected):
+            visit(d)
+        order.append(name)
+    for name in sorted(affected):
+        visit(name)
+    return order
+
+
+# =========================
+# Watcher
+# =========================
+class Watcher:
+    """Polls inputs and modules, keeps stage results warm and reruns only dirty stages."""
+
+    def __init__(self, from_csv=False, compact=False, interval=INTERVAL, settle=SETTLE, target=TARGET,
+                 verbose=False, log=print):
+        self.from_csv = from_csv
+        self.interval, self.settle, self.target = interval, settle, target
+        self.verbose = verbose
+        self.log = log
+        self.stages = {s.name: s for s in pipeline.default_stages(from_csv=from_csv, compact=compact)}
+        self.stages["food"] = self.stages["food"]._replace(run=partial(self.stage_food, compact=compact))
+        self.order = pipeline.validate(list(self.stages.values()))
+
+        import pre_process_defra_2025 as pp
+        food = pipeline.food_script()
+        # file -> stage it feeds; module -> stages rooted in it
+        self.inputs = {
+            DATA_DIR / (pp.output_path if from_csv else pp.excel_path): SOURCE_STAGE,
+            DATA_DIR / food.csv_path: "food",
+            DATA_DIR / "household-assumptions.csv": "general_activities",
+        }
+        self.roots = {
+            "pre_process_defra_2025": {SOURCE_STAGE},
+            "generate_js_from_defra": {"generate_js_from_defra"},
+            "general_activities": {"general_activities"},
+            FOOD_MODULE: {"food"},
+            "activity_aggregates": {"activity_aggregates"},
+        }
+        if from_csv:
+            self.roots["defra_frames"] = {SOURCE_STAGE}
+        self.modules = {DATA_DIR / filename: name for name, filename in MODULES.items()}
+
+        self.results = {}
+        self.dirty = set(self.stages)  # everything, for the initial build
+        self.rebuilds = 0
+        self._clark = (None, None)     # (signature, frame)
+        self._stale = set()            # modules whose reload failed, retried on the next change
+        self._seen = self.snapshot()
+
+    # -------------------------
+    # Warm stages
+    # -------------------------
+    def stage_food(self, inputs, compact=False):
+        """pipeline.stage_food with the Clark frame kept until the CSV changes."""
+        fp = pipeline.food_script()
+        path = DATA_DIR / fp.csv_path
+        sig = self.signature(path)
+        if self._clark[0] != sig:
+            self._clark = (sig, fp.load_clark(path))
+        activities = fp.build_activities(self._clark[1])
+        fp.write_module(activities, fp.output_dir, compact=compact)
+        return activities
+
+    # -------------------------
+    # Polling
+    # -------------------------
+    @staticmethod
+    def signature(path):
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def snapshot(self) -> dict:
+        return {path: self.signature(path) for path in [*self.inputs, *self.modules]}
+
+    def poll(self) -> set:
+        """Paths whose signature changed since the last poll."""
+        now = self.snapshot()
+        changed = {path for path, sig in now.items() if sig != self._seen.get(path)}
+        self._seen = now
+        return changed
+
+    def wait_for_changes(self) -> set:
+        """Block until something changes and stays quiet for `settle` seconds."""
+        changed = set()
+        while not changed:
+            time.sleep(self.interval)
+            changed = self.poll()
+        while True:
+            time.sleep(self.settle)
+            more = self.poll()
+            if not more:
+                return changed
+            changed |= more
+
+    # -------------------------
+    # Rebuild
+    # -------------------------
+    def reload(self, changed_modules) -> list:
+        """
+        Reload edited modules and their importers; returns the names reloaded.
+        If one fails (e.g. a half-saved edit), it and the rest of the order are
+        retried with the next change.
+        """
+        order = reload_order(set(changed_modules) | self._stale, module_graph()) if changed_modules or self._stale else []
+        reloaded = []
+        for i, name in enumerate(order):
+            self.dirty |= self.roots.get(name, set())
+            module = sys.modules.get(name)
+            if module is None:  # not imported yet: the next import reads the new source
+                continue
+            try:
+                if name == FOOD_MODULE:  # loaded by file path, so import machinery cannot find it again
+                    del sys.modules[name]
+                    pipeline.food_script()
+                else:
+                    importlib.reload(module)
+            except BaseException:
+                sys.modules[name] = module
+                self._stale = set(order[i:])
+                raise
+            reloaded.append(name)
+        self._stale = set()
+        return reloaded
+
+    def plan(self):
+        """
+        (stages, names to run): dirty stages, stages without a result yet and
+        everything downstream of them, plus warm stand-ins for their inputs.
+        """
+        run = set()
+        for name in self.order:
+            if name in self.dirty or name not in self.results or any(d in run for d in self.stages[name].deps):
+                run.add(name)
+        stages = []
+        for name in self.order:
+            if name in run:
+                stages.append(self.stages[name])
+            elif any(name in self.stages[n].deps for n in run):
+                stages.append(Stage(name, [], lambda inputs, r=self.results[name]: r))
+        return stages, run
+
+    def rebuild(self, changed=()):
+        t0 = time.perf_counter()
+        files = sorted(p.name for p in changed)
+        try:
+            for path in changed:
+                if path in self.inputs:
+                    self.dirty.add(self.inputs[path])
+            reloaded = self.reload({self.modules[p] for p in changed if p in self.modules})
+            reload_s = time.perf_counter() - t0
+            stages, run = self.plan()
+            if not run:
+                return self._line(t0, files, reloaded, reload_s, {}, "nothing to rebuild")
+            out = io.StringIO()
+            with contextlib.redirect_stdout(sys.stdout if self.verbose else out):
+                results, timings, _ = pipeline.run_graph(stages)
+        except Exception as e:  # keep watching; the dirty stages are retried on the next change
+            self.rebuilds += 1
+            return self._line(t0, files, [], 0.0, {}, f"FAILED {type(e).__name__}: {e}")
+        self.rebuilds += 1
+        for name in run:
+            self.results[name] = results[name]
+        self.dirty -= run
+        return self._line(t0, files, reloaded, reload_s, {n: timings[n] for n in self.order if n in run})
+
+    def _line(self, t0, files, reloaded, reload_s, timings, note=""):
+        seconds = time.perf_counter() - t0
+        parts = [f"{datetime.now():%H:%M:%S} rebuild #{self.rebuilds} {seconds:.3f}s"]
+        parts.append(f"changed: {', '.join(files)}" if files else "initial build")
+        if reloaded:
+            parts.append(f"reloaded {len(reloaded)} module(s) {reload_s:.3f}s")
+        if timings:
+            parts.append("ran " + ", ".join(f"{n} {end - start:.3f}s" for n, (start, end) in timings.items()))
+            reused = [n for n in self.order if n not in timings]
+            if reused:
+                parts.append(f"warm: {', '.join(reused)}")
+        if note:
+            parts.append(note)
+        if self.target and seconds > self.target and timings:
+            parts.append(f"over {self.target:g}s target")
+        line = " | ".join(parts)
+        self.log(line)
+        return line
+
+    def run(self, max_rebuilds=None):
+        """Initial build, then rebuild on every change (Ctrl-C to stop)."""
+        source = "pre-processed-defra.csv" if self.from_csv else "the DEFRA workbook"
+        self.log(f"Watching {len(self._seen)} files ({source}, CSVs, build modules); "
+                 f"polling every {self.interval:g}s")
+        self.rebuild()
+        try:
+            while max_rebuilds is None or self.rebuilds < max_rebuilds:
+                self.rebuild(self.wait_for_changes())
+        except KeyboardInterrupt:
+            self.log("Stopped")
@@ -7,47 +7,105 @@
 #  activity). CH₄/N₂O per-gas breakdown rows are excluded for simpler joins
 #  and downstream analysis.
 #
+#  Other years: load_workbook_frame() / process_defra() take a `year`, and
+#  factor_store.py ingests several yearly workbooks into one factor store.
+#
 #  Author: Finlay Shaw
 # =============================================================================
 
 
 import pandas as pd
 
-# Step 1: Load the Excel file and skip the first 5 non-data rows
-# - The DEFRA workbook has a preamble/header; real data starts after row 5.
-excel_path = "ghg-conversion-factors-2025-flat-format.xlsx" 
+from defra_cache import CACHE_DIR, format_stats, read_sheet_cached
+from pipeline_trace import step
+
+YEAR = 2025
 sheet_name = "Factors by Category"
-df = pd.read_excel(excel_path, sheet_name=sheet_name, skiprows=5)
-
-# Step 2: Rename the relevant columns
-# - Normalise to simpler, consistent field names for downstream processing.
-df = df.rename(columns={
-    "Level 1": "Category",
-    "Level 2": "Subcategory",
-    "Level 3": "Detail",
-    "Level 4": "Activity",
-    "Column Text": "Description",
-    "UOM": "Unit",
-    "GHG Conversion Factor 2025": "EmissionFactor"
-})
-
-# Step 3: Drop rows missing essential info (Category or EmissionFactor)
-# - Keep only rows with a valid category and numeric EF.
-df = df.dropna(subset=["Category", "EmissionFactor"]).reset_index(drop=True)
-
-# Step 4: Filter to only 'kg CO2e' rows 
-# - DEFRA provides multiple gases and units; we retain aggregate CO2e rows.
-df = df[df["GHG/Unit"] == "kg CO2e"]
-
-# Step 5: Select and reorder the final columns
-# - Keep just the fields consumed by later scripts.
-df_final = df[[
-    "Category", "Subcategory", "Detail", "Activity", "Description", "Unit", "EmissionFactor"
-]]
-
-# Step 6: Export to CSV
-# This CSV is used by subsequent scripts to build JS activity modules.
 output_path = "pre-processed-defra.csv"
-df_final.to_csv(output_path, index=False)
 
-print(f"Processed DEFRA data saved to: {output_path}")
+
+def workbook_name(year):
+    return f"ghg-conversion-factors-{year}-flat-format.xlsx"
+
+
+def factor_column(year):
+    return f"GHG Conversion Factor {year}"
+
+
+def columns_for(year):
+    return [
+        "Level 1", "Level 2", "Level 3", "Level 4", "Column Text", "UOM",
+        "GHG/Unit", factor_column(year),
+    ]
+
+
+excel_path = workbook_name(YEAR)
+source_columns = columns_for(YEAR)
+
+
+def load_workbook_frame(path=excel_path, year=YEAR, cache_dir=CACHE_DIR, verbose=True):
+    """
+    Step 1: Load the Excel file and skip the first 5 non-data rows
+    - The DEFRA workbook has a preamble/header; real data starts after row 5.
+    - Only the columns used below are read (streamed), and the parsed result is
+      cached by workbook content hash so unchanged workbooks skip the XLSX parse.
+    """
+    with step("pre_process.step1_load_workbook") as s:
+        df, cache_stats = read_sheet_cached(path, sheet_name, columns_for(year), skiprows=5, cache_dir=cache_dir)
+        s.done(df)
+    if verbose:
+        print(format_stats(cache_stats))
+    return df
+
+
+def process_defra(df: pd.DataFrame, year=YEAR) -> pd.DataFrame:
+    """Steps 2-5: raw sheet columns -> tidy CO₂e factor table."""
+    # Step 2: Rename the relevant columns
+    # - Normalise to simpler, consistent field names for downstream processing.
+    with step("pre_process.step2_rename", df) as s:
+        df = s.done(df.rename(columns={
+            "Level 1": "Category",
+            "Level 2": "Subcategory",
+            "Level 3": "Detail",
+            "Level 4": "Activity",
+            "Column Text": "Description",
+            "UOM": "Unit",
+            factor_column(year): "EmissionFactor"
+        }))
+
+    # Step 3: Drop rows missing essential info (Category or EmissionFactor)
+    # - Keep only rows with a valid category and numeric EF.
+    with step("pre_process.step3_drop_missing", df) as s:
+        df = s.done(df.dropna(subset=["Category", "EmissionFactor"]).reset_index(drop=True))
+
+    # Step 4: Filter to only 'kg CO2e' rows
+    # - DEFRA provides multiple gases and units; we retain aggregate CO2e rows.
+    with step("pre_process.step4_co2e_only", df) as s:
+        df = s.done(df[df["GHG/Unit"] == "kg CO2e"])
+
+    # Step 5: Select and reorder the final columns
+    # - Keep just the fields consumed by later scripts.
+    with step("pre_process.step5_select_columns", df) as s:
+        return s.done(df[[
+            "Category", "Subcategory", "Detail", "Activity", "Description", "Unit", "EmissionFactor"
+        ]])
+
+
+def export_csv(df_final: pd.DataFrame, path=output_path):
+    """
+    Step 6: Export to CSV
+    This CSV is used by subsequent scripts to build JS activity modules.
+    """
+    with step("pre_process.step6_export_csv", df_final):
+        df_final.to_csv(path, index=False)
+    print(f"Processed DEFRA data saved to: {path}")
+
+
+def main():
+    df_final = process_defra(load_workbook_frame(excel_path))
+    export_csv(df_final, output_path)
+    return df_final
+
+
+if __name__ == "__main__":
+    main()
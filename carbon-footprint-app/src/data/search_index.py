@@ -0,0 +1,244 @@
+# =============================================================================
+#  Module: search_index.py
+#
+#  Description:
+#  Prebuilt search index for the activity picker (LogActivity). The picker
+#  matches `activity.toLowerCase().includes(query)`; this index answers the
+#  same question from postings lists instead of scanning every name.
+#
+#  Documents are the activities in allActivities.js order (so a posting is
+#  also the activity's index in that array). Postings are kept for every
+#  1-, 2- and 3-character substring of the lowercased names:
+#    - queries of up to 3 characters are a single posting lookup (exact)
+#    - longer queries intersect the postings of their trigrams, shortest
+#      first, and the few survivors are confirmed with includes()
+#  Postings are delta-encoded in the JSON to keep the file small.
+#
+#  Writes next to the modules:
+#    activitySearchIndex.json  ids + gram postings
+#    activitySearch.js         searchActivities(activities, query) helper
+#
+#  Usage (from src/data):
+#    python search_index.py            # rebuild the index
+#    python search_index.py --check    # verify it, exit 1 if out of date
+#
+#  Author: Finlay Shaw
+# =============================================================================
+
+import json
+import re
+import sys
+from pathlib import Path
+
+from js_modules import read_module, write_if_changed
+from pipeline_trace import step
+
+ACTIVITIES_DIR = "Activities"
+ALL_ACTIVITIES = "allActivities.js"
+INDEX_JSON = "activitySearchIndex.json"
+INDEX_JS = "activitySearch.js"
+INDEX_VERSION = 1
+GRAM = 3
+
+
+# =========================
+# Documents
+# =========================
+def document_order(activities_dir=ACTIVITIES_DIR):
+    """Module files in the order allActivities.js spreads them."""
+    text = (Path(activities_dir) / ALL_ACTIVITIES).read_text(encoding="utf-8")
+    files = dict(re.findall(r"import\s+(\w+)\s+from\s+['\"]\./([\w.]+?)(?:\.js)?['\"]", text))
+    return [f"{files[name]}.js" for name in re.findall(r"\.\.\.(\w+)", text) if name in files]
+
+
+def load_documents(activities_dir=ACTIVITIES_DIR):
+    """[(id, activity name)] exactly as the client's allActivities array holds them."""
+    docs = []
+    for name in document_order(activities_dir):
+        path = Path(activities_dir) / name
+        if path.exists():
+            docs.extend((a["id"], a["activity"]) for a in read_module(path)[1])
+    return docs
+
+
+# =========================
+# Build
+# =========================
+def grams(text, max_n=GRAM):
+    """Every distinct substring of length 1..max_n."""
+    return {text[i:i + n] for n in range(1, max_n + 1) for i in range(len(text) - n + 1)}
+
+
+def delta_encode(values):
+    prev, out = 0, []
+    for v in values:
+        out.append(v - prev)
+        prev = v
+    return out
+
+
+def build_index(docs) -> dict:
+    postings = {}
+    for i, (_, name) in enumerate(docs):
+        for g in grams(name.lower()):
+            postings.setdefault(g, []).append(i)  # i is increasing, so lists stay sorted
+    return {
+        "version": INDEX_VERSION,
+        "gram": GRAM,
+        "ids": [doc_id for doc_id, _ in docs],
+        "grams": {g: delta_encode(p) for g, p in sorted(postings.items())},
+    }
+
+
+# Client runtime: mirrors search() below
+INDEX_RUNTIME_JS = """\
+// Generated by search_index.py - do not edit.
+import index from "./activitySearchIndex.json";
+
+const decoded = new Map();
+function postings(gram) {
+  let list = decoded.get(gram);
+  if (!list) {
+    const deltas = index.grams[gram] || [];
+    list = new Array(deltas.length);
+    for (let i = 0, v = 0; i < deltas.length; i++) list[i] = v += deltas[i];
+    decoded.set(gram, list);
+  }
+  return list;
+}
+
+function intersect(a, b) {
+  const out = [];
+  for (let i = 0, j = 0; i < a.length && j < b.length; ) {
+    if (a[i] === b[j]) { out.push(a[i]); i++; j++; }
+    else if (a[i] < b[j]) i++;
+    else j++;
+  }
+  return out;
+}
+
+// Index positions (into allActivities) whose name contains `query`, in order
+export function searchPositions(query) {
+  const q = query.toLowerCase();
+  if (q.length <= index.gram) return postings(q);
+  const lists = [];
+  for (let i = 0; i + index.gram <= q.length; i++) lists.push(postings(q.slice(i, i + index.gram)));
+  lists.sort((a, b) => a.length - b.length);
+  return lists.reduce(intersect);
+}
+
+// Same result as activities.filter((a) => a.activity.toLowerCase().includes(query)).
+// Falls back to that scan if `activities` is not the array the index was built from.
+export function searchActivities(activities, query) {
+  if (!query) return activities;
+  const q = query.toLowerCase();
+  const matches = (a) => a.activity.toLowerCase().includes(q);
+  if (activities.length !== index.ids.length) return activities.filter(matches);
+  const out = [];
+  for (const i of searchPositions(q)) {
+    const a = activities[i];
+    if (a.id !== index.ids[i]) return activities.filter(matches);
+    if (q.length <= index.gram || matches(a)) out.push(a);
+  }
+  return out;
+}
+
+export default index;
+"""
+
+
+def update_search_index(activities_dir=ACTIVITIES_DIR) -> dict:
+    """Rebuild both index files from the modules on disk (no-op writes if unchanged)."""
+    with step("search_index.update") as s:
+        index = build_index(s.done(load_documents(activities_dir)))
+        out = Path(activities_dir)
+        write_if_changed(out / INDEX_JSON, json.dumps(index, separators=(",", ":")) + "\n")
+        write_if_changed(out / INDEX_JS, INDEX_RUNTIME_JS)
+    return index
+
+
+# =========================
+# Query (Python mirror of the client runtime, used by the check and benchmark)
+# =========================
+def decode_postings(index) -> dict:
+    decoded = {}
+    for g, deltas in index["grams"].items():
+        v, out = 0, []
+        for d in deltas:
+            v += d
+            out.append(v)
+        decoded[g] = out
+    return decoded
+
+
+def intersect(a, b):
+    out, i, j = [], 0, 0
+    while i < len(a) and j < len(b):
+        if a[i] == b[j]:
+            out.append(a[i])
+            i += 1
+            j += 1
+        elif a[i] < b[j]:
+            i += 1
+        else:
+            j += 1
+    return out
+
+
+def search(postings, names_lower, query, gram=GRAM):
+    """Positions of names containing `query`; `postings` from decode_postings()."""
+    q = query.lower()
+    if not q:
+        return list(range(len(names_lower)))
+    if len(q) <= gram:
+        return postings.get(q, [])
+    lists = sorted((postings.get(q[i:i + gram], []) for i in range(len(q) - gram + 1)), key=len)
+    candidates = lists[0]
+    for other in lists[1:]:
+        candidates = intersect(candidates, other)
+    return [i for i in candidates if q in names_lower[i]]
+
+
+# =========================
+# Check
+# =========================
+def check_search_index(activities_dir=ACTIVITIES_DIR):
+    """Return a list of problems (empty when the index matches the modules)."""
+    out = Path(activities_dir)
+    try:
+        stored = json.loads((out / INDEX_JSON).read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return [f"{INDEX_JSON} is missing"]
+    except ValueError as e:
+        return [f"{INDEX_JSON} does not parse ({e})"]
+
+    problems = []
+    try:
+        fresh = build_index(load_documents(activities_dir))
+    except ValueError as e:
+        return [f"cannot read modules ({e})"]
+    if stored.get("ids") != fresh["ids"]:
+        problems.append(f"document ids differ ({len(stored.get('ids', []))} indexed, {len(fresh['ids'])} in modules)")
+    if stored.get("grams") != fresh["grams"]:
+        problems.append("gram postings differ from the modules")
+    js = out / INDEX_JS
+    if not js.exists() or js.read_text(encoding="utf-8") != INDEX_RUNTIME_JS:
+        problems.append(f"{INDEX_JS} is out of date")
+    return problems
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if "--check" in argv:
+        problems = check_search_index(ACTIVITIES_DIR)
+        for p in problems:
+            print(f" ✗ {p}")
+        print("Search index OK" if not problems else f"Search index check failed: {len(problems)} problem(s)")
+        sys.exit(1 if problems else 0)
+    index = update_search_index(ACTIVITIES_DIR)
+    size = (Path(ACTIVITIES_DIR) / INDEX_JSON).stat().st_size
+    print(f"Search index written: {len(index['ids'])} activities, {len(index['grams'])} grams, {size} bytes")
+
+
+if __name__ == "__main__":
+    main()
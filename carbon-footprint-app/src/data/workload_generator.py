@@ -0,0 +1,458 @@
+# =============================================================================
+#  Script: workload_generator.py
+#
+#  Description:
+#  Generates a production-scale synthetic dataset for the app's tables:
+#  users, friendships, friend_requests, blocks, user_goals and
+#  user_activities. Activities are drawn from the generated Activities/*.js
+#  catalogue (factor_registry), so ids, names, units and emission factors
+#  are the ones the app would log.
+#
+#  Shape of the data:
+#    - users sign up through the date range, some stop logging (churn), and
+#      each has their own logging rate (log-normal) and category mix
+#      (Dirichlet around CATEGORY PROFILES shares)
+#    - within a category, activities follow a Zipf-like popularity
+#    - times follow per-category hour-of-day peaks, weekend and winter /
+#      summer factors; quantities are log-normal around a typical amount
+#      per unit
+#    - friendships by random stub matching (~FRIENDS per user); pending,
+#      declined and canceled requests (accepted ones are deleted by the
+#      app); a few blocks; cap goals sized from each user's expected kg
+#
+#  Activities are produced one day at a time in time order (auto-increment
+#  ids follow occurred_at) and streamed to the sink: a database (multi-row
+#  INSERTs, one commit per batch) or TSV bulk-load files plus a load.sql of
+#  LOAD DATA LOCAL INFILE statements (for an empty database: ids start at 1).
+#  The same seed and arguments give the same data.
+#
+#  Generated accounts get a placeholder password that is not a bcrypt
+#  hash, so they cannot log in.
+#
+#  Usage (from src/data):
+#    python workload_generator.py --users 10000 --db sqlite:synthetic.db
+#    python workload_generator.py --users 200000 --out synthetic/ --seed 7
+#
+#  Author: Finlay Shaw
+# =============================================================================
+
+import argparse
+import time
+from collections import namedtuple
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from activity_importer import to_records
+from db import USER_ACTIVITY_COLUMNS, connect
+from factor_registry import FactorRegistry
+
+SEED = 42
+START = "2024-01-01"
+END = "2025-01-01"
+USERS = 10_000
+RATE = 2.0                # mean activities per user per active day
+FRIENDS = 8               # mean friends per user
+BATCH_SIZE = 10_000
+CHURN = 0.25              # share of users who stop logging at some point
+PUBLIC = 0.35             # share of users with privacy_public = 1
+MIX_CONCENTRATION = 20.0  # higher = users' category mixes closer to the shares
+PASSWORD = "!synthetic"
+
+# =========================
+# Catalogue profiles
+# =========================
+# share: of all activities; peaks: (hour, width, weight) of the hour-of-day
+# curve; weekend: activity multiplier on Sat/Sun; winter: multiplier in
+# Nov-Feb (its inverse applies in Jun-Aug)
+Profile = namedtuple("Profile", ["share", "peaks", "weekend", "winter"])
+
+PROFILES = {
+    "food":                   Profile(0.55, ((8, 1.0, 0.8), (12.5, 1.0, 1.0), (18.5, 1.5, 1.2)), 1.1, 1.0),
+    "general":                Profile(0.20, ((8, 1.5, 0.6), (19.5, 2.0, 1.0)), 1.3, 1.2),
+    "passenger_vehicles":     Profile(0.10, ((8, 1.0, 1.0), (17.5, 1.0, 1.0), (13, 3.0, 0.3)), 0.7, 1.0),
+    "homeworking":            Profile(0.04, ((10, 1.5, 1.0), (14.5, 2.0, 1.0)), 0.1, 1.1),
+    "waste_disposal":         Profile(0.03, ((18, 2.0, 1.0),), 1.2, 1.0),
+    "water_supply":           Profile(0.02, ((7, 1.0, 1.0), (20.5, 1.5, 0.8)), 1.2, 0.9),
+    "uk_electricity":         Profile(0.02, ((19, 2.5, 1.0),), 1.1, 1.3),
+    "delivery_vehicles":      Profile(0.02, ((11, 2.0, 1.0), (15, 2.0, 0.7)), 0.6, 1.2),
+    "uk_electricity_for_evs": Profile(0.01, ((8, 1.0, 0.8), (18, 1.5, 1.0)), 0.8, 1.0),
+    "business_travel_air":    Profile(0.005, ((7, 2.0, 1.0), (15, 3.0, 0.8)), 0.8, 0.6),
+    "hotel_stay":             Profile(0.003, ((20, 2.0, 1.0),), 1.5, 0.7),
+    "business_travel_sea":    Profile(0.002, ((10, 2.0, 1.0),), 1.3, 0.5),
+}
+DEFAULT_PROFILE = Profile(0.005, ((12, 4.0, 1.0),), 1.0, 1.0)
+
+# Typical quantity (median, log-normal sigma) per unit, with category overrides
+QUANTITY = {
+    "kg": (0.25, 0.6), "litres": (0.4, 0.5), "kilograms": (3.0, 0.7), "km": (12.0, 0.9),
+    "kg·km": (40.0, 1.0), "tonne.km": (5.0, 0.8), "passenger.km": (900.0, 0.8),
+    "minutes": (15.0, 0.6), "10 minutes": (2.0, 0.5), "hours": (2.0, 0.6), "days": (1.0, 0.3),
+    "uses": (1.0, 0.3), "charges": (1.0, 0.3), "FTE working hour": (7.5, 0.15),
+    "Room per night": (2.0, 0.5), "wh": (3000.0, 0.7),
+}
+QUANTITY_OVERRIDES = {("water_supply", "litres"): (150.0, 0.5)}
+DEFAULT_QUANTITY = (1.0, 0.5)
+
+FIRST_NAMES = ("Alex", "Sam", "Jordan", "Taylor", "Morgan", "Casey", "Jamie", "Riley", "Avery", "Charlie",
+               "Finlay", "Priya", "Omar", "Mei", "Lucia", "Tom", "Aisha", "Noah", "Grace", "Ivan")
+LAST_NAMES = ("Smith", "Jones", "Taylor", "Brown", "Williams", "Wilson", "Patel", "Khan", "Evans", "Shaw",
+              "Thomas", "Roberts", "Walker", "Wright", "Green", "Hall", "Wood", "Clarke", "Hughes", "Lewis")
+GOAL_PERIOD_DAYS = {"week": 7, "month": 30.4, "year": 365}
+
+
+def hour_cdf(peaks):
+    """Hour-of-day CDF from a small baseline plus Gaussian peaks."""
+    h = np.arange(24) + 0.5
+    w = 0.02 + sum(weight * np.exp(-0.5 * ((h - hour) / width) ** 2) for hour, width, weight in peaks)
+    return np.cumsum(w) / w.sum()
+
+
+class Catalogue:
+    """Registry rows grouped by category, with popularity, time and quantity profiles."""
+
+    def __init__(self, registry, rng):
+        rows = sorted(registry, key=lambda f: (f.category, f.id))
+        self.categories = sorted({f.category for f in rows})
+        cat_of = {c: i for i, c in enumerate(self.categories)}
+        self.ids = np.array([f.id for f in rows], dtype=object)
+        self.names = np.array([f.activity for f in rows], dtype=object)
+        self.cats = np.array([f.category for f in rows], dtype=object)
+        self.types = np.array([f.type for f in rows], dtype=object)
+        self.units = np.array([f.unit for f in rows], dtype=object)
+        self.factors = np.round(np.array([f.emission_factor for f in rows]), 6)
+        q = [QUANTITY_OVERRIDES.get((f.category, f.unit), QUANTITY.get(f.unit, DEFAULT_QUANTITY)) for f in rows]
+        self.q_median = np.array([m for m, _ in q])
+        self.q_sigma = np.array([s for _, s in q])
+
+        codes = np.array([cat_of[f.category] for f in rows])
+        self.bounds = np.searchsorted(codes, np.arange(len(self.categories) + 1))
+        self.item_cdfs, mean_kg = [], []
+        for c in range(len(self.categories)):
+            lo, hi = self.bounds[c], self.bounds[c + 1]
+            weights = np.empty(hi - lo)
+            weights[rng.permutation(hi - lo)] = 1.0 / np.arange(1, hi - lo + 1) ** 0.8
+            weights /= weights.sum()
+            self.item_cdfs.append(np.cumsum(weights))
+            per_item = self.factors[lo:hi] * self.q_median[lo:hi] * np.exp(self.q_sigma[lo:hi] ** 2 / 2)
+            mean_kg.append(float(weights @ per_item))
+        self.mean_kg = np.array(mean_kg)  # expected kg CO2e per activity in each category
+
+        profiles = [PROFILES.get(c, DEFAULT_PROFILE) for c in self.categories]
+        self.shares = np.array([p.share for p in profiles])
+        self.shares /= self.shares.sum()
+        self.hour_cdfs = [hour_cdf(p.peaks) for p in profiles]
+        self.weekend = np.array([p.weekend for p in profiles])
+        self.winter = np.array([p.winter for p in profiles])
+
+    def season(self, month):
+        if month in (11, 12, 1, 2):
+            return self.winter
+        if month in (6, 7, 8):
+            return 1.0 / self.winter
+        return np.ones(len(self.categories))
+
+    def sample_items(self, cats, rng):
+        out = np.empty(len(cats), dtype=np.int64)
+        for c in np.unique(cats):
+            mask = cats == c
+            pick = np.searchsorted(self.item_cdfs[c], rng.random(int(mask.sum())), side="right")
+            out[mask] = self.bounds[c] + np.minimum(pick, len(self.item_cdfs[c]) - 1)
+        return out
+
+    def sample_hours(self, cats, rng):
+        out = np.empty(len(cats), dtype=np.int64)
+        for c in np.unique(cats):
+            mask = cats == c
+            out[mask] = np.minimum(np.searchsorted(self.hour_cdfs[c], rng.random(int(mask.sum()))), 23)
+        return out
+
+
+def timestamps(start, seconds):
+    """Seconds since `start` (a date) -> 'Y-m-d H:i:s' strings."""
+    at = np.datetime64(start, "s") + np.asarray(seconds, dtype=np.int64).astype("timedelta64[s]")
+    return pd.Series(np.datetime_as_string(at, unit="s"), dtype=object).str.slice_replace(10, 11, " ").to_numpy()
+
+
+def pair_keys(a, b, base):
+    """Unordered pair -> one int64 key (for set membership with np.isin)."""
+    return np.minimum(a, b) * base + np.maximum(a, b)
+
+
+# =========================
+# Sinks
+# =========================
+class DatabaseSink:
+    """Streams frames into a database with multi-row INSERTs, one commit per batch."""
+
+    def __init__(self, db, batch_size=BATCH_SIZE):
+        self.db = db
+        self.batch_size = batch_size
+
+    def next_id(self, table):
+        return int(self.db.query(f"SELECT COALESCE(MAX(id), 0) FROM {table}")[0][0]) + 1
+
+    def write(self, table, frame):
+        records = to_records(frame)
+        for start in range(0, len(records), self.batch_size):
+            self.db.insert_rows(table, tuple(frame.columns), records[start:start + self.batch_size])
+            self.db.commit()
+
+    def close(self):
+        pass
+
+
+def tsv_lines(frame):
+    """Frame -> LOAD DATA text: tab-separated, backslash escapes, \\N for NULL."""
+    cols = []
+    for name in frame.columns:
+        values = frame[name]
+        text = values.astype(str)
+        if values.dtype == object:
+            text = (text.str.replace("\\", "\\\\", regex=False).str.replace("\t", "\\t", regex=False)
+                    .str.replace("\n", "\\n", regex=False))
+        cols.append(text.where(values.notna(), "\\N").tolist())
+    return "".join("\t".join(row) + "\n" for row in zip(*cols))
+
+
+class FileSink:
+    """Writes one TSV per table (MariaDB LOAD DATA format) and a load.sql to load them."""
+
+    def __init__(self, out_dir):
+        self.out_dir = Path(out_dir)
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        self.files, self.columns = {}, {}
+
+    def next_id(self, table):
+        return 1
+
+    def write(self, table, frame):
+        if table not in self.files:
+            self.files[table] = open(self.out_dir / f"{table}.tsv", "w", encoding="utf-8", newline="")
+            self.columns[table] = list(frame.columns)
+        self.files[table].write(tsv_lines(frame))
+
+    def close(self):
+        for f in self.files.values():
+            f.close()
+        with open(self.out_dir / "load.sql", "w", encoding="utf-8") as f:
+            f.write("-- mysql --local-infile=1 carbon_app < load.sql  (run from this directory)\n")
+            for table, columns in self.columns.items():
+                f.write(f"LOAD DATA LOCAL INFILE '{table}.tsv' INTO TABLE `{table}` CHARACTER SET utf8mb4 "
+                        f"FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' LINES TERMINATED BY '\\n' "
+                        f"({', '.join(f'`{c}`' for c in columns)});\n")
+
+
+# =========================
+# Generators
+# =========================
+def generate_users(n, first_id, start, days, catalogue, rate, rng):
+    """users frame plus the per-user state the other generators need."""
+    ids = first_id + np.arange(n, dtype=np.int64)
+    signup = rng.random(n) * max(days - 7, 1)
+    churned = rng.random(n) < CHURN
+    last = np.where(churned, signup + rng.random(n) * (days - signup), days)
+    sigma = 0.8
+    rates = rng.lognormal(np.log(rate) - sigma ** 2 / 2, sigma, n)
+    mix = rng.dirichlet(catalogue.shares * MIX_CONCENTRATION, n).astype(np.float32)
+
+    first = np.array(FIRST_NAMES, dtype=object)[rng.integers(len(FIRST_NAMES), size=n)]
+    last_name = np.array(LAST_NAMES, dtype=object)[rng.integers(len(LAST_NAMES), size=n)]
+    created = timestamps(start, signup * 86400)
+    frame = pd.DataFrame({
+        "id": ids,
+        "name": first + " " + last_name,
+        "email": (pd.Series(first).str.lower() + "." + pd.Series(last_name).str.lower() + "."
+                  + pd.Series(ids).astype(str) + "@example.com").to_numpy(),
+        "units": np.where(rng.random(n) < 0.1, "lb", "kg"),
+        "privacy_public": (rng.random(n) < PUBLIC).astype(np.int64),
+        "password": PASSWORD,
+        "created_at": created, "updated_at": created,
+    })
+    state = {"ids": ids, "signup": signup, "last": last, "rates": rates, "mix": mix}
+    return frame, state
+
+
+def generate_social(state, start, days, friends, next_request_id, rng):
+    """(friendships, friend_requests, blocks) frames."""
+    ids, signup = state["ids"], state["signup"]
+    n = len(ids)
+    base = int(ids.max()) + 1
+
+    # Friendships: random stub matching on geometric degrees
+    stubs = np.repeat(np.arange(n), rng.geometric(1.0 / (friends + 1), n) - 1)
+    rng.shuffle(stubs)
+    pairs = stubs[:len(stubs) // 2 * 2].reshape(-1, 2)
+    pairs = pairs[pairs[:, 0] != pairs[:, 1]]
+    pairs = np.unique(np.sort(pairs, axis=1), axis=0)
+    since = np.maximum(signup[pairs[:, 0]], signup[pairs[:, 1]]) + rng.exponential(14, len(pairs))
+    friendships = pd.DataFrame({
+        "user_id_low": ids[pairs[:, 0]], "user_id_high": ids[pairs[:, 1]],
+        "created_at": timestamps(start, np.minimum(since, days - 1e-3) * 86400),
+    })
+    taken = pair_keys(friendships["user_id_low"].to_numpy(), friendships["user_id_high"].to_numpy(), base)
+
+    # Open and closed requests between users who are not friends
+    req = rng.integers(n, size=(max(1, len(pairs) // 4), 2))
+    req = req[req[:, 0] != req[:, 1]]
+    keys = pair_keys(ids[req[:, 0]], ids[req[:, 1]], base)
+    _, first = np.unique(keys, return_index=True)
+    first = first[~np.isin(keys[first], taken)]
+    req, keys = req[np.sort(first)], keys[np.sort(first)]
+    sent = np.minimum(np.maximum(signup[req[:, 0]], signup[req[:, 1]]) + rng.exponential(30, len(req)), days - 1e-3)
+    status = rng.choice(np.array(["pending", "declined", "canceled"], dtype=object), len(req), p=[0.6, 0.3, 0.1])
+    answered = np.minimum(sent + rng.exponential(2, len(req)), days - 1e-3)
+    requests = pd.DataFrame({
+        "id": next_request_id + np.arange(len(req), dtype=np.int64),
+        "requester_id": ids[req[:, 0]], "addressee_id": ids[req[:, 1]], "status": status,
+        "created_at": timestamps(start, sent * 86400),
+        "responded_at": np.where(status == "pending", None, timestamps(start, answered * 86400)),
+    })
+    taken = np.concatenate([taken, keys])
+
+    # Blocks: about 1 in 100 users blocks a stranger (blocking removes friendships and requests)
+    blk = rng.integers(n, size=(max(1, n // 100), 2))
+    blk = blk[blk[:, 0] != blk[:, 1]]
+    blk = blk[~np.isin(pair_keys(ids[blk[:, 0]], ids[blk[:, 1]], base), taken)]
+    blk = np.unique(blk, axis=0)
+    blocked_at = np.minimum(np.maximum(signup[blk[:, 0]], signup[blk[:, 1]]) + rng.exponential(30, len(blk)), days - 1e-3)
+    blocks = pd.DataFrame({"blocker_id": ids[blk[:, 0]], "blocked_id": ids[blk[:, 1]],
+                           "created_at": timestamps(start, blocked_at * 86400)})
+    return friendships, requests, blocks
+
+
+def generate_goals(state, start, days, catalogue, next_goal_id, rng):
+    """Cap goals for ~30% of users, targets a little under their expected kg per period."""
+    n = len(state["ids"])
+    counts = np.where(rng.random(n) < 0.3, rng.integers(1, 4, n), 0)
+    owner = np.repeat(np.arange(n), counts)
+    m = len(owner)
+    period = rng.choice(np.array(list(GOAL_PERIOD_DAYS), dtype=object), m, p=[0.3, 0.5, 0.2])
+    mix = state["mix"][owner]
+    whole = rng.random(m) < 0.4
+    cat = np.argmax(mix * rng.random(mix.shape), axis=1)  # usually one of the user's main categories
+    daily_kg = state["rates"][owner] * np.where(whole, mix @ catalogue.mean_kg, mix[np.arange(m), cat] * catalogue.mean_kg[cat])
+    target = daily_kg * np.array([GOAL_PERIOD_DAYS[p] for p in period]) * rng.uniform(0.7, 0.95, m)
+    categories = np.array(catalogue.categories, dtype=object)[cat]
+    created = np.minimum(state["signup"][owner] + rng.exponential(10, m), days - 1e-3) * 86400
+    stamps = timestamps(start, created)
+    return pd.DataFrame({
+        "id": next_goal_id + np.arange(m, dtype=np.int64),
+        "user_id": state["ids"][owner],
+        "name": np.where(whole, pd.Series(period).str.capitalize() + " cap",
+                         "Cut " + pd.Series(categories).str.replace("_", " ")),
+        "type": "cap",
+        "period": period,
+        "category": np.where(whole, None, categories),
+        "target_kg": np.round(target, 3),
+        "is_active": (rng.random(m) < 0.85).astype(np.int64),
+        "created_at": stamps, "updated_at": stamps,
+    })
+
+
+def generate_activities(state, start, days, catalogue, rng):
+    """Yields one user_activities frame per day, rows in occurred_at order."""
+    ids, signup, last, rates, mix = state["ids"], state["signup"], state["last"], state["rates"], state["mix"]
+    weekend_mix = mix @ catalogue.weekend.astype(np.float32)
+    weekly_norm = (5 + 2 * weekend_mix) / 7  # so weekday/weekend factors keep the weekly mean
+    first_weekday = start.weekday()
+    for day in range(days):
+        lo, hi = np.maximum(signup, day), np.minimum(last, day + 1)
+        active = np.flatnonzero(hi > lo)
+        weekend = (first_weekday + day) % 7 >= 5
+        day_factor = (weekend_mix[active] if weekend else 1.0) / weekly_norm[active]
+        counts = rng.poisson(rates[active] * (hi - lo)[active] * day_factor)
+        users = np.repeat(active, counts)
+        m = len(users)
+        if m == 0:
+            continue
+
+        weights = catalogue.season((start + timedelta(days=day)).month) * (catalogue.weekend if weekend else 1.0)
+        cdf = np.cumsum(mix[users] * weights.astype(np.float32), axis=1)
+        cats = np.minimum((rng.random(m)[:, None] * cdf[:, -1:] > cdf).sum(axis=1), len(weights) - 1)
+        items = catalogue.sample_items(cats, rng)
+        seconds = day * 86400 + catalogue.sample_hours(cats, rng) * 3600 + rng.integers(0, 3600, m)
+        seconds = np.clip(seconds, (lo[users] * 86400).astype(np.int64), (hi[users] * 86400).astype(np.int64) - 1)
+        order = np.argsort(seconds, kind="stable")
+        users, items, seconds = users[order], items[order], seconds[order]
+
+        quantity = rng.lognormal(np.log(catalogue.q_median[items]), catalogue.q_sigma[items])
+        stamps = timestamps(start, seconds)
+        yield pd.DataFrame({
+            "user_id": ids[users],
+            "activity_id": catalogue.ids[items],
+            "activity_name": catalogue.names[items],
+            "category": catalogue.cats[items],
+            "type": catalogue.types[items],
+            "unit": catalogue.units[items],
+            "emission_factor": catalogue.factors[items],
+            "quantity": np.clip(np.round(quantity, 3), 0.001, 1e6),
+            "occurred_at": stamps,
+            "meta": "[]",
+            "created_at": stamps, "updated_at": stamps,
+        }, columns=[*USER_ACTIVITY_COLUMNS, "created_at", "updated_at"])
+
+
+def generate(sink, users=USERS, start=START, end=END, rate=RATE, friends=FRIENDS, seed=SEED, registry=None):
+    """Generate everything into `sink`; returns {table: rows} plus seconds."""
+    start, end = date.fromisoformat(start), date.fromisoformat(end)
+    days = (end - start).days
+    if days <= 0:
+        raise ValueError(f"end ({end}) must be after start ({start})")
+    rng = np.random.default_rng(seed)
+    catalogue = Catalogue(registry or FactorRegistry.from_modules(), rng)
+    stats = {}
+    t0 = time.perf_counter()
+
+    frame, state = generate_users(users, sink.next_id("users"), start, days, catalogue, rate, rng)
+    sink.write("users", frame)
+    stats["users"] = len(frame)
+
+    friendships, requests, blocks = generate_social(state, start, days, friends, sink.next_id("friend_requests"), rng)
+    goals = generate_goals(state, start, days, catalogue, sink.next_id("user_goals"), rng)
+    for table, frame in (("friendships", friendships), ("friend_requests", requests),
+                         ("blocks", blocks), ("user_goals", goals)):
+        sink.write(table, frame)
+        stats[table] = len(frame)
+
+    stats["user_activities"] = 0
+    for frame in generate_activities(state, start, days, catalogue, rng):
+        sink.write("user_activities", frame)
+        stats["user_activities"] += len(frame)
+    sink.close()
+    stats["seconds"] = time.perf_counter() - t0
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic carbon_app dataset from the activity catalogue.")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--db", help="'mysql' (DB_* env settings) or 'sqlite:<path>'")
+    target.add_argument("--out", help="directory for TSV bulk-load files and load.sql")
+    parser.add_argument("--users", type=int, default=USERS)
+    parser.add_argument("--start", default=START, help="first day (YYYY-MM-DD)")
+    parser.add_argument("--end", default=END, help="day after the last (YYYY-MM-DD)")
+    parser.add_argument("--rate", type=float, default=RATE, help="mean activities per user per active day")
+    parser.add_argument("--friends", type=float, default=FRIENDS, help="mean friends per user")
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="rows per INSERT / commit")
+    args = parser.parse_args(argv)
+
+    db = connect(args.db) if args.db else None
+    sink = DatabaseSink(db, args.batch_size) if db else FileSink(args.out)
+    try:
+        stats = generate(sink, args.users, args.start, args.end, args.rate, args.friends, args.seed)
+    finally:
+        if db:
+            db.close()
+    seconds = stats.pop("seconds")
+    total = sum(stats.values())
+    print("Generated " + ", ".join(f"{rows:,} {table}" for table, rows in stats.items()))
+    print(f"  {total:,} rows in {seconds:.1f}s = {total / seconds:,.0f} rows/s -> {args.db or args.out}")
+    return stats
+
+
+if __name__ == "__main__":
+    main()
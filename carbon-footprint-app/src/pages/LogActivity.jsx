@@ -16,6 +16,7 @@
 
 import { useMemo, useState } from "react";
 import allActivities from "../data/Activities/allActivities";
+import { searchActivities } from "../data/Activities/activitySearch";
 import ActivityModal from "../components/ui/ActivityModal";
 import { api } from "../services/api"; 
 import { useUnits } from "../context/UnitsContext";
@@ -50,14 +51,12 @@ function LogActivity() {
 
   // Filter master activities list by chosen category + search term
   const filteredActivities = useMemo(() => {
-    const q = searchTerm.toLowerCase();
-    return allActivities.filter((activity) => {
-      const inCategory =
-        selectedCategory === "all" ||
-        categoryGroups[selectedCategory]?.includes(activity.category);
-      const matchesSearch = activity.activity.toLowerCase().includes(q);
-      return inCategory && matchesSearch;
-    });
+    // Prebuilt index (search_index.py) narrows by name without scanning every activity
+    const matches = searchActivities(allActivities, searchTerm);
+    if (selectedCategory === "all") return matches;
+    return matches.filter((activity) =>
+      categoryGroups[selectedCategory]?.includes(activity.category)
+    );
   }, [selectedCategory, searchTerm]);
 
   // Live preview of total emissions based on current quantity 